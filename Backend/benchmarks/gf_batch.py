@@ -0,0 +1,78 @@
+"""
+Scalar vs. vectorized GF(2^m) operations.
+
+    python -m Backend.benchmarks.gf_batch [--size 100000]
+
+Prints the time per operation for Backend.gf (one Python call per element,
+table fast path) and Backend.gf.batch (NumPy gathers over the whole array).
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from ..gf import IRRED_DEFAULTS, GFConfig, get_tables, gf_inv, gf_mul, gf_pow
+from ..gf.batch import batch_inv, batch_mul, batch_pow, table_bytes
+
+FIELDS = ((8, IRRED_DEFAULTS[8]), (16, 0x1100B))
+
+
+def _best(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(size: int) -> list[tuple[str, int, float | None, float]]:
+    results = []
+    rng = random.Random(0)
+    for m, mod_poly in FIELDS:
+        cfg = GFConfig(m, mod_poly)
+        get_tables(m, mod_poly)  # build tables outside the timed region
+        a = [rng.randrange(1, 1 << m) for _ in range(size)]
+        b = [rng.randrange(1, 1 << m) for _ in range(size)]
+        a_np, b_np = np.array(a), np.array(b)
+        batch_mul(a_np[:1], b_np[:1], m, mod_poly)
+
+        cases = {
+            "mul": (
+                lambda: [gf_mul(x, y, cfg) for x, y in zip(a, b)],
+                lambda: batch_mul(a_np, b_np, m, mod_poly),
+            ),
+            "inv": (
+                lambda: [gf_inv(x, cfg) for x in a],
+                lambda: batch_inv(a_np, m, mod_poly),
+            ),
+            "pow": (
+                lambda: [gf_pow(x, 12345, cfg) for x in a],
+                lambda: batch_pow(a_np, 12345, m, mod_poly),
+            ),
+        }
+        for name, (scalar, vector) in cases.items():
+            results.append((name, m, _best(scalar), _best(vector)))
+        table_bytes.cache_clear()
+        kind = "mul" if m <= 8 else "log"
+        results.append((f"{kind} table", m, None, _best(lambda: table_bytes(kind, m, mod_poly), 1)))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100_000)
+    args = parser.parse_args()
+    print(f"{'op':<10} {'m':>3} {'scalar ns/op':>14} {'numpy ns/op':>13} {'speedup':>8}")
+    for name, m, scalar, vector in run(args.size):
+        per = 1e9 / args.size
+        if scalar is None:  # one-off table export, report the total time
+            print(f"{name:<10} {m:>3} {'-':>14} {vector * 1e3:>10.2f} ms {'-':>8}")
+            continue
+        print(f"{name:<10} {m:>3} {scalar * per:>14.1f} {vector * per:>13.1f} {scalar / vector:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Big-field GF(2^m) arithmetic on the NIST binary fields.
+
+    python -m Backend.benchmarks.gf_bigfield [--count 2000]
+
+Prints µs per operation for each field: schoolbook shift-and-add vs. comb vs.
+Karatsuba multiplication, table squaring, sparse vs. generic reduction, and
+extended Euclid vs. Itoh–Tsujii inversion. KARATSUBA_THRESHOLD and the choice
+of Euclid in big_inv come from these numbers.
+"""
+
+import argparse
+import random
+import time
+
+from ..gf import bigfield
+from ..gf.bigfield import NIST_MODULI, clmul, clsquare, inv_eea, inv_itoh_tsujii, reducer
+
+
+def _schoolbook(a: int, b: int) -> int:
+    prod = 0
+    while b:
+        if b & 1:
+            prod ^= a
+        a <<= 1
+        b >>= 1
+    return prod
+
+
+def _karatsuba(a: int, b: int) -> int:
+    old = bigfield.KARATSUBA_THRESHOLD
+    bigfield.KARATSUBA_THRESHOLD = 64
+    try:
+        return clmul(a, b)
+    finally:
+        bigfield.KARATSUBA_THRESHOLD = old
+
+
+def _generic_reducer(m: int, mod_poly: int):
+    def reduce(c: int) -> int:
+        while c.bit_length() > m:
+            c ^= mod_poly << (c.bit_length() - 1 - m)
+        return c
+
+    return reduce
+
+
+def _per_op_us(fn, args: list[tuple], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for a in args:
+            fn(*a)
+        best = min(best, time.perf_counter() - start)
+    return best / len(args) * 1e6
+
+
+def run(count: int) -> list[tuple[int, dict[str, float]]]:
+    rng = random.Random(0)
+    results = []
+    for m, mod_poly in NIST_MODULI.items():
+        pairs = [(rng.getrandbits(m) | 1, rng.getrandbits(m) | 1) for _ in range(count)]
+        products = [(clmul(a, b),) for a, b in pairs]
+        singles = [(a,) for a, _ in pairs]
+        sparse = reducer(m, mod_poly)
+        generic = _generic_reducer(m, mod_poly)
+        few = singles[: max(1, count // 20)]  # Itoh–Tsujii is slow; time fewer
+        results.append(
+            (
+                m,
+                {
+                    "mul schoolbook": _per_op_us(_schoolbook, pairs),
+                    "mul comb": _per_op_us(clmul, pairs),
+                    "mul karatsuba": _per_op_us(_karatsuba, pairs),
+                    "square table": _per_op_us(clsquare, singles),
+                    "square comb": _per_op_us(lambda a: clmul(a, a), singles),
+                    "reduce sparse": _per_op_us(sparse, products),
+                    "reduce generic": _per_op_us(generic, products),
+                    "inv euclid": _per_op_us(lambda a: inv_eea(a, mod_poly), singles),
+                    "inv itoh-tsujii": _per_op_us(lambda a: inv_itoh_tsujii(a, m, mod_poly), few, 1),
+                },
+            )
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+    results = run(args.count)
+    names = list(results[0][1])
+    print(f"{'µs/op':<16}" + "".join(f"{f'm={m}':>10}" for m, _ in results))
+    for name in names:
+        print(f"{name:<16}" + "".join(f"{timings[name]:>10.2f}" for _, timings in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Scalar multiplication on the NIST binary curves.
+
+    python -m Backend.benchmarks.gf_ec [--count 20] [--curves B-163,K-283]
+
+For each curve: affine double-and-add, López–Dahab double-and-add, the
+Montgomery ladder and the generator's fixed-base window table (plus the time
+to build the table), in milliseconds per k*G with random k < n.
+"""
+
+import argparse
+import random
+import time
+
+from ..gf import ec
+
+METHODS = ("affine", "projective", "ladder", "fixed")
+
+
+def run(names: list[str], count: int) -> list[tuple[str, float, dict[str, float]]]:
+    rng = random.Random(0)
+    results = []
+    for name in names:
+        curve = ec.NIST_CURVES[name]
+        g = curve.generator
+        scalars = [rng.randrange(1, curve.n) for _ in range(count)]
+        start = time.perf_counter()
+        table = ec.generator_table(name)
+        build = time.perf_counter() - start
+        fns = {
+            "affine": lambda k: ec.scalar_mul_affine(curve, k, g),
+            "projective": lambda k: ec.scalar_mul_ld(curve, k, g),
+            "ladder": lambda k: ec.montgomery_ladder(curve, k, g),
+            "fixed": table.multiply,
+        }
+        expected = [ec.montgomery_ladder(curve, k, g) for k in scalars[:2]]
+        assert [table.multiply(k) for k in scalars[:2]] == expected
+        timings = {}
+        for method in METHODS:
+            start = time.perf_counter()
+            for k in scalars:
+                fns[method](k)
+            timings[method] = (time.perf_counter() - start) / count
+        results.append((name, build, timings))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--curves", default=",".join(ec.NIST_CURVES))
+    args = parser.parse_args()
+    print(f"{'curve':<8} {'table ms':>9}" + "".join(f" {method + ' ms':>14}" for method in METHODS))
+    for name, build, timings in run(args.curves.split(","), args.count):
+        print(f"{name:<8} {build * 1e3:>9.0f}" + "".join(f" {timings[m] * 1e3:>14.2f}" for m in METHODS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Reed-Solomon and matrix throughput over GF(2^m).
+
+    python -m Backend.benchmarks.gf_rs [--words 1000]
+
+For each code length: encoding, syndrome checks of clean codewords, and
+decoding with t/2 random symbol errors per word, in words and symbols per
+second. Then Gauss-Jordan inverse and rank of random n x n matrices.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ..gf import IRRED_DEFAULTS, GFConfig, matrix
+from ..gf.reedsolomon import get_code
+
+# (m, mod_poly, n, k)
+CODES = (
+    (4, IRRED_DEFAULTS[4], 15, 11),
+    (6, IRRED_DEFAULTS[6], 63, 51),
+    (8, 0x11D, 255, 239),
+    (8, 0x11D, 255, 223),
+    (10, 0x409, 1023, 959),
+    (16, 0x1100B, 4095, 3839),
+)
+MATRIX_SIZES = (32, 64, 128, 256)
+
+
+def _best(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_codes(words: int) -> list[tuple[str, str, float, float]]:
+    rng = np.random.default_rng(0)
+    results = []
+    for m, mod_poly, n, k in CODES:
+        code = get_code(n, k, m, mod_poly)
+        messages = rng.integers(0, 1 << m, (words, k))
+        codewords = code.encode(messages)
+        received = codewords.copy()
+        errors = code.t // 2
+        for word in received:
+            positions = rng.choice(n, errors, replace=False)
+            word[positions] ^= rng.integers(1, 1 << m, errors)
+        assert (code.decode(received)[0] == codewords).all()
+        name = f"RS({n},{k}) m={m}"
+        for label, fn, symbols in (
+            ("encode", lambda: code.encode(messages), k),
+            ("syndromes", lambda: code.syndromes(codewords), n),
+            (f"decode t/2={errors}", lambda: code.decode(received), n),
+        ):
+            seconds = _best(fn)
+            results.append((name, label, words / seconds, words * symbols / seconds))
+    return results
+
+
+def run_matrices() -> list[tuple[int, float, float]]:
+    rng = np.random.default_rng(0)
+    cfg = GFConfig(8, IRRED_DEFAULTS[8])
+    results = []
+    for size in MATRIX_SIZES:
+        a = rng.integers(0, 256, (size, size))
+        while matrix.rank(a, cfg) < size:
+            a = rng.integers(0, 256, (size, size))
+        results.append(
+            (size, _best(lambda: matrix.inverse(a, cfg)), _best(lambda: matrix.rank(a, cfg)))
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, default=1000)
+    args = parser.parse_args()
+    print(f"{'code':<22} {'op':<16} {'words/s':>12} {'symbols/s':>14}")
+    for name, label, per_second, symbols in run_codes(args.words):
+        print(f"{name:<22} {label:<16} {per_second:>12,.0f} {symbols:>14,.0f}")
+    print(f"\n{'n x n (m=8)':<12} {'inverse ms':>11} {'rank ms':>9}")
+    for size, inverse, rank in run_matrices():
+        print(f"{size:<12} {inverse * 1e3:>11.2f} {rank * 1e3:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
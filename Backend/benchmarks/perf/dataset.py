@@ -0,0 +1,182 @@
+"""
+Seeded dataset for the perf suite: a term's worth of one department.
+
+600 students in 12 classrooms of 50, each classroom with 8 assignments, 10
+materials and a submission from every member for every assignment (4 800
+submissions), plus 100 instructor requests for the admin lists. Rows are
+bulk-inserted; the whole thing takes well under a second.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from ... import models
+from ...core.config import settings
+from ...database import SessionLocal
+
+STUDENTS = 600
+CLASSROOMS = 12
+MEMBERS_PER_CLASSROOM = 50
+ASSIGNMENTS_PER_CLASSROOM = 8
+MATERIALS_PER_CLASSROOM = 10
+INSTRUCTOR_REQUESTS = 100
+
+
+@dataclass
+class Dataset:
+    admin_id: int
+    instructor_id: int
+    student_id: int  # a member of classroom_id
+    classroom_id: int
+    assignment_id: int
+
+
+def _users(db, role: models.UserRole, count: int, tag: str) -> list[int]:
+    now = datetime.utcnow()
+    rows = [
+        {
+            "email": f"{tag}{i}-{uuid.uuid4().hex[:6]}@example.com",
+            "password_hash": "x",
+            "role": role,
+            "email_verified": True,
+            "totp_enabled": False,
+            "is_active": True,
+            "created_at": now,
+        }
+        for i in range(count)
+    ]
+    return list(db.scalars(insert(models.User).returning(models.User.id), rows))
+
+
+def seed() -> Dataset:
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        (admin,) = _users(db, models.UserRole.admin, 1, "admin")
+        instructors = _users(db, models.UserRole.instructor, CLASSROOMS // 4, "prof")
+        students = _users(db, models.UserRole.student, STUDENTS, "student")
+
+        classrooms = list(
+            db.scalars(
+                insert(models.Classroom).returning(models.Classroom.id),
+                [
+                    {
+                        "name": f"Finite fields {c}",
+                        "code": uuid.uuid4().hex[:8].upper(),
+                        "instructor_id": instructors[c % len(instructors)],
+                        "created_at": now,
+                    }
+                    for c in range(CLASSROOMS)
+                ],
+            )
+        )
+        members = {
+            room: students[c * MEMBERS_PER_CLASSROOM : (c + 1) * MEMBERS_PER_CLASSROOM]
+            for c, room in enumerate(classrooms)
+        }
+        db.execute(
+            insert(models.ClassroomMember),
+            [
+                {"classroom_id": room, "user_id": u, "joined_at": now}
+                for room, users in members.items()
+                for u in users
+            ],
+        )
+        assignments = db.execute(
+            insert(models.Assignment).returning(models.Assignment.id, models.Assignment.classroom_id),
+            [
+                {
+                    "title": f"Homework {a}",
+                    "description": "Compute the products and inverses below. " * 4,
+                    "classroom_id": room,
+                    "template_id": "gf-multiplication" if a % 2 else None,
+                    "due_date": now + timedelta(days=7 * (a + 1)),
+                    "created_at": now,
+                }
+                for room in classrooms
+                for a in range(ASSIGNMENTS_PER_CLASSROOM)
+            ],
+        ).all()
+        db.execute(
+            insert(models.Submission),
+            [
+                {
+                    "user_id": u,
+                    "assignment_id": assignment_id,
+                    "content": "1) x^3 + x + 1\n2) x^2",
+                    "file_url": (
+                        f"{settings.BACKEND_BASE_URL}/uploads/submissions/"
+                        f"assignment_{assignment_id}/user{u}_report.pdf"
+                    ),
+                    "grade": 100.0 if u % 3 else None,
+                    "submitted_at": now,
+                }
+                for assignment_id, room in assignments
+                for u in members[room]
+            ],
+        )
+        db.execute(
+            insert(models.Material),
+            [
+                {
+                    "classroom_id": room,
+                    "title": f"Lecture {i}",
+                    "description": "Slides",
+                    "file_url": f"{settings.BACKEND_BASE_URL}/uploads/materials/{room}/lecture{i}.pdf",
+                    "created_at": now,
+                }
+                for room in classrooms
+                for i in range(MATERIALS_PER_CLASSROOM)
+            ],
+        )
+        db.execute(
+            insert(models.InstructorRequest),
+            [
+                {
+                    "user_id": students[i],
+                    "note": "I teach the Tuesday lab.",
+                    "file_path": f"instructor_requests/{i}.pdf",
+                    "status": ("pending", "approved", "rejected")[i % 3],
+                    "created_at": now,
+                }
+                for i in range(INSTRUCTOR_REQUESTS)
+            ],
+        )
+        db.commit()
+        room = classrooms[0]
+        return Dataset(
+            admin_id=admin,
+            instructor_id=instructors[0],
+            student_id=members[room][0],
+            classroom_id=room,
+            assignment_id=next(a for a, r in assignments if r == room),
+        )
+    finally:
+        db.close()
+
+
+def session_for(user_id: int) -> str:
+    db = SessionLocal()
+    try:
+        sid = str(uuid.uuid4())
+        now = datetime.utcnow()
+        db.add(
+            models.Session(id=sid, user_id=user_id, created_at=now, expires_at=now + timedelta(hours=1))
+        )
+        db.commit()
+        return sid
+    finally:
+        db.close()
+
+
+def client_for(app, user_id: int) -> TestClient:
+    """A TestClient logged in as `user_id`, with the double-submit CSRF pair set."""
+    client = TestClient(app)
+    client.cookies.set(settings.SESSION_COOKIE_NAME, session_for(user_id))
+    client.cookies.set(settings.CSRF_COOKIE_NAME, "perf-csrf")
+    client.headers["x-csrf-token"] = "perf-csrf"
+    return client
@@ -0,0 +1,187 @@
+"""
+Timing, JSON baselines and regression checks for the perf suite (plugin.py).
+
+A benchmark runs its function in rounds; each round calls it `iterations`
+times, calibrated so one round takes at least `min_round_time`, and rounds
+repeat until `max_time` is spent (between `min_rounds` and `max_rounds`).
+Stats are per call, in seconds. Comparisons use the fastest round by default:
+noise from other processes, GC and frequency scaling only ever adds time, so
+the minimum moves least between runs on a busy machine. `median` is there
+for benchmarks whose typical case matters more than their best one.
+"""
+
+import json
+import math
+import os
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+BASELINE_FORMAT = 1
+
+
+@dataclass
+class Stats:
+    min: float
+    max: float
+    mean: float
+    median: float
+    stddev: float
+    rounds: int
+    iterations: int
+
+    @property
+    def ops(self) -> float:
+        return 1 / self.median if self.median else math.inf
+
+    @classmethod
+    def from_times(cls, times: list[float], iterations: int) -> "Stats":
+        return cls(
+            min=min(times),
+            max=max(times),
+            mean=statistics.fmean(times),
+            median=statistics.median(times),
+            stddev=statistics.stdev(times) if len(times) > 1 else 0.0,
+            rounds=len(times),
+            iterations=iterations,
+        )
+
+
+@dataclass
+class Result:
+    name: str
+    group: str
+    stats: Stats
+    extra_info: dict = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float | None:
+        """Bytes per second when the benchmark declared `extra_info["bytes"]` per call."""
+        size = self.extra_info.get("bytes")
+        return size / self.stats.median if size and self.stats.median else None
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: float  # seconds, of the compared stat
+    current: float
+    change: float  # current / baseline - 1
+    regressed: bool
+
+
+def measure(
+    fn: Callable[[], object],
+    *,
+    min_round_time: float = 0.02,
+    max_time: float = 0.5,
+    min_rounds: int = 5,
+    max_rounds: int = 200,
+    setup: Callable[[], None] | None = None,
+    iterations: int | None = None,
+) -> tuple[Stats, object]:
+    """
+    Time `fn` (returning its last result). With `setup`, every call gets its
+    own setup, outside the timed region, and `iterations` is 1.
+    """
+    clock = time.perf_counter
+    if setup is not None:
+        iterations = 1
+    elif iterations is None:
+        start = clock()
+        fn()  # warm-up doubles as calibration
+        first = clock() - start
+        iterations = max(1, math.ceil(min_round_time / first)) if first > 0 else 1000
+    times: list[float] = []
+    result = None
+    deadline = clock() + max_time
+    while len(times) < min_rounds or (len(times) < max_rounds and clock() < deadline):
+        if setup is not None:
+            setup()
+        start = clock()
+        for _ in range(iterations):
+            result = fn()
+        times.append((clock() - start) / iterations)
+    return Stats.from_times(times, iterations), result
+
+
+def machine_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save(path: Path, results: list[Result]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "format": BASELINE_FORMAT,
+        "datetime": datetime.now(timezone.utc).isoformat(),
+        "machine_info": machine_info(),
+        "benchmarks": [
+            {"name": r.name, "group": r.group, "stats": asdict(r.stats), "extra_info": r.extra_info}
+            for r in results
+        ],
+    }
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, indent=2, sort_keys=True))
+    tmp.replace(path)
+
+
+def load(path: Path) -> dict[str, Result]:
+    payload = json.loads(path.read_text())
+    if payload.get("format") != BASELINE_FORMAT:
+        raise ValueError(f"{path} is not a perf baseline (format {payload.get('format')!r})")
+    return {
+        b["name"]: Result(b["name"], b["group"], Stats(**b["stats"]), b.get("extra_info", {}))
+        for b in payload["benchmarks"]
+    }
+
+
+COMPARE_STATS = ("min", "median", "mean")
+
+
+def compare(
+    current: list[Result], baseline: dict[str, Result], threshold: float, stat: str = "min"
+) -> list[Comparison]:
+    """
+    One Comparison per benchmark present in both runs; `regressed` when `stat`
+    grew by more than `threshold` (0.25 = 25% slower).
+    """
+    out = []
+    for result in current:
+        before = baseline.get(result.name)
+        old = getattr(before.stats, stat) if before else 0
+        if not old:
+            continue
+        new = getattr(result.stats, stat)
+        change = new / old - 1
+        out.append(Comparison(result.name, old, new, change, change > threshold))
+    return out
+
+
+def resolve_baseline(directory: Path, name: str) -> Path:
+    """`name` as a path, a file in `directory` (with or without .json), or "latest"."""
+    if name == "latest":
+        files = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        if not files:
+            raise FileNotFoundError(f"No baselines in {directory}")
+        return files[-1]
+    for candidate in (Path(name), directory / name, directory / f"{name}.json"):
+        if candidate.is_file():
+            return candidate
+    raise FileNotFoundError(f"No baseline {name!r} in {directory}")
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
@@ -0,0 +1,46 @@
+from starlette.requests import Request
+
+from Backend.core.config import settings
+from Backend.core.security import hash_password, pwd_context, require_user, verify_password
+from Backend.database import SessionLocal
+from Backend.benchmarks.perf.dataset import session_for
+
+PASSWORD = "Correct-Horse-Battery-9!"
+
+
+def _argon2_params() -> dict:
+    handler = pwd_context.handler("argon2")
+    return {"time_cost": handler.default_rounds, "memory_cost": handler.memory_cost, "parallelism": handler.parallelism}
+
+
+def test_argon2_hash(benchmark):
+    benchmark.extra_info.update(_argon2_params())
+    assert benchmark(hash_password, PASSWORD).startswith("$argon2")
+
+
+def test_argon2_verify(benchmark):
+    benchmark.extra_info.update(_argon2_params())
+    hashed = hash_password(PASSWORD)
+    assert benchmark(verify_password, PASSWORD, hashed)
+
+
+def test_require_user(benchmark, dataset):
+    """Session cookie -> User, as every authenticated route resolves it."""
+    sid = session_for(dataset.student_id)
+    cookie = f"{settings.SESSION_COOKIE_NAME}={sid}".encode()
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": [(b"cookie", cookie)]})
+
+    def resolve():
+        db = SessionLocal()
+        try:
+            return require_user(request, db)
+        finally:
+            db.close()
+
+    assert benchmark(resolve).id == dataset.student_id
+
+
+def test_me_endpoint(benchmark, clients):
+    """require_user plus the middleware stack and serialization, end to end."""
+    response = benchmark(clients["student"].get, "/api/me")
+    assert response.status_code == 200
@@ -0,0 +1,100 @@
+import random
+
+import numpy as np
+import pytest
+
+from Backend.gf import (
+    IRRED_DEFAULTS,
+    NIST_MODULI,
+    GFConfig,
+    aes,
+    big_inv,
+    big_mul,
+    ec,
+    gf_inv,
+    gf_mul,
+    gf_pow,
+    gfp,
+)
+from Backend.gf.batch import batch_inv, batch_mul
+from Backend.gf.matrix import inverse
+from Backend.gf.reedsolomon import get_code
+
+GF8 = GFConfig(8, IRRED_DEFAULTS[8])
+MODULI = {8: IRRED_DEFAULTS[8], 16: 0x1100B}
+rng = np.random.default_rng(0)
+
+
+def test_gf8_mul(benchmark):
+    assert benchmark(gf_mul, 0x57, 0x83, GF8) == 0xC1
+
+
+def test_gf8_inv(benchmark):
+    assert gf_mul(benchmark(gf_inv, 0x53, GF8), 0x53, GF8) == 1
+
+
+def test_gf8_pow_traced(benchmark):
+    benchmark(lambda: gf_pow(0x57, 200, GF8, []))
+
+
+@pytest.mark.parametrize("m", [163, 571])
+def test_big_field_mul(benchmark, m):
+    r = random.Random(m)
+    a, b = r.getrandbits(m), r.getrandbits(m)
+    benchmark(big_mul, a, b, m, NIST_MODULI[m])
+
+
+@pytest.mark.parametrize("m", [163, 571])
+def test_big_field_inv(benchmark, m):
+    a = random.Random(m).getrandbits(m) | 1
+    benchmark(big_inv, a, m, NIST_MODULI[m])
+
+
+@pytest.mark.parametrize("m", [8, 16])
+def test_batch_mul_1m(benchmark, m):
+    a, b = rng.integers(0, 1 << m, 1 << 20), rng.integers(0, 1 << m, 1 << 20)
+    benchmark.extra_info["elements"] = len(a)
+    benchmark(batch_mul, a, b, m, MODULI[m])
+
+
+def test_batch_inv_1m(benchmark):
+    a = rng.integers(1, 1 << 16, 1 << 20)
+    benchmark(batch_inv, a, 16, MODULI[16])
+
+
+def test_aes_encrypt_64k_blocks(benchmark, tmp_path):
+    tables = aes.get_aes_tables(str(tmp_path / "aes.bin"))
+    keys = aes.expand_key(bytes(range(16)), tables)
+    states = rng.integers(0, 256, (1 << 16, 16), dtype=np.uint8)
+    benchmark.extra_info["bytes"] = states.size
+    benchmark(aes.encrypt, states, keys, tables)
+
+
+def test_reed_solomon_decode(benchmark):
+    code = get_code(255, 223, 8, 0x11D)
+    words = code.encode(rng.integers(0, 256, (200, 223)))
+    for word in words:
+        word[rng.choice(255, 8, replace=False)] ^= rng.integers(1, 256, 8)
+    benchmark.extra_info["bytes"] = words.size
+    assert (benchmark(code.decode, words)[1] == 8).all()
+
+
+def test_matrix_inverse_64(benchmark):
+    a = rng.integers(0, 256, (64, 64))
+    benchmark(inverse, a, GF8)
+
+
+def test_gfp_factor(benchmark):
+    f = gfp.poly([random.Random(7).randrange(7) for _ in range(30)] + [1], 7)
+    benchmark(gfp.factor.__wrapped__, f, 7)  # past the memo
+
+
+@pytest.mark.parametrize("method", ["ladder", "fixed"])
+def test_ec_scalar_mul_k163(benchmark, method):
+    curve = ec.NIST_CURVES["K-163"]
+    k = random.Random(163).randrange(curve.n)
+    if method == "fixed":
+        table = ec.generator_table("K-163")
+        benchmark(table.multiply, k)
+    else:
+        benchmark(ec.montgomery_ladder, curve, k, curve.generator)
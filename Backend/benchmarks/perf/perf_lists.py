@@ -0,0 +1,24 @@
+import pytest
+
+from Backend.benchmarks.perf.dataset import MEMBERS_PER_CLASSROOM
+
+# (role, url template, rows expected at least)
+LIST_ENDPOINTS = {
+    "classrooms": ("student", "/api/classrooms", 1),
+    "assignments": ("student", "/api/assignments/classroom/{classroom_id}", 8),
+    "materials": ("student", "/api/materials/classroom/{classroom_id}", 10),
+    "assignment_submissions": ("instructor", "/api/submissions/assignment/{assignment_id}", MEMBERS_PER_CLASSROOM),
+    "classroom_submissions": ("instructor", "/api/submissions/classroom/{classroom_id}", MEMBERS_PER_CLASSROOM),
+    "admin_users": ("admin", "/api/admin/users", 600),
+    "instructor_requests": ("admin", "/api/admin/roles/requests", 100),
+}
+
+
+@pytest.mark.parametrize("endpoint", list(LIST_ENDPOINTS))
+def test_list_endpoint(benchmark, clients, dataset, endpoint):
+    role, template, expected = LIST_ENDPOINTS[endpoint]
+    url = template.format(classroom_id=dataset.classroom_id, assignment_id=dataset.assignment_id)
+    response = benchmark(clients[role].get, url)
+    assert response.status_code == 200, response.text
+    benchmark.extra_info["rows"] = len(response.json())
+    assert len(response.json()) >= expected
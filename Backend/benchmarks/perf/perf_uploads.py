@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+CHUNK = 1 << 20
+
+
+@pytest.mark.parametrize("size_mb", [1, 8])
+def test_multipart_submission_upload(benchmark, clients, dataset, size_mb):
+    body = os.urandom(size_mb << 20)
+    benchmark.extra_info["bytes"] = len(body)
+    client = clients["student"]
+
+    def upload():
+        return client.post(
+            f"/api/submissions/{dataset.assignment_id}/upload",
+            files={"file": ("report.bin", body, "application/octet-stream")},
+        )
+
+    assert benchmark.pedantic(upload, rounds=5).status_code == 200
+
+
+def test_resumable_submission_upload(benchmark, clients, dataset):
+    """Open, PATCH in 1 MiB chunks, finalize: 8 MiB per round."""
+    body = os.urandom(8 * CHUNK)
+    benchmark.extra_info["bytes"] = len(body)
+    client = clients["student"]
+    base = f"/api/submissions/{dataset.assignment_id}/resumable"
+
+    def upload():
+        url = client.post(base, json={"filename": "big.bin", "length": len(body)}).json()["url"]
+        for offset in range(0, len(body), CHUNK):
+            client.patch(
+                url,
+                content=body[offset : offset + CHUNK],
+                headers={"Content-Type": "application/offset+octet-stream", "Upload-Offset": str(offset)},
+            )
+        return client.post(f"{base}/{url.rsplit('/', 1)[-1]}/finalize", json={})
+
+    assert benchmark.pedantic(upload, rounds=5).status_code == 200
@@ -0,0 +1,203 @@
+"""
+pytest plugin for the perf suite, loaded by this directory's pytest.ini:
+
+    python -m pytest Backend/benchmarks/perf [-k gf] [--perf-save NAME]
+        [--perf-compare [NAME]] [--perf-threshold 0.25]
+
+Tests take a `benchmark` fixture shaped like pytest-benchmark's:
+`benchmark(fn, *args)` times fn and returns its result,
+`benchmark.pedantic(fn, setup=...)` gives every call a fresh setup, and
+`benchmark.extra_info` is stored with the stats (`bytes` per call adds a
+throughput column).
+
+`--perf-save` writes the run to `<perf-dir>/<NAME>.json`. `--perf-compare`
+compares against a saved run (the newest when NAME is omitted) and fails the
+session when a benchmark's `--perf-compare-stat` (min by default) grew by
+more than `--perf-threshold` (PERF_THRESHOLD, default 25%).
+
+The app runs against a throwaway SQLite DB and upload dir, set up here before
+Backend is imported, just like Backend/tests/conftest.py.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+_TMP = Path(tempfile.mkdtemp(prefix="polylab-perf-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP / 'perf.db'}"
+os.environ["UPLOAD_DIR"] = str(_TMP / "uploads")
+os.environ["AES_TABLE_PATH"] = str(_TMP / "aes-tables.bin")
+os.environ["RATE_LIMIT_PER_MINUTE"] = "10000000"
+os.environ["SMTP_USER"] = ""
+
+import pytest  # noqa: E402
+
+from .dataset import Dataset, client_for, seed  # noqa: E402
+from .harness import (  # noqa: E402
+    COMPARE_STATS,
+    Result,
+    compare,
+    format_time,
+    load,
+    measure,
+    resolve_baseline,
+    save,
+)
+
+DEFAULT_DIR = Path(__file__).resolve().parent / "baselines"
+_RESULTS = pytest.StashKey[list]()
+_COMPARISONS = pytest.StashKey[list]()
+_CALL_REPORT = pytest.StashKey[pytest.TestReport]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "performance suite")
+    group.addoption("--perf-save", metavar="NAME", help="save this run as <perf-dir>/NAME.json")
+    group.addoption(
+        "--perf-compare",
+        metavar="NAME",
+        nargs="?",
+        const="latest",
+        help="compare with a saved run (default: the newest) and fail on regressions",
+    )
+    group.addoption(
+        "--perf-threshold",
+        type=float,
+        default=float(os.environ.get("PERF_THRESHOLD", "0.25")),
+        help="allowed slowdown before a benchmark counts as regressed (0.25 = 25%%)",
+    )
+    group.addoption(
+        "--perf-compare-stat", choices=COMPARE_STATS, default="min", help="statistic compared with the baseline"
+    )
+    group.addoption("--perf-dir", type=Path, default=DEFAULT_DIR, help="where baselines are kept")
+    group.addoption("--perf-max-time", type=float, default=0.5, help="seconds spent per benchmark")
+
+
+def pytest_configure(config):
+    config.stash[_RESULTS] = []
+    config.stash[_COMPARISONS] = []
+
+
+class Benchmark:
+    def __init__(self, name: str, group: str, max_time: float):
+        self.name, self.group, self.max_time = name, group, max_time
+        self.extra_info: dict = {}
+        self.result: Result | None = None
+
+    def _record(self, stats) -> None:
+        if self.result is not None:
+            raise RuntimeError("A test can only run one benchmark")
+        self.result = Result(self.name, self.group, stats, self.extra_info)
+
+    def __call__(self, fn, *args, **kwargs):
+        stats, value = measure(lambda: fn(*args, **kwargs), max_time=self.max_time)
+        self._record(stats)
+        return value
+
+    def pedantic(self, fn, *, setup=None, rounds: int = 5, iterations: int | None = None):
+        stats, value = measure(
+            fn, setup=setup, iterations=iterations, min_rounds=rounds, max_rounds=rounds, max_time=0
+        )
+        self._record(stats)
+        return value
+
+
+@pytest.fixture
+def benchmark(request):
+    """Times one function per test; results are collected for the summary and baselines."""
+    group = request.node.get_closest_marker("group")
+    bench = Benchmark(
+        request.node.nodeid.split("::", 1)[-1],
+        group.args[0] if group else request.node.module.__name__.rsplit(".", 1)[-1].removeprefix("perf_"),
+        request.config.getoption("--perf-max-time"),
+    )
+    yield bench
+    report = request.node.stash.get(_CALL_REPORT, None)
+    if bench.result is not None and report is not None and report.passed:
+        request.config.stash[_RESULTS].append(bench.result)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    report = yield
+    if report.when == "call":
+        item.stash[_CALL_REPORT] = report  # failed benchmarks stay out of baselines
+    return report
+
+
+@pytest.fixture(scope="session")
+def app():
+    from ...main import app
+
+    return app
+
+
+@pytest.fixture(scope="session")
+def dataset(app) -> Dataset:
+    return seed()
+
+
+@pytest.fixture(scope="session")
+def clients(app, dataset):
+    """Logged-in TestClients by role: admin, instructor (owns classroom_id), student (member of it)."""
+    return {
+        "admin": client_for(app, dataset.admin_id),
+        "instructor": client_for(app, dataset.instructor_id),
+        "student": client_for(app, dataset.student_id),
+    }
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = config.stash[_RESULTS]
+    directory = config.getoption("--perf-dir")
+    if not results:
+        return
+    compare_to = config.getoption("--perf-compare")
+    if compare_to:
+        path = resolve_baseline(directory, compare_to)
+        comparisons = compare(
+            results,
+            load(path),
+            config.getoption("--perf-threshold"),
+            config.getoption("--perf-compare-stat"),
+        )
+        config.stash[_COMPARISONS] = [path, comparisons]
+        if any(c.regressed for c in comparisons) and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+    name = config.getoption("--perf-save")
+    if name:
+        save(directory / f"{name}.json", results)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash[_RESULTS]
+    if not results:
+        return
+    write = terminalreporter.write_line
+    terminalreporter.section("perf")
+    width = max(len(r.name) for r in results)
+    write(f"{'benchmark':<{width}}  {'median':>10}  {'min':>10}  {'stddev':>10}  {'ops/s':>10}  {'MB/s':>8}")
+    for result in sorted(results, key=lambda r: (r.group, r.name)):
+        s = result.stats
+        mbps = f"{result.throughput / 1e6:8.1f}" if result.throughput else f"{'':8}"
+        write(
+            f"{result.name:<{width}}  {format_time(s.median):>10}  {format_time(s.min):>10}  "
+            f"{format_time(s.stddev):>10}  {s.ops:>10,.1f}  {mbps}"
+        )
+    if config.stash[_COMPARISONS]:
+        path, comparisons = config.stash[_COMPARISONS]
+        threshold = config.getoption("--perf-threshold")
+        stat = config.getoption("--perf-compare-stat")
+        terminalreporter.section(f"perf vs {path.name} ({stat}, threshold +{threshold:.0%})")
+        for c in comparisons:
+            flag = "REGRESSED" if c.regressed else ""
+            write(
+                f"{c.name:<{width}}  {format_time(c.baseline):>10} -> {format_time(c.current):>10}  "
+                f"{c.change:+7.1%}  {flag}",
+                red=c.regressed,
+            )
+        regressed = sum(c.regressed for c in comparisons)
+        write(f"{regressed} of {len(comparisons)} benchmarks regressed", red=bool(regressed), bold=True)
+    if config.getoption("--perf-save"):
+        write(f"saved {config.getoption('--perf-dir') / (config.getoption('--perf-save') + '.json')}")
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import EmailStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,6 +28,83 @@ class Settings(BaseSettings):
 
     # Files
     UPLOAD_DIR: str = "./uploads"
+    # Hand file transfers to nginx (X-Accel-Redirect) instead of streaming them from Python
+    FILES_ACCEL_REDIRECT: bool = False
+    FILES_ACCEL_PREFIX: str = "/_protected_uploads/"
+    # HMAC key for expiring download links (falls back to SECRET_KEY); nginx needs the same value
+    FILE_URL_SECRET: Optional[str] = None
+    SIGNED_URL_TTL_SECONDS: int = 300
+    # Upload storage: "local" (UPLOAD_DIR) or "s3" (any S3-compatible endpoint, e.g. MinIO)
+    STORAGE_BACKEND: Literal["local", "s3"] = "local"
+    S3_BUCKET: Optional[str] = None
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_REGION: Optional[str] = None
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    S3_PRESIGN_TTL_SECONDS: int = 900
+    MAX_DIRECT_UPLOAD_BYTES: int = 200 * 1024 * 1024
+    # WebP previews for images / first PDF page, rendered in a process pool
+    PREVIEWS_ENABLED: bool = True
+    PREVIEW_MAX_PX: int = 480
+    PREVIEW_WORKERS: int = 2
+    # Resumable (tus-style) uploads: partial files on local disk, expired after a while
+    RESUMABLE_UPLOAD_DIR: Optional[str] = None  # default: <UPLOAD_DIR>/.resumable
+    RESUMABLE_UPLOAD_TTL_HOURS: int = 24
+    RESUMABLE_SWEEP_MINUTES: int = 15
+    # Storage GC: orphans must stay unreferenced this long before they are moved
+    # to .quarantine/ (protects uploads whose DB row isn't committed yet), and
+    # stay quarantined this long before they are deleted
+    STORAGE_GC_MIN_ORPHAN_MINUTES: int = 60
+    STORAGE_GC_GRACE_DAYS: int = 7
+    # Irreducible-modulus search: fields with m >= GF_SEARCH_POOL_MIN_M are scanned in
+    # the compute tier; each request tests at most GF_SEARCH_MAX_CANDIDATES polynomials
+    GF_SEARCH_POOL_MIN_M: int = 64
+    GF_SEARCH_MAX_CANDIDATES: int = 20_000
+    # Compute tier for CPU-heavy math endpoints (utils/compute.py): a separate process
+    # pool with COMPUTE_QUEUE_SIZE waiting jobs at most (then 503 + Retry-After)
+    COMPUTE_WORKERS: int = 2
+    COMPUTE_QUEUE_SIZE: int = 8
+    COMPUTE_CPU_SECONDS: int = 5
+    COMPUTE_WALL_SECONDS: float = 15.0
+    COMPUTE_MAX_TASKS_PER_WORKER: int = 500
+    COMPUTE_RETRY_AFTER_SECONDS: int = 2
+    # Memoized GF results (utils/resultcache.py); set the path to share them between
+    # workers and keep them across restarts
+    GF_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    GF_CACHE_SQLITE_PATH: Optional[str] = None
+    GF_CACHE_SQLITE_MAX_ROWS: int = 200_000
+    # Streamed step traces (/api/gf/{op}/stream) run in the API process's threadpool
+    GF_STREAM_MAX_STEPS: int = 2_000_000
+    GF_STREAM_MAX_CONCURRENT: int = 4
+    # Memory-mapped AES byte tables shared by all processes (default: next to UPLOAD_DIR)
+    AES_TABLE_PATH: Optional[str] = None
+    # Prometheus text at GET /metrics (core/metrics.py). With several uvicorn workers, set
+    # PROMETHEUS_MULTIPROC_DIR to a directory they share (start.sh empties it on boot);
+    # METRICS_TOKEN makes the endpoint ask for "Authorization: Bearer <token>"
+    PROMETHEUS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_TOKEN: Optional[str] = None
+    # Request profiler (utils/profiling.py): requests with an admin's token from
+    # POST /api/admin/profiles/token, plus a PROFILE_SAMPLE_RATE fraction of all requests,
+    # are sampled every PROFILE_INTERVAL_MS; reports go to PROFILE_DIR (default: the temp dir)
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: float = 1.0
+    PROFILE_DIR: Optional[str] = None
+    PROFILE_MAX_REPORTS: int = 200
+    PROFILE_TOKEN_TTL_MINUTES: int = 60
+    # Slow query log (utils/slowqueries.py, GET /api/admin/slow-queries): statements slower
+    # than SLOW_QUERY_MS (unset to disable), deduplicated, newest SLOW_QUERY_LOG_SIZE kept
+    SLOW_QUERY_MS: Optional[float] = 200.0
+    SLOW_QUERY_LOG_SIZE: int = 100
+    SLOW_QUERY_EXPLAIN: bool = True
+
+    # Logging (core/logs.py): JSON lines (or "text") on stdout via a background thread.
+    # Access-log lines for requests that succeeded (< 400) within ACCESS_LOG_SLOW_MS are
+    # kept with probability ACCESS_LOG_SAMPLE_RATE; errors and slow requests always are
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: Literal["json", "text"] = "json"
+    ACCESS_LOG_ENABLED: bool = True
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_SLOW_MS: float = 1000.0
 
     # Seed admin (optional)
     ADMIN_EMAIL: Optional[EmailStr] = None
@@ -56,5 +133,17 @@ class Settings(BaseSettings):
             base = base[:-4]
         return base
 
+    @property
+    def resumable_upload_dir(self) -> Path:
+        if self.RESUMABLE_UPLOAD_DIR:
+            return Path(self.RESUMABLE_UPLOAD_DIR)
+        return Path(self.UPLOAD_DIR) / ".resumable"
+
+    @property
+    def aes_table_path(self) -> str:
+        if self.AES_TABLE_PATH:
+            return self.AES_TABLE_PATH
+        return str(Path(self.UPLOAD_DIR).parent / ".polylab-cache" / "aes-tables.bin")
+
 
 settings = Settings()
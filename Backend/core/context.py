@@ -0,0 +1,36 @@
+"""
+The request being handled, for code far below the routers (SQLAlchemy event
+hooks, log records, reports). The outermost middleware (access_log.py) sets
+`request_scope` to the ASGI scope and `request_id`; the context is copied
+into threadpool threads and background tasks, and the router adds the
+matched route to the same scope dict later on. `require_user` leaves the
+user id in the scope's state.
+"""
+
+from contextvars import ContextVar
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+request_scope: ContextVar[dict | None] = ContextVar("request_scope", default=None)
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def route_template(scope) -> str:
+    """`/api/assignments/{assignment_id}` for a request the router matched, else UNMATCHED_ROUTE."""
+    route = scope.get("route")  # the router stores the matched route in the (shared) scope
+    if route is None:
+        return UNMATCHED_ROUTE
+    path, regex = scope["path"], getattr(route, "path_regex", None)
+    if regex is not None and not regex.match(path):
+        # newer FastAPI keeps the include_router prefix (/api) out of route.path;
+        # it is whatever precedes the part of the path the route matched
+        for i, char in enumerate(path):
+            if char == "/" and i and regex.match(path[i:]):
+                return path[:i] + route.path
+    return route.path
+
+
+def current_route() -> str | None:
+    """Route template of the request this code runs for; None outside requests."""
+    scope = request_scope.get()
+    return None if scope is None else route_template(scope)
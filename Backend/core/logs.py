@@ -0,0 +1,149 @@
+"""
+Logging: JSON lines on stdout, written by a background thread.
+
+`configure_logging` gives the root logger a single QueueHandler. Request
+threads and the event loop only put records on an unbounded queue; a
+QueueListener thread formats and writes them, so a slow or blocked stdout
+never stalls a request. Records are stamped with the request's context
+(request id, user id, route template) before they are queued, because the
+listener thread doesn't see the request's context variables.
+
+Each line is one JSON object: ts, level, logger, message, the request
+fields when there is a request, anything passed in `extra=`, and `exc` with
+the traceback for `logger.exception`. LOG_FORMAT=text gives plain lines for
+local development.
+
+uvicorn's own loggers are routed through the same pipeline; its access log
+is switched off because middleware/access_log.py writes a richer one.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from .config import settings
+from .context import current_route, request_id, request_scope
+
+# attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_listener: QueueListener | None = None
+
+
+class RequestContextFilter(logging.Filter):
+    """Copies the current request's id, user and route onto the record, in the thread that logs it."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rid = request_id.get()
+        if rid is not None and not hasattr(record, "request_id"):
+            record.request_id = rid
+            scope = request_scope.get()
+            user_id = scope.get("state", {}).get("user_id") if scope is not None else None
+            if user_id is not None:
+                record.user_id = user_id
+            route = current_route()
+            if route is not None:
+                record.route = route
+        return True
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merge the message args and render the traceback now: args and
+        tracebacks can reference objects that change or die before the
+        listener gets to them. Unlike the stock prepare, the traceback stays
+        out of the message so the JSON formatter can put it in its own field.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes to whatever sys.stdout is at the time (test runners swap it)."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, _value):
+        pass
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+def configure_logging() -> None:
+    """Install the queue pipeline on the root logger; safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        return
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    output = _StdoutHandler()
+    output.setFormatter(TextFormatter() if settings.LOG_FORMAT == "text" else JsonFormatter())
+    handler = _QueueHandler(records)
+    handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        root.removeHandler(old)
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    for name in ("uvicorn", "uvicorn.error"):
+        logger = logging.getLogger(name)
+        logger.handlers.clear()
+        logger.propagate = True
+    access = logging.getLogger("uvicorn.access")
+    access.handlers.clear()
+    access.propagate = False
+    access.disabled = True
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush what's queued and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,160 @@
+"""
+Prometheus metrics, served in the text exposition format at GET /metrics.
+
+Requests are timed by middleware/metrics.py and labelled with the route
+template (`/api/gf/{op}`), never the raw path, so ids and 404 scans can't
+blow up the series count. The SQLAlchemy engine reports pool checkouts and
+overflow plus the duration of every statement (`instrument_engine`); the
+rate limiter, the upload endpoints and the Argon2 helpers count their own.
+
+With several uvicorn workers each process only sees its own requests. Setting
+PROMETHEUS_MULTIPROC_DIR switches prometheus_client to its multiprocess mode:
+every process writes its samples to memory-mapped files in that directory and
+a scrape, whichever worker answers it, merges them. Counters and histograms
+are summed over all processes that ever ran; gauges over the live ones
+(`mark_worker_dead` drops a worker's gauges on shutdown). The directory must
+be emptied before the workers start, which start.sh does.
+"""
+
+import os
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+# prometheus_client picks its storage when it is imported, so the directory has to
+# be in the environment first (settings may come from .env rather than the environment)
+if settings.PROMETHEUS_MULTIPROC_DIR:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if MULTIPROC_DIR:
+    Path(MULTIPROC_DIR).mkdir(parents=True, exist_ok=True)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+_STATEMENTS = {"SELECT", "INSERT", "UPDATE", "DELETE", "PRAGMA", "BEGIN", "COMMIT", "ROLLBACK"}
+
+HTTP_REQUESTS = Counter(
+    "polylab_http_requests",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "polylab_http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "polylab_http_requests_in_flight",
+    "Requests being handled right now",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "polylab_db_pool_checked_out",
+    "Connections currently checked out of the SQLAlchemy pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "polylab_db_pool_overflow",
+    "Connections open beyond the pool size",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUTS = Counter("polylab_db_pool_checkouts", "Connection checkouts from the SQLAlchemy pool")
+DB_POOL_CONNECTS = Counter("polylab_db_pool_connects", "New DBAPI connections opened by the pool")
+DB_QUERY_LATENCY = Histogram(
+    "polylab_db_query_duration_seconds",
+    "Statement execution time, by statement type",
+    ["statement"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+RATE_LIMIT_REJECTIONS = Counter("polylab_rate_limit_rejections", "Requests refused with 429 by the rate limiter")
+UPLOAD_BYTES = Counter("polylab_upload_bytes", "Bytes received in uploads", ["kind"])
+ARGON2_LATENCY = Histogram(
+    "polylab_argon2_duration_seconds",
+    "Argon2 password hashing and verification time",
+    ["op"],
+    buckets=(0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2),
+)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    HTTP_REQUESTS.labels(method, route, str(status)).inc()
+    HTTP_LATENCY.labels(method, route).observe(seconds)
+
+
+def record_upload(kind: str, size: int) -> None:
+    UPLOAD_BYTES.labels(kind).inc(size)
+
+
+def statement_type(statement: str) -> str:
+    words = statement.split(None, 1)
+    word = words[0].upper() if words else ""
+    return word if word in _STATEMENTS else "OTHER"
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy
+# ---------------------------------------------------------------------------
+def _pool_overflow(pool) -> int:
+    overflow = getattr(pool, "overflow", None)
+    return max(0, overflow()) if overflow else 0  # QueuePool counts up from -pool_size
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Pool and statement metrics for `engine`; call once per engine."""
+    pool = engine.pool
+
+    @event.listens_for(pool, "connect")
+    def _connect(_dbapi_conn, _record):
+        DB_POOL_CONNECTS.inc()
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(_dbapi_conn, _record, _proxy):
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_CHECKED_OUT.inc()
+        DB_POOL_OVERFLOW.set(_pool_overflow(pool))
+
+    @event.listens_for(pool, "checkin")
+    def _checkin(_dbapi_conn, _record):
+        DB_POOL_CHECKED_OUT.dec()
+        DB_POOL_OVERFLOW.set(_pool_overflow(pool))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, _cursor, _statement, _parameters, _context, _executemany):
+        conn.info["query_started"] = time.perf_counter()  # a Connection runs one statement at a time
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, _cursor, statement, _parameters, _context, _executemany):
+        started = conn.info.pop("query_started")
+        DB_QUERY_LATENCY.labels(statement_type(statement)).observe(time.perf_counter() - started)
+
+
+# ---------------------------------------------------------------------------
+# Exposition
+# ---------------------------------------------------------------------------
+def render() -> bytes:
+    """Every metric in the text format; merged over all workers in multiprocess mode."""
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=MULTIPROC_DIR)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_worker_dead() -> None:
+    """Drop this process's live gauges from the merged view (worker shutdown)."""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid(), MULTIPROC_DIR)
@@ -4,6 +4,7 @@ from collections import defaultdict, deque
 from fastapi import HTTPException, Request, status
 
 from .config import settings
+from .metrics import RATE_LIMIT_REJECTIONS
 
 WINDOW_SECONDS = 60
 _buckets: dict[str, deque[float]] = defaultdict(deque)
@@ -17,6 +18,7 @@ async def rate_limit(request: Request) -> None:
         dq.popleft()
     dq.append(now)
     if len(dq) > settings.RATE_LIMIT_PER_MINUTE:
+        RATE_LIMIT_REJECTIONS.inc()
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Rate limit exceeded",
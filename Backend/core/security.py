@@ -1,4 +1,5 @@
 import secrets
+import time
 import uuid
 from datetime import datetime, timedelta
 from typing import Iterable, Sequence
@@ -11,16 +12,25 @@ from ..database import get_db
 from ..models import Session as DBSession
 from ..models import User, UserRole
 from .config import settings
+from .metrics import ARGON2_LATENCY
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    started = time.perf_counter()
+    try:
+        return pwd_context.hash(password)
+    finally:
+        ARGON2_LATENCY.labels("hash").observe(time.perf_counter() - started)
 
 
 def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
+    started = time.perf_counter()
+    try:
+        return pwd_context.verify(password, hashed)
+    finally:
+        ARGON2_LATENCY.labels("verify").observe(time.perf_counter() - started)
 
 
 from fastapi import Response
@@ -104,6 +114,7 @@ def require_user(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
         )
+    request.state.user_id = user.id  # for the access log
     return user
 
 
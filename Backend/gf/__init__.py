@@ -0,0 +1,76 @@
+"""
+Server-side GF(2^m) arithmetic (mirrors Frontend/src/lib/gf2m.ts).
+
+    from Backend.gf import GFConfig, gf_mul
+    gf_mul(0x57, 0x13, GFConfig(8, 0x11B))  # 0xFE
+"""
+
+from . import aes, ec, gfp, matrix
+from .bigfield import (
+    NIST_MODULI,
+    big_inv,
+    big_mul,
+    big_pow,
+    big_square,
+    clmul,
+    clsquare,
+    reducer,
+)
+from .field import (
+    IRRED_DEFAULTS,
+    GFConfig,
+    Step,
+    StepGen,
+    as_poly_string,
+    gf_add,
+    gf_inv,
+    gf_mod,
+    gf_mul,
+    gf_pow,
+    iter_inv,
+    iter_mod,
+    iter_mul,
+    iter_pow,
+    poly_degree,
+)
+from .tables import MAX_TABLE_M, FieldTables, get_tables, is_irreducible
+from .trace import STEP_KINDS, TRACE_OPS, TraceTooLong, iter_trace, summarize
+
+__all__ = [
+    "IRRED_DEFAULTS",
+    "MAX_TABLE_M",
+    "NIST_MODULI",
+    "FieldTables",
+    "GFConfig",
+    "STEP_KINDS",
+    "Step",
+    "StepGen",
+    "TRACE_OPS",
+    "TraceTooLong",
+    "aes",
+    "ec",
+    "as_poly_string",
+    "big_inv",
+    "big_mul",
+    "big_pow",
+    "big_square",
+    "clmul",
+    "clsquare",
+    "get_tables",
+    "gf_add",
+    "gf_inv",
+    "gf_mod",
+    "gf_mul",
+    "gf_pow",
+    "gfp",
+    "is_irreducible",
+    "iter_inv",
+    "iter_mod",
+    "iter_mul",
+    "iter_pow",
+    "iter_trace",
+    "matrix",
+    "poly_degree",
+    "reducer",
+    "summarize",
+]
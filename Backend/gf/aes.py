@@ -0,0 +1,243 @@
+"""
+AES (Rijndael) over GF(2^8) with the modulus 0x11B, following FIPS-197.
+
+Nothing is hard-coded: the S-box is derived from field inverses plus the
+affine map, Rcon from powers of x, and MixColumns from field products. The
+byte tables (full 256 x 256 multiplication table, S-box, inverse S-box) are
+built once and written to a file that every process memory-maps read-only, so
+API and compute workers share one copy in the page cache. The file is only
+mapped if its SHA-256 matches TABLES_SHA256 (test_aes.py checks that constant
+against build_tables), so a tampered or stale file is rebuilt, never used.
+
+States are uint8 arrays of shape (N, 16) in FIPS-197 order (byte r + 4c is row
+r, column c); every round function works on a whole batch with table gathers.
+`encrypt_trace` and `sbox_entry` produce step-by-step records for the UI.
+"""
+
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from .batch import batch_inv, batch_mul
+from .field import GFConfig, Step, gf_inv, gf_pow
+
+AES_MOD_POLY = 0x11B
+AES_FIELD = GFConfig(8, AES_MOD_POLY)
+AFFINE_CONSTANT = 0x63
+BLOCK_BYTES = 16
+KEY_ROUNDS = {16: 10, 24: 12, 32: 14}
+
+# mmap file layout: magic, mul[256 * 256], sbox[256], inv_sbox[256]
+_MAGIC = b"GF8AES01"
+_MUL_AT = len(_MAGIC)
+_SBOX_AT = _MUL_AT + 256 * 256
+_INV_SBOX_AT = _SBOX_AT + 256
+_FILE_BYTES = _INV_SBOX_AT + 256
+TABLES_SHA256 = "277457965f62b0a1d01b6e17595c510396460d7783e4e1ce714cbe5c1f19adb7"
+
+# out[r + 4c] = in[r + 4((c + r) mod 4)]: row r rotates left by r
+SHIFT_ROWS = np.array([r + 4 * ((c + r) % 4) for c in range(4) for r in range(4)])
+INV_SHIFT_ROWS = np.argsort(SHIFT_ROWS)
+# _COLUMN_ROTATIONS[k][r + 4c] = (r + k) mod 4 + 4c: each column rotated up by k
+_COLUMN_ROTATIONS = [np.array([(r + k) % 4 + 4 * c for c in range(4) for r in range(4)]) for k in range(4)]
+
+
+class AESTables:
+    def __init__(self, data: np.ndarray):
+        self.mul = data[_MUL_AT:_SBOX_AT].reshape(256, 256)
+        self.sbox = data[_SBOX_AT:_INV_SBOX_AT]
+        self.inv_sbox = data[_INV_SBOX_AT:_FILE_BYTES]
+
+
+# ---------- Derivation ----------
+def _rotl8(x: np.ndarray, k: int) -> np.ndarray:
+    return ((x << k) | (x >> (8 - k))) & 0xFF
+
+
+def affine(x):
+    """b ^ rotl(b, 1) ^ rotl(b, 2) ^ rotl(b, 3) ^ rotl(b, 4) ^ 0x63 (ints or arrays)."""
+    x = np.asarray(x, dtype=np.uint16)
+    out = x ^ _rotl8(x, 1) ^ _rotl8(x, 2) ^ _rotl8(x, 3) ^ _rotl8(x, 4) ^ AFFINE_CONSTANT
+    return out.astype(np.uint8)
+
+
+def build_tables() -> bytes:
+    elements = np.arange(256)
+    mul = batch_mul(elements[:, None], elements[None, :], 8, AES_MOD_POLY)
+    inverses = np.zeros(256, dtype=np.uint8)
+    inverses[1:] = batch_inv(elements[1:], 8, AES_MOD_POLY)  # 0 maps to 0 by convention
+    sbox = affine(inverses)
+    inv_sbox = np.empty(256, dtype=np.uint8)
+    inv_sbox[sbox] = np.arange(256, dtype=np.uint8)
+    return _MAGIC + mul.astype(np.uint8).tobytes() + sbox.tobytes() + inv_sbox.tobytes()
+
+
+def _open_verified(path: Path):
+    """`path` opened for reading if it holds exactly the expected tables, else None."""
+    try:
+        fh = path.open("rb")
+    except OSError:
+        return None
+    data = fh.read(_FILE_BYTES + 1)
+    if len(data) == _FILE_BYTES and hashlib.sha256(data).hexdigest() == TABLES_SHA256:
+        return fh
+    fh.close()
+    return None
+
+
+@lru_cache(maxsize=4)
+def get_aes_tables(path: str) -> AESTables:
+    """Map the table file at `path`, (re)building it when it is missing or doesn't verify."""
+    target = Path(path)
+    fh = _open_verified(target)
+    if fh is None:
+        target.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # write-then-rename: concurrent workers all produce the same bytes, and
+        # nobody ever maps a half-written file
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+        with os.fdopen(fd, "wb") as out:
+            out.write(build_tables())
+        os.replace(tmp, target)
+        fh = _open_verified(target)
+        if fh is None:
+            raise RuntimeError(f"AES tables at {target} were changed while being written")
+    # map the descriptor that was verified, not the path, which could be swapped meanwhile;
+    # a plain ndarray view of the mapping: gathers on np.memmap itself are several times slower
+    with fh:
+        data = np.memmap(fh, dtype=np.uint8, mode="r", shape=(_FILE_BYTES,))
+    return AESTables(data.view(np.ndarray))
+
+
+def sbox_entry(x: int, steps: list[Step] | None = None) -> dict:
+    """S(x) = affine(x^-1), with the inverse's extended-Euclid trace in `steps`."""
+    x &= 0xFF
+    inverse = gf_inv(x, AES_FIELD, steps) if x else 0
+    return {"x": x, "inverse": inverse, "sbox": int(affine(inverse))}
+
+
+def rcon(i: int) -> int:
+    """Round constant for key-schedule step i >= 1: x^(i-1) in GF(2^8)."""
+    return gf_pow(2, i - 1, AES_FIELD)
+
+
+# ---------- Key expansion ----------
+def expand_key(key: bytes, tables: AESTables, steps: list[Step] | None = None) -> np.ndarray:
+    """Round keys as a (rounds + 1, 16) uint8 array; `steps` gets one record per derived word."""
+    nk = len(key) // 4
+    if len(key) not in KEY_ROUNDS:
+        raise ValueError("AES keys are 16, 24 or 32 bytes long.")
+    rounds = KEY_ROUNDS[len(key)]
+    sbox = tables.sbox
+    words = [list(key[4 * i : 4 * i + 4]) for i in range(nk)]
+    for i in range(nk, 4 * (rounds + 1)):
+        temp = list(words[i - 1])
+        record: Step = {"kind": "keyWord", "i": i, "temp": bytes(temp).hex()}
+        if i % nk == 0:
+            temp = temp[1:] + temp[:1]
+            record["afterRotWord"] = bytes(temp).hex()
+            temp = [int(sbox[b]) for b in temp]
+            record["afterSubWord"] = bytes(temp).hex()
+            temp[0] ^= rcon(i // nk)
+            record["rcon"] = rcon(i // nk)
+        elif nk > 6 and i % nk == 4:
+            temp = [int(sbox[b]) for b in temp]
+            record["afterSubWord"] = bytes(temp).hex()
+        word = [a ^ b for a, b in zip(words[i - nk], temp)]
+        words.append(word)
+        if steps is not None:
+            record["word"] = bytes(word).hex()
+            steps.append(record)
+    return np.array(words, dtype=np.uint8).reshape(rounds + 1, BLOCK_BYTES)
+
+
+# ---------- Round functions on (N, 16) batches ----------
+def as_states(blocks) -> np.ndarray:
+    states = np.asarray(blocks, dtype=np.uint8)
+    if states.ndim != 2 or states.shape[1] != BLOCK_BYTES:
+        raise ValueError("States must have shape (N, 16).")
+    return states
+
+
+def sub_bytes(states: np.ndarray, tables: AESTables) -> np.ndarray:
+    return tables.sbox[states]
+
+
+def inv_sub_bytes(states: np.ndarray, tables: AESTables) -> np.ndarray:
+    return tables.inv_sbox[states]
+
+
+def shift_rows(states: np.ndarray) -> np.ndarray:
+    return states[:, SHIFT_ROWS]
+
+
+def inv_shift_rows(states: np.ndarray) -> np.ndarray:
+    return states[:, INV_SHIFT_ROWS]
+
+
+def _mix(states: np.ndarray, tables: AESTables, coefficients: tuple[int, int, int, int]) -> np.ndarray:
+    # row r of the circulant matrix is `coefficients` rotated right by r, so
+    # out[r + 4c] = XOR_k coefficients[k] * in[(r + k) mod 4 + 4c]
+    out = np.zeros_like(states)
+    for k, coefficient in enumerate(coefficients):
+        column = states[:, _COLUMN_ROTATIONS[k]]
+        out ^= column if coefficient == 1 else tables.mul[coefficient][column]
+    return out
+
+
+def mix_columns(states: np.ndarray, tables: AESTables) -> np.ndarray:
+    return _mix(states, tables, (2, 3, 1, 1))
+
+
+def inv_mix_columns(states: np.ndarray, tables: AESTables) -> np.ndarray:
+    return _mix(states, tables, (14, 11, 13, 9))
+
+
+def encrypt(states: np.ndarray, round_keys: np.ndarray, tables: AESTables) -> np.ndarray:
+    rounds = len(round_keys) - 1
+    states = states ^ round_keys[0]
+    for r in range(1, rounds):
+        states = mix_columns(shift_rows(sub_bytes(states, tables)), tables) ^ round_keys[r]
+    return shift_rows(sub_bytes(states, tables)) ^ round_keys[rounds]
+
+
+def decrypt(states: np.ndarray, round_keys: np.ndarray, tables: AESTables) -> np.ndarray:
+    rounds = len(round_keys) - 1
+    states = states ^ round_keys[rounds]
+    for r in range(rounds - 1, 0, -1):
+        states = inv_mix_columns(inv_sub_bytes(inv_shift_rows(states), tables) ^ round_keys[r], tables)
+    return inv_sub_bytes(inv_shift_rows(states), tables) ^ round_keys[0]
+
+
+def encrypt_trace(
+    block: bytes, key: bytes, tables: AESTables
+) -> tuple[bytes, np.ndarray, list[Step], list[Step]]:
+    """Encrypt one block; returns (ciphertext, round keys, key-expansion steps, round steps)."""
+    key_steps: list[Step] = []
+    round_keys = expand_key(key, tables, key_steps)
+    rounds = len(round_keys) - 1
+    state = as_states([list(block)])
+    steps: list[Step] = [{"kind": "input", "round": 0, "state": state[0].tobytes().hex()}]
+
+    def record(kind: str, r: int, round_key: np.ndarray | None = None) -> None:
+        step: Step = {"kind": kind, "round": r, "state": state[0].tobytes().hex()}
+        if round_key is not None:
+            step["roundKey"] = round_key.tobytes().hex()
+        steps.append(step)
+
+    state = state ^ round_keys[0]
+    record("AddRoundKey", 0, round_keys[0])
+    for r in range(1, rounds + 1):
+        state = sub_bytes(state, tables)
+        record("SubBytes", r)
+        state = shift_rows(state)
+        record("ShiftRows", r)
+        if r < rounds:
+            state = mix_columns(state, tables)
+            record("MixColumns", r)
+        state = state ^ round_keys[r]
+        record("AddRoundKey", r, round_keys[r])
+    return state[0].tobytes(), round_keys, key_steps, steps
@@ -0,0 +1,102 @@
+"""
+Vectorized GF(2^m) operations for whole arrays of operands (m <= 16).
+
+Every op is a handful of gathers into the log/antilog tables from tables.py:
+    a * b   = exp[log a + log b]
+    a^-1    = exp[order - log a]
+    a^n     = exp[(log a * n) mod order]
+so a million multiplications cost a few NumPy passes instead of a Python loop.
+Full tables can be exported as little-endian uint8 (m <= 8) / uint16 arrays.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .tables import get_tables
+
+# A full multiplication table has 4^m entries; 2^10 x 2^10 uint16 is 2 MB
+MAX_MUL_TABLE_M = 10
+TABLE_KINDS = ("mul", "inv", "log", "exp")
+
+
+def element_dtype(m: int) -> np.dtype:
+    return np.dtype(np.uint8 if m <= 8 else np.uint16)
+
+
+@lru_cache(maxsize=32)
+def _np_tables(m: int, mod_poly: int) -> tuple[np.ndarray, np.ndarray, int]:
+    tables = get_tables(m, mod_poly)
+    if tables is None:
+        raise ValueError("Batch operations need m <= 16 and an irreducible modulus of degree m.")
+    exp = np.asarray(tables.exp, dtype=element_dtype(m))
+    log = np.asarray(tables.log, dtype=np.int64)
+    exp.flags.writeable = False
+    log.flags.writeable = False
+    return exp, log, tables.order
+
+
+def _elements(values, m: int) -> np.ndarray:
+    return np.asarray(values, dtype=np.int64) & ((1 << m) - 1)
+
+
+def batch_add(a, b, m: int) -> np.ndarray:
+    return (_elements(a, m) ^ _elements(b, m)).astype(element_dtype(m))
+
+
+def batch_mul(a, b, m: int, mod_poly: int) -> np.ndarray:
+    exp, log, _order = _np_tables(m, mod_poly)
+    a, b = np.broadcast_arrays(_elements(a, m), _elements(b, m))
+    out = exp[log[a] + log[b]]
+    out[(a == 0) | (b == 0)] = 0
+    return out
+
+
+def batch_inv(a, m: int, mod_poly: int) -> np.ndarray:
+    exp, log, order = _np_tables(m, mod_poly)
+    a = _elements(a, m)
+    if np.any(a == 0):
+        raise ValueError("Zero has no multiplicative inverse in GF(2^m).")
+    return exp[order - log[a]]
+
+
+def batch_pow(a, n, m: int, mod_poly: int) -> np.ndarray:
+    exp, log, order = _np_tables(m, mod_poly)
+    a, n = np.broadcast_arrays(_elements(a, m), np.asarray(n, dtype=np.int64))
+    if np.any(n < 0):
+        raise ValueError("Exponent must be non-negative.")
+    # reduce n first so log * n stays far away from int64 overflow
+    out = exp[log[a] * (n % order) % order]
+    out[a == 0] = 0
+    out[n == 0] = 1  # by convention a^0 = 1 even if a = 0
+    return out
+
+
+@lru_cache(maxsize=16)
+def table_bytes(kind: str, m: int, mod_poly: int) -> tuple[bytes, tuple[int, ...], str]:
+    """
+    (little-endian bytes, shape, dtype name) of a full table:
+      mul  2^m x 2^m products (m <= MAX_MUL_TABLE_M)
+      inv  inverse of each element, inv[0] = 0
+      log  discrete log base the table generator, log[0] = 0 (undefined)
+      exp  generator powers g^0 .. g^(2^m - 2)
+    """
+    exp, log, order = _np_tables(m, mod_poly)
+    dtype = element_dtype(m)
+    size = 1 << m
+    if kind == "mul":
+        if m > MAX_MUL_TABLE_M:
+            raise ValueError(f"Full multiplication tables are limited to m <= {MAX_MUL_TABLE_M}; use log/exp.")
+        elements = np.arange(size)
+        table = batch_mul(elements[:, None], elements[None, :], m, mod_poly)
+    elif kind == "inv":
+        table = np.zeros(size, dtype=dtype)
+        table[1:] = batch_inv(np.arange(1, size), m, mod_poly)
+    elif kind == "log":
+        table = log.astype(dtype)
+    elif kind == "exp":
+        table = exp[:order]
+    else:
+        raise ValueError(f"Unknown table kind {kind!r}")
+    table = np.ascontiguousarray(table, dtype=dtype.newbyteorder("<"))
+    return table.tobytes(), table.shape, dtype.name
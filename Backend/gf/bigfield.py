@@ -0,0 +1,166 @@
+"""
+GF(2^m) for large m (the NIST binary fields go up to m = 571), on Python ints.
+
+- carry-less multiplication: 4-bit windowed comb, Karatsuba above a size threshold
+- squaring: spread every byte to 16 bits with a lookup table, no multiplication
+- reduction: folding for trinomial/pentanomial moduli (x^m = sum of the low
+  terms, two or three folds finish the job), long division otherwise
+- inversion: extended Euclid over GF(2)[x]; Itoh–Tsujii (m - 1 squarings +
+  O(log m) multiplications) is kept for comparison, but in CPython every
+  squaring is a few big-int passes, so Euclid is ~20x faster for NIST fields
+
+field.py routes untraced operations on fields without log tables here.
+"""
+
+from functools import lru_cache
+from typing import Callable
+
+# Operands wider than this are split with Karatsuba. In CPython the comb's C-level
+# shifts/XORs win below roughly 2k bits, i.e. for every NIST field
+# (measured with benchmarks/gf_bigfield.py)
+KARATSUBA_THRESHOLD = 2048
+# x^m + 3 lower terms at most: trinomials and pentanomials
+MAX_SPARSE_TERMS = 5
+
+# NIST FIPS 186 reduction polynomials
+NIST_MODULI: dict[int, int] = {
+    163: (1 << 163) | (1 << 7) | (1 << 6) | (1 << 3) | 1,
+    233: (1 << 233) | (1 << 74) | 1,
+    283: (1 << 283) | (1 << 12) | (1 << 7) | (1 << 5) | 1,
+    409: (1 << 409) | (1 << 87) | 1,
+    571: (1 << 571) | (1 << 10) | (1 << 5) | (1 << 2) | 1,
+}
+
+
+# ---------- Carry-less multiplication ----------
+def _clmul_comb(a: int, b: int) -> int:
+    """Left-to-right comb over 4-bit windows of the shorter operand."""
+    if a.bit_length() < b.bit_length():
+        a, b = b, a
+    if b == 0:
+        return 0
+    window = [0, a]
+    for u in range(2, 16):
+        window.append(window[u >> 1] << 1 if u % 2 == 0 else window[u - 1] ^ a)
+    r = 0
+    for digit in format(b, "x"):
+        r = (r << 4) ^ window[int(digit, 16)]
+    return r
+
+
+def clmul(a: int, b: int) -> int:
+    """Product of two GF(2)[x] polynomials (no reduction)."""
+    n = max(a.bit_length(), b.bit_length())
+    if n <= KARATSUBA_THRESHOLD:
+        return _clmul_comb(a, b)
+    h = n // 2
+    mask = (1 << h) - 1
+    a0, a1 = a & mask, a >> h
+    b0, b1 = b & mask, b >> h
+    z0 = clmul(a0, b0)
+    z2 = clmul(a1, b1)
+    z1 = clmul(a0 ^ a1, b0 ^ b1) ^ z0 ^ z2
+    return (z2 << (2 * h)) ^ (z1 << h) ^ z0
+
+
+# byte -> its bits interleaved with zeros, as 2 little-endian bytes
+_SPREAD = [int("0".join(format(i, "b")), 2).to_bytes(2, "little") for i in range(256)]
+
+
+def clsquare(a: int) -> int:
+    """a(x)^2 = a(x^2) in characteristic 2: interleave the bits with zeros."""
+    raw = a.to_bytes((a.bit_length() + 7) // 8, "little")
+    return int.from_bytes(b"".join([_SPREAD[byte] for byte in raw]), "little")
+
+
+# ---------- Reduction ----------
+@lru_cache(maxsize=64)
+def reducer(m: int, mod_poly: int) -> Callable[[int], int]:
+    """Function reducing any polynomial modulo `mod_poly` (degree m)."""
+    mask = (1 << m) - 1
+    taps = [k for k in range(m) if mod_poly >> k & 1]
+
+    if len(taps) + 1 <= MAX_SPARSE_TERMS and max(taps, default=0) < m - 1:
+        # x^m = sum(x^k for k in taps), so fold the part above x^m back down
+        def reduce_sparse(c: int) -> int:
+            while c >> m:
+                hi = c >> m
+                c &= mask
+                for k in taps:
+                    c ^= hi << k
+            return c
+
+        return reduce_sparse
+
+    def reduce_generic(c: int) -> int:
+        while c.bit_length() > m:
+            c ^= mod_poly << (c.bit_length() - 1 - m)
+        return c
+
+    return reduce_generic
+
+
+# ---------- Field operations ----------
+def big_mul(a: int, b: int, m: int, mod_poly: int) -> int:
+    return reducer(m, mod_poly)(clmul(a, b))
+
+
+def big_square(a: int, m: int, mod_poly: int) -> int:
+    return reducer(m, mod_poly)(clsquare(a))
+
+
+def big_pow(a: int, n: int, m: int, mod_poly: int) -> int:
+    if n < 0:
+        raise ValueError("Exponent must be non-negative.")
+    reduce = reducer(m, mod_poly)
+    acc = 1
+    for bit in format(n, "b") if n else "":
+        acc = reduce(clsquare(acc))
+        if bit == "1":
+            acc = reduce(clmul(acc, a))
+    return acc
+
+
+def inv_eea(a: int, mod_poly: int) -> int:
+    """Extended Euclid over GF(2)[x] (Hankerson et al., Alg. 2.48)."""
+    if a == 0:
+        raise ValueError("Zero has no multiplicative inverse in GF(2^m).")
+    u, v = a, mod_poly
+    g1, g2 = 1, 0
+    while u != 1:
+        if u == 0:
+            raise ValueError("gcd(a, modPoly) != 1; inverse does not exist.")
+        j = u.bit_length() - v.bit_length()
+        if j < 0:
+            u, v = v, u
+            g1, g2 = g2, g1
+            j = -j
+        u ^= v << j
+        g1 ^= g2 << j
+    return g1
+
+
+def inv_itoh_tsujii(a: int, m: int, mod_poly: int) -> int:
+    """
+    a^-1 = a^(2^m - 2) = (a^(2^(m-1) - 1))^2, building b_k = a^(2^k - 1) along
+    the binary expansion of m - 1 with b_2k = b_k^(2^k) * b_k, b_k+1 = b_k^2 * a.
+    """
+    if a == 0:
+        raise ValueError("Zero has no multiplicative inverse in GF(2^m).")
+    reduce = reducer(m, mod_poly)
+    beta, k = a, 1
+    for bit in format(m - 1, "b")[1:]:
+        t = beta
+        for _ in range(k):
+            t = reduce(clsquare(t))
+        beta = reduce(clmul(t, beta))
+        k *= 2
+        if bit == "1":
+            beta = reduce(clmul(reduce(clsquare(beta)), a))
+            k += 1
+    return reduce(clsquare(beta))
+
+
+def big_inv(a: int, m: int, mod_poly: int) -> int:
+    # Euclid also reports a missing inverse for reducible moduli
+    return reducer(m, mod_poly)(inv_eea(a, mod_poly))
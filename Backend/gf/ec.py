@@ -0,0 +1,404 @@
+"""
+Elliptic curves y^2 + xy = x^3 + a x^2 + b over GF(2^m) (b != 0).
+
+Points are affine `(x, y)` tuples, with None for the point at infinity. Traced
+steps write field elements and points as hex strings (they outgrow JSON
+numbers in JavaScript).
+Three ways to compute k*P:
+
+- `scalar_mul_affine`: double-and-add in affine coordinates, one inversion per
+  group operation. Slow, but each step is the textbook formula, so this is
+  the one to trace for teaching.
+- `montgomery_ladder`: López–Dahab's x-only Montgomery ladder (Hankerson et
+  al., Alg. 3.40). It does one addition and one doubling per bit whatever the
+  bit is, needs no inversions until the end, and recovers y at the end.
+- `FixedBaseTable`: for a fixed base point (the generator of a named curve),
+  it precomputes j * 2^(w i) * P for every w-bit window. Then k*P is one mixed
+  López–Dahab + affine addition per window and no doublings.
+
+López–Dahab projective coordinates (X : Y : Z) stand for (X/Z, Y/Z^2). The
+NIST B- and K- curves from FIPS 186-4 are in NIST_CURVES.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+
+from .bigfield import NIST_MODULI, clmul, clsquare, inv_eea, reducer
+from .field import Step
+
+Point = tuple[int, int] | None
+LDPoint = tuple[int, int, int]  # Z = 0 is the point at infinity
+
+DEFAULT_WINDOW = 4
+
+
+@dataclass(frozen=True)
+class Curve:
+    m: int
+    mod_poly: int
+    a: int
+    b: int
+    name: str | None = None
+    gx: int | None = None
+    gy: int | None = None
+    n: int | None = None  # order of G
+    h: int | None = None  # cofactor
+
+    @property
+    def generator(self) -> Point:
+        return None if self.gx is None else (self.gx, self.gy)
+
+    @cached_property
+    def _reduce(self):
+        return reducer(self.m, self.mod_poly)
+
+    def mul(self, x: int, y: int) -> int:
+        return self._reduce(clmul(x, y))
+
+    def sqr(self, x: int) -> int:
+        return self._reduce(clsquare(x))
+
+    def inv(self, x: int) -> int:
+        return self._reduce(inv_eea(x, self.mod_poly))
+
+    def contains(self, point: Point) -> bool:
+        if point is None:
+            return True
+        x, y = point
+        if x >> self.m or y >> self.m:
+            return False
+        x2 = self.sqr(x)
+        return self.sqr(y) ^ self.mul(x, y) == self.mul(x2, x) ^ self.mul(self.a, x2) ^ self.b
+
+
+def _nist(name: str, a: int, b: int, gx: int, gy: int, n: int, h: int) -> Curve:
+    m = int(name[2:])
+    return Curve(m, NIST_MODULI[m], a, b, name, gx, gy, n, h)
+
+
+# FIPS 186-4, appendix D.1.3
+NIST_CURVES: dict[str, Curve] = {
+    curve.name: curve
+    for curve in (
+        _nist(
+            "K-163", 1, 1,
+            0x2FE13C0537BBC11ACAA07D793DE4E6D5E5C94EEE8,
+            0x289070FB05D38FF58321F2E800536D538CCDAA3D9,
+            0x4000000000000000000020108A2E0CC0D99F8A5EF, 2,
+        ),
+        _nist(
+            "B-163", 1, 0x20A601907B8C953CA1481EB10512F78744A3205FD,
+            0x3F0EBA16286A2D57EA0991168D4994637E8343E36,
+            0x0D51FBC6C71A0094FA2CDD545B11C5C0C797324F1,
+            0x40000000000000000000292FE77E70C12A4234C33, 2,
+        ),
+        _nist(
+            "K-233", 0, 1,
+            0x17232BA853A7E731AF129F22FF4149563A419C26BF50A4C9D6EEFAD6126,
+            0x1DB537DECE819B7F70F555A67C427A8CD9BF18AEB9B56E0C11056FAE6A3,
+            0x8000000000000000000000000000069D5BB915BCD46EFB1AD5F173ABDF, 4,
+        ),
+        _nist(
+            "B-233", 1, 0x066647EDE6C332C7F8C0923BB58213B333B20E9CE4281FE115F7D8F90AD,
+            0x0FAC9DFCBAC8313BB2139F1BB755FEF65BC391F8B36F8F8EB7371FD558B,
+            0x1006A08A41903350678E58528BEBF8A0BEFF867A7CA36716F7E01F81052,
+            0x1000000000000000000000000000013E974E72F8A6922031D2603CFE0D7, 2,
+        ),
+        _nist(
+            "K-283", 0, 1,
+            0x503213F78CA44883F1A3B8162F188E553CD265F23C1567A16876913B0C2AC2458492836,
+            0x1CCDA380F1C9E318D90F95D07E5426FE87E45C0E8184698E45962364E34116177DD2259,
+            0x1FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFE9AE2ED07577265DFF7F94451E061E163C61, 4,
+        ),
+        _nist(
+            "B-283", 1, 0x27B680AC8B8596DA5A4AF8A19A0303FCA97FD7645309FA2A581485AF6263E313B79A2F5,
+            0x5F939258DB7DD90E1934F8C70B0DFEC2EED25B8557EAC9C80E2E198F8CDBECD86B12053,
+            0x3676854FE24141CB98FE6D4B20D02B4516FF702350EDDB0826779C813F0DF45BE8112F4,
+            0x3FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEF90399660FC938A90165B042A7CEFADB307, 2,
+        ),
+        _nist(
+            "K-409", 0, 1,
+            0x060F05F658F49C1AD3AB1890F7184210EFD0987E307C84C27ACCFB8F9F67CC2C460189EB5AAAA62EE222EB1B35540CFE9023746,
+            0x1E369050B7C4E42ACBA1DACBF04299C3460782F918EA427E6325165E9EA10E3DA5F6C42E9C55215AA9CA27A5863EC48D8E0286B,
+            0x7FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFE5F83B2D4EA20400EC4557D5ED3E3E7CA5B4B5C83B8E01E5FCF, 4,
+        ),
+        _nist(
+            "B-409", 1,
+            0x021A5C2C8EE9FEB5C4B9A753B7B476B7FD6422EF1F3DD674761FA99D6AC27C8A9A197B272822F6CD57A55AA4F50AE317B13545F,
+            0x15D4860D088DDB3496B0C6064756260441CDE4AF1771D4DB01FFE5B34E59703DC255A868A1180515603AEAB60794E54BB7996A7,
+            0x061B1CFAB6BE5F32BBFA78324ED106A7636B9C5A7BD198D0158AA4F5488D08F38514F1FDF4B4F40D2181B3681C364BA0273C706,
+            0x10000000000000000000000000000000000000000000000000001E2AAD6A612F33307BE5FA47C3C9E052F838164CD37D9A21173, 2,
+        ),
+        _nist(
+            "K-571", 0, 1,
+            0x26EB7A859923FBC82189631F8103FE4AC9CA2970012D5D46024804801841CA44370958493B205E647DA304DB4CEB08CBBD1BA39494776FB988B47174DCA88C7E2945283A01C8972,
+            0x349DC807F4FBF374F4AEADE3BCA95314DD58CEC9F307A54FFC61EFC006D8A2C9D4979C0AC44AEA74FBEBBB9F772AEDCB620B01A7BA7AF1B320430C8591984F601CD4C143EF1C7A3,
+            0x20000000000000000000000000000000000000000000000000000000000000000000000131850E1F19A63E4B391A8DB917F4138B630D84BE5D639381E91DEB45CFE778F637C1001, 4,
+        ),
+        _nist(
+            "B-571", 1,
+            0x2F40E7E2221F295DE297117B7F3D62F5C6A97FFCB8CEFF1CD6BA8CE4A9A18AD84FFABBD8EFA59332BE7AD6756A66E294AFD185A78FF12AA520E4DE739BACA0C7FFEFF7F2955727A,
+            0x303001D34B856296C16C0D40D3CD7750A93D1D2955FA80AA5F40FC8DB7B2ABDBDE53950F4C0D293CDD711A35B67FB1499AE60038614F1394ABFA3B4C850D927E1E7769C8EEC2D19,
+            0x37BF27342DA639B6DCCFFFEB73D69D78C6C27A6009CBBCA1980F8533921E8A684423E43BAB08A576291AF8F461BB2A8B3531D2F0485C19B16E2F1516E23DD3C1A4827AF1B8AC15B,
+            0x3FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFE661CE18FF55987308059B186823851EC7DD9CA1161DE93D5174D66E8382E9BB2FE84E47, 2,
+        ),
+    )
+}
+
+
+# ---------- Affine arithmetic (traceable) ----------
+def negate(curve: Curve, point: Point) -> Point:
+    return None if point is None else (point[0], point[0] ^ point[1])
+
+
+def double_affine(curve: Curve, p: Point, steps: list[Step] | None = None) -> Point:
+    if p is None or p[0] == 0:  # (0, sqrt b) has order 2
+        result = None
+    else:
+        x1, y1 = p
+        lam = x1 ^ curve.mul(y1, curve.inv(x1))  # x + y/x
+        x3 = curve.sqr(lam) ^ lam ^ curve.a
+        y3 = curve.sqr(x1) ^ curve.mul(lam ^ 1, x3)
+        result = (x3, y3)
+    if steps is not None:
+        step: Step = {"kind": "ecDouble", "P": _fmt(p), "result": _fmt(result)}
+        if result is not None:
+            step["lambda"] = f"{lam:#x}"
+        steps.append(step)
+    return result
+
+
+def add_affine(curve: Curve, p: Point, q: Point, steps: list[Step] | None = None) -> Point:
+    if p is None or q is None:
+        result = q if p is None else p
+    elif p[0] == q[0]:
+        if p[1] != q[1] or p[0] == 0:  # q = -p
+            result = None
+        else:
+            return double_affine(curve, p, steps)
+    else:
+        x1, y1 = p
+        x2, y2 = q
+        lam = curve.mul(y1 ^ y2, curve.inv(x1 ^ x2))
+        x3 = curve.sqr(lam) ^ lam ^ x1 ^ x2 ^ curve.a
+        y3 = curve.mul(lam, x1 ^ x3) ^ x3 ^ y1
+        result = (x3, y3)
+    if steps is not None:
+        step: Step = {"kind": "ecAdd", "P": _fmt(p), "Q": _fmt(q), "result": _fmt(result)}
+        if p is not None and q is not None and result is not None:
+            step["lambda"] = f"{lam:#x}"
+        steps.append(step)
+    return result
+
+
+def scalar_mul_affine(curve: Curve, k: int, p: Point, steps: list[Step] | None = None) -> Point:
+    """Left-to-right double-and-add; `steps` gets every ecDouble/ecAdd."""
+    if k < 0:
+        k, p = -k, negate(curve, p)
+    acc: Point = None
+    for bit in format(k, "b") if k else "":
+        acc = double_affine(curve, acc, steps) if acc is not None else None
+        if bit == "1":
+            acc = add_affine(curve, acc, p, steps)
+    return acc
+
+
+def _fmt(point: Point) -> str | None:
+    return None if point is None else f"({point[0]:#x}, {point[1]:#x})"
+
+
+# ---------- López–Dahab coordinates ----------
+def to_ld(point: Point) -> LDPoint:
+    return (1, 0, 0) if point is None else (point[0], point[1], 1)
+
+
+def from_ld(curve: Curve, point: LDPoint) -> Point:
+    x, y, z = point
+    if z == 0:
+        return None
+    z_inv = curve.inv(z)
+    return curve.mul(x, z_inv), curve.mul(y, curve.sqr(z_inv))
+
+
+def double_ld(curve: Curve, point: LDPoint) -> LDPoint:
+    """Z3 = X1^2 Z1^2, X3 = X1^4 + b Z1^4, Y3 = b Z1^4 Z3 + X3 (a Z3 + Y1^2 + b Z1^4)."""
+    x1, y1, z1 = point
+    if z1 == 0 or x1 == 0:
+        return (1, 0, 0)
+    mul, sqr = curve.mul, curve.sqr
+    x1s, z1s = sqr(x1), sqr(z1)
+    z3 = mul(x1s, z1s)
+    bz4 = mul(curve.b, sqr(z1s))
+    x3 = sqr(x1s) ^ bz4
+    a_z3 = z3 if curve.a == 1 else mul(curve.a, z3) if curve.a else 0
+    y3 = mul(bz4, z3) ^ mul(x3, a_z3 ^ sqr(y1) ^ bz4)
+    return (x3, y3, z3)
+
+
+def add_mixed(curve: Curve, p: LDPoint, q: Point) -> LDPoint:
+    """López–Dahab + affine (Hankerson et al., Alg. 3.25)."""
+    if q is None:
+        return p
+    x1, y1, z1 = p
+    x2, y2 = q
+    if z1 == 0:
+        return (x2, y2, 1)
+    mul, sqr = curve.mul, curve.sqr
+    z1s = sqr(z1)
+    a_ = mul(y2, z1s) ^ y1
+    b_ = mul(x2, z1) ^ x1
+    if b_ == 0:
+        return double_ld(curve, (x2, y2, 1)) if a_ == 0 else (1, 0, 0)
+    c = mul(z1, b_)
+    a_z1s = z1s if curve.a == 1 else mul(curve.a, z1s) if curve.a else 0
+    d = mul(sqr(b_), c ^ a_z1s)
+    z3 = sqr(c)
+    e = mul(a_, c)
+    x3 = sqr(a_) ^ d ^ e
+    f = x3 ^ mul(x2, z3)
+    g = mul(x2 ^ y2, sqr(z3))
+    y3 = mul(e ^ z3, f) ^ g
+    return (x3, y3, z3)
+
+
+def scalar_mul_ld(curve: Curve, k: int, p: Point) -> Point:
+    """Left-to-right double-and-add in López–Dahab coordinates (one inversion at the end)."""
+    if k < 0:
+        k, p = -k, negate(curve, p)
+    acc: LDPoint = (1, 0, 0)
+    for bit in format(k, "b") if k else "":
+        acc = double_ld(curve, acc)
+        if bit == "1":
+            acc = add_mixed(curve, acc, p)
+    return from_ld(curve, acc)
+
+
+# ---------- Montgomery ladder ----------
+def montgomery_ladder(curve: Curve, k: int, p: Point, steps: list[Step] | None = None) -> Point:
+    """
+    k*P with the x-only ladder on (X1 : Z1) = jP, (X2 : Z2) = (j + 1)P:
+      add:    Z = (X1 Z2 + X2 Z1)^2,  X = x Z + (X1 Z2)(X2 Z1)
+      double: X = X^4 + b Z^4,        Z = X^2 Z^2
+    then y from x, y and both ladder points (Hankerson et al., Alg. 3.40).
+    """
+    if k < 0:
+        k, p = -k, negate(curve, p)
+    if curve.n is not None:
+        k %= curve.n * (curve.h or 1)
+    if p is None or k == 0:
+        return None
+    x, y = p
+    if x == 0:  # order 2
+        return p if k & 1 else None
+    mul, sqr, b = curve.mul, curve.sqr, curve.b
+    x1, z1 = x, 1
+    x2, z2 = sqr(sqr(x)) ^ b, sqr(x)
+    bits = format(k, "b")[1:]
+    for i, bit in enumerate(bits):
+        t1, t2 = mul(x1, z2), mul(x2, z1)
+        if bit == "1":
+            z1 = sqr(t1 ^ t2)
+            x1 = mul(x, z1) ^ mul(t1, t2)
+            xs, zs = sqr(x2), sqr(z2)
+            x2, z2 = sqr(xs) ^ mul(b, sqr(zs)), mul(xs, zs)
+        else:
+            z2 = sqr(t1 ^ t2)
+            x2 = mul(x, z2) ^ mul(t1, t2)
+            xs, zs = sqr(x1), sqr(z1)
+            x1, z1 = sqr(xs) ^ mul(b, sqr(zs)), mul(xs, zs)
+        if steps is not None:
+            steps.append(
+                {
+                    "kind": "ladder",
+                    "i": i,
+                    "bit": int(bit),
+                    **{name: f"{v:#x}" for name, v in (("X1", x1), ("Z1", z1), ("X2", x2), ("Z2", z2))},
+                }
+            )
+    result = _ladder_y(curve, x, y, x1, z1, x2, z2)
+    if steps is not None:
+        steps.append({"kind": "ladderY", "result": _fmt(result)})
+    return result
+
+
+def _ladder_y(curve: Curve, x: int, y: int, x1: int, z1: int, x2: int, z2: int) -> Point:
+    if z1 == 0:
+        return None
+    if z2 == 0:
+        return (x, x ^ y)  # kP = -P
+    mul, sqr = curve.mul, curve.sqr
+    x3 = mul(x1, curve.inv(z1))
+    t = mul(x1 ^ mul(x, z1), x2 ^ mul(x, z2)) ^ mul(sqr(x) ^ y, mul(z1, z2))
+    y3 = mul(mul(x ^ x3, t), curve.inv(mul(x, mul(z1, z2)))) ^ y
+    return (x3, y3)
+
+
+# ---------- Fixed-base windows ----------
+def _batch_to_affine(curve: Curve, points: list[LDPoint]) -> list[Point]:
+    """from_ld on many points with one inversion (Montgomery's trick)."""
+    prefix, acc = [], 1
+    for _x, _y, z in points:
+        prefix.append(acc)
+        if z:
+            acc = curve.mul(acc, z)
+    inv = curve.inv(acc)
+    out: list[Point] = [None] * len(points)
+    for i in range(len(points) - 1, -1, -1):
+        x, y, z = points[i]
+        if z == 0:
+            continue
+        z_inv = curve.mul(inv, prefix[i])
+        inv = curve.mul(inv, z)
+        out[i] = (curve.mul(x, z_inv), curve.mul(y, curve.sqr(z_inv)))
+    return out
+
+
+class FixedBaseTable:
+    """
+    table[i][j - 1] = j * 2^(w i) * P (affine) for every w-bit window i of
+    scalars up to `bits` bits; k*P is then the sum of one entry per nonzero
+    window. Building it costs about as much as 2^w scalar multiplications.
+    """
+
+    def __init__(self, curve: Curve, p: Point, window: int = DEFAULT_WINDOW, bits: int | None = None):
+        self.curve, self.point, self.window = curve, p, window
+        self.bits = bits or (curve.n.bit_length() if curve.n else curve.m + 1)
+        self.windows = -(-self.bits // window)
+        size = (1 << window) - 1
+        entries: list[LDPoint] = []
+        base = to_ld(p)
+        for _ in range(self.windows):
+            base_affine = from_ld(curve, base)
+            acc = base
+            row = [acc]
+            for _ in range(size - 1):
+                acc = add_mixed(curve, acc, base_affine)
+                row.append(acc)
+            entries.extend(row)
+            for _ in range(window):  # base *= 2^w
+                base = double_ld(curve, base)
+        flat = _batch_to_affine(curve, entries)
+        self.table = [flat[i * size : (i + 1) * size] for i in range(self.windows)]
+
+    def multiply(self, k: int) -> Point:
+        curve = self.curve
+        if k < 0:
+            return negate(curve, self.multiply(-k))
+        if curve.n is not None:
+            k %= curve.n
+        if k.bit_length() > self.bits:
+            raise ValueError(f"Scalar has more than {self.bits} bits")
+        mask = (1 << self.window) - 1
+        acc: LDPoint = (1, 0, 0)
+        for row in self.table:
+            digit = k & mask
+            if digit:
+                acc = add_mixed(curve, acc, row[digit - 1])
+            k >>= self.window
+        return from_ld(curve, acc)
+
+
+@lru_cache(maxsize=32)
+def generator_table(name: str, window: int = DEFAULT_WINDOW) -> FixedBaseTable:
+    curve = NIST_CURVES[name]
+    return FixedBaseTable(curve, curve.generator, window)
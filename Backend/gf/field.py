@@ -0,0 +1,243 @@
+"""
+GF(2^m) arithmetic, mirroring Frontend/src/lib/gf2m.ts.
+
+Elements and moduli are ints whose bits are polynomial coefficients
+(0x11B = x^8 + x^4 + x^3 + x + 1). Every operation takes an optional `steps`
+list; when given, the operation runs the same shift-and-add algorithm as the
+frontend and appends the same step records (same keys as the TS `Step` type),
+so the UI can render server-side traces unchanged. Without `steps`, fields up
+to m = 16 use cached log/antilog tables (see tables.py) and everything else
+the big-field routines in bigfield.py (comb multiplication, sparse reduction).
+
+The traced algorithms are generators (`iter_mod`, `iter_mul`, `iter_pow`,
+`iter_inv`) that yield one step at a time and return the value; the `steps`
+list is filled by draining them, and trace.py streams them instead.
+"""
+
+from collections.abc import Generator
+from dataclasses import dataclass
+
+from .bigfield import big_inv, big_pow, clmul, reducer
+from .tables import get_tables
+
+# Same as Frontend/src/lib/irreducibles.ts
+IRRED_DEFAULTS: dict[int, int] = {
+    2: 0x7,  # x^2 + x + 1
+    3: 0xB,  # x^3 + x + 1
+    4: 0x13,  # x^4 + x + 1
+    5: 0x25,  # x^5 + x^2 + 1
+    6: 0x43,  # x^6 + x + 1
+    7: 0x89,  # x^7 + x^3 + 1
+    8: 0x11B,  # AES: x^8 + x^4 + x^3 + x + 1
+}
+
+Step = dict[str, int | str]
+# Yields steps, returns the operation's value
+StepGen = Generator[Step, None, int]
+
+
+@dataclass(frozen=True)
+class GFConfig:
+    m: int
+    mod_poly: int  # irreducible polynomial with top bit at x^m
+
+    @property
+    def mask(self) -> int:
+        return (1 << self.m) - 1
+
+    @property
+    def standard(self) -> bool:
+        """True when mod_poly has degree m, which the fast paths assume."""
+        return self.mod_poly.bit_length() - 1 == self.m
+
+
+def poly_degree(p: int) -> int:
+    """Degree of a GF(2)[x] polynomial; -1 for the zero polynomial."""
+    return p.bit_length() - 1
+
+
+def as_poly_string(poly: int) -> str:
+    if not poly:
+        return "0"
+    terms = []
+    for i in range(poly_degree(poly), -1, -1):
+        if poly >> i & 1:
+            terms.append("1" if i == 0 else "x" if i == 1 else f"x^{i}")
+    return " + ".join(terms)
+
+
+# ---------- Basic helpers ----------
+def gf_add(a: int, b: int, steps: list[Step] | None = None, op: str = "add") -> int:
+    """Field addition (and subtraction) in characteristic 2 is XOR."""
+    result = a ^ b
+    if steps is not None:
+        steps.append({"kind": "add", "op": op, "a": a, "b": b, "result": result})
+    return result
+
+
+def _drain(gen: StepGen, steps: list[Step] | None) -> int:
+    """Run a traced algorithm to the end, appending its steps to `steps` (if given)."""
+    while True:
+        try:
+            step = next(gen)
+        except StopIteration as stop:
+            return stop.value
+        if steps is not None:
+            steps.append(step)
+
+
+# ---------- Modular reduction ----------
+def iter_mod(x: int, cfg: GFConfig) -> StepGen:
+    deg_mod = poly_degree(cfg.mod_poly)
+    if deg_mod < 0:
+        raise ValueError("Invalid modPoly (zero).")
+    r = x
+    while True:
+        deg_r = poly_degree(r)
+        if deg_r < deg_mod:
+            break
+        shift = deg_r - deg_mod
+        before = r
+        r ^= cfg.mod_poly << shift
+        yield {"kind": "reduce", "carry": shift, "before": before, "after": r}
+
+    value = r & cfg.mask
+    yield {"kind": "mod", "before": x, "after": value}
+    return value
+
+
+def gf_mod(x: int, cfg: GFConfig, steps: list[Step] | None = None) -> int:
+    deg_mod = poly_degree(cfg.mod_poly)
+    if deg_mod < 0:
+        raise ValueError("Invalid modPoly (zero).")
+    if steps is None:
+        return reducer(deg_mod, cfg.mod_poly)(x) & cfg.mask
+    return _drain(iter_mod(x, cfg), steps)
+
+
+# ---------- Multiplication ----------
+def iter_mul(a: int, b: int, cfg: GFConfig) -> StepGen:
+    a &= cfg.mask
+    b &= cfg.mask
+    prod = 0
+    for i in range(cfg.m):
+        b_bit = (b >> i) & 1
+        p_before = prod
+        if b_bit:
+            prod ^= a << i
+        yield {
+            "kind": "mul",
+            "i": i,
+            "bBit": b_bit,
+            "aBefore": a,
+            "aAfter": a,  # 'a' is conceptually shifted, never mutated
+            "pBefore": p_before,
+            "pAfter": prod,
+        }
+    return (yield from iter_mod(prod, cfg))
+
+
+def gf_mul(a: int, b: int, cfg: GFConfig, steps: list[Step] | None = None) -> int:
+    if steps is not None:
+        return _drain(iter_mul(a, b, cfg), steps)
+    a &= cfg.mask
+    b &= cfg.mask
+    tables = get_tables(cfg.m, cfg.mod_poly)
+    if tables is not None:
+        if a == 0 or b == 0:
+            return 0
+        return tables.exp[tables.log[a] + tables.log[b]]
+    return gf_mod(clmul(a, b), cfg)
+
+
+# ---------- Exponentiation ----------
+def iter_pow(a: int, n: int, cfg: GFConfig) -> StepGen:
+    if n < 0:
+        raise ValueError("Exponent must be non-negative.")
+    base = a & cfg.mask
+    acc = 1
+    while n > 0:
+        bit = n & 1
+        base_before, acc_before = base, acc
+        if bit:
+            acc = yield from iter_mul(acc, base, cfg)
+        base = yield from iter_mul(base, base, cfg)
+        yield {
+            "kind": "exp",
+            "bit": bit,
+            "baseBefore": base_before,
+            "baseAfter": base,
+            "accBefore": acc_before,
+            "accAfter": acc,
+        }
+        n >>= 1
+    return acc & cfg.mask
+
+
+def gf_pow(a: int, n: int, cfg: GFConfig, steps: list[Step] | None = None) -> int:
+    if n < 0:
+        raise ValueError("Exponent must be non-negative.")
+    if steps is not None:
+        return _drain(iter_pow(a, n, cfg), steps)
+    base = a & cfg.mask
+    tables = get_tables(cfg.m, cfg.mod_poly)
+    if tables is not None:
+        if n == 0:
+            return 1  # by convention a^0 = 1 even if a = 0
+        if base == 0:
+            return 0
+        return tables.exp[tables.log[base] * n % tables.order]
+    if cfg.standard:
+        return big_pow(base, n, cfg.m, cfg.mod_poly)
+
+    acc = 1
+    while n > 0:
+        if n & 1:
+            acc = gf_mul(acc, base, cfg)
+        base = gf_mul(base, base, cfg)
+        n >>= 1
+    return acc & cfg.mask
+
+
+# ---------- Inverse via extended Euclid over GF(2)[x] ----------
+def iter_inv(a: int, cfg: GFConfig) -> StepGen:
+    u = a & cfg.mask
+    if u == 0:
+        raise ValueError("Zero has no multiplicative inverse in GF(2^m).")
+    v = cfg.mod_poly
+    g1, g2 = 1, 0
+    while u != 1:
+        deg_u, deg_v = poly_degree(u), poly_degree(v)
+        if deg_u == -1:
+            raise ValueError("gcd(a, modPoly) != 1; inverse does not exist.")
+        shift = deg_u - deg_v
+        if shift < 0:
+            u, v = v, u
+            g1, g2 = g2, g1
+            shift = -shift
+        before_u, before_v, before_g1, before_g2 = u, v, g1, g2
+        u ^= v << shift
+        g1 ^= g2 << shift
+        yield {
+            "kind": "egcd",
+            "a": before_u,
+            "b": before_v,
+            "q": 1 << shift,  # in F2 the quotient is just x^shift
+            "r": u,
+            "t0": before_g1,
+            "t1": before_g2,
+        }
+    return (yield from iter_mod(g1, cfg))
+
+
+def gf_inv(a: int, cfg: GFConfig, steps: list[Step] | None = None) -> int:
+    u = a & cfg.mask
+    if u == 0:
+        raise ValueError("Zero has no multiplicative inverse in GF(2^m).")
+    if steps is None:
+        tables = get_tables(cfg.m, cfg.mod_poly)
+        if tables is not None:
+            return tables.exp[tables.order - tables.log[u]]
+        if cfg.standard:
+            return big_inv(u, cfg.m, cfg.mod_poly)
+    return _drain(iter_inv(u, cfg), steps)
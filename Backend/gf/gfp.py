@@ -0,0 +1,251 @@
+"""
+Polynomials over a prime field GF(p).
+
+A polynomial is a tuple of coefficients in [0, p), lowest degree first, with no
+trailing zeros: 3x^3 + 4x^2 + 2x + 1 over GF(5) is (1, 2, 4, 3) and the zero
+polynomial is (). Factorization is the usual three stages:
+
+1. square-free factorization (Yun, plus p-th roots when f' = 0)
+2. distinct-degree factorization: gcd(f, x^(p^i) - x) collects the factors of degree i
+3. equal-degree splitting (Cantor–Zassenhaus): gcd(f, a^((p^d - 1)/2) - 1) for
+   random a, or the trace a + a^2 + ... + a^(2^(d-1)) when p = 2
+
+`factor` is memoized per (polynomial, p), so checking a class's answers against
+the same polynomial factors it once.
+"""
+
+import random
+from functools import lru_cache
+
+import numpy as np
+
+from .irreducible import _is_probable_prime
+
+Poly = tuple[int, ...]
+
+ONE: Poly = (1,)
+X: Poly = (0, 1)
+FACTOR_CACHE_SIZE = 4096
+# Horner on int64 arrays needs (p - 1)^2 + p < 2^63
+_NUMPY_MAX_P = 1 << 31
+
+
+def is_prime(p: int) -> bool:
+    return _is_probable_prime(p)
+
+
+def poly(coeffs, p: int) -> Poly:
+    """Normalize any iterable of integer coefficients (lowest degree first)."""
+    out = [c % p for c in coeffs]
+    while out and out[-1] == 0:
+        out.pop()
+    return tuple(out)
+
+
+def degree(f: Poly) -> int:
+    """-1 for the zero polynomial."""
+    return len(f) - 1
+
+
+def add(f: Poly, g: Poly, p: int) -> Poly:
+    if len(f) < len(g):
+        f, g = g, f
+    return poly([a + b for a, b in zip(f, g)] + list(f[len(g) :]), p)
+
+
+def sub(f: Poly, g: Poly, p: int) -> Poly:
+    return add(f, scale(g, p - 1, p), p)
+
+
+def scale(f: Poly, c: int, p: int) -> Poly:
+    return poly([a * c for a in f], p)
+
+
+def mul(f: Poly, g: Poly, p: int) -> Poly:
+    if not f or not g:
+        return ()
+    out = [0] * (len(f) + len(g) - 1)
+    for i, a in enumerate(f):
+        if a:
+            for j, b in enumerate(g):
+                out[i + j] += a * b
+    return poly(out, p)
+
+
+def poly_divmod(f: Poly, g: Poly, p: int) -> tuple[Poly, Poly]:
+    if not g:
+        raise ZeroDivisionError("Polynomial division by zero.")
+    r = list(f)
+    q = [0] * max(0, len(f) - len(g) + 1)
+    inv = pow(g[-1], -1, p)
+    for shift in range(len(f) - len(g), -1, -1):
+        c = r[shift + len(g) - 1] * inv % p
+        if c:
+            q[shift] = c
+            for j, b in enumerate(g):
+                r[shift + j] = (r[shift + j] - c * b) % p
+    return poly(q, p), poly(r[: len(g) - 1], p)
+
+
+def rem(f: Poly, g: Poly, p: int) -> Poly:
+    return poly_divmod(f, g, p)[1]
+
+
+def monic(f: Poly, p: int) -> Poly:
+    return scale(f, pow(f[-1], -1, p), p) if f else ()
+
+
+def gcd(f: Poly, g: Poly, p: int) -> Poly:
+    """Monic gcd (gcd(0, 0) = 0)."""
+    while g:
+        f, g = g, rem(f, g, p)
+    return monic(f, p)
+
+
+def derivative(f: Poly, p: int) -> Poly:
+    return poly([i * c for i, c in enumerate(f)][1:], p)
+
+
+def powmod(f: Poly, e: int, mod: Poly, p: int) -> Poly:
+    result, base = ONE, rem(f, mod, p)
+    while e:
+        if e & 1:
+            result = rem(mul(result, base, p), mod, p)
+        base = rem(mul(base, base, p), mod, p)
+        e >>= 1
+    return rem(result, mod, p)
+
+
+# ---------- Evaluation ----------
+def evaluate(f: Poly, x: int, p: int) -> int:
+    """Horner's rule."""
+    acc = 0
+    for c in reversed(f):
+        acc = (acc * x + c) % p
+    return acc
+
+
+def evaluate_many(f: Poly, xs, p: int) -> list[int]:
+    """f at every point of `xs`: one vectorized Horner pass per coefficient."""
+    if p >= _NUMPY_MAX_P:
+        return [evaluate(f, x % p, p) for x in xs]
+    xs = np.asarray([x % p for x in xs], dtype=np.int64)
+    acc = np.zeros_like(xs)
+    for c in reversed(f):
+        acc = (acc * xs + c) % p
+    return acc.tolist()
+
+
+# ---------- Factorization ----------
+def _pth_root(f: Poly, p: int) -> Poly:
+    """g with g^p = f, for f' = 0 (in GF(p), a^p = a for every coefficient)."""
+    return f[::p]
+
+
+def squarefree(f: Poly, p: int) -> list[tuple[Poly, int]]:
+    """Monic f as [(g, k)] with f = prod g^k and every g square-free."""
+    if degree(f) < 1:
+        return []
+    d = derivative(f, p)
+    if not d:
+        return [(g, k * p) for g, k in squarefree(_pth_root(f, p), p)]
+    out = []
+    c = gcd(f, d, p)
+    w = poly_divmod(f, c, p)[0]
+    k = 1
+    while w != ONE:
+        y = gcd(w, c, p)
+        z = poly_divmod(w, y, p)[0]
+        if degree(z) > 0:
+            out.append((z, k))
+        k += 1
+        w = y
+        c = poly_divmod(c, y, p)[0]
+    if c != ONE:
+        out += [(g, j * p) for g, j in squarefree(_pth_root(c, p), p)]
+    return out
+
+
+def distinct_degree(f: Poly, p: int) -> list[tuple[Poly, int]]:
+    """Square-free monic f as [(g, d)]: g is the product of all its degree-d factors."""
+    out = []
+    h = X
+    i = 1
+    while degree(f) >= 2 * i:
+        h = powmod(h, p, f, p)
+        g = gcd(f, sub(h, X, p), p)
+        if g != ONE:
+            out.append((g, i))
+            f = poly_divmod(f, g, p)[0]
+            h = rem(h, f, p)
+        i += 1
+    if degree(f) > 0:
+        out.append((f, degree(f)))
+    return out
+
+
+def equal_degree(f: Poly, d: int, p: int, rng: random.Random) -> list[Poly]:
+    """Split a product of distinct monic irreducibles of degree d (Cantor–Zassenhaus)."""
+    n = degree(f)
+    if n <= d:
+        return [f]
+    while True:
+        a = poly([rng.randrange(p) for _ in range(n)], p)
+        if degree(a) < 1:
+            continue
+        g = gcd(a, f, p)
+        if g == ONE:
+            if p == 2:
+                t, b = a, a
+                for _ in range(d - 1):
+                    t = rem(mul(t, t, p), f, p)
+                    b = add(b, t, p)
+            else:
+                b = sub(powmod(a, (p**d - 1) // 2, f, p), ONE, p)
+            g = gcd(b, f, p)
+        if 0 < degree(g) < n:
+            return equal_degree(g, d, p, rng) + equal_degree(poly_divmod(f, g, p)[0], d, p, rng)
+
+
+@lru_cache(maxsize=FACTOR_CACHE_SIZE)
+def factor(f: Poly, p: int) -> tuple[int, tuple[tuple[Poly, int], ...]]:
+    """(leading coefficient, ((monic irreducible, multiplicity), ...)) sorted by degree, then coefficients."""
+    if not f:
+        raise ValueError("The zero polynomial has no factorization.")
+    lead = f[-1]
+    rng = random.Random(hash((f, p)))
+    factors: dict[Poly, int] = {}
+    for g, k in squarefree(monic(f, p), p):
+        for h, d in distinct_degree(g, p):
+            for irreducible in equal_degree(h, d, p, rng):
+                factors[irreducible] = factors.get(irreducible, 0) + k
+    return lead, tuple(sorted(factors.items(), key=lambda item: (len(item[0]), item[0][::-1])))
+
+
+def is_irreducible(f: Poly, p: int) -> bool:
+    if degree(f) < 1:
+        return False
+    _, factors = factor(f, p)
+    return len(factors) == 1 and factors[0][1] == 1
+
+
+# ---------- Formatting ----------
+def as_string(f: Poly) -> str:
+    if not f:
+        return "0"
+    terms = []
+    for i in range(degree(f), -1, -1):
+        c = f[i]
+        if not c:
+            continue
+        var = "" if i == 0 else "x" if i == 1 else f"x^{i}"
+        terms.append(str(c) if not var else var if c == 1 else f"{c}{var}")
+    return " + ".join(terms)
+
+
+def factorization_string(lead: int, factors: tuple[tuple[Poly, int], ...]) -> str:
+    parts = [] if lead == 1 and factors else [str(lead)]
+    for g, k in factors:
+        text = as_string(g) if len(factors) == 1 and k == 1 and lead == 1 else f"({as_string(g)})"
+        parts.append(text + (f"^{k}" if k > 1 else ""))
+    return " ".join(parts)
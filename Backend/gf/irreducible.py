@@ -0,0 +1,264 @@
+"""
+Irreducibility and primitivity tests, and searches for moduli of degree m.
+
+- Ben-Or: f of degree m is irreducible iff gcd(x^(2^i) - x, f) = 1 for
+  i = 1..m/2. Most reducible f have a small factor, so the test usually stops
+  after a few squarings (Rabin's test in tables.py always does m of them).
+- Primitivity: f irreducible and x has order 2^m - 1, i.e. x^((2^m - 1)/p) != 1
+  for every prime p | 2^m - 1. 2^m - 1 is split into cyclotomic values
+  Phi_d(2) (d | m), whose prime factors are 1 mod d, and those are factored
+  with trial division + Pollard-Brent. When that doesn't finish within the
+  budget, primitivity is reported as unknown (None).
+- Candidates of degree m are enumerated in increasing order, by kind:
+  "trinomial" x^m + x^k + 1, "pentanomial" x^m + x^a + x^b + x^c + 1, or "any".
+  `scan` tests one slice of that order and is picklable for a process pool.
+"""
+
+import math
+import random
+from functools import lru_cache
+from typing import Iterator
+
+from .bigfield import clsquare, reducer
+from .tables import _poly_gcd
+
+KINDS = ("trinomial", "pentanomial", "any")
+# Pollard-Brent iterations per composite before primitivity is given up on
+FACTOR_BUDGET = 200_000
+
+_SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47)
+
+
+# ---------- Irreducibility ----------
+def is_irreducible_ben_or(f: int) -> bool:
+    m = f.bit_length() - 1
+    if m < 1:
+        return False
+    if m == 1:
+        return True
+    # divisible by x, or by x + 1 (an even number of terms)
+    if not f & 1 or f.bit_count() % 2 == 0:
+        return False
+    reduce = reducer(m, f)
+    t = 2  # x
+    for _ in range(m // 2):
+        t = reduce(clsquare(t))
+        if _poly_gcd(f, t ^ 2) != 1:
+            return False
+    return True
+
+
+# ---------- Factoring 2^m - 1 ----------
+def _is_probable_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    for p in _SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    # deterministic below 3.3e24, a strong probable-prime test above
+    for a in _SMALL_PRIMES[:13]:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _pollard_brent(n: int, budget: int) -> int | None:
+    """A nontrivial factor of the odd composite n, or None when out of budget."""
+    rng = random.Random(n)
+    while budget > 0:
+        y, c, g, r, q = rng.randrange(1, n), rng.randrange(1, n), 1, 1, 1
+        x = ys = y
+        while g == 1 and budget > 0:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(128, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += 128
+            budget -= r
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if 1 < g < n:
+            return g
+    return None
+
+
+def _factor(n: int, d: int, primes: set[int], budget: int) -> bool:
+    """Add the prime factors of n (all 1 mod d, or dividing d) to `primes`."""
+    for p in _SMALL_PRIMES:
+        while n % p == 0:
+            primes.add(p)
+            n //= p
+    q = 2 * d + 1 if d % 2 else d + 1  # prime factors of Phi_d(2) are 1 mod 2d
+    step = q - 1
+    for _ in range(2000):
+        if q * q > n:
+            break
+        while n % q == 0:
+            primes.add(q)
+            n //= q
+        q += step
+    stack = [n] if n > 1 else []
+    while stack:
+        n = stack.pop()
+        if _is_probable_prime(n):
+            primes.add(n)
+            continue
+        factor = _pollard_brent(n, budget)
+        if factor is None:
+            return False
+        stack += [factor, n // factor]
+    return True
+
+
+def _cyclotomic_at_2(d: int) -> int:
+    """Phi_d(2) = prod over e | d of (2^e - 1)^mu(d/e)."""
+    num, den = 1, 1
+    for e in range(1, d + 1):
+        if d % e:
+            continue
+        mu = _mobius(d // e)
+        if mu == 1:
+            num *= (1 << e) - 1
+        elif mu == -1:
+            den *= (1 << e) - 1
+    return num // den
+
+
+def _mobius(n: int) -> int:
+    result, p = 1, 2
+    while p * p <= n:
+        if n % p == 0:
+            n //= p
+            if n % p == 0:
+                return 0
+            result = -result
+        p += 1
+    return -result if n > 1 else result
+
+
+@lru_cache(maxsize=1024)
+def order_factors(m: int, budget: int = FACTOR_BUDGET) -> tuple[int, ...] | None:
+    """Prime factors of 2^m - 1, or None if they can't be found within `budget`."""
+    primes: set[int] = set()
+    for d in range(2, m + 1):
+        if m % d == 0 and not _factor(_cyclotomic_at_2(d), d, primes, budget):
+            return None
+    return tuple(sorted(primes))
+
+
+def _pow_x(e: int, f: int) -> int:
+    """x^e mod f"""
+    m = f.bit_length() - 1
+    reduce = reducer(m, f)
+    acc = 1
+    for bit in format(e, "b"):
+        acc = reduce(clsquare(acc))
+        if bit == "1":
+            acc = reduce(acc << 1)
+    return acc
+
+
+def is_primitive(f: int, irreducible: bool | None = None) -> bool | None:
+    """Whether x generates GF(2)[x]/(f)^*; None when 2^m - 1 can't be factored."""
+    m = f.bit_length() - 1
+    if m == 1:
+        return f == 0b11
+    if irreducible is None:
+        irreducible = is_irreducible_ben_or(f)
+    if not irreducible:
+        return False
+    factors = order_factors(m)
+    if factors is None:
+        return None
+    order = (1 << m) - 1
+    return all(_pow_x(order // p, f) != 1 for p in factors)
+
+
+# ---------- Candidate enumeration ----------
+def outer_range(m: int, kind: str) -> range:
+    """The outer loop of `candidates`; `scan` slices work along it."""
+    if kind == "trinomial":
+        return range(1, m)  # k
+    if kind == "pentanomial":
+        return range(3, m)  # a
+    if kind == "any":
+        return range(0, 1 << (m - 1))  # the bits between x^m and 1
+    raise ValueError(f"Unknown kind {kind!r}; expected one of {', '.join(KINDS)}")
+
+
+def lower_bound(m: int, kind: str, index: int) -> int:
+    """A value <= every candidate at outer index >= `index` and > all earlier ones."""
+    top = (1 << m) | 1
+    if kind == "any":
+        return top | index << 1
+    return top | 1 << index
+
+
+def candidate_count(m: int, kind: str, index: int) -> int:
+    """Number of candidates at one outer index (before the odd-weight filter)."""
+    return (index - 1) * (index - 2) // 2 if kind == "pentanomial" else 1
+
+
+def candidates(m: int, kind: str, lo: int, hi: int) -> Iterator[int]:
+    """Degree-m candidates for outer indexes lo..hi - 1, in increasing order."""
+    top = (1 << m) | 1
+    if kind == "trinomial":
+        for k in range(lo, hi):
+            yield top | 1 << k
+    elif kind == "pentanomial":
+        for a in range(lo, hi):
+            for b in range(2, a):
+                for c in range(1, b):
+                    yield top | 1 << a | 1 << b | 1 << c
+    elif kind == "any":
+        for middle in range(lo, hi):
+            f = top | middle << 1
+            if f.bit_count() % 2:
+                yield f
+    else:
+        outer_range(m, kind)  # raises
+
+
+def scan(m: int, kind: str, lo: int, hi: int, primitive: bool = True) -> list[tuple[int, bool | None]]:
+    """(f, is_primitive) for every irreducible candidate in outer indexes lo..hi - 1."""
+    found = []
+    for f in candidates(m, kind, lo, hi):
+        if is_irreducible_ben_or(f):
+            found.append((f, is_primitive(f, True) if primitive else None))
+    return found
+
+
+def sample(
+    m: int, count: int, seed: int | None = None, max_tries: int = 20_000, primitive: bool = True
+) -> list[tuple[int, bool | None]]:
+    """Up to `count` distinct random irreducible polynomials of degree m (about 1 in m is)."""
+    rng = random.Random(seed)
+    found: dict[int, bool | None] = {}
+    for _ in range(max_tries):
+        if len(found) >= count:
+            break
+        f = (1 << m) | rng.getrandbits(m - 1) << 1 | 1
+        if f not in found and f.bit_count() % 2 and is_irreducible_ben_or(f):
+            found[f] = is_primitive(f, True) if primitive else None
+    return list(found.items())
@@ -0,0 +1,155 @@
+"""
+Picklable entry points for the compute tier (utils/compute.py).
+
+Each takes and returns plain ints/lists/tuples so it can cross the process
+boundary; the routers turn the results into response models.
+"""
+
+import numpy as np
+
+from . import aes, ec, gfp, matrix
+from .batch import batch_add, batch_inv, batch_mul, batch_pow
+from .field import GFConfig, Step, gf_inv, gf_mod, gf_mul, gf_pow
+from .irreducible import is_irreducible_ben_or, is_primitive
+from .reedsolomon import DecodeFailure, get_code
+
+
+def field_op(op: str, x: int, y: int | None, m: int, mod_poly: int, trace: bool) -> tuple[int, list[Step] | None]:
+    """One of mod(x) / mul(x, y) / pow(x, y) / inv(x); returns (value, steps)."""
+    cfg = GFConfig(m, mod_poly)
+    steps: list[Step] | None = [] if trace else None
+    if op == "mod":
+        value = gf_mod(x, cfg, steps)
+    elif op == "mul":
+        value = gf_mul(x, y, cfg, steps)
+    elif op == "pow":
+        value = gf_pow(x, y, cfg, steps)
+    elif op == "inv":
+        value = gf_inv(x, cfg, steps)
+    else:
+        raise ValueError(f"Unknown operation {op!r}")
+    return value, steps
+
+
+def classify_modulus(f: int) -> tuple[bool, bool | None]:
+    """(irreducible, primitive) for a candidate modulus f."""
+    if not is_irreducible_ben_or(f):
+        return False, False
+    return True, is_primitive(f, True)
+
+
+def batch_op(op: str, m: int, mod_poly: int, a: list[int], b: list[int] | None, n) -> list[int]:
+    if op == "add":
+        values = batch_add(a, b, m)
+    elif op == "mul":
+        values = batch_mul(a, b, m, mod_poly)
+    elif op == "inv":
+        values = batch_inv(a, m, mod_poly)
+    else:
+        values = batch_pow(a, n, m, mod_poly)
+    return values.tolist()
+
+
+def factor_poly(f: gfp.Poly, p: int) -> tuple[int, tuple[tuple[gfp.Poly, int], ...], bool]:
+    lead, factors = gfp.factor(f, p)
+    return lead, factors, gfp.is_irreducible(f, p)
+
+
+AES_BATCH_OPS = {
+    "sub_bytes": aes.sub_bytes,
+    "inv_sub_bytes": aes.inv_sub_bytes,
+    "shift_rows": lambda states, _tables: aes.shift_rows(states),
+    "inv_shift_rows": lambda states, _tables: aes.inv_shift_rows(states),
+    "mix_columns": aes.mix_columns,
+    "inv_mix_columns": aes.inv_mix_columns,
+}
+
+
+def aes_batch(op: str, blocks: bytes, key: bytes | None, table_path: str) -> bytes:
+    """Apply an AES round function (or the whole cipher) to concatenated 16-byte states."""
+    tables = aes.get_aes_tables(table_path)
+    states = np.frombuffer(blocks, dtype=np.uint8).reshape(-1, aes.BLOCK_BYTES)
+    if op in ("encrypt", "decrypt"):
+        if key is None:
+            raise ValueError("`key` is required")
+        round_keys = aes.expand_key(key, tables)
+        out = (aes.encrypt if op == "encrypt" else aes.decrypt)(states, round_keys, tables)
+    elif op in AES_BATCH_OPS:
+        out = AES_BATCH_OPS[op](states, tables)
+    else:
+        raise ValueError(f"Unknown operation {op!r}")
+    return out.tobytes()
+
+
+def matrix_op(op: str, m: int, mod_poly: int, a: list[list[int]], b: list[list[int]] | None) -> dict:
+    cfg = GFConfig(m, mod_poly)
+    if op in ("rref", "rank"):
+        reduced, pivots = matrix.rref(a, cfg)
+        return {"matrix": reduced.tolist() if op == "rref" else None, "rank": len(pivots), "pivots": pivots}
+    if op == "inverse":
+        return {"matrix": matrix.inverse(a, cfg).tolist()}
+    if b is None:
+        raise ValueError("`b` is required")
+    if op == "solve":
+        return {"matrix": matrix.solve(a, b, cfg).tolist()}
+    if op == "mul":
+        return {"matrix": matrix.matmul(a, b, cfg).tolist()}
+    raise ValueError(f"Unknown operation {op!r}")
+
+
+def rs_encode(n: int, k: int, m: int, mod_poly: int, fcr: int, messages: list[list[int]]) -> list[list[int]]:
+    return get_code(n, k, m, mod_poly, fcr).encode(messages).tolist()
+
+
+def rs_decode(
+    n: int, k: int, m: int, mod_poly: int, fcr: int, codewords: list[list[int]], trace: bool
+) -> tuple[list[list[int]], list[int], list[Step] | None]:
+    """(corrected codewords, errors fixed per word or -1, steps of the single traced word)."""
+    code = get_code(n, k, m, mod_poly, fcr)
+    if not trace:
+        corrected, errors = code.decode(codewords)
+        return corrected.tolist(), errors.tolist(), None
+    steps: list[Step] = []
+    try:
+        corrected, positions = code.decode_word(codewords[0], steps)
+    except DecodeFailure:
+        return [list(codewords[0])], [-1], steps
+    return [corrected], [len(positions)], steps
+
+
+def ec_op(
+    op: str,
+    curve: str | tuple[int, int, int, int],
+    p: tuple[int, int] | None,
+    q: tuple[int, int] | None,
+    k: int | None,
+    method: str,
+    trace: bool,
+) -> tuple[tuple[int, int] | None, list[Step] | None]:
+    """
+    add(p, q) / double(p) / mul(k, p) on a NIST curve (by name) or on
+    (m, mod_poly, a, b); p = None means the named curve's generator.
+    Returns (point or None for infinity, steps).
+    """
+    curve = ec.NIST_CURVES[curve] if isinstance(curve, str) else ec.Curve(*curve)
+    if p is None:
+        p = curve.generator
+    for point in (p, q):
+        if point is not None and not curve.contains(point):
+            raise ValueError(f"({point[0]:#x}, {point[1]:#x}) is not on the curve")
+    steps: list[Step] | None = [] if trace else None
+    if op == "add":
+        return ec.add_affine(curve, p, q, steps), steps
+    if op == "double":
+        return ec.double_affine(curve, p, steps), steps
+    if op != "mul":
+        raise ValueError(f"Unknown operation {op!r}")
+    if method == "fixed":
+        if p != curve.generator or curve.name is None:
+            raise ValueError("The fixed-base method needs a named curve's generator")
+        return ec.generator_table(curve.name).multiply(k), None
+    if method == "projective":
+        return ec.scalar_mul_ld(curve, k, p), None
+    if method == "affine":
+        return ec.scalar_mul_affine(curve, k, p, steps), steps
+    return ec.montgomery_ladder(curve, k, p, steps), steps
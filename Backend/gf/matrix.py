@@ -0,0 +1,113 @@
+"""
+Linear algebra over GF(2^m) (m <= 16): Gauss-Jordan elimination, rank,
+inverse, linear systems and products.
+
+Matrices are 2-D int64 NumPy arrays of field elements; the field is the same
+GFConfig(m, mod_poly) as everywhere else. Each elimination step is one
+vectorized update: the pivot row is scaled through the log/antilog tables,
+then (column factors) x (pivot row) is XORed into every row that needs it.
+"""
+
+import numpy as np
+
+from .batch import _np_tables
+from .field import GFConfig
+
+# Largest intermediate (rows x inner x cols) array matmul materializes at once
+_MATMUL_CHUNK = 1 << 21
+
+
+def as_matrix(values, cfg: GFConfig) -> np.ndarray:
+    matrix = np.array(values, dtype=np.int64)
+    if matrix.ndim != 2:
+        raise ValueError("Expected a 2-D matrix.")
+    if np.any(matrix < 0) or np.any(matrix >> cfg.m):
+        raise ValueError(f"Matrix entries must be elements of GF(2^{cfg.m}).")
+    return matrix
+
+
+def _mul(a: np.ndarray, b: np.ndarray, exp: np.ndarray, log: np.ndarray) -> np.ndarray:
+    """Element-wise (broadcast) product of int64 arrays."""
+    return np.where((a == 0) | (b == 0), 0, exp[log[a] + log[b]])
+
+
+def rref(values, cfg: GFConfig) -> tuple[np.ndarray, list[int]]:
+    """Reduced row echelon form and the pivot columns."""
+    exp, log, order = _np_tables(cfg.m, cfg.mod_poly)
+    r = as_matrix(values, cfg)
+    rows, cols = r.shape
+    pivots: list[int] = []
+    for col in range(cols):
+        row = len(pivots)
+        if row == rows:
+            break
+        candidates = np.flatnonzero(r[row:, col])
+        if not candidates.size:
+            continue
+        pivot = row + candidates[0]
+        if pivot != row:
+            r[[row, pivot]] = r[[pivot, row]]
+        r[row] = _mul(r[row], exp[order - log[r[row, col]]], exp, log)
+        factors = r[:, col].copy()
+        factors[row] = 0
+        targets = np.flatnonzero(factors)
+        if targets.size:
+            r[targets] ^= _mul(factors[targets, None], r[row][None, :], exp, log)
+        pivots.append(col)
+    return r, pivots
+
+
+def rank(values, cfg: GFConfig) -> int:
+    return len(rref(values, cfg)[1])
+
+
+def inverse(values, cfg: GFConfig) -> np.ndarray:
+    a = as_matrix(values, cfg)
+    n = a.shape[0]
+    if a.shape != (n, n):
+        raise ValueError("Only square matrices have an inverse.")
+    r, pivots = rref(np.hstack([a, np.eye(n, dtype=np.int64)]), cfg)
+    if pivots[:n] != list(range(n)):
+        raise ValueError("Matrix is singular.")
+    return r[:, n:]
+
+
+def solve(a_values, b_values, cfg: GFConfig) -> np.ndarray:
+    """
+    One solution x of a x = b (b a vector or a matrix of right-hand sides);
+    free variables are set to 0. Raises ValueError when there is none.
+    """
+    a = as_matrix(a_values, cfg)
+    b = np.asarray(b_values, dtype=np.int64)
+    vector = b.ndim == 1
+    b = as_matrix(b[:, None] if vector else b, cfg)
+    if b.shape[0] != a.shape[0]:
+        raise ValueError("`a` and `b` must have the same number of rows.")
+    cols = a.shape[1]
+    r, pivots = rref(np.hstack([a, b]), cfg)
+    if pivots and pivots[-1] >= cols:
+        raise ValueError("The system has no solution.")
+    x = np.zeros((cols, b.shape[1]), dtype=np.int64)
+    x[pivots] = r[: len(pivots), cols:]
+    return x[:, 0] if vector else x
+
+
+def matmul(a_values, b_values, cfg: GFConfig) -> np.ndarray:
+    exp, log, _order = _np_tables(cfg.m, cfg.mod_poly)
+    a, b = as_matrix(a_values, cfg), as_matrix(b_values, cfg)
+    if a.shape[1] != b.shape[0]:
+        raise ValueError(f"Shapes {a.shape} and {b.shape} can't be multiplied.")
+    rows, inner = a.shape
+    cols = b.shape[1]
+    out = np.zeros((rows, cols), dtype=np.int64)
+    if not inner:
+        return out
+    log_a, log_b = log[a], log[b]
+    zero_a, zero_b = a == 0, b == 0
+    step = max(1, _MATMUL_CHUNK // (inner * cols or 1))
+    for start in range(0, rows, step):
+        chunk = slice(start, start + step)
+        products = exp[log_a[chunk, :, None] + log_b[None, :, :]]
+        products[zero_a[chunk, :, None] | zero_b[None, :, :]] = 0
+        out[chunk] = np.bitwise_xor.reduce(products, axis=1)
+    return out
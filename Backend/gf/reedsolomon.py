@@ -0,0 +1,230 @@
+"""
+Reed-Solomon codes over GF(2^m) (m <= 16).
+
+RS(n, k) with n <= 2^m - 1 corrects t = (n - k) // 2 symbol errors. The
+generator polynomial has the roots alpha^fcr .. alpha^(fcr + n - k - 1), where
+alpha is the generator of the field's log/antilog tables (x itself when
+mod_poly is primitive). Codewords are systematic and written highest degree
+first: `codeword[:k]` is the message, `codeword[k:]` the parity symbols.
+
+Everything runs on whole batches of words with NumPy gathers into the
+log/antilog tables. Encoding and syndromes are products with fixed matrices
+(matrix.matmul). The words with a nonzero syndrome are then decoded in
+lockstep: Berlekamp-Massey runs its n - k iterations over all of them at once
+(per-word branches become masks), and the Chien search and Forney's formula
+evaluate the locator and evaluator polynomials at every position with a
+vectorized Horner scheme. Pass a `steps` list to `decode_word` to get each
+stage for a single word.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .batch import _np_tables
+from .field import GFConfig, Step
+from .matrix import as_matrix, matmul
+from .tables import get_tables
+
+
+class DecodeFailure(ValueError):
+    """More errors than the code can correct."""
+
+
+class ReedSolomon:
+    def __init__(self, n: int, k: int, cfg: GFConfig, fcr: int = 1):
+        self._exp, self._log, self._order = _np_tables(cfg.m, cfg.mod_poly)
+        if not 0 < k < n <= self._order:
+            raise ValueError(f"Need 0 < k < n <= {self._order} for GF(2^{cfg.m}).")
+        self.n, self.k, self.cfg, self.fcr = n, k, cfg, fcr
+        self.nsym = n - k
+        self.t = self.nsym // 2
+        tables = get_tables(cfg.m, cfg.mod_poly)
+        self._exp_list, self._log_list = tables.exp, tables.log
+        # log of alpha^-p for each power p, for the Horner evaluations
+        self._inverse_power_logs = -np.arange(n) % self._order
+
+        # g(x) = prod_j (x - alpha^(fcr + j)), highest degree first
+        g = [1]
+        for j in range(self.nsym):
+            root = self._alpha(fcr + j)
+            g = [a ^ self._scalar_mul(root, b) for a, b in zip(g + [0], [0] + g)]
+        self.generator = g
+
+        # parity rows: row i is x^(n - 1 - i) mod g(x), so parity = message . P
+        parity = np.zeros((k, self.nsym), dtype=np.int64)
+        rem = g[1:]  # x^(n-k) mod g, g being monic
+        for i in range(k - 1, -1, -1):
+            parity[i] = rem
+            # times x: shift, then fold the x^(n-k) term back in
+            rem = [r ^ self._scalar_mul(rem[0], c) for r, c in zip(rem[1:] + [0], g[1:])]
+        self._parity = parity
+
+        # syndrome matrix: S_j = sum_i c_i alpha^((fcr + j)(n - 1 - i))
+        powers = (fcr + np.arange(self.nsym))[None, :] * (n - 1 - np.arange(n))[:, None]
+        self._syndrome_matrix = self._exp[powers % self._order].astype(np.int64)
+
+    # ---------- field helpers ----------
+    def _alpha(self, power: int) -> int:
+        return self._exp_list[power % self._order]
+
+    def _scalar_mul(self, a: int, b: int) -> int:
+        if a == 0 or b == 0:
+            return 0
+        return self._exp_list[self._log_list[a] + self._log_list[b]]
+
+    def _mul(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.where((a == 0) | (b == 0), 0, self._exp[self._log[a] + self._log[b]])
+
+    def _div(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """a / b for b != 0."""
+        return np.where(a == 0, 0, self._exp[self._log[a] - self._log[b] + self._order])
+
+    def _eval_at_inverse_powers(self, polys: np.ndarray) -> np.ndarray:
+        """(W, D) polynomials (lowest degree first) -> (W, n) values at alpha^-p, by Horner."""
+        acc = np.zeros((len(polys), self.n), dtype=np.int64)
+        for j in range(polys.shape[1] - 1, -1, -1):
+            shifted = np.where(acc == 0, 0, self._exp[self._log[acc] + self._inverse_power_logs])
+            acc = shifted ^ polys[:, j, None]
+        return acc
+
+    # ---------- batch operations ----------
+    def _words(self, values, length: int) -> np.ndarray:
+        words = np.asarray(values, dtype=np.int64)
+        single = words.ndim == 1
+        words = as_matrix(words[None, :] if single else words, self.cfg)
+        if words.shape[1] != length:
+            raise ValueError(f"Expected words of {length} symbols.")
+        return words
+
+    def encode(self, messages) -> np.ndarray:
+        """(B, k) messages -> (B, n) codewords (a single message gives a single codeword)."""
+        words = self._words(messages, self.k)
+        out = np.hstack([words, matmul(words, self._parity, self.cfg)])
+        return out[0] if np.ndim(messages) == 1 else out
+
+    def syndromes(self, codewords) -> np.ndarray:
+        return matmul(self._words(codewords, self.n), self._syndrome_matrix, self.cfg)
+
+    def decode(self, codewords) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Corrected (B, n) codewords and the number of symbol errors fixed in
+        each, -1 where the word had more errors than the code can correct
+        (those words are returned unchanged).
+        """
+        words = self._words(codewords, self.n)
+        syndromes = matmul(words, self._syndrome_matrix, self.cfg)
+        corrected = words.copy()
+        errors = np.zeros(len(words), dtype=np.int64)
+        bad = np.flatnonzero(syndromes.any(axis=1))
+        if bad.size:
+            error_values, counts = self._correct(syndromes[bad], None)
+            ok = counts >= 0
+            corrected[bad[ok]] ^= error_values[ok]
+            errors[bad] = counts
+        return corrected, errors
+
+    def decode_word(self, codeword, steps: list[Step] | None = None) -> tuple[list[int], list[int]]:
+        """
+        Decode one word; returns (corrected codeword, error positions). `steps`
+        gets the syndromes, each Berlekamp-Massey iteration, the Chien roots and
+        the Forney error values. Raises DecodeFailure.
+        """
+        word = self._words(codeword, self.n)
+        syndromes = matmul(word, self._syndrome_matrix, self.cfg)
+        if steps is not None:
+            steps.append({"kind": "syndromes", "values": syndromes[0].tolist()})
+        if not syndromes.any():
+            return word[0].tolist(), []
+        error_values, counts = self._correct(syndromes, steps)
+        if counts[0] < 0:
+            raise DecodeFailure(f"More than {self.t} errors")
+        positions = np.flatnonzero(error_values[0])
+        return (word[0] ^ error_values[0]).tolist(), positions.tolist()
+
+    # ---------- decoding stages ----------
+    def _berlekamp_massey(self, syndromes: np.ndarray, steps: list[Step] | None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Error locators Lambda(x) (lowest degree first, Lambda(0) = 1) and their
+        lengths L for (W, n - k) syndromes. `shifted` holds x^m B(x), the
+        correction polynomial already multiplied by the power of x it will be
+        used with, so every word shifts it by one place per iteration.
+        """
+        count = len(syndromes)
+        width = self.nsym + 2
+        locator = np.zeros((count, width), dtype=np.int64)
+        locator[:, 0] = 1
+        shifted = np.zeros_like(locator)
+        shifted[:, 1] = 1
+        length = np.zeros(count, dtype=np.int64)
+        last = np.ones(count, dtype=np.int64)
+        for i in range(self.nsym):
+            # discrepancy: S_i + sum_{j=1..i} Lambda_j S_(i-j)
+            products = self._mul(locator[:, 1 : i + 1], syndromes[:, i - 1 :: -1] if i else syndromes[:, :0])
+            discrepancy = syndromes[:, i] ^ np.bitwise_xor.reduce(products, axis=1)
+            nonzero = discrepancy != 0
+            grow = nonzero & (2 * length <= i)
+            scale = self._div(discrepancy, last)[:, None]
+            updated = np.where(nonzero[:, None], locator ^ self._mul(scale, shifted), locator)
+            shifted = np.where(grow[:, None], locator, shifted)
+            shifted = np.roll(shifted, 1, axis=1)
+            shifted[:, 0] = 0
+            length = np.where(grow, i + 1 - length, length)
+            last = np.where(grow, discrepancy, last)
+            locator = updated
+            if steps is not None:
+                degree = int(np.flatnonzero(locator[0]).max())
+                steps.append(
+                    {
+                        "kind": "bm",
+                        "i": i,
+                        "discrepancy": int(discrepancy[0]),
+                        "length": int(length[0]),
+                        "locator": locator[0, : degree + 1].tolist(),
+                    }
+                )
+        return locator[:, : self.nsym + 1], length
+
+    def _correct(self, syndromes: np.ndarray, steps: list[Step] | None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (W, n) error patterns and error counts (-1: not correctable, with an
+        all-zero pattern) for (W, n - k) nonzero syndromes.
+        """
+        locator, length = self._berlekamp_massey(syndromes, steps)
+        ok = length <= self.t
+        locator = locator[:, : self.t + 1]  # higher terms are zero whenever ok
+
+        # Chien: error at power p (index n - 1 - p) where Lambda(alpha^-p) = 0
+        roots = self._eval_at_inverse_powers(locator) == 0
+        ok &= roots.sum(axis=1) == length
+        if steps is not None:
+            steps.append({"kind": "chien", "roots": np.flatnonzero(roots[0]).tolist()})
+
+        # Forney: e = X^(1 - fcr) Omega(X^-1) / Lambda'(X^-1) at X = alpha^p, with
+        # Omega(x) = S(x) Lambda(x) mod x^t (its degree is below L <= t) and
+        # Lambda' keeping the odd terms of Lambda (characteristic 2)
+        evaluator = np.zeros((len(syndromes), max(self.t, 1)), dtype=np.int64)
+        for j in range(self.t):
+            evaluator[:, j:] ^= self._mul(locator[:, j, None], syndromes[:, : self.t - j])
+        derivative = locator[:, 1:].copy()
+        derivative[:, 1::2] = 0
+        numerators = self._eval_at_inverse_powers(evaluator)
+        denominators = self._eval_at_inverse_powers(derivative)
+        ok &= ~np.any(roots & (denominators == 0), axis=1)
+
+        safe = np.where(denominators == 0, 1, denominators)
+        powers = np.arange(self.n)
+        values = self._div(numerators, safe)
+        values = np.where(values == 0, 0, self._exp[(self._log[values] + powers * (1 - self.fcr)) % self._order])
+        ok &= ~np.any(roots & (values == 0), axis=1)
+        values = np.where(roots & ok[:, None], values, 0)[:, ::-1]  # power p -> index n - 1 - p
+        counts = np.where(ok, length, -1)
+        if steps is not None and ok[0]:
+            for position in np.flatnonzero(values[0]).tolist():
+                steps.append({"kind": "forney", "position": position, "value": int(values[0, position])})
+        return values, counts
+
+
+@lru_cache(maxsize=16)
+def get_code(n: int, k: int, m: int, mod_poly: int, fcr: int = 1) -> ReedSolomon:
+    return ReedSolomon(n, k, GFConfig(m, mod_poly), fcr)
@@ -0,0 +1,110 @@
+"""
+Log/antilog tables for small fields.
+
+For m <= MAX_TABLE_M every nonzero element is g^k for a generator g, so
+a*b = exp[log a + log b] and a^-1 = exp[order - log a]: two lookups instead of
+an m-step shift-and-add plus reduction. Tables are built once per
+(m, mod_poly) and kept in an LRU cache (a GF(2^16) pair is ~1 MB of lists).
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .bigfield import clsquare, reducer
+
+MAX_TABLE_M = 16
+TABLE_CACHE_SIZE = 32
+
+
+@dataclass(frozen=True)
+class FieldTables:
+    m: int
+    mod_poly: int
+    generator: int
+    order: int  # 2^m - 1
+    exp: list[int]  # exp[k] = g^k, doubled so exp[log a + log b] needs no `% order`
+    log: list[int]  # log[a] for a != 0; log[0] is unused
+
+
+def _mul_reduce(a: int, b: int, m: int, mod_poly: int) -> int:
+    prod = 0
+    while b:
+        if b & 1:
+            prod ^= a
+        b >>= 1
+        a <<= 1
+        if a >> m & 1:
+            a ^= mod_poly
+    return prod
+
+
+def _pow_reduce(a: int, e: int, m: int, mod_poly: int) -> int:
+    acc = 1
+    while e:
+        if e & 1:
+            acc = _mul_reduce(acc, a, m, mod_poly)
+        a = _mul_reduce(a, a, m, mod_poly)
+        e >>= 1
+    return acc
+
+
+def _prime_factors(n: int) -> list[int]:
+    factors, p = [], 2
+    while p * p <= n:
+        if n % p == 0:
+            factors.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def _poly_gcd(a: int, b: int) -> int:
+    while b:
+        while a and a.bit_length() >= b.bit_length():
+            a ^= b << (a.bit_length() - b.bit_length())
+        a, b = b, a
+    return a
+
+
+def is_irreducible(mod_poly: int, m: int) -> bool:
+    """Rabin's test: x^(2^m) = x mod f, and gcd(x^(2^(m/p)) - x, f) = 1 for primes p | m."""
+    if mod_poly.bit_length() - 1 != m or m < 1:
+        return False
+    if m == 1:
+        return True
+    x = 2
+    reduce = reducer(m, mod_poly)
+    frob = [x]  # frob[k] = x^(2^k) mod f
+    for _ in range(m):
+        frob.append(reduce(clsquare(frob[-1])))
+    if frob[m] != x:
+        return False
+    return all(_poly_gcd(mod_poly, frob[m // p] ^ x) == 1 for p in _prime_factors(m))
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def get_tables(m: int, mod_poly: int) -> FieldTables | None:
+    """
+    Tables for GF(2^m) mod `mod_poly`, or None when the field is too large or
+    the modulus is not irreducible of degree m (callers then use shift-and-add).
+    """
+    if not 1 <= m <= MAX_TABLE_M or not is_irreducible(mod_poly, m):
+        return None
+    order = (1 << m) - 1
+    factors = _prime_factors(order)
+    generator = 1
+    for g in range(2, 1 << m):
+        if all(_pow_reduce(g, order // p, m, mod_poly) != 1 for p in factors):
+            generator = g
+            break
+    exp = [1] * order
+    log = [0] * (order + 1)
+    x = 1
+    for k in range(order):
+        exp[k] = x
+        log[x] = k
+        x = _mul_reduce(x, generator, m, mod_poly)
+    return FieldTables(m, mod_poly, generator, order, exp + exp, log)
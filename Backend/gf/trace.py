@@ -0,0 +1,61 @@
+"""
+Streaming step traces.
+
+`iter_trace` runs one traced operation as a generator of steps, so a trace
+with hundreds of thousands of steps never has to exist as a list. `summarize`
+thins it for clients that only want some of it: one kind of step
+(`kinds={"reduce"}`) and/or every k-th step. The step records are the same as
+in the list-based API (and the TS `Step` type).
+"""
+
+from collections.abc import Generator, Iterable
+
+from .field import GFConfig, Step, StepGen, iter_inv, iter_mod, iter_mul, iter_pow
+
+STEP_KINDS = ("mul", "reduce", "mod", "exp", "egcd")
+TRACE_OPS = ("mod", "mul", "pow", "inv")
+
+
+class TraceTooLong(ValueError):
+    pass
+
+
+def iter_trace(op: str, x: int, y: int | None, cfg: GFConfig) -> StepGen:
+    if op == "mod":
+        return iter_mod(x, cfg)
+    if op == "mul":
+        return iter_mul(x, y, cfg)
+    if op == "pow":
+        return iter_pow(x, y, cfg)
+    if op == "inv":
+        return iter_inv(x, cfg)
+    raise ValueError(f"Unknown operation {op!r}")
+
+
+def summarize(
+    steps: StepGen,
+    every: int = 1,
+    kinds: Iterable[str] | None = None,
+    max_steps: int | None = None,
+) -> Generator[tuple[int, Step], None, tuple[int, int]]:
+    """
+    Yield `(index, step)` for every `every`-th step whose kind is in `kinds`
+    (all kinds when None); `index` is the step's position in the full trace.
+    Returns `(value, total number of steps)`. Raises TraceTooLong once more
+    than `max_steps` steps have been computed.
+    """
+    wanted = None if kinds is None else frozenset(kinds)
+    index = matched = 0
+    while True:
+        try:
+            step = next(steps)
+        except StopIteration as stop:
+            return stop.value, index
+        if max_steps is not None and index >= max_steps:
+            steps.close()
+            raise TraceTooLong(f"Trace is longer than {max_steps} steps")
+        if wanted is None or step["kind"] in wanted:
+            if matched % every == 0:
+                yield index, step
+            matched += 1
+        index += 1
@@ -10,34 +10,55 @@ if __package__ is None or __package__ == "":
     sys.path.append(str(Path(__file__).resolve().parent.parent))
     __package__ = "Backend"
 
-from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
+import asyncio
+import hmac
+import logging
+from contextlib import asynccontextmanager
+
+import anyio
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from .core import metrics
 from .core.config import settings
 from .core.csrf import csrf_protect
+from .core.logs import configure_logging
 from .core.ratelimit import rate_limit
 from .core.security import hash_password, password_policy_ok
 from .database import Base, SessionLocal, engine
+from .middleware.access_log import AccessLogMiddleware
+from .middleware.metrics import MetricsMiddleware
+from .middleware.profiling import ProfilingMiddleware
 from .middleware.security_headers import SecurityHeadersMiddleware
 from .routers import (
     admin,
     assignment,
     auth,
     classrooms,
+    files,
+    gf,
     materials,
     instructor_requests,
     me,
     mfa,
     quiz,
+    resumable,
     submission,
 )
 from .models import User, UserRole
+from .storage.resumable import purge_expired_uploads
+from .utils import compute, previews, slowqueries
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Database schema + seed admin
 # ---------------------------------------------------------------------------
 Base.metadata.create_all(bind=engine)
+metrics.instrument_engine(engine)
+slowqueries.instrument_engine(engine)
 
 
 def ensure_seed_admin() -> None:
@@ -49,7 +70,7 @@ def ensure_seed_admin() -> None:
         return
 
     if not password_policy_ok(password):
-        print("[WARN] Seed admin not created: ADMIN_PASSWORD fails password policy")
+        logger.warning("Seed admin not created: ADMIN_PASSWORD fails password policy")
         return
 
     db = SessionLocal()
@@ -77,13 +98,60 @@ def ensure_seed_admin() -> None:
         )
         db.add(admin_user)
         db.commit()
-        print(f"[INFO] Seed admin created: {email}")
+        logger.info("Seed admin created: %s", email)
     finally:
         db.close()
 
 
 ensure_seed_admin()
 
+
+def ensure_schema_upgrades() -> None:
+    """Columns added after the first release (create_all doesn't alter tables)."""
+    db = SessionLocal()
+    try:
+        assignment.ensure_assignment_columns(db)
+    finally:
+        db.close()
+
+
+ensure_schema_upgrades()
+
+
+# ---------------------------------------------------------------------------
+# Background housekeeping
+# ---------------------------------------------------------------------------
+def _purge_resumable_uploads() -> None:
+    db = SessionLocal()
+    try:
+        removed = purge_expired_uploads(db)
+        if removed:
+            logger.info("Removed %d expired resumable upload(s)", removed)
+    finally:
+        db.close()
+
+
+async def _housekeeping_loop() -> None:
+    while True:
+        try:
+            await anyio.to_thread.run_sync(_purge_resumable_uploads)
+        except Exception as exc:  # keep the loop alive; next run may succeed
+            logger.warning("Resumable upload sweep failed: %r", exc, exc_info=True)
+        await asyncio.sleep(settings.RESUMABLE_SWEEP_MINUTES * 60)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    previews.check_dependencies()
+    task = asyncio.create_task(_housekeeping_loop())
+    try:
+        yield
+    finally:
+        task.cancel()
+        compute.shutdown()
+        previews.shutdown()
+        metrics.mark_worker_dead()
+
 # ---------------------------------------------------------------------------
 # FastAPI app (docs explicitly enabled)
 # ---------------------------------------------------------------------------
@@ -92,6 +160,7 @@ app = FastAPI(
     docs_url="/docs",             # Swagger UI
     redoc_url=None,               # disable ReDoc (optional)
     openapi_url="/openapi.json",  # JSON schema
+    lifespan=lifespan,
 )
 
 # ---------------------------------------------------------------------------
@@ -112,24 +181,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # resumable uploads report progress in headers; GF table downloads describe their layout
+    expose_headers=[
+        "Location",
+        "Upload-Offset",
+        "Upload-Length",
+        "Upload-Expires",
+        "X-GF-Dtype",
+        "X-GF-Shape",
+    ],
 )
 
 # Security headers middleware (CSP etc.)
 app.add_middleware(SecurityHeadersMiddleware)
 
 # ---------------------------------------------------------------------------
-# Static files (uploads)
+# Uploaded files
 # ---------------------------------------------------------------------------
 # Make sure upload dir exists (important in Docker)
 Path(settings.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
+# /uploads/... is access-checked (or HMAC-signed) and handed to nginx via
+# X-Accel-Redirect when FILES_ACCEL_REDIRECT is on; see routers/files.py.
+app.include_router(files.uploads_router)
 
 # ---------------------------------------------------------------------------
 # Rate limiting middleware
 # ---------------------------------------------------------------------------
 @app.middleware("http")
 async def _rate_limit(request: Request, call_next):
-    await rate_limit(request)
+    try:
+        await rate_limit(request)
+    except HTTPException as exc:  # raised outside the routers, so no exception handler turns it into a 429
+        return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
     return await call_next(request)
 
 # ---------------------------------------------------------------------------
@@ -183,6 +266,14 @@ async def _csrf(request: Request, call_next):
 
     return await call_next(request)
 
+# ---------------------------------------------------------------------------
+# Request profiling, metrics and the access log (outermost, so rate-limited and
+# CSRF-rejected requests count too; the access log sets the request context)
+# ---------------------------------------------------------------------------
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(AccessLogMiddleware)
+
 # ---------------------------------------------------------------------------
 # Routers  (ALL under /api)
 # ---------------------------------------------------------------------------
@@ -195,7 +286,10 @@ app.include_router(assignment.router, prefix="/api")
 app.include_router(materials.router, prefix="/api")
 app.include_router(quiz.router, prefix="/api")
 app.include_router(submission.router, prefix="/api")
+app.include_router(files.router, prefix="/api")
+app.include_router(resumable.router, prefix="/api")
 app.include_router(admin.router, prefix="/api")
+app.include_router(gf.router, prefix="/api")
 
 # ---------------------------------------------------------------------------
 # Health / root
@@ -205,6 +299,17 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics(request: Request):
+    """Prometheus scrape target; see core/metrics.py."""
+    token = settings.METRICS_TOKEN
+    if token and not hmac.compare_digest(
+        request.headers.get("authorization", "").encode(), f"Bearer {token}".encode()
+    ):
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE_LATEST)
+
+
 @app.get("/")
 def read_root():
     return {"status": "ok", "docs": "/docs"}
@@ -0,0 +1,81 @@
+import logging
+import random
+import re
+import time
+import uuid
+
+from ..core.config import settings
+from ..core.context import request_id, request_scope
+
+logger = logging.getLogger("polylab.access")
+
+_HEADER = b"x-request-id"
+# an upstream id (nginx $request_id, a load balancer's) is reused when it looks sane
+_VALID_ID = re.compile(r"[A-Za-z0-9._-]{8,64}")
+
+
+def _incoming_id(scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == _HEADER:
+            candidate = value.decode("latin-1")
+            return candidate if _VALID_ID.fullmatch(candidate) else None
+    return None
+
+
+class AccessLogMiddleware:
+    """
+    Outermost middleware: gives each request an id (X-Request-ID, echoed in
+    the response), publishes it and the scope as the request context
+    (core/context.py), and writes one access-log record per request with
+    method, path, status and latency; core/logs.py adds the route template
+    and user id like it does for every record logged during a request.
+
+    Successful requests faster than ACCESS_LOG_SLOW_MS are sampled at
+    ACCESS_LOG_SAMPLE_RATE; 4xx/5xx and slow ones are always logged.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rid = _incoming_id(scope) or uuid.uuid4().hex
+        scope.setdefault("state", {})  # shared with request.state, where require_user puts the user id
+        status = 500  # the app raised before responding
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (_HEADER, rid.encode())]}
+            await send(message)
+
+        scope_token, id_token = request_scope.set(scope), request_id.set(rid)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            if settings.ACCESS_LOG_ENABLED and (
+                status >= 400
+                or ms >= settings.ACCESS_LOG_SLOW_MS
+                or random.random() < settings.ACCESS_LOG_SAMPLE_RATE
+            ):
+                logger.info(
+                    "%s %s %d",
+                    scope["method"],
+                    scope["path"],
+                    status,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status,
+                        "latency_ms": round(ms, 3),
+                        "client": scope["client"][0] if scope.get("client") else None,
+                    },
+                )
+            request_id.reset(id_token)
+            request_scope.reset(scope_token)
@@ -0,0 +1,36 @@
+import time
+
+from ..core.context import route_template
+from ..core.metrics import HTTP_IN_FLIGHT, observe_request
+
+
+class MetricsMiddleware:
+    """
+    Times every HTTP request and counts it by method, route template and
+    status. Plain ASGI rather than BaseHTTPMiddleware: it only watches the
+    `http.response.start` message and never wraps the response body.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # the app raised before responding
+
+        async def send_and_watch(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_and_watch)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            observe_request(scope["method"], route_template(scope), status, time.perf_counter() - started)
@@ -0,0 +1,73 @@
+import logging
+import random
+import threading
+from urllib.parse import parse_qs
+
+import anyio
+
+from ..core.config import settings
+from ..core.context import route_template
+from ..utils.profiling import TOKEN_HEADER, TOKEN_QUERY_PARAM, RequestProfile, sampler, save_report, verify_token
+
+logger = logging.getLogger(__name__)
+
+_HEADER = TOKEN_HEADER.encode()
+_QUERY_MARK = f"{TOKEN_QUERY_PARAM}=".encode()
+
+
+def _token(scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == _HEADER:
+            return value.decode("latin-1")
+    query = scope.get("query_string", b"")
+    if _QUERY_MARK in query:
+        values = parse_qs(query.decode("latin-1")).get(TOKEN_QUERY_PARAM)
+        return values[0] if values else None
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests that carry an admin's profiling token, plus a random
+    PROFILE_SAMPLE_RATE fraction of all requests (utils/profiling.py), and
+    names the saved report in an `X-Profile-Id` response header. Requests
+    that are neither cost a scan of the header list.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _token(scope)
+        admin_id = verify_token(token) if token else None
+        if admin_id is not None:
+            trigger = "token"
+        elif settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE:
+            trigger = "sampled"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope, threading.get_ident(), trigger, admin_id)
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile.id.encode())]}
+            await send(message)
+
+        sampler.start(profile)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop(profile)
+            report = profile.report(status, route_template(scope))
+            try:
+                await anyio.to_thread.run_sync(save_report, report)
+            except OSError as exc:
+                logger.warning("Could not save request profile %s: %r", profile.id, exc)
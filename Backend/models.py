@@ -8,6 +8,7 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -133,12 +134,33 @@ class Assignment(Base):
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     attachment_url = Column(String, nullable=True)
+    template_id = Column(String, nullable=True)  # POLY_TEMPLATES id, enables auto-grading
     classroom_id = Column(Integer, ForeignKey("classrooms.id"), nullable=False)
     due_date = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     classroom = relationship("Classroom", back_populates="assignments")
     submissions = relationship("Submission", back_populates="assignment")
+    variants = relationship("ExerciseVariant", cascade="all, delete-orphan")
+
+
+class ExerciseVariant(Base):
+    """One student's instance of a parameterized template (utils/exercises.py)."""
+
+    __tablename__ = "exercise_variants"
+
+    id = Column(Integer, primary_key=True)
+    assignment_id = Column(Integer, ForeignKey("assignments.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    template_id = Column(String, nullable=False)
+    seed = Column(Integer, nullable=False)
+    description = Column(Text, nullable=False)
+    answer = Column(Text, nullable=False)  # AnswerKey JSON
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("assignment_id", "user_id", name="uq_exercise_variants_assignment_user"),
+    )
 
 
 class Submission(Base):
@@ -167,3 +189,61 @@ class Material(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     classroom = relationship("Classroom")
+
+
+class ResumableUpload(Base):
+    """An upload in progress; the bytes received so far live in resumable_upload_dir/<id>."""
+
+    __tablename__ = "resumable_uploads"
+
+    id = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    target = Column(String, nullable=False)  # "submission" | "material"
+    target_id = Column(Integer, nullable=False)
+    filename = Column(String, nullable=False)
+    content_type = Column(String, nullable=True)
+    length = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class StorageOrphan(Base):
+    """Upload not referenced by any row, tracked by the storage GC (storage/gc.py)."""
+
+    __tablename__ = "storage_orphans"
+
+    key = Column(String, primary_key=True)
+    size = Column(Integer, nullable=False, default=0)
+    first_seen_at = Column(DateTime, nullable=False)
+    quarantined_at = Column(DateTime, nullable=True, index=True)
+
+
+class GFModulus(Base):
+    """Irreducible polynomial found by the modulus search (utils/moduli.py)."""
+
+    __tablename__ = "gf_moduli"
+
+    id = Column(Integer, primary_key=True)
+    m = Column(Integer, nullable=False)
+    # lowercase hex, zero-padded to the width of degree m: string order is numeric order
+    poly = Column(String, nullable=False)
+    weight = Column(Integer, nullable=False)  # number of terms (3 = trinomial, 5 = pentanomial)
+    primitive = Column(Boolean, nullable=True)  # None: 2^m - 1 couldn't be factored
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("m", "poly", name="uq_gf_moduli_m_poly"),
+        Index("ix_gf_moduli_m_weight_poly", "m", "weight", "poly"),
+    )
+
+
+class GFModulusScan(Base):
+    """How far the candidates of one (m, kind) have been searched, in gf/irreducible.py order."""
+
+    __tablename__ = "gf_modulus_scans"
+
+    m = Column(Integer, primary_key=True)
+    kind = Column(String, primary_key=True)  # "trinomial" | "pentanomial" | "any"
+    next_index = Column(String, nullable=False, default="0")  # decimal; may exceed 64 bits
+    exhausted = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,10 +1,25 @@
+from datetime import datetime, timezone
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 
 from ..database import get_db
 from ..deps import require_admin
 from ..models import User, UserRole
-from ..schemas import BasicOK, UserOut
+from ..schemas import (
+    BasicOK,
+    ProfileOut,
+    ProfileSummary,
+    ProfileTokenOut,
+    SlowQueryOut,
+    StorageGCReport,
+    UserOut,
+)
+from ..storage.gc import collect_garbage
+from ..utils import compute, profiling
+from ..utils.resultcache import get_result_cache
+from ..utils.slowqueries import slow_query_log
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -29,3 +44,91 @@ def update_role(
     db.commit()
     return {"ok": True}
 
+
+@router.post("/storage/gc", response_model=StorageGCReport)
+def run_storage_gc(
+    dry_run: bool = True,
+    admin=Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    POST /admin/storage/gc?dry_run=false
+    One mark-and-sweep pass over uploaded files; see storage/gc.py for the stages.
+    """
+    return collect_garbage(db, dry_run=dry_run)
+
+
+@router.get("/compute")
+def compute_metrics(admin=Depends(require_admin)):
+    """
+    GET /admin/compute — math worker pool (queue depth, rejections, execution
+    times) and the GF result cache (size, hit rate).
+    """
+    return {**compute.metrics(), "result_cache": get_result_cache().metrics()}
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryOut])
+def list_slow_queries(admin=Depends(require_admin)):
+    """
+    GET /admin/slow-queries — statements slower than SLOW_QUERY_MS seen by
+    this worker, one entry per fingerprint, slowest in total first.
+    """
+    return slow_query_log.entries()
+
+
+@router.delete("/slow-queries", response_model=BasicOK)
+def clear_slow_queries(admin=Depends(require_admin)):
+    slow_query_log.clear()
+    return {"ok": True}
+
+
+@router.post("/profiles/token", response_model=ProfileTokenOut)
+def create_profile_token(admin=Depends(require_admin)):
+    """
+    POST /admin/profiles/token — a signed token that profiles every request
+    carrying it (X-Profile-Token header or ?_profile=) until it expires. The
+    response of a profiled request names its report in X-Profile-Id.
+    """
+    token, expires = profiling.make_token(admin.id)
+    return {
+        "token": token,
+        "expires_at": datetime.fromtimestamp(expires, timezone.utc),
+        "header": "X-Profile-Token",
+        "query_param": profiling.TOKEN_QUERY_PARAM,
+    }
+
+
+@router.get("/profiles", response_model=list[ProfileSummary])
+def list_profiles(admin=Depends(require_admin)):
+    return profiling.list_reports()
+
+
+@router.delete("/profiles", response_model=BasicOK)
+def delete_profiles(admin=Depends(require_admin)):
+    profiling.delete_reports()
+    return {"ok": True}
+
+
+def _load_profile(profile_id: str) -> dict:
+    report = profiling.load_report(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return report
+
+
+@router.get("/profiles/{profile_id}", response_model=ProfileOut)
+def get_profile(profile_id: str, admin=Depends(require_admin)):
+    """Hottest functions by self/total samples, plus the folded stacks."""
+    return _load_profile(profile_id)
+
+
+@router.get("/profiles/{profile_id}/folded", response_class=PlainTextResponse)
+def get_profile_folded(profile_id: str, admin=Depends(require_admin)):
+    """
+    GET /admin/profiles/{id}/folded — `frame;frame;frame count` lines; open in
+    speedscope or pipe through flamegraph.pl / inferno for a flame graph.
+    """
+    return PlainTextResponse(
+        _load_profile(profile_id)["folded"],
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'},
+    )
@@ -1,13 +1,25 @@
-from pathlib import Path
+import csv
+import io
+from functools import partial
+from pathlib import PurePosixPath
+from urllib.parse import unquote, urlsplit
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy import text
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, text
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
+from ..core.metrics import record_upload
 from ..database import get_db
+from ..gf import as_poly_string
 from ..deps import get_current_user, require_instructor
-from ..core.config import settings
+from ..storage import get_storage, public_url
+from ..storage.direct import begin_direct_upload, finish_direct_upload, unique_folder
+from ..utils.autograde import grade_pending
+from ..utils.exercises import EXERCISE_TEMPLATES, AnswerKey, get_variant, is_parameterized, publish
+from ..utils.uploads import versioned_key
+from ..utils.zipstream import ZipEntry, stream_zip
 
 router = APIRouter(prefix="/assignments", tags=["Assignments"])
 
@@ -32,6 +44,9 @@ POLY_TEMPLATES: list[schemas.AssignmentTemplate] = [
         title="Evaluate Polynomial in GF(5)",
         description="Evaluate f(x) = 3x³ + 4x² + 2x + 1 at x = 7 (mod 5). Show intermediate steps.",
     ),
+] + [
+    schemas.AssignmentTemplate(id=t.id, title=t.title, description=t.text, parameterized=True)
+    for t in EXERCISE_TEMPLATES.values()
 ]
 
 
@@ -66,27 +81,28 @@ def _ensure_membership(db: Session, classroom_id: int, user: models.User):
         raise HTTPException(status_code=403, detail="You are not enrolled in this class")
 
 
+def _safe_name(filename: str | None) -> str:
+    return "".join(
+        ch if ch.isalnum() or ch in ("-", "_", ".", " ") else "_"
+        for ch in (filename or "assignment.pdf")
+    )
+
+
 def _store_attachment(assignment_id: int, filename: str, content: bytes) -> str:
     """
-    Store the attachment on disk and return a public URL.
+    Store the attachment in the upload storage and return a public URL.
 
-    Files are served from the /uploads static mount in main.py, so we build:
-      https://polylab.onrender.com/uploads/assignments/assignment_{id}/filename
+    Files are served by the /uploads route in routers/files.py. The content
+    digest is part of the key so each upload gets a new, cacheable URL:
+      https://polylab.onrender.com/uploads/assignments/assignment_{id}/{digest}/filename
     using BACKEND_BASE_URL.
     """
-    base_dir = Path(settings.UPLOAD_DIR) / "assignments" / f"assignment_{assignment_id}"
-    base_dir.mkdir(parents=True, exist_ok=True)
-
-    safe_name = "".join(
-        ch if ch.isalnum() or ch in ("-", "_", ".", " ") else "_"
-        for ch in (filename or "assignment.pdf")
-    )
-    dest = base_dir / safe_name
-    dest.write_bytes(content)
-
-    # Static path under the /uploads mount
-    static_rel = f"/uploads/assignments/assignment_{assignment_id}/{safe_name}"
-    return f"{settings.backend_base_public}{static_rel}"
+    safe_name = _safe_name(filename)
+    key = versioned_key(f"assignments/assignment_{assignment_id}", safe_name, content)
+    storage = get_storage()
+    if not storage.exists(key):
+        storage.save(key, content)
+    return public_url(key)
 
 
 def _ensure_attachment_column(db: Session) -> None:
@@ -98,6 +114,32 @@ def _ensure_attachment_column(db: Session) -> None:
         db.commit()
 
 
+def _ensure_template_column(db: Session) -> None:
+    """Add template_id on existing DBs and tag assignments created from a template."""
+    result = db.execute(text("PRAGMA table_info(assignments)")).fetchall()
+    has_col = any(row[1] == "template_id" for row in result)
+    if not has_col:
+        db.execute(text("ALTER TABLE assignments ADD COLUMN template_id TEXT"))
+        # Older assignments only kept the template's title
+        for template in POLY_TEMPLATES:
+            db.execute(
+                text("UPDATE assignments SET template_id = :id WHERE title = :title"),
+                {"id": template.id, "title": template.title},
+            )
+        db.commit()
+
+
+def ensure_assignment_columns(db: Session) -> None:
+    """Run at startup so every route can load Assignment rows on older DBs."""
+    _ensure_attachment_column(db)
+    _ensure_template_column(db)
+
+
+def _check_template(template_id: str | None) -> None:
+    if template_id is not None and template_id not in {t.id for t in POLY_TEMPLATES}:
+        raise HTTPException(status_code=400, detail="Unknown assignment template")
+
+
 @router.get("/classroom/{classroom_id}", response_model=list[schemas.AssignmentOut])
 def list_assignments_for_classroom(
     classroom_id: int,
@@ -133,10 +175,13 @@ async def create_assignment(
     if not classroom:
         raise HTTPException(status_code=404, detail="Classroom not found")
     _ensure_can_manage(classroom, user)
+    _check_template(payload.template_id)
     assignment = models.Assignment(**payload.dict())
     db.add(assignment)
     db.commit()
     db.refresh(assignment)
+    if is_parameterized(assignment.template_id):
+        publish(db, assignment)
     return assignment
 
 
@@ -155,6 +200,7 @@ async def upload_assignment_attachment(
     _ensure_can_manage(assignment.classroom, user)
 
     content = await file.read()
+    record_upload("assignment", len(content))
     attachment_url = _store_attachment(
         assignment_id,
         file.filename or "assignment.pdf",
@@ -167,6 +213,210 @@ async def upload_assignment_attachment(
     return assignment
 
 
+@router.post(
+    "/{assignment_id}/attachment-url",
+    response_model=schemas.DirectUploadOut,
+)
+def create_attachment_upload_url(
+    assignment_id: int,
+    payload: schemas.DirectUploadIn,
+    db: Session = Depends(get_db),
+    user=Depends(require_instructor),
+):
+    """
+    Presigned PUT for large attachments (object storage only).
+    Follow up with POST /assignments/{assignment_id}/attachment-complete.
+    """
+    assignment = _get_assignment(db, assignment_id)
+    _ensure_can_manage(assignment.classroom, user)
+    key = (
+        f"assignments/assignment_{assignment_id}/{unique_folder()}/"
+        f"{_safe_name(payload.filename)}"
+    )
+    return begin_direct_upload(key, payload.content_type)
+
+
+@router.post(
+    "/{assignment_id}/attachment-complete",
+    response_model=schemas.AssignmentOut,
+)
+def complete_attachment_upload(
+    assignment_id: int,
+    payload: schemas.DirectUploadComplete,
+    db: Session = Depends(get_db),
+    user=Depends(require_instructor),
+):
+    _ensure_attachment_column(db)
+    assignment = _get_assignment(db, assignment_id)
+    _ensure_can_manage(assignment.classroom, user)
+    key = finish_direct_upload(payload.key, f"assignments/assignment_{assignment_id}/")
+    assignment.attachment_url = public_url(key)
+    db.add(assignment)
+    db.commit()
+    db.refresh(assignment)
+    return assignment
+
+
+@router.get("/{assignment_id}/submissions.zip")
+def download_submissions_zip(
+    assignment_id: int,
+    db: Session = Depends(get_db),
+    user=Depends(require_instructor),
+):
+    """
+    GET /assignments/{assignment_id}/submissions.zip
+    Latest uploaded file of every student, named by email, plus manifest.csv.
+    The archive is streamed as it is built; nothing is staged on disk.
+    """
+    assignment = _get_assignment(db, assignment_id)
+    _ensure_can_manage(assignment.classroom, user)
+
+    # One query: latest submission with a file per student
+    ranked = (
+        db.query(
+            models.Submission.id.label("submission_id"),
+            models.Submission.file_url.label("file_url"),
+            models.Submission.submitted_at.label("submitted_at"),
+            models.Submission.grade.label("grade"),
+            models.User.email.label("email"),
+            func.row_number()
+            .over(
+                partition_by=models.Submission.user_id,
+                order_by=(models.Submission.submitted_at.desc(), models.Submission.id.desc()),
+            )
+            .label("rank"),
+        )
+        .join(models.User, models.User.id == models.Submission.user_id)
+        .filter(
+            models.Submission.assignment_id == assignment_id,
+            models.Submission.file_url.isnot(None),
+        )
+        .subquery()
+    )
+    manifest = (
+        db.query(ranked)
+        .filter(ranked.c.rank == 1)
+        .order_by(ranked.c.email)
+        .all()
+    )
+
+    storage = get_storage()
+    entries: list[ZipEntry] = []
+    csv_buf = io.StringIO()
+    writer = csv.writer(csv_buf)
+    writer.writerow(["email", "submission_id", "submitted_at", "grade", "file"])
+    for row in manifest:
+        path = unquote(urlsplit(row.file_url).path)
+        if not path.startswith("/uploads/"):
+            continue
+        key = path[len("/uploads/"):]
+        try:
+            size = storage.size(key)
+        except FileNotFoundError:
+            writer.writerow([row.email, row.submission_id, row.submitted_at, row.grade, "MISSING"])
+            continue
+        name = f"{row.email}{PurePosixPath(key).suffix.lower()}"
+        entries.append(
+            ZipEntry(
+                name=name,
+                open=partial(storage.open, key),
+                size=size,
+                modified=row.submitted_at,
+            )
+        )
+        writer.writerow([row.email, row.submission_id, row.submitted_at, row.grade, name])
+
+    manifest_csv = csv_buf.getvalue().encode()
+    entries.append(ZipEntry(name="manifest.csv", open=partial(io.BytesIO, manifest_csv)))
+
+    filename = f"assignment_{assignment_id}_submissions.zip"
+    return StreamingResponse(
+        stream_zip(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/{assignment_id}/autograde", response_model=schemas.AutoGradeOut)
+def autograde_assignment(
+    assignment_id: int,
+    db: Session = Depends(get_db),
+    user=Depends(require_instructor),
+):
+    """
+    POST /assignments/{assignment_id}/autograde
+    Grade all ungraded submissions of a template-based assignment in one pass.
+    Answers that can't be parsed are left for manual grading (`skipped`).
+    """
+    assignment = _get_assignment(db, assignment_id)
+    _ensure_can_manage(assignment.classroom, user)
+    if not assignment.template_id:
+        raise HTTPException(
+            status_code=400, detail="Only assignments created from a template can be auto-graded"
+        )
+    graded, skipped = grade_pending(db, assignment)
+    return {"graded": graded, "skipped": skipped}
+
+
+def _answer_text(key: AnswerKey) -> str:
+    if key.irreducible is not None:
+        return "irreducible" if key.irreducible else "reducible"
+    if key.value is not None:
+        return str(key.value)
+    return "; ".join(as_poly_string(p) for p in key.polys)
+
+
+@router.get("/{assignment_id}/exercise", response_model=schemas.ExerciseOut)
+def get_my_exercise(
+    assignment_id: int,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    GET /assignments/{assignment_id}/exercise
+    The caller's own variant of a parameterized assignment (generated on the
+    spot for students who joined after it was published).
+    """
+    assignment = _get_assignment(db, assignment_id)
+    _ensure_membership(db, assignment.classroom_id, user)
+    if not is_parameterized(assignment.template_id):
+        raise HTTPException(status_code=400, detail="This assignment is the same for everyone")
+    variant = get_variant(db, assignment, user.id)
+    return {
+        "assignment_id": assignment.id,
+        "template_id": variant.template_id,
+        "description": variant.description,
+    }
+
+
+@router.get("/{assignment_id}/variants", response_model=list[schemas.ExerciseVariantOut])
+def list_exercise_variants(
+    assignment_id: int,
+    db: Session = Depends(get_db),
+    user=Depends(require_instructor),
+):
+    """GET /assignments/{assignment_id}/variants — every student's exercise and answer key."""
+    assignment = _get_assignment(db, assignment_id)
+    _ensure_can_manage(assignment.classroom, user)
+    variant = models.ExerciseVariant
+    rows = (
+        db.query(variant.user_id, models.User.email, variant.description, variant.answer)
+        .join(models.User, models.User.id == variant.user_id)
+        .filter(variant.assignment_id == assignment_id)
+        .order_by(models.User.email)
+        .all()
+    )
+    return [
+        {
+            "user_id": user_id,
+            "email": email,
+            "description": description,
+            "answer": _answer_text(AnswerKey.from_json(answer)),
+        }
+        for user_id, email, description, answer in rows
+    ]
+
+
 @router.get("/{assignment_id}", response_model=schemas.AssignmentOut)
 def get_assignment(
     assignment_id: int,
@@ -190,11 +440,15 @@ def update_assignment(
     _ensure_attachment_column(db)
     assignment = _get_assignment(db, assignment_id)
     _ensure_can_manage(assignment.classroom, user)
+    _check_template(payload.template_id)
+    template_changed = payload.template_id != assignment.template_id
     for key, value in payload.dict().items():
         setattr(assignment, key, value)
     db.add(assignment)
     db.commit()
     db.refresh(assignment)
+    if template_changed:
+        publish(db, assignment)
     return assignment
 
 
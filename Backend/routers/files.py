@@ -0,0 +1,180 @@
+import re
+import time
+from urllib.parse import quote, unquote, urlparse
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import RedirectResponse, Response
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core.config import settings
+from ..core.security import require_user
+from ..database import get_db
+from ..deps import get_current_user
+from ..storage import InvalidKey, get_storage, normalize_key
+from ..utils.file_response import cache_headers, serve_file
+from ..utils.previews import ensure_preview, source_key
+from ..utils.signing import sign_upload_uri, verify_upload_signature
+
+# API helpers live under /api/files; the download route itself keeps the
+# historic /uploads/... URLs so links already stored in the DB keep working.
+router = APIRouter(prefix="/files", tags=["Files"])
+uploads_router = APIRouter(tags=["Files"])
+
+_ASSIGNMENT_DIR = re.compile(r"^assignment_(\d+)$")
+_CLASSROOM_DIR = re.compile(r"^classroom_(\d+)$")
+
+
+def _upload_key(file_path: str) -> str:
+    """Map a path below /uploads to a storage key, refusing `..` tricks."""
+    try:
+        key = normalize_key(file_path)
+    except InvalidKey:
+        raise HTTPException(status_code=404, detail="File not found")
+    # dot-entries are temp files and internal folders (e.g. .resumable/)
+    if any(part.startswith(".") for part in key.split("/")):
+        raise HTTPException(status_code=404, detail="File not found")
+    return key
+
+
+def _ensure_exists(key: str) -> None:
+    if get_storage().exists(key):
+        return
+    source = source_key(key)
+    # Previews are rendered in the background; fill in any that aren't there yet
+    if source is not None and ensure_preview(source):
+        return
+    raise HTTPException(status_code=404, detail="File not found")
+
+
+def _ensure_membership(db: Session, classroom_id: int, user: models.User):
+    classroom = db.query(models.Classroom).filter_by(id=classroom_id).first()
+    if not classroom:
+        raise HTTPException(status_code=404, detail="File not found")
+    if classroom.instructor_id == user.id:
+        return
+    membership = (
+        db.query(models.ClassroomMember)
+        .filter_by(classroom_id=classroom_id, user_id=user.id)
+        .first()
+    )
+    if not membership:
+        raise HTTPException(status_code=403, detail="You are not enrolled in this class")
+
+
+def _assignment_for_dir(db: Session, dirname: str) -> models.Assignment:
+    match = _ASSIGNMENT_DIR.match(dirname)
+    assignment = (
+        db.query(models.Assignment).filter_by(id=int(match.group(1))).first()
+        if match
+        else None
+    )
+    if not assignment:
+        raise HTTPException(status_code=404, detail="File not found")
+    return assignment
+
+
+def _ensure_can_read(db: Session, user: models.User, rel: str) -> None:
+    """
+    Apply the same rules as the list endpoints:
+      - submissions: the submitting student, the classroom instructor, admins
+      - assignment attachments / materials (optionally in a digest folder):
+        classroom members and the instructor
+      - instructor-request proofs: the requester and admins
+    """
+    if user.role == models.UserRole.admin:
+        return
+    # A preview is readable by whoever may read the original
+    rel = source_key(rel) or rel
+    parts = rel.split("/")
+    kind = parts[0]
+
+    if kind == "submissions" and len(parts) == 3:
+        assignment = _assignment_for_dir(db, parts[1])
+        if assignment.classroom.instructor_id == user.id:
+            return
+        if parts[2].startswith(f"user{user.id}_"):
+            _ensure_membership(db, assignment.classroom_id, user)
+            return
+    elif kind == "assignments" and len(parts) in (3, 4):
+        assignment = _assignment_for_dir(db, parts[1])
+        _ensure_membership(db, assignment.classroom_id, user)
+        return
+    elif kind == "materials" and len(parts) in (3, 4):
+        match = _CLASSROOM_DIR.match(parts[1])
+        if match:
+            _ensure_membership(db, int(match.group(1)), user)
+            return
+    elif kind == "proofs" and len(parts) == 2:
+        owned = (
+            db.query(models.InstructorRequest.id)
+            .filter_by(user_id=user.id, file_path=f"/uploads/{rel}")
+            .first()
+        )
+        if owned:
+            return
+
+    raise HTTPException(status_code=403, detail="Not allowed to access this file")
+
+
+def _send_file(request: Request, rel: str) -> Response:
+    target = get_storage().local_path(rel)
+    if target is None:
+        # Object storage: let the client fetch the bytes from the bucket directly
+        return RedirectResponse(get_storage().presign_get(rel), status_code=307)
+    if settings.FILES_ACCEL_REDIRECT:
+        # nginx picks the file up from its internal location and sends it with
+        # sendfile(), answering ETag/Range/gzip_static itself; no Content-Type here
+        # so nginx derives it from mime.types. Cache-Control/Content-Disposition pass through.
+        headers = cache_headers(target, rel)
+        headers["X-Accel-Redirect"] = f"{settings.FILES_ACCEL_PREFIX}{quote(rel)}"
+        return Response(headers=headers)
+    return serve_file(request, target, rel)
+
+
+@uploads_router.get("/uploads/{file_path:path}")
+def download_upload(
+    file_path: str,
+    request: Request,
+    expires: str | None = None,
+    sig: str | None = None,
+    db: Session = Depends(get_db),
+):
+    """
+    GET /uploads/{path}
+    Serve an uploaded file either for a signed, unexpired link or for a logged-in
+    user allowed to see it. Without nginx in front the file is streamed directly;
+    with object storage the client is redirected to a presigned GET.
+    """
+    signed = verify_upload_signature(f"/uploads/{file_path}", expires, sig)
+    user = None if signed else require_user(request, db)
+    rel = _upload_key(file_path)
+    if user is not None:
+        _ensure_can_read(db, user, rel)
+    _ensure_exists(rel)
+    return _send_file(request, rel)
+
+
+@router.get("/signed-url")
+def get_signed_url(
+    url: str,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    GET /files/signed-url?url=/uploads/...
+    Exchange a stored file URL for a short-lived signed link that works without
+    cookies (e.g. for <img> tags or sharing with a download manager).
+    """
+    path = unquote(urlparse(url).path)
+    if not path.startswith("/uploads/"):
+        raise HTTPException(status_code=400, detail="Not an uploaded file URL")
+    rel = _upload_key(path[len("/uploads/"):])
+    _ensure_can_read(db, user, rel)
+    _ensure_exists(rel)
+    storage = get_storage()
+    if storage.local_path(rel) is None:
+        ttl = settings.SIGNED_URL_TTL_SECONDS
+        return {"url": storage.presign_get(rel, ttl), "expires": int(time.time()) + ttl}
+    signed, expires = sign_upload_uri(f"/uploads/{rel}")
+    return {"url": f"{settings.backend_base_public}{signed}", "expires": expires}
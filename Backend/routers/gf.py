@@ -0,0 +1,681 @@
+import json
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Annotated, Any, Callable, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BeforeValidator
+from starlette.background import BackgroundTask
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+from ..core.config import settings
+from ..deps import get_db
+from ..gf import (
+    IRRED_DEFAULTS,
+    MAX_TABLE_M,
+    NIST_MODULI,
+    STEP_KINDS,
+    GFConfig,
+    as_poly_string,
+    gf_add,
+    iter_trace,
+    poly_degree,
+    summarize,
+)
+from ..gf import aes, ec, gfp, jobs
+from ..gf.batch import TABLE_KINDS, table_bytes
+from ..utils.autograde import check_factorizations, parse_gfp_poly
+from ..utils.compute import ComputeSaturated, ComputeTimeLimit, run_compute
+from ..utils.resultcache import (
+    decode_json,
+    decode_result,
+    encode_json,
+    encode_result,
+    field_key,
+    get_result_cache,
+)
+from ..utils.moduli import check_polynomial, find_moduli, sample_moduli
+
+router = APIRouter(prefix="/gf", tags=["GF(2^m)"])
+
+MAX_M = 571
+# Traces grow with m^2 (and with the exponent's bit length for pow)
+MAX_TRACE_M = 64
+# Largest GF(p)[x] polynomial accepted for factorization
+MAX_GFP_DEGREE = 256
+# Steps per chunk written to a trace stream
+STREAM_CHUNK_STEPS = 256
+
+_stream_slots = threading.BoundedSemaphore(settings.GF_STREAM_MAX_CONCURRENT)
+
+
+def _parse_int(value):
+    """Accept 87, "87", "0x57" and "0b1010111" in query strings."""
+    if isinstance(value, str):
+        try:
+            return int(value.strip(), 0)
+        except ValueError:
+            pass
+    return value
+
+
+# Non-negative int that may be written in hex/binary
+GFInt = Annotated[int, BeforeValidator(_parse_int), Query(ge=0)]
+
+
+def _field(
+    m: int = Query(8, ge=1, le=MAX_M),
+    mod_poly: GFInt | None = None,
+) -> GFConfig:
+    return _config(m, mod_poly)
+
+
+def _config(m: int, mod_poly: int | None) -> GFConfig:
+    if mod_poly is None:
+        mod_poly = IRRED_DEFAULTS.get(m) or NIST_MODULI.get(m)
+        if mod_poly is None:
+            raise HTTPException(status_code=400, detail=f"No default modulus for m={m}; pass mod_poly")
+    if poly_degree(mod_poly) != m:
+        raise HTTPException(status_code=400, detail="mod_poly must have degree m")
+    return GFConfig(m, mod_poly)
+
+
+@contextmanager
+def _compute_errors():
+    """Compute tier errors (utils/compute.py) as HTTP errors."""
+    try:
+        yield
+    except ComputeSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Math workers are busy; try again shortly",
+            headers={"Retry-After": str(settings.COMPUTE_RETRY_AFTER_SECONDS)},
+        )
+    except ComputeTimeLimit as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+async def _compute(fn: Callable, *args) -> Any:
+    """Run a job in the compute tier, mapping its errors to HTTP."""
+    with _compute_errors():
+        return await run_compute(fn, *args)
+
+
+async def _field_op(op: str, x: int, y: int | None, field: GFConfig, trace: bool) -> schemas.GFResult:
+    if trace and field.m > MAX_TRACE_M:
+        raise HTTPException(status_code=400, detail=f"trace is limited to m <= {MAX_TRACE_M}")
+    cache = get_result_cache()
+    key = field_key(op, field.m, field.mod_poly, x, y, trace)
+    cached = await cache.aget(key)
+    if cached is not None:
+        return _result(*decode_result(cached), field.m)
+
+    args = (op, x, y, field.m, field.mod_poly, trace)
+    # reducing more than a product's 2m bits is unbounded work; keep it off the event loop
+    oversized = op == "mod" and x.bit_length() > 2 * field.m
+    if trace or field.m > MAX_TABLE_M or oversized:
+        value, steps = await _compute(jobs.field_op, *args)
+    else:  # table lookups: cheaper than a round trip to the pool
+        try:
+            value, steps = jobs.field_op(*args)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    await cache.aput(key, encode_result(value, steps))
+    return _result(value, steps, field.m)
+
+
+def _result(value: int, steps: list | None, m: int) -> schemas.GFResult:
+    return schemas.GFResult(
+        value=value,
+        hex=f"0x{value:0{max(2, (m + 3) // 4)}X}",
+        poly=as_poly_string(value),
+        steps=steps,
+    )
+
+
+@router.get("/irreducibles")
+def list_default_moduli():
+    """Default irreducible polynomial per m (the frontend's table plus the NIST fields)."""
+    return {
+        m: {"value": poly, "hex": f"0x{poly:X}", "poly": as_poly_string(poly)}
+        for m, poly in {**IRRED_DEFAULTS, **NIST_MODULI}.items()
+    }
+
+
+@router.get("/add", response_model=schemas.GFResult)
+def add(a: GFInt, b: GFInt, trace: bool = False, field: GFConfig = Depends(_field)):
+    """GET /gf/add?a=0x57&b=0x13 — XOR; also used for subtraction."""
+    steps: list | None = [] if trace else None
+    return _result(gf_add(a, b, steps), steps, field.m)
+
+
+@router.get("/mod", response_model=schemas.GFResult)
+async def mod(x: GFInt, trace: bool = False, field: GFConfig = Depends(_field)):
+    """GET /gf/mod?x=...&m=8 — reduce any GF(2)[x] polynomial modulo mod_poly."""
+    return await _field_op("mod", x, None, field, trace)
+
+
+@router.get("/mul", response_model=schemas.GFResult)
+async def mul(a: GFInt, b: GFInt, trace: bool = False, field: GFConfig = Depends(_field)):
+    """GET /gf/mul?a=0x57&b=0x13&m=8[&mod_poly=0x11B][&trace=true]"""
+    return await _field_op("mul", a, b, field, trace)
+
+
+@router.get("/pow", response_model=schemas.GFResult)
+async def power(a: GFInt, n: GFInt, trace: bool = False, field: GFConfig = Depends(_field)):
+    """GET /gf/pow?a=0x57&n=2&m=8 — square-and-multiply."""
+    return await _field_op("pow", a, n, field, trace)
+
+
+@router.get("/inv", response_model=schemas.GFResult)
+async def inverse(a: GFInt, trace: bool = False, field: GFConfig = Depends(_field)):
+    """GET /gf/inv?a=0x57&m=8 — extended Euclid over GF(2)[x]."""
+    return await _field_op("inv", a, None, field, trace)
+
+
+# ---------------------------------------------------------------------------
+# Streamed traces (gf/trace.py)
+# ---------------------------------------------------------------------------
+def _step_kinds(kinds: str | None = Query(None, description="Comma-separated step kinds to keep, e.g. reduce,mod")):
+    if kinds is None:
+        return None
+    wanted = {kind.strip() for kind in kinds.split(",") if kind.strip()}
+    unknown = wanted - set(STEP_KINDS)
+    if unknown or not wanted:
+        raise HTTPException(status_code=400, detail=f"kinds must be among {', '.join(STEP_KINDS)}")
+    return wanted
+
+
+def _ndjson(event: str, payload: dict) -> str:
+    return json.dumps(payload, separators=(",", ":")) + "\n"
+
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+def _trace_lines(op: str, x: int, y: int | None, field: GFConfig, every: int, kinds, encode) -> Iterator[bytes]:
+    """
+    Runs in Starlette's threadpool, one chunk of STREAM_CHUNK_STEPS steps per
+    `next()`: the next chunk is only computed once the previous one has been
+    sent, so a slow reader holds back the computation instead of buffering it.
+    """
+    steps = summarize(iter_trace(op, x, y, field), every, kinds, settings.GF_STREAM_MAX_STEPS)
+    chunk: list[str] = []
+    emitted = 0
+    try:
+        while True:
+            try:
+                index, step = next(steps)
+            except StopIteration as stop:
+                value, total = stop.value
+                break
+            chunk.append(encode("step", {"index": index, **step}))
+            emitted += 1
+            if len(chunk) >= STREAM_CHUNK_STEPS:
+                yield "".join(chunk).encode()
+                chunk = []
+    except ValueError as exc:  # the status line is already sent: report in-band
+        chunk.append(encode("error", {"kind": "error", "detail": str(exc)}))
+    else:
+        result = _result(value, None, field.m).model_dump(exclude={"steps"})
+        chunk.append(encode("result", {"kind": "result", **result, "steps": total, "emitted": emitted}))
+    yield "".join(chunk).encode()
+
+
+def _stream(op: str, x: int, y: int | None, field: GFConfig, every: int, kinds, format: str) -> StreamingResponse:
+    if op == "inv" and x & field.mask == 0:
+        raise HTTPException(status_code=400, detail="Zero has no multiplicative inverse in GF(2^m).")
+    if not _stream_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many trace streams; try again shortly",
+            headers={"Retry-After": str(settings.COMPUTE_RETRY_AFTER_SECONDS)},
+        )
+    sse = format == "sse"
+    return StreamingResponse(
+        _trace_lines(op, x, y, field, every, kinds, _sse if sse else _ndjson),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(_stream_slots.release),
+    )
+
+
+StreamFormat = Annotated[Literal["ndjson", "sse"], Query()]
+Every = Annotated[int, Query(ge=1, le=1_000_000, description="Keep every k-th (matching) step")]
+
+
+@router.get("/mod/stream")
+def mod_stream(
+    x: GFInt,
+    every: Every = 1,
+    kinds: set[str] | None = Depends(_step_kinds),
+    format: StreamFormat = "ndjson",
+    field: GFConfig = Depends(_field),
+):
+    """GET /gf/mod/stream?x=...&m=8[&every=k][&kinds=reduce][&format=sse]"""
+    return _stream("mod", x, None, field, every, kinds, format)
+
+
+@router.get("/mul/stream")
+def mul_stream(
+    a: GFInt,
+    b: GFInt,
+    every: Every = 1,
+    kinds: set[str] | None = Depends(_step_kinds),
+    format: StreamFormat = "ndjson",
+    field: GFConfig = Depends(_field),
+):
+    """GET /gf/mul/stream?a=...&b=...&m=163[&every=k][&kinds=reduce][&format=sse]"""
+    return _stream("mul", a, b, field, every, kinds, format)
+
+
+@router.get("/pow/stream")
+def pow_stream(
+    a: GFInt,
+    n: GFInt,
+    every: Every = 1,
+    kinds: set[str] | None = Depends(_step_kinds),
+    format: StreamFormat = "ndjson",
+    field: GFConfig = Depends(_field),
+):
+    """GET /gf/pow/stream?a=...&n=...&m=163[&every=k][&kinds=exp][&format=sse]"""
+    return _stream("pow", a, n, field, every, kinds, format)
+
+
+@router.get("/inv/stream")
+def inv_stream(
+    a: GFInt,
+    every: Every = 1,
+    kinds: set[str] | None = Depends(_step_kinds),
+    format: StreamFormat = "ndjson",
+    field: GFConfig = Depends(_field),
+):
+    """GET /gf/inv/stream?a=...&m=163[&every=k][&kinds=egcd][&format=sse]"""
+    return _stream("inv", a, None, field, every, kinds, format)
+
+
+@router.post("/batch", response_model=schemas.GFBatchOut)
+async def batch(payload: schemas.GFBatchIn):
+    """
+    POST /gf/batch  {"op": "mul", "m": 8, "a": [...], "b": [...]}
+    Element-wise add/mul/inv/pow over whole arrays (m <= 16), vectorized with
+    log/antilog table gathers. `b` and `n` may also be a single value
+    (broadcast) for mul/pow.
+    """
+    field = _config(payload.m, payload.mod_poly)
+    if payload.op in ("add", "mul"):
+        if payload.b is None:
+            raise HTTPException(status_code=400, detail="`b` is required")
+        if len(payload.b) not in (1, len(payload.a)):
+            raise HTTPException(status_code=400, detail="`a` and `b` must have the same length")
+    elif payload.op == "pow":
+        if payload.n is None:
+            raise HTTPException(status_code=400, detail="`n` is required")
+        if isinstance(payload.n, list) and len(payload.n) not in (1, len(payload.a)):
+            raise HTTPException(status_code=400, detail="`a` and `n` must have the same length")
+    values = await _compute(
+        jobs.batch_op, payload.op, field.m, field.mod_poly, payload.a, payload.b, payload.n
+    )
+    return {"values": values}
+
+
+@router.get("/tables/{kind}")
+def download_table(kind: str, field: GFConfig = Depends(_field)):
+    """
+    GET /gf/tables/{mul|inv|log|exp}?m=8&mod_poly=0x11B
+    Raw little-endian uint8 (m <= 8) or uint16 array; `X-GF-Shape` gives the
+    dimensions. The bytes only depend on the query, so they are cached forever.
+    """
+    if kind not in TABLE_KINDS:
+        raise HTTPException(status_code=404, detail="Unknown table")
+    try:
+        data, shape, dtype = table_bytes(kind, field.m, field.mod_poly)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return Response(
+        content=data,
+        media_type="application/octet-stream",
+        headers={
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "Content-Disposition": (
+                f'attachment; filename="gf2_{field.m}_{field.mod_poly:x}_{kind}.bin"'
+            ),
+            "X-GF-Dtype": dtype,
+            "X-GF-Shape": ",".join(map(str, shape)),
+        },
+    )
+
+
+# Matrices are at most MAX_MATRIX_DIM x MAX_MATRIX_DIM
+MAX_MATRIX_DIM = 256
+
+
+@router.post("/matrix", response_model=schemas.GFMatrixOut)
+async def matrix_op(payload: schemas.GFMatrixIn):
+    """
+    POST /gf/matrix  {"op": "rref"|"rank"|"inverse"|"solve"|"mul", "m": 8, "a": [[...]], "b"?: [[...]]}
+    Gauss-Jordan elimination over GF(2^m) (m <= 16) with vectorized row operations.
+    """
+    field = _config(payload.m, payload.mod_poly)
+    for rows in (payload.a, payload.b or []):
+        if any(len(row) > MAX_MATRIX_DIM for row in rows):
+            raise HTTPException(status_code=400, detail=f"Matrices are limited to {MAX_MATRIX_DIM} columns")
+    return await _compute(jobs.matrix_op, payload.op, field.m, field.mod_poly, payload.a, payload.b)
+
+
+def _rs_args(payload: schemas.RSCodeIn) -> tuple:
+    field = _config(payload.m, payload.mod_poly)
+    if not payload.k < payload.n < 1 << payload.m:
+        raise HTTPException(status_code=400, detail=f"Need k < n <= {(1 << payload.m) - 1}")
+    return payload.n, payload.k, field.m, field.mod_poly, payload.fcr
+
+
+@router.post("/rs/encode", response_model=schemas.RSEncodeOut)
+async def rs_encode(payload: schemas.RSEncodeIn):
+    """POST /gf/rs/encode  {"m": 8, "n": 255, "k": 223, "messages": [[...k symbols], ...]} — systematic RS."""
+    args = _rs_args(payload)
+    return {"codewords": await _compute(jobs.rs_encode, *args, payload.messages)}
+
+
+@router.post("/rs/decode", response_model=schemas.RSDecodeOut)
+async def rs_decode(payload: schemas.RSDecodeIn):
+    """
+    POST /gf/rs/decode  {"m": 8, "n": 255, "k": 223, "codewords": [[...n symbols], ...][, "trace": true]}
+    Syndromes, Berlekamp-Massey, Chien search and Forney. `trace` (one
+    codeword) returns the intermediate values of each stage.
+    """
+    args = _rs_args(payload)
+    if payload.trace and len(payload.codewords) != 1:
+        raise HTTPException(status_code=400, detail="trace needs exactly one codeword")
+    codewords, errors, steps = await _compute(jobs.rs_decode, *args, payload.codewords, payload.trace)
+    return {
+        "codewords": codewords,
+        "messages": [word[: payload.k] for word in codewords],
+        "errors": errors,
+        "steps": steps,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Irreducible / primitive moduli (persistent index, see utils/moduli.py)
+# ---------------------------------------------------------------------------
+def _modulus_out(m: int, value: int, primitive: bool | None) -> dict:
+    return {
+        "m": m,
+        "value": value,
+        "hex": f"0x{value:X}",
+        "poly": as_poly_string(value),
+        "weight": value.bit_count(),
+        "primitive": primitive,
+    }
+
+
+def _stored_out(row: models.GFModulus) -> dict:
+    return _modulus_out(row.m, int(row.poly, 16), row.primitive)
+
+
+@router.get("/moduli/check", response_model=schemas.GFModulusCheck)
+def check_modulus(poly: GFInt, db: Session = Depends(get_db)):
+    """GET /gf/moduli/check?poly=0x11B — Ben-Or irreducibility test + primitivity."""
+    m = poly_degree(poly)
+    if not 1 <= m <= MAX_M:
+        raise HTTPException(status_code=400, detail=f"poly must have degree 1..{MAX_M}")
+    with _compute_errors():
+        irreducible, primitive = check_polynomial(db, poly)
+    return {**_modulus_out(m, poly, primitive), "irreducible": irreducible}
+
+
+@router.get("/moduli", response_model=schemas.GFModuliOut)
+def search_moduli(
+    m: int = Query(..., ge=2, le=MAX_M),
+    kind: Literal["trinomial", "pentanomial", "any"] = "any",
+    primitive: bool = False,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """
+    GET /gf/moduli?m=163&kind=pentanomial[&primitive=true][&limit=10]
+    The first irreducible (or primitive) polynomials of degree m in increasing
+    order. `partial` means the per-request search budget ran out: ask again.
+    """
+    with _compute_errors():
+        result = find_moduli(db, m, kind, limit, primitive)
+    return {
+        "m": m,
+        "kind": kind,
+        "moduli": [_stored_out(row) for row in result.moduli],
+        "exhausted": result.exhausted,
+        "partial": result.partial,
+    }
+
+
+@router.get("/moduli/sample", response_model=list[schemas.GFModulusOut])
+def sample_random_moduli(
+    m: int = Query(..., ge=2, le=MAX_M),
+    count: int = Query(5, ge=1, le=50),
+    seed: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """GET /gf/moduli/sample?m=233&count=5[&seed=1] — random irreducible polynomials."""
+    with _compute_errors():
+        rows = sample_moduli(db, m, count, seed)
+    return [_stored_out(row) for row in rows]
+
+
+# ---------------------------------------------------------------------------
+# Polynomials over GF(p) (gf/gfp.py)
+# ---------------------------------------------------------------------------
+def _gfp_poly(text: str, p: int, max_degree: int = MAX_GFP_DEGREE) -> gfp.Poly:
+    if not gfp.is_prime(p):
+        raise HTTPException(status_code=400, detail="p must be prime")
+    f = parse_gfp_poly(text, p)
+    if f is None:
+        raise HTTPException(status_code=400, detail="Could not read the polynomial")
+    if gfp.degree(f) > max_degree:
+        raise HTTPException(status_code=400, detail=f"Degree is limited to {max_degree}")
+    return f
+
+
+@router.post("/gfp/eval", response_model=schemas.GFBatchOut)
+async def gfp_evaluate(payload: schemas.GFpEvalIn):
+    """POST /gf/gfp/eval  {"p": 5, "poly": "3x^3 + 4x^2 + 2x + 1", "xs": [7, 8]} — Horner at every point."""
+    f = _gfp_poly(payload.poly, payload.p)
+    return {"values": await _compute(gfp.evaluate_many, f, payload.xs, payload.p)}
+
+
+@router.get("/gfp/factor", response_model=schemas.GFpFactorOut)
+async def gfp_factor(p: int = Query(..., ge=2), poly: str = Query(..., max_length=4096)):
+    """GET /gf/gfp/factor?p=5&poly=x^4+4 — square-free, distinct-degree and Cantor–Zassenhaus."""
+    f = _gfp_poly(poly, p)
+    if not f:
+        raise HTTPException(status_code=400, detail="The zero polynomial has no factorization")
+    cache = get_result_cache()
+    key = f"gfp:factor:{p}:{','.join(map(str, f))}"
+    cached = await cache.aget(key)
+    if cached is not None:
+        return decode_json(cached)
+    lead, factors, irreducible = await _compute(jobs.factor_poly, f, p)
+    body = {
+        "p": p,
+        "poly": gfp.as_string(f),
+        "lead": lead,
+        "factors": [
+            {"poly": gfp.as_string(g), "coeffs": list(g), "multiplicity": k} for g, k in factors
+        ],
+        "factorization": gfp.factorization_string(lead, factors),
+        "irreducible": irreducible,
+    }
+    await cache.aput(key, encode_json(body))
+    return body
+
+
+@router.post("/gfp/factor/check", response_model=schemas.GFpFactorCheckOut)
+async def gfp_check_factorizations(payload: schemas.GFpFactorCheckIn):
+    """
+    POST /gf/gfp/factor/check  {"p": 5, "poly": "x^4 + 4", "answers": ["(x+1)(x+2)(x+3)(x+4)", ...]}
+    One verdict per answer: true/false, or null when no factorization could be read.
+    Factoring is memoized per (p, polynomial), so a whole class costs one factorization.
+    """
+    f = _gfp_poly(payload.poly, payload.p)
+    if not f:
+        raise HTTPException(status_code=400, detail="The zero polynomial has no factorization")
+    factorization, results = await _compute(check_factorizations, payload.answers, f, payload.p)
+    return {"factorization": factorization, "results": results}
+
+
+# ---------------------------------------------------------------------------
+# AES / Rijndael (gf/aes.py)
+# ---------------------------------------------------------------------------
+def _hex_bytes(text: str, name: str, sizes: tuple[int, ...]) -> bytes:
+    try:
+        data = bytes.fromhex(text.removeprefix("0x"))
+    except ValueError:
+        data = None
+    if data is None or len(data) not in sizes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"`{name}` must be {' or '.join(str(2 * n) for n in sizes)} hex digits",
+        )
+    return data
+
+
+def _aes_tables() -> aes.AESTables:
+    return aes.get_aes_tables(settings.aes_table_path)
+
+
+@router.get("/aes/sbox", response_model=schemas.AESSboxOut)
+def aes_sbox():
+    """GET /gf/aes/sbox — S-box and inverse S-box, derived from GF(2^8) inverses + the affine map."""
+    tables = _aes_tables()
+    return {"sbox": tables.sbox.tolist(), "inv_sbox": tables.inv_sbox.tolist()}
+
+
+@router.get("/aes/sbox/entry", response_model=schemas.AESSboxEntry)
+def aes_sbox_entry(x: GFInt, trace: bool = False):
+    """GET /gf/aes/sbox/entry?x=0x53[&trace=true] — S(x) = affine(x^-1), with the inverse's trace."""
+    if x > 0xFF:
+        raise HTTPException(status_code=400, detail="x must be a byte")
+    steps: list | None = [] if trace else None
+    return {**aes.sbox_entry(x, steps), "steps": steps}
+
+
+@router.post("/aes/batch", response_model=schemas.AESBatchOut)
+async def aes_batch(payload: schemas.AESBatchIn):
+    """
+    POST /gf/aes/batch  {"op": "encrypt", "key": "2b7e...", "states": ["3243f6a8...", ...]}
+    One AES round function (sub_bytes, shift_rows, mix_columns and their
+    inverses) or the whole cipher (encrypt/decrypt, ECB) over up to 65536
+    16-byte states, vectorized with NumPy table gathers.
+    """
+    blocks = b"".join(_hex_bytes(state, "states", (aes.BLOCK_BYTES,)) for state in payload.states)
+    key = None
+    if payload.key is not None:
+        key = _hex_bytes(payload.key, "key", tuple(aes.KEY_ROUNDS))
+    elif payload.op in ("encrypt", "decrypt"):
+        raise HTTPException(status_code=400, detail="`key` is required")
+    out = await _compute(jobs.aes_batch, payload.op, blocks, key, settings.aes_table_path)
+    return {"states": [out[i : i + aes.BLOCK_BYTES].hex() for i in range(0, len(out), aes.BLOCK_BYTES)]}
+
+
+@router.post("/aes/trace", response_model=schemas.AESTraceOut)
+def aes_trace(payload: schemas.AESTraceIn):
+    """
+    POST /gf/aes/trace  {"key": "2b7e1516...", "block": "3243f6a8..."}
+    Encrypts one block and returns the key schedule (one record per derived
+    word) and the state after every SubBytes/ShiftRows/MixColumns/AddRoundKey.
+    """
+    key = _hex_bytes(payload.key, "key", tuple(aes.KEY_ROUNDS))
+    block = _hex_bytes(payload.block, "block", (aes.BLOCK_BYTES,))
+    output, round_keys, key_steps, steps = aes.encrypt_trace(block, key, _aes_tables())
+    return {
+        "output": output.hex(),
+        "round_keys": [round_key.tobytes().hex() for round_key in round_keys],
+        "key_steps": key_steps,
+        "steps": steps,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Binary elliptic curves (gf/ec.py)
+# ---------------------------------------------------------------------------
+# Scalars for curves without a known order are limited to this many bits
+MAX_EC_SCALAR_BITS = 1152
+
+
+def _hex_int(text: str | None, name: str) -> int:
+    value = _parse_int(text) if text is not None else None
+    if not isinstance(value, int) or value < 0:
+        raise HTTPException(status_code=400, detail=f"`{name}` must be a non-negative integer (decimal or 0x hex)")
+    return value
+
+
+def _point(values: list[str] | None, name: str) -> tuple[int, int] | None:
+    if values is None:
+        return None
+    return _hex_int(values[0], f"{name}.x"), _hex_int(values[1], f"{name}.y")
+
+
+def _ec_curve(payload: schemas.ECOpIn) -> str | tuple[int, int, int, int]:
+    if payload.curve is not None:
+        if payload.curve not in ec.NIST_CURVES:
+            raise HTTPException(status_code=400, detail=f"Unknown curve; one of {', '.join(ec.NIST_CURVES)}")
+        return payload.curve
+    if payload.m is None:
+        raise HTTPException(status_code=400, detail="Pass `curve` or `m`, `a` and `b`")
+    mod_poly = None if payload.mod_poly is None else _hex_int(payload.mod_poly, "mod_poly")
+    field = _config(payload.m, mod_poly)
+    a, b = _hex_int(payload.a, "a"), _hex_int(payload.b, "b")
+    if a >> field.m or b >> field.m or b == 0:
+        raise HTTPException(status_code=400, detail="`a` and `b` must be field elements, b != 0")
+    return field.m, field.mod_poly, a, b
+
+
+def _hex_point(point: tuple[int, int] | None) -> list[str] | None:
+    return None if point is None else [f"{point[0]:#x}", f"{point[1]:#x}"]
+
+
+@router.get("/ec/curves", response_model=list[schemas.ECCurveOut])
+def ec_curves():
+    """GET /gf/ec/curves — the NIST B- and K- curves (FIPS 186-4)."""
+    return [
+        {
+            "name": curve.name,
+            "m": curve.m,
+            "h": curve.h,
+            **{name: f"{getattr(curve, name):#x}" for name in ("mod_poly", "a", "b", "gx", "gy", "n")},
+        }
+        for curve in ec.NIST_CURVES.values()
+    ]
+
+
+@router.post("/ec", response_model=schemas.ECOpOut)
+async def ec_op(payload: schemas.ECOpIn):
+    """
+    POST /gf/ec  {"op": "mul", "curve": "B-163", "k": "0x1234"[, "p": [x, y]][, "method": "ladder"]}
+    Point addition, doubling and scalar multiplication on y^2 + xy = x^3 + ax^2 + b
+    (a NIST curve or custom m/mod_poly/a/b). `mul` uses the Montgomery ladder,
+    López–Dahab double-and-add ("projective"), affine double-and-add, or the
+    generator's precomputed window table ("fixed"). `trace` records every
+    affine group operation or ladder step.
+    """
+    curve = _ec_curve(payload)
+    p, q = _point(payload.p, "p"), _point(payload.q, "q")
+    if p is None and not isinstance(curve, str):
+        raise HTTPException(status_code=400, detail="`p` is required on custom curves")
+    if payload.op == "add" and q is None:
+        raise HTTPException(status_code=400, detail="`q` is required")
+    k = None
+    if payload.op == "mul":
+        k = _hex_int(payload.k, "k")
+        if k.bit_length() > MAX_EC_SCALAR_BITS:
+            raise HTTPException(status_code=400, detail=f"k is limited to {MAX_EC_SCALAR_BITS} bits")
+        if payload.trace and payload.method not in ("ladder", "affine"):
+            raise HTTPException(status_code=400, detail="trace needs method ladder or affine")
+    point, steps = await _compute(jobs.ec_op, payload.op, curve, p, q, k, payload.method, payload.trace)
+    return {"point": _hex_point(point), "steps": steps}
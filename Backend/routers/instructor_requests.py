@@ -5,7 +5,7 @@ from pathlib import Path
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
-from ..core.config import settings
+from ..core.metrics import record_upload
 from ..database import get_db
 from ..deps import get_current_user, require_admin
 from ..models import InstructorRequest, User, UserRole
@@ -14,11 +14,11 @@ from ..schemas import (
     InstructorRequestAdminOut,
     InstructorRequestOut,
 )
+from ..storage import get_storage
+from ..utils.previews import schedule_preview
 
 router = APIRouter(tags=["Instructor Requests"])
 
-UPLOAD_DIR = Path(settings.UPLOAD_DIR)
-
 
 @router.post("/roles/requests", response_model=InstructorRequestOut)
 def submit_request(
@@ -34,12 +34,11 @@ def submit_request(
         raise HTTPException(status_code=400, detail="Empty file")
     if len(data) > 10 * 1024 * 1024:
         raise HTTPException(status_code=400, detail="File too large (10MB max)")
-    proof_dir = UPLOAD_DIR / "proofs"
-    proof_dir.mkdir(parents=True, exist_ok=True)
+    record_upload("instructor_request", len(data))
     ext = Path(file.filename).suffix or ".bin"
     filename = f"{uuid.uuid4()}{ext}"
-    dest = proof_dir / filename
-    dest.write_bytes(data)
+    get_storage().save(f"proofs/{filename}", data, file.content_type)
+    schedule_preview(f"proofs/{filename}", data)
     file_url = f"/uploads/proofs/{filename}"
     request_obj = InstructorRequest(
         user_id=user.id,
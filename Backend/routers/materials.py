@@ -1,12 +1,23 @@
-from pathlib import Path
+import hashlib
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, UploadFile, File
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
+from ..core.metrics import record_upload
 from ..database import get_db
 from ..deps import get_current_user, require_instructor
-from ..core.config import settings
+from ..storage import get_storage, public_url
+from ..storage.direct import begin_direct_upload, finish_direct_upload, unique_folder
+from ..storage.resumable import (
+    begin_resumable_upload,
+    commit_resumable_upload,
+    current_offset,
+    finish_resumable_upload,
+    upload_headers,
+)
+from ..utils.previews import schedule_preview
+from ..utils.uploads import DIGEST_LEN, versioned_key
 
 router = APIRouter(prefix="/materials", tags=["Materials"])
 
@@ -18,6 +29,23 @@ def _ensure_classroom(db: Session, classroom_id: int) -> models.Classroom:
     return classroom
 
 
+def _get_managed_material(db: Session, material_id: int, instructor: models.User) -> models.Material:
+    material = db.query(models.Material).filter_by(id=material_id).first()
+    if not material:
+        raise HTTPException(status_code=404, detail="Material not found")
+    classroom = _ensure_classroom(db, material.classroom_id)
+    if classroom.instructor_id != instructor.id and instructor.role != models.UserRole.admin:
+        raise HTTPException(status_code=403, detail="Not allowed for this classroom")
+    return material
+
+
+def _safe_name(filename: str | None) -> str:
+    return "".join(
+        ch if ch.isalnum() or ch in ("-", "_", ".", " ") else "_"
+        for ch in (filename or "material.pdf")
+    )
+
+
 @router.get("/classroom/{classroom_id}", response_model=list[schemas.MaterialOut])
 def list_materials(
     classroom_id: int,
@@ -66,31 +94,116 @@ async def upload_material(
     db: Session = Depends(get_db),
     instructor=Depends(require_instructor),
 ):
-    material = db.query(models.Material).filter_by(id=material_id).first()
-    if not material:
-        raise HTTPException(status_code=404, detail="Material not found")
-    classroom = _ensure_classroom(db, material.classroom_id)
-    if classroom.instructor_id != instructor.id and instructor.role != models.UserRole.admin:
-        raise HTTPException(status_code=403, detail="Not allowed for this classroom")
-
-    # ----- save file on disk -----
-    base_dir = Path(settings.UPLOAD_DIR) / "materials" / f"classroom_{material.classroom_id}"
-    base_dir.mkdir(parents=True, exist_ok=True)
+    material = _get_managed_material(db, material_id, instructor)
 
-    safe_name = "".join(
-        ch if ch.isalnum() or ch in ("-", "_", ".", " ") else "_"
-        for ch in (file.filename or "material.pdf")
-    )
-    dest = base_dir / safe_name
+    # ----- save file (content-addressed, never overwrites) -----
+    safe_name = _safe_name(file.filename)
     content = await file.read()
-    dest.write_bytes(content)
+    record_upload("material", len(content))
+    key = versioned_key(f"materials/classroom_{material.classroom_id}", safe_name, content)
+    storage = get_storage()
+    if not storage.exists(key):
+        storage.save(key, content, file.content_type)
+        schedule_preview(key, content)
 
     # ----- build public URL (absolute) -----
-    # Static mount in main.py: app.mount("/uploads", ...)
-    static_rel = f"/uploads/materials/classroom_{material.classroom_id}/{safe_name}"
-    material.file_url = f"{settings.backend_base_public}{static_rel}"
+    # Served by the /uploads route in routers/files.py; immutable thanks to the digest folder
+    material.file_url = public_url(key)
+
+    db.add(material)
+    db.commit()
+    db.refresh(material)
+    return material
+
 
+@router.post("/{material_id}/upload-url", response_model=schemas.DirectUploadOut)
+def create_material_upload_url(
+    material_id: int,
+    payload: schemas.DirectUploadIn,
+    db: Session = Depends(get_db),
+    instructor=Depends(require_instructor),
+):
+    """
+    Presigned PUT for large course files (object storage only).
+    Follow up with POST /materials/{material_id}/upload-complete.
+    """
+    material = _get_managed_material(db, material_id, instructor)
+    key = (
+        f"materials/classroom_{material.classroom_id}/{unique_folder()}/"
+        f"{_safe_name(payload.filename)}"
+    )
+    return begin_direct_upload(key, payload.content_type)
+
+
+@router.post("/{material_id}/upload-complete", response_model=schemas.MaterialOut)
+def complete_material_upload(
+    material_id: int,
+    payload: schemas.DirectUploadComplete,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    instructor=Depends(require_instructor),
+):
+    material = _get_managed_material(db, material_id, instructor)
+    key = finish_direct_upload(payload.key, f"materials/classroom_{material.classroom_id}/")
+    record_upload("material", get_storage().size(key))
+    material.file_url = public_url(key)
     db.add(material)
     db.commit()
     db.refresh(material)
+    background_tasks.add_task(schedule_preview, key)  # reads the object back from storage
+    return material
+
+
+@router.post(
+    "/{material_id}/resumable", response_model=schemas.ResumableUploadOut, status_code=201
+)
+def create_resumable_material_upload(
+    material_id: int,
+    payload: schemas.ResumableUploadIn,
+    response: Response,
+    db: Session = Depends(get_db),
+    instructor=Depends(require_instructor),
+):
+    """
+    Open a resumable upload for a large course file. Send the bytes with
+    PATCH /resumable-uploads/{id}, then POST .../resumable/{id}/finalize.
+    """
+    material = _get_managed_material(db, material_id, instructor)
+    upload = begin_resumable_upload(
+        db,
+        instructor,
+        "material",
+        material.id,
+        _safe_name(payload.filename),
+        payload.content_type,
+        payload.length,
+    )
+    url = f"/api/resumable-uploads/{upload.id}"
+    response.headers.update({**upload_headers(upload), "Location": url})
+    return schemas.ResumableUploadOut(
+        id=upload.id,
+        url=url,
+        offset=current_offset(upload),
+        length=upload.length,
+        expires_at=upload.expires_at,
+    )
+
+
+@router.post("/{material_id}/resumable/{upload_id}/finalize", response_model=schemas.MaterialOut)
+def finalize_resumable_material_upload(
+    material_id: int,
+    upload_id: str,
+    db: Session = Depends(get_db),
+    instructor=Depends(require_instructor),
+):
+    material = _get_managed_material(db, material_id, instructor)
+    upload, path = finish_resumable_upload(db, upload_id, instructor, "material", material.id)
+    # same content-digest folder as versioned_key(), hashed from disk
+    with open(path, "rb") as fh:
+        digest = hashlib.file_digest(fh, "sha256").hexdigest()[:DIGEST_LEN]
+    key = f"materials/classroom_{material.classroom_id}/{digest}/{upload.filename}"
+    material.file_url = public_url(key)
+    db.add(material)
+    commit_resumable_upload(db, upload, key)
+    db.refresh(material)
     return material
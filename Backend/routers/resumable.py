@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..deps import get_current_user
+from ..storage.resumable import (
+    append_chunk,
+    discard_resumable_upload,
+    get_resumable_upload,
+    upload_headers,
+)
+
+# Uploads are opened and finalized on their target routes
+# (/submissions/{assignment_id}/resumable, /materials/{material_id}/resumable);
+# the byte transfer itself is the same for every target.
+router = APIRouter(prefix="/resumable-uploads", tags=["Uploads"])
+
+
+@router.head("/{upload_id}")
+def get_upload_offset(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    HEAD /resumable-uploads/{upload_id}
+    `Upload-Offset` tells the client where to resume after a dropped connection.
+    """
+    upload = get_resumable_upload(db, upload_id, user)
+    return Response(headers=upload_headers(upload))
+
+
+@router.patch("/{upload_id}", status_code=204)
+async def patch_upload(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    PATCH /resumable-uploads/{upload_id}
+    Body: the next bytes (`Content-Type: application/offset+octet-stream`),
+    starting at `Upload-Offset`. Keep chunks below nginx's client_max_body_size.
+    """
+    upload = get_resumable_upload(db, upload_id, user)
+    await append_chunk(db, upload, request, upload_offset)
+    return Response(status_code=204, headers=upload_headers(upload))
+
+
+@router.delete("/{upload_id}", status_code=204)
+def abort_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    upload = get_resumable_upload(db, upload_id, user)
+    discard_resumable_upload(db, upload)
+    return Response(status_code=204)
@@ -2,7 +2,16 @@ from datetime import datetime, timezone
 from pathlib import Path
 import re
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Response,
+    UploadFile,
+)
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
@@ -10,6 +19,18 @@ from .. import models, schemas
 from ..database import get_db
 from ..deps import get_current_user, require_instructor
 from ..core.config import settings
+from ..core.metrics import record_upload
+from ..storage import get_storage, public_url
+from ..storage.direct import begin_direct_upload, finish_direct_upload
+from ..storage.resumable import (
+    begin_resumable_upload,
+    commit_resumable_upload,
+    current_offset,
+    finish_resumable_upload,
+    upload_headers,
+)
+from ..utils.autograde import FILE_UPLOAD_PREFIX, grade_submission_in_background
+from ..utils.previews import schedule_preview
 
 router = APIRouter(prefix="/submissions", tags=["Submissions"])
 
@@ -56,6 +77,20 @@ def _as_utc(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
+def _ensure_open(assignment: models.Assignment) -> None:
+    if assignment.due_date and datetime.now(timezone.utc) > _as_utc(assignment.due_date):
+        raise HTTPException(status_code=400, detail="Past due date")
+
+
+def _safe_name(filename: str | None) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", filename or "upload.bin")
+
+
+def _submission_prefix(assignment_id: int, user: models.User) -> str:
+    """Storage key prefix for a student's files, e.g. submissions/assignment_1/user3_."""
+    return f"submissions/assignment_{assignment_id}/user{user.id}_"
+
+
 def _resolve_file_url(submission: models.Submission) -> str | None:
     """
     Derive a downloadable URL for legacy rows where the file path was stored in content,
@@ -96,14 +131,14 @@ def _resolve_file_url(submission: models.Submission) -> str | None:
 @router.post("/", response_model=schemas.SubmissionOut)
 def create_submission(
     payload: schemas.SubmissionCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
     assignment = _get_assignment(db, payload.assignment_id)
     _ensure_submission_file_column(db)
     now = datetime.now(timezone.utc)
-    if assignment.due_date and now > _as_utc(assignment.due_date):
-        raise HTTPException(status_code=400, detail="Past due date")
+    _ensure_open(assignment)
     _ensure_membership(db, assignment.classroom_id, user)
     submission = models.Submission(
         user_id=user.id,
@@ -115,6 +150,7 @@ def create_submission(
     db.add(submission)
     db.commit()
     db.refresh(submission)
+    background_tasks.add_task(grade_submission_in_background, submission.id)
     return submission
 
 
@@ -219,6 +255,7 @@ def list_submissions_for_classroom(
 @router.post("/{assignment_id}/upload", response_model=schemas.SubmissionOut)
 async def upload_submission_file(
     assignment_id: int,
+    background_tasks: BackgroundTasks,
     content: str | None = Form(None),
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -227,23 +264,21 @@ async def upload_submission_file(
     assignment = _get_assignment(db, assignment_id)
     _ensure_submission_file_column(db)
     now = datetime.now(timezone.utc)
-    if assignment.due_date and now > _as_utc(assignment.due_date):
-        raise HTTPException(status_code=400, detail="Past due date")
+    _ensure_open(assignment)
     _ensure_membership(db, assignment.classroom_id, user)
 
-    safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", file.filename or "upload.bin")
-    base_dir = Path(settings.UPLOAD_DIR) / "submissions" / f"assignment_{assignment_id}"
-    base_dir.mkdir(parents=True, exist_ok=True)
-    dest = base_dir / f"user{user.id}_{int(now.timestamp())}_{safe_name}"
+    safe_name = _safe_name(file.filename)
+    key = f"{_submission_prefix(assignment_id, user)}{int(now.timestamp())}_{safe_name}"
 
     file_bytes = await file.read()
-    dest.write_bytes(file_bytes)
+    record_upload("submission", len(file_bytes))
+    get_storage().save(key, file_bytes, file.content_type)
+    schedule_preview(key, file_bytes)
 
     # Build absolute URL to the uploaded file
-    static_rel = f"/uploads/submissions/assignment_{assignment_id}/{dest.name}"
-    file_url = f"{settings.backend_base_public}{static_rel}"
+    file_url = public_url(key)
 
-    submission_content = content.strip() if content else f"File upload: {safe_name}"
+    submission_content = content.strip() if content else f"{FILE_UPLOAD_PREFIX}{safe_name}"
 
     submission = models.Submission(
         user_id=user.id,
@@ -255,6 +290,129 @@ async def upload_submission_file(
     db.add(submission)
     db.commit()
     db.refresh(submission)
+    background_tasks.add_task(grade_submission_in_background, submission.id)
+    return submission
+
+
+@router.post("/{assignment_id}/upload-url", response_model=schemas.DirectUploadOut)
+def create_submission_upload_url(
+    assignment_id: int,
+    payload: schemas.DirectUploadIn,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Presigned PUT so large submission files go straight to object storage.
+    Follow up with POST /submissions/{assignment_id}/upload-complete.
+    """
+    assignment = _get_assignment(db, assignment_id)
+    _ensure_open(assignment)
+    _ensure_membership(db, assignment.classroom_id, user)
+    now = datetime.now(timezone.utc)
+    key = (
+        f"{_submission_prefix(assignment_id, user)}"
+        f"{int(now.timestamp())}_{_safe_name(payload.filename)}"
+    )
+    return begin_direct_upload(key, payload.content_type)
+
+
+@router.post("/{assignment_id}/upload-complete", response_model=schemas.SubmissionOut)
+def complete_submission_upload(
+    assignment_id: int,
+    payload: schemas.DirectUploadComplete,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    assignment = _get_assignment(db, assignment_id)
+    _ensure_submission_file_column(db)
+    _ensure_open(assignment)
+    _ensure_membership(db, assignment.classroom_id, user)
+    key = finish_direct_upload(payload.key, _submission_prefix(assignment_id, user))
+    record_upload("submission", get_storage().size(key))
+    original_name = key.rsplit("/", 1)[-1].split("_", 2)[-1]
+    submission = models.Submission(
+        user_id=user.id,
+        assignment_id=assignment.id,
+        content=payload.content.strip() if payload.content else f"{FILE_UPLOAD_PREFIX}{original_name}",
+        file_url=public_url(key),
+        submitted_at=datetime.now(timezone.utc),
+    )
+    db.add(submission)
+    db.commit()
+    db.refresh(submission)
+    background_tasks.add_task(grade_submission_in_background, submission.id)
+    background_tasks.add_task(schedule_preview, key)  # reads the object back from storage
+    return submission
+
+
+@router.post(
+    "/{assignment_id}/resumable", response_model=schemas.ResumableUploadOut, status_code=201
+)
+def create_resumable_submission_upload(
+    assignment_id: int,
+    payload: schemas.ResumableUploadIn,
+    response: Response,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Open a resumable upload for a large submission file. Send the bytes with
+    PATCH /resumable-uploads/{id}, then POST .../resumable/{id}/finalize.
+    """
+    assignment = _get_assignment(db, assignment_id)
+    _ensure_open(assignment)
+    _ensure_membership(db, assignment.classroom_id, user)
+    upload = begin_resumable_upload(
+        db,
+        user,
+        "submission",
+        assignment_id,
+        _safe_name(payload.filename),
+        payload.content_type,
+        payload.length,
+    )
+    url = f"/api/resumable-uploads/{upload.id}"
+    response.headers.update({**upload_headers(upload), "Location": url})
+    return schemas.ResumableUploadOut(
+        id=upload.id,
+        url=url,
+        offset=current_offset(upload),
+        length=upload.length,
+        expires_at=upload.expires_at,
+    )
+
+
+@router.post(
+    "/{assignment_id}/resumable/{upload_id}/finalize", response_model=schemas.SubmissionOut
+)
+def finalize_resumable_submission_upload(
+    assignment_id: int,
+    upload_id: str,
+    payload: schemas.ResumableUploadFinalize,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    assignment = _get_assignment(db, assignment_id)
+    _ensure_submission_file_column(db)
+    _ensure_open(assignment)
+    _ensure_membership(db, assignment.classroom_id, user)
+    upload, _path = finish_resumable_upload(db, upload_id, user, "submission", assignment_id)
+    now = datetime.now(timezone.utc)
+    key = f"{_submission_prefix(assignment_id, user)}{int(now.timestamp())}_{upload.filename}"
+    submission = models.Submission(
+        user_id=user.id,
+        assignment_id=assignment.id,
+        content=payload.content.strip() if payload.content else f"{FILE_UPLOAD_PREFIX}{upload.filename}",
+        file_url=public_url(key),
+        submitted_at=now,
+    )
+    db.add(submission)
+    # the Submission row and consuming the upload commit together
+    commit_resumable_upload(db, upload, key)
+    db.refresh(submission)
+    background_tasks.add_task(grade_submission_in_background, submission.id)
     return submission
 
 
@@ -1,9 +1,10 @@
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Annotated, Literal, Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, model_validator
 
 from .models import UserRole
+from .utils.previews import preview_url_for
 
 
 class OrmBase(BaseModel):
@@ -55,9 +56,16 @@ class InstructorRequestOut(OrmBase):
     status: Literal["pending", "approved", "rejected"]
     note: Optional[str] = None
     file_path: str
+    preview_url: Optional[str] = None
     user_id: int
     created_at: datetime
 
+    @model_validator(mode="after")
+    def _fill_preview_url(self):
+        if self.preview_url is None:
+            self.preview_url = preview_url_for(self.file_path)
+        return self
+
 
 class InstructorRequestAdminOut(InstructorRequestOut):
     user_email: Optional[EmailStr] = None
@@ -71,6 +79,7 @@ class AssignmentBase(BaseModel):
     classroom_id: int
     due_date: Optional[datetime] = None
     attachment_url: Optional[str] = None
+    template_id: Optional[str] = None
 
 
 class AssignmentCreate(AssignmentBase):
@@ -86,6 +95,20 @@ class AssignmentTemplate(BaseModel):
     id: str
     title: str
     description: Optional[str] = None
+    parameterized: bool = False  # description has {slots}; every student gets their own variant
+
+
+class ExerciseOut(BaseModel):
+    assignment_id: int
+    template_id: str
+    description: str
+
+
+class ExerciseVariantOut(BaseModel):
+    user_id: int
+    email: str
+    description: str
+    answer: str
 
 
 class QuizBase(BaseModel):
@@ -114,8 +137,15 @@ class SubmissionOut(SubmissionCreate, OrmBase):
     user_id: int
     grade: Optional[float]
     file_url: Optional[str] = None
+    preview_url: Optional[str] = None
     submitted_at: datetime
 
+    @model_validator(mode="after")
+    def _fill_preview_url(self):
+        if self.preview_url is None:
+            self.preview_url = preview_url_for(self.file_url)
+        return self
+
 
 class SubmissionWithUser(SubmissionOut):
     user_email: EmailStr
@@ -134,7 +164,308 @@ class MaterialCreate(MaterialBase):
 
 class MaterialOut(MaterialBase, OrmBase):
     id: int
+    preview_url: Optional[str] = None
+    created_at: datetime
+
+    @model_validator(mode="after")
+    def _fill_preview_url(self):
+        if self.preview_url is None:
+            self.preview_url = preview_url_for(self.file_url)
+        return self
+
+
+class DirectUploadIn(BaseModel):
+    filename: str
+    content_type: Optional[str] = None
+
+
+class DirectUploadOut(BaseModel):
+    key: str
+    method: Literal["PUT"]
+    url: str
+    headers: dict[str, str] = {}
+
+
+class DirectUploadComplete(BaseModel):
+    key: str
+    content: Optional[str] = None
+
+
+class ResumableUploadIn(BaseModel):
+    filename: str
+    content_type: Optional[str] = None
+    length: int = Field(gt=0)
+
+
+class ResumableUploadOut(BaseModel):
+    id: str
+    url: str
+    offset: int
+    length: int
+    expires_at: datetime
+
+
+class ResumableUploadFinalize(BaseModel):
+    content: Optional[str] = None
+
+
+class StorageGCReport(OrmBase):
+    scanned: int
+    live: int
+    orphans: int
+    quarantined: int
+    restored: int
+    deleted: int
+    reclaimed_bytes: int
+    dry_run: bool
+
+
+class ProfileTokenOut(BaseModel):
+    token: str
+    expires_at: datetime
+    header: str
+    query_param: str
+
+
+class ProfileFunction(BaseModel):
+    function: str
+    self: int
+    total: int
+
+
+class ProfileSummary(BaseModel):
+    id: str
     created_at: datetime
+    method: str
+    path: str
+    route: str | None = None
+    status: int
+    duration_ms: float
+    trigger: Literal["token", "sampled"]
+    admin_id: int | None = None
+    interval_ms: float
+    samples: int
+
+
+class ProfileOut(ProfileSummary):
+    functions: list[ProfileFunction]
+    folded: str
+
+
+class SlowQueryOut(BaseModel):
+    fingerprint: str
+    statement: str  # normalized: literals and parameters as ?
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    last_ms: float
+    first_seen: datetime
+    last_seen: datetime
+    routes: dict[str, int]
+    parameters: list | dict  # of the latest occurrence, strings and bytes redacted
+    plan: list[str] | None = None
+
+
+class GFResult(BaseModel):
+    value: int
+    hex: str
+    poly: str
+    steps: Optional[list[dict[str, int | str]]] = None
+
+
+# Batch operands and exponents are converted to int64 arrays
+BatchInt = Annotated[int, Field(ge=0, lt=1 << 63)]
+
+
+class GFBatchIn(BaseModel):
+    op: Literal["add", "mul", "inv", "pow"]
+    m: int = Field(8, ge=1, le=16)
+    mod_poly: Optional[int] = None
+    a: list[BatchInt] = Field(max_length=1 << 20)
+    b: Optional[list[BatchInt]] = Field(None, max_length=1 << 20)
+    n: Optional[BatchInt | Annotated[list[BatchInt], Field(max_length=1 << 20)]] = None
+
+
+class GFBatchOut(BaseModel):
+    values: list[int]
+
+
+class GFModulusOut(BaseModel):
+    m: int
+    value: int
+    hex: str
+    poly: str
+    weight: int
+    primitive: Optional[bool] = None  # None: unknown (2^m - 1 not factored)
+
+
+class GFModulusCheck(GFModulusOut):
+    irreducible: bool
+
+
+class GFModuliOut(BaseModel):
+    m: int
+    kind: str
+    moduli: list[GFModulusOut]
+    exhausted: bool
+    partial: bool
+
+
+class GFpEvalIn(BaseModel):
+    p: int = Field(ge=2)
+    poly: str
+    xs: list[int] = Field(max_length=1 << 20)
+
+
+class GFpFactor(BaseModel):
+    poly: str
+    coeffs: list[int]  # lowest degree first
+    multiplicity: int
+
+
+class GFpFactorOut(BaseModel):
+    p: int
+    poly: str
+    lead: int
+    factors: list[GFpFactor]
+    factorization: str
+    irreducible: bool
+
+
+class GFpFactorCheckIn(BaseModel):
+    p: int = Field(ge=2)
+    poly: str
+    answers: list[str] = Field(max_length=2000)
+
+
+class GFpFactorCheckOut(BaseModel):
+    factorization: str
+    results: list[Optional[bool]]  # None: no factorization could be read
+
+
+class GFMatrixIn(BaseModel):
+    op: Literal["rref", "rank", "inverse", "solve", "mul"]
+    m: int = Field(8, ge=1, le=16)
+    mod_poly: Optional[int] = None
+    a: list[list[int]] = Field(max_length=256)
+    b: Optional[list[list[int]]] = Field(None, max_length=256)  # solve: right-hand sides, mul: right factor
+
+
+class GFMatrixOut(BaseModel):
+    matrix: Optional[list[list[int]]] = None
+    rank: Optional[int] = None
+    pivots: Optional[list[int]] = None
+
+
+class RSCodeIn(BaseModel):
+    m: int = Field(8, ge=2, le=16)
+    mod_poly: Optional[int] = None
+    n: int = Field(ge=2)
+    k: int = Field(ge=1)
+    fcr: int = Field(1, ge=0)  # first consecutive root: g(x) has roots alpha^fcr ...
+
+
+class RSEncodeIn(RSCodeIn):
+    messages: list[list[int]] = Field(max_length=4096)
+
+
+class RSEncodeOut(BaseModel):
+    codewords: list[list[int]]
+
+
+class RSDecodeIn(RSCodeIn):
+    codewords: list[list[int]] = Field(max_length=4096)
+    trace: bool = False  # single codeword only
+
+
+class RSDecodeOut(BaseModel):
+    codewords: list[list[int]]
+    messages: list[list[int]]
+    errors: list[int]  # symbol errors corrected, -1: too many errors (word left unchanged)
+    steps: Optional[list[dict]] = None
+
+
+AESOp = Literal[
+    "encrypt",
+    "decrypt",
+    "sub_bytes",
+    "inv_sub_bytes",
+    "shift_rows",
+    "inv_shift_rows",
+    "mix_columns",
+    "inv_mix_columns",
+]
+
+
+class AESBatchIn(BaseModel):
+    op: AESOp
+    states: list[str] = Field(max_length=1 << 16)  # 32 hex digits each
+    key: Optional[str] = None  # hex, 16/24/32 bytes; encrypt/decrypt only
+
+
+class AESBatchOut(BaseModel):
+    states: list[str]
+
+
+class AESTraceIn(BaseModel):
+    key: str
+    block: str
+
+
+class AESTraceOut(BaseModel):
+    output: str
+    round_keys: list[str]
+    key_steps: list[dict[str, int | str]]
+    steps: list[dict[str, int | str]]
+
+
+class AESSboxOut(BaseModel):
+    sbox: list[int]
+    inv_sbox: list[int]
+
+
+class AESSboxEntry(BaseModel):
+    x: int
+    inverse: int
+    sbox: int
+    steps: Optional[list[dict[str, int | str]]] = None
+
+
+class ECCurveOut(BaseModel):
+    name: str
+    m: int
+    mod_poly: str  # field elements and curve parameters are hex strings
+    a: str
+    b: str
+    gx: str
+    gy: str
+    n: str
+    h: int
+
+
+class ECOpIn(BaseModel):
+    op: Literal["add", "double", "mul"]
+    curve: Optional[str] = None  # NIST name ("B-163", "K-233", ...) or m/mod_poly/a/b below
+    m: Optional[int] = Field(None, ge=2, le=571)
+    mod_poly: Optional[str] = None
+    a: Optional[str] = None
+    b: Optional[str] = None
+    p: Optional[list[str]] = Field(None, min_length=2, max_length=2)  # [x, y]; default: the generator
+    q: Optional[list[str]] = Field(None, min_length=2, max_length=2)  # add only
+    k: Optional[str] = None  # mul only, decimal or 0x hex
+    method: Literal["ladder", "projective", "affine", "fixed"] = "ladder"
+    trace: bool = False  # add, double, mul with ladder/affine
+
+
+class ECOpOut(BaseModel):
+    point: Optional[list[str]]  # None: the point at infinity
+    steps: Optional[list[dict[str, int | str | None]]] = None
+
+
+class AutoGradeOut(BaseModel):
+    graded: int
+    skipped: int
 
 
 class MFAEnrollOut(BaseModel):
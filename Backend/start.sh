@@ -1,2 +1,9 @@
 #!/usr/bin/env bash
+# Workers share metrics through files in PROMETHEUS_MULTIPROC_DIR (see core/metrics.py);
+# samples left by the previous run's workers would otherwise be counted again
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+# uvicorn takes the worker count from WEB_CONCURRENCY (default 1)
 uvicorn Backend.main:app --host 0.0.0.0 --port 8000
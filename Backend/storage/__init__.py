@@ -0,0 +1,47 @@
+"""
+Upload storage backends.
+
+Routers store and look up files by *key* (e.g. `materials/classroom_3/<digest>/ch01.pdf`)
+and never touch UPLOAD_DIR directly, so the API can run as several replicas
+against one bucket (`STORAGE_BACKEND=s3`).
+"""
+
+from functools import lru_cache
+from urllib.parse import quote
+
+from ..core.config import settings
+from .base import InvalidKey, Storage, normalize_key
+from .local import LocalStorage
+from .s3 import S3Storage
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> Storage:
+    if settings.STORAGE_BACKEND == "s3":
+        if not settings.S3_BUCKET:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        return S3Storage(
+            settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            presign_ttl=settings.S3_PRESIGN_TTL_SECONDS,
+        )
+    return LocalStorage(settings.UPLOAD_DIR)
+
+
+def public_url(key: str) -> str:
+    """URL stored in the DB; always the access-checked /uploads route."""
+    return f"{settings.backend_base_public}/uploads/{quote(normalize_key(key))}"
+
+
+__all__ = [
+    "InvalidKey",
+    "LocalStorage",
+    "S3Storage",
+    "Storage",
+    "get_storage",
+    "normalize_key",
+    "public_url",
+]
@@ -0,0 +1,76 @@
+from abc import ABC, abstractmethod
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterator
+
+
+class InvalidKey(ValueError):
+    pass
+
+
+def normalize_key(key: str) -> str:
+    """
+    Canonical storage key: relative, forward slashes, no `.`/`..` segments.
+    Keys mirror the historic layout under UPLOAD_DIR, e.g.
+    `submissions/assignment_1/user3_1764430566_report.pdf`.
+    """
+    parts = [p for p in PurePosixPath(key.replace("\\", "/")).parts if p not in ("", "/")]
+    if not parts or any(p in (".", "..") for p in parts):
+        raise InvalidKey(key)
+    return "/".join(parts)
+
+
+class Storage(ABC):
+    """Interface shared by the upload backends (see local.py / s3.py)."""
+
+    #: True when presigned URLs let clients talk to the backend directly
+    supports_direct_upload = False
+
+    @abstractmethod
+    def save(self, key: str, content: bytes, content_type: str | None = None) -> None:
+        ...
+
+    def save_file(self, key: str, path: Path, content_type: str | None = None) -> None:
+        """Store a file that is already on local disk (the source is left in place)."""
+        self.save(key, Path(path).read_bytes(), content_type)
+
+    @abstractmethod
+    def read(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """Binary stream for reading large objects chunk by chunk."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    def rename(self, src: str, dst: str) -> None:
+        """Move an object to a new key (used to quarantine orphans)."""
+        self.save(dst, self.read(src))
+        self.delete(src)
+
+    @abstractmethod
+    def iter_keys(self, prefix: str = "") -> Iterator[tuple[str, int]]:
+        """Yield (key, size) for every stored object below `prefix`."""
+
+    def local_path(self, key: str) -> Path | None:
+        """Filesystem path when the object lives on this machine, else None."""
+        return None
+
+    # Only backends with supports_direct_upload implement presigning.
+    def presign_get(self, key: str, expires_in: int | None = None) -> str:
+        raise NotImplementedError
+
+    def presign_put(
+        self, key: str, content_type: str | None = None, expires_in: int | None = None
+    ) -> dict:
+        raise NotImplementedError
@@ -0,0 +1,48 @@
+"""
+Direct-to-storage uploads: the API hands out a presigned PUT for a key it
+chose, the client uploads the bytes to the bucket, then calls the route's
+`*-complete` endpoint which re-checks the key and records the URL.
+"""
+
+import secrets
+
+from fastapi import HTTPException
+
+from ..core.config import settings
+from ..schemas import DirectUploadOut
+from ..utils.uploads import DIGEST_LEN
+from . import get_storage
+from .base import InvalidKey, normalize_key
+
+
+def unique_folder() -> str:
+    """Random folder name shaped like a content digest, so the URL is still immutable."""
+    return secrets.token_hex(DIGEST_LEN // 2)
+
+
+def begin_direct_upload(key: str, content_type: str | None) -> DirectUploadOut:
+    storage = get_storage()
+    if not storage.supports_direct_upload:
+        raise HTTPException(
+            status_code=400,
+            detail="Direct uploads need object storage; use the multipart upload endpoint",
+        )
+    presigned = storage.presign_put(key, content_type)
+    return DirectUploadOut(**presigned)
+
+
+def finish_direct_upload(key: str, expected_prefix: str) -> str:
+    """Validate a client-reported key and return it in canonical form."""
+    try:
+        key = normalize_key(key)
+    except InvalidKey:
+        raise HTTPException(status_code=400, detail="Invalid upload key")
+    if not key.startswith(expected_prefix):
+        raise HTTPException(status_code=403, detail="Upload key does not belong to this target")
+    storage = get_storage()
+    if not storage.exists(key):
+        raise HTTPException(status_code=400, detail="Upload not found in storage")
+    if storage.size(key) > settings.MAX_DIRECT_UPLOAD_BYTES:
+        storage.delete(key)
+        raise HTTPException(status_code=413, detail="File too large")
+    return key
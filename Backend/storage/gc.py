@@ -0,0 +1,161 @@
+"""
+Mark-and-sweep garbage collection for uploaded files.
+
+Mark: one streaming query over every column that points at an upload
+(assignment attachments, materials, submissions, instructor-request proofs).
+Sweep: walk the storage backend and compare. A file is only collected in stages:
+
+1. first seen unreferenced -> remembered in `storage_orphans`
+2. still unreferenced after STORAGE_GC_MIN_ORPHAN_MINUTES -> moved to
+   `.quarantine/<key>` (no longer served, still recoverable)
+3. quarantined for STORAGE_GC_GRACE_DAYS -> deleted
+
+A quarantined file that becomes referenced again is moved back. Previews
+(`previews/<key>.webp`) live and die with their source file.
+
+Run it from cron with `python -m Backend.storage.gc [--dry-run]` or through
+`POST /api/admin/storage/gc`.
+"""
+
+import argparse
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from urllib.parse import unquote, urlsplit
+
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core.config import settings
+from ..utils.previews import source_key
+from . import get_storage
+
+QUARANTINE_PREFIX = ".quarantine/"
+_LEGACY_MARKER = "submissions/"
+
+
+@dataclass
+class GCReport:
+    scanned: int = 0
+    live: int = 0
+    orphans: int = 0
+    quarantined: int = 0
+    restored: int = 0
+    deleted: int = 0
+    reclaimed_bytes: int = 0
+    dry_run: bool = False
+
+
+def _key_from_reference(value: str | None, legacy: bool = False) -> str | None:
+    if not value:
+        return None
+    if legacy:
+        # Old submissions stored a filesystem path in `content`
+        value = value.strip().replace("\\", "/")
+        index = value.find(_LEGACY_MARKER)
+        return value[index:] if index >= 0 else None
+    path = unquote(urlsplit(value).path)
+    if not path.startswith("/uploads/"):
+        return None
+    return path[len("/uploads/") :] or None
+
+
+def live_keys(db: Session) -> set[str]:
+    """Every storage key referenced from the database, in a single streaming pass."""
+    stmt = union_all(
+        select(models.Assignment.attachment_url.label("ref"), literal(False).label("legacy")),
+        select(models.Material.file_url, literal(False)),
+        select(models.Submission.file_url, literal(False)),
+        select(models.InstructorRequest.file_path, literal(False)),
+        select(models.Submission.content, literal(True)).where(
+            models.Submission.file_url.is_(None),
+            models.Submission.content.like(f"%{_LEGACY_MARKER}%"),
+        ),
+    )
+    keys: set[str] = set()
+    result = db.execute(stmt.execution_options(yield_per=2000))
+    for ref, legacy in result:
+        key = _key_from_reference(ref, bool(legacy))
+        if key:
+            keys.add(key)
+    return keys
+
+
+def _is_live(key: str, live: set[str]) -> bool:
+    return key in live or source_key(key) in live
+
+
+def collect_garbage(db: Session, *, dry_run: bool = False) -> GCReport:
+    storage = get_storage()
+    now = datetime.utcnow()
+    min_age = timedelta(minutes=settings.STORAGE_GC_MIN_ORPHAN_MINUTES)
+    grace = timedelta(days=settings.STORAGE_GC_GRACE_DAYS)
+    report = GCReport(dry_run=dry_run)
+
+    live = live_keys(db)
+    tracked = {row.key: row for row in db.query(models.StorageOrphan)}
+
+    # Quarantined files: restore if referenced again, delete once the grace period is over
+    for key, row in list(tracked.items()):
+        if row.quarantined_at is None:
+            continue
+        del tracked[key]
+        if _is_live(key, live):
+            report.restored += 1
+            if not dry_run:
+                storage.rename(f"{QUARANTINE_PREFIX}{key}", key)
+                db.delete(row)
+        elif now - row.quarantined_at >= grace:
+            report.deleted += 1
+            report.reclaimed_bytes += row.size
+            if not dry_run:
+                storage.delete(f"{QUARANTINE_PREFIX}{key}")
+                db.delete(row)
+
+    # Walk the live files
+    for key, size in storage.iter_keys():
+        if key.startswith("."):  # .quarantine/, .resumable/ on object storage, ...
+            continue
+        report.scanned += 1
+        if _is_live(key, live):
+            report.live += 1
+            continue
+        report.orphans += 1
+        row = tracked.pop(key, None)
+        if row is None:
+            if not dry_run:
+                db.add(models.StorageOrphan(key=key, size=size, first_seen_at=now))
+        elif now - row.first_seen_at >= min_age:
+            report.quarantined += 1
+            if not dry_run:
+                storage.rename(key, f"{QUARANTINE_PREFIX}{key}")
+                row.size = size
+                row.quarantined_at = now
+
+    # Tracked candidates that got referenced again or vanished on their own
+    if not dry_run:
+        for row in tracked.values():
+            db.delete(row)
+        db.commit()
+    return report
+
+
+def main() -> None:
+    from ..database import Base, SessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Collect orphaned upload files.")
+    parser.add_argument("--dry-run", action="store_true", help="only report, change nothing")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        report = collect_garbage(db, dry_run=args.dry_run)
+    finally:
+        db.close()
+    print(json.dumps(asdict(report)))
+
+
+if __name__ == "__main__":
+    main()
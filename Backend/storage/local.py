@@ -0,0 +1,82 @@
+import os
+import shutil
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from ..utils.uploads import is_text_like, write_precompressed
+from .base import Storage, normalize_key
+
+
+class LocalStorage(Storage):
+    """Files under UPLOAD_DIR, served by the /uploads route (and nginx X-Accel)."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / normalize_key(key)
+
+    def save(self, key: str, content: bytes, content_type: str | None = None) -> None:
+        dest = self._path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        # write-then-rename so readers never see a half-written file
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(content)
+        os.replace(tmp, dest)
+        write_precompressed(dest, content)
+
+    def save_file(self, key: str, path: Path, content_type: str | None = None) -> None:
+        dest = self._path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(path, tmp)  # same filesystem: no copy at all
+        except OSError:
+            shutil.copyfile(path, tmp)
+        os.replace(tmp, dest)
+        if is_text_like(dest.name):
+            write_precompressed(dest, dest.read_bytes())
+
+    def read(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def open(self, key: str) -> BinaryIO:
+        return self._path(key).open("rb")
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def size(self, key: str) -> int:
+        return self._path(key).stat().st_size
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        for candidate in (path, path.with_name(path.name + ".gz"), path.with_name(path.name + ".br")):
+            candidate.unlink(missing_ok=True)
+
+    def rename(self, src: str, dst: str) -> None:
+        src_path, dst_path = self._path(src), self._path(dst)
+        dst_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(src_path, dst_path)
+        for suffix in (".gz", ".br"):
+            sibling = src_path.with_name(src_path.name + suffix)
+            if sibling.is_file():
+                os.replace(sibling, dst_path.with_name(dst_path.name + suffix))
+
+    def iter_keys(self, prefix: str = "") -> Iterator[tuple[str, int]]:
+        base = self.root / prefix if prefix else self.root
+        for dirpath, dirnames, filenames in os.walk(base):
+            # skip temp files and internal folders such as .resumable/
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for name in filenames:
+                if name.startswith("."):
+                    continue
+                if name.endswith((".gz", ".br")) and (Path(dirpath) / name[:-3]).is_file():
+                    continue  # precompressed sibling, goes with its original
+                full = Path(dirpath) / name
+                yield full.relative_to(self.root).as_posix(), full.stat().st_size
+
+    def local_path(self, key: str) -> Path | None:
+        return self._path(key)
@@ -0,0 +1,222 @@
+"""
+Resumable uploads (tus-style) for large files over flaky connections.
+
+1. `POST .../resumable` on the target route (submission / material) checks
+   permissions and opens an upload of a declared length.
+2. `PATCH /resumable-uploads/{id}` with `Upload-Offset` appends a chunk;
+   `HEAD` reports how many bytes arrived so a client can resume after a drop.
+3. `POST .../resumable/{id}/finalize` on the target route moves the file into
+   storage and creates/updates the DB row in the same transaction that
+   consumes the upload.
+
+The bytes received so far live in a plain file on local disk, so its size is
+the upload offset. Uploads that aren't touched for RESUMABLE_UPLOAD_TTL_HOURS
+are removed by `purge_expired_uploads()`.
+"""
+
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+
+import anyio
+from fastapi import HTTPException, Request
+from sqlalchemy.orm import Session
+from starlette.requests import ClientDisconnect
+
+from .. import models
+from ..core.config import settings
+from ..core.metrics import record_upload
+from ..utils.previews import schedule_preview
+from . import get_storage
+
+try:  # advisory lock against two PATCHes racing on one upload (POSIX only)
+    import fcntl
+except ImportError:  # pragma: no cover - depends on platform
+    fcntl = None
+
+CHUNK_CONTENT_TYPE = "application/offset+octet-stream"
+
+
+def partial_path(upload_id: str) -> Path:
+    return settings.resumable_upload_dir / upload_id
+
+
+def current_offset(upload: models.ResumableUpload) -> int:
+    try:
+        return partial_path(upload.id).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _expiry() -> datetime:
+    return datetime.utcnow() + timedelta(hours=settings.RESUMABLE_UPLOAD_TTL_HOURS)
+
+
+def upload_headers(upload: models.ResumableUpload) -> dict[str, str]:
+    """tus-style status headers shared by create / HEAD / PATCH."""
+    return {
+        "Upload-Offset": str(current_offset(upload)),
+        "Upload-Length": str(upload.length),
+        "Upload-Expires": format_datetime(
+            upload.expires_at.replace(tzinfo=timezone.utc), usegmt=True
+        ),
+        "Cache-Control": "no-store",
+    }
+
+
+def begin_resumable_upload(
+    db: Session,
+    user: models.User,
+    target: str,
+    target_id: int,
+    filename: str,
+    content_type: str | None,
+    length: int,
+) -> models.ResumableUpload:
+    if length > settings.MAX_DIRECT_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="File too large")
+    upload = models.ResumableUpload(
+        id=secrets.token_urlsafe(16),
+        user_id=user.id,
+        target=target,
+        target_id=target_id,
+        filename=filename,
+        content_type=content_type,
+        length=length,
+        expires_at=_expiry(),
+    )
+    path = partial_path(upload.id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    db.add(upload)
+    db.commit()
+    db.refresh(upload)
+    return upload
+
+
+def get_resumable_upload(db: Session, upload_id: str, user: models.User) -> models.ResumableUpload:
+    upload = db.query(models.ResumableUpload).filter_by(id=upload_id, user_id=user.id).first()
+    if not upload or upload.expires_at < datetime.utcnow():
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+
+async def append_chunk(
+    db: Session, upload: models.ResumableUpload, request: Request, offset: int
+) -> int:
+    """
+    Append the request body at `offset` and return the new offset. Whatever
+    arrived before a dropped connection is kept, so the client just resumes.
+    """
+    if request.headers.get("content-type", "").split(";")[0].strip() != CHUNK_CONTENT_TYPE:
+        raise HTTPException(status_code=415, detail=f"Content-Type must be {CHUNK_CONTENT_TYPE}")
+    path = partial_path(upload.id)
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Upload not found")
+
+    async with await anyio.open_file(path, "ab") as fh:
+        if fcntl is not None:
+            try:
+                fcntl.flock(fh.wrapped.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise HTTPException(status_code=423, detail="Upload is busy")
+        written = os.fstat(fh.wrapped.fileno()).st_size
+        if offset != written:
+            raise HTTPException(status_code=409, detail="Upload-Offset mismatch")
+        try:
+            async for chunk in request.stream():
+                if written + len(chunk) > upload.length:
+                    raise HTTPException(status_code=413, detail="Chunk exceeds Upload-Length")
+                await fh.write(chunk)
+                written += len(chunk)
+        except ClientDisconnect:
+            pass
+        finally:
+            record_upload("resumable", written - offset)
+
+    upload.expires_at = _expiry()
+    db.add(upload)
+    db.commit()
+    return written
+
+
+def finish_resumable_upload(
+    db: Session, upload_id: str, user: models.User, target: str, target_id: int
+) -> tuple[models.ResumableUpload, Path]:
+    """Return the upload and its complete file, or 404/409 if it isn't ready."""
+    upload = get_resumable_upload(db, upload_id, user)
+    if upload.target != target or upload.target_id != target_id:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if current_offset(upload) != upload.length:
+        raise HTTPException(status_code=409, detail="Upload is incomplete")
+    return upload, partial_path(upload.id)
+
+
+def commit_resumable_upload(db: Session, upload: models.ResumableUpload, key: str) -> None:
+    """
+    Store the finished file under `key`, then commit the caller's pending ORM
+    changes together with consuming the upload row. A concurrent finalize of
+    the same upload loses the race with a 409 and leaves no extra DB rows.
+    """
+    path = partial_path(upload.id)
+    storage = get_storage()
+    existed = storage.exists(key)  # content-addressed keys may already be in use
+    if not existed:
+        storage.save_file(key, path, upload.content_type)
+    try:
+        claimed = (
+            db.query(models.ResumableUpload)
+            .filter_by(id=upload.id)
+            .delete(synchronize_session=False)
+        )
+        if not claimed:
+            raise HTTPException(status_code=409, detail="Upload already finalized")
+        db.commit()
+    except Exception:
+        db.rollback()
+        if not existed:
+            storage.delete(key)
+        raise
+    preview = schedule_preview(key, path) if not existed else None
+    if preview is None:
+        path.unlink(missing_ok=True)
+    else:  # the worker reads the partial file; drop it once the preview is done
+        preview.add_done_callback(lambda _future: path.unlink(missing_ok=True))
+
+
+def discard_resumable_upload(db: Session, upload: models.ResumableUpload) -> None:
+    partial_path(upload.id).unlink(missing_ok=True)
+    db.delete(upload)
+    db.commit()
+
+
+def purge_expired_uploads(db: Session) -> int:
+    """Drop expired uploads and stray partial files; returns how many were removed."""
+    now = datetime.utcnow()
+    expired = [
+        row.id
+        for row in db.query(models.ResumableUpload.id).filter(
+            models.ResumableUpload.expires_at < now
+        )
+    ]
+    if expired:
+        db.query(models.ResumableUpload).filter(
+            models.ResumableUpload.id.in_(expired)
+        ).delete(synchronize_session=False)
+        db.commit()
+    for upload_id in expired:
+        partial_path(upload_id).unlink(missing_ok=True)
+
+    # Files whose row is gone (crash between commit and unlink, DB reset, ...)
+    removed = len(expired)
+    root = settings.resumable_upload_dir
+    if root.is_dir():
+        cutoff = (now - timedelta(hours=settings.RESUMABLE_UPLOAD_TTL_HOURS)).timestamp()
+        for path in root.iterdir():
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                if not db.query(models.ResumableUpload.id).filter_by(id=path.name).first():
+                    path.unlink(missing_ok=True)
+                    removed += 1
+    return removed
@@ -0,0 +1,115 @@
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from .base import Storage, normalize_key
+
+
+class S3Storage(Storage):
+    """
+    S3-compatible bucket (AWS, MinIO, ...). Downloads and large uploads use
+    presigned URLs so file bytes never pass through the API process.
+    `boto3` is only required when this backend is selected.
+    """
+
+    supports_direct_upload = True
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+        presign_ttl: int = 900,
+        client=None,
+    ) -> None:
+        if client is None:
+            try:
+                import boto3
+            except ImportError as exc:  # pragma: no cover - depends on environment
+                raise RuntimeError("STORAGE_BACKEND=s3 requires the boto3 package") from exc
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                region_name=region,
+                aws_access_key_id=access_key_id,
+                aws_secret_access_key=secret_access_key,
+            )
+        self.client = client
+        self.bucket = bucket
+        self.presign_ttl = presign_ttl
+
+    def save(self, key: str, content: bytes, content_type: str | None = None) -> None:
+        extra = {"ContentType": content_type} if content_type else {}
+        self.client.put_object(Bucket=self.bucket, Key=normalize_key(key), Body=content, **extra)
+
+    def save_file(self, key: str, path: Path, content_type: str | None = None) -> None:
+        # upload_file switches to multipart uploads for large files
+        extra = {"ContentType": content_type} if content_type else {}
+        self.client.upload_file(str(path), self.bucket, normalize_key(key), ExtraArgs=extra)
+
+    def read(self, key: str) -> bytes:
+        obj = self.client.get_object(Bucket=self.bucket, Key=normalize_key(key))
+        return obj["Body"].read()
+
+    def open(self, key: str) -> BinaryIO:
+        # botocore's StreamingBody supports read(n) and close()
+        return self.client.get_object(Bucket=self.bucket, Key=normalize_key(key))["Body"]
+
+    def _head(self, key: str) -> dict | None:
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=normalize_key(key))
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def exists(self, key: str) -> bool:
+        return self._head(key) is not None
+
+    def size(self, key: str) -> int:
+        head = self._head(key)
+        if head is None:
+            raise FileNotFoundError(key)
+        return head["ContentLength"]
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=normalize_key(key))
+
+    def rename(self, src: str, dst: str) -> None:
+        # server-side copy; the bytes never leave the bucket
+        self.client.copy_object(
+            Bucket=self.bucket,
+            Key=normalize_key(dst),
+            CopySource={"Bucket": self.bucket, "Key": normalize_key(src)},
+        )
+        self.delete(src)
+
+    def iter_keys(self, prefix: str = "") -> Iterator[tuple[str, int]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield obj["Key"], obj["Size"]
+
+    def presign_get(self, key: str, expires_in: int | None = None) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": normalize_key(key)},
+            ExpiresIn=expires_in or self.presign_ttl,
+        )
+
+    def presign_put(
+        self, key: str, content_type: str | None = None, expires_in: int | None = None
+    ) -> dict:
+        params = {"Bucket": self.bucket, "Key": normalize_key(key)}
+        headers = {}
+        if content_type:
+            params["ContentType"] = content_type
+            headers["Content-Type"] = content_type
+        url = self.client.generate_presigned_url(
+            "put_object", Params=params, ExpiresIn=expires_in or self.presign_ttl
+        )
+        return {"method": "PUT", "url": url, "headers": headers, "key": normalize_key(key)}
@@ -0,0 +1,104 @@
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Point the app at a throwaway DB / upload dir *before* Backend is imported.
+_TMP = Path(tempfile.mkdtemp(prefix="polylab-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP / 'test.db'}"
+os.environ["UPLOAD_DIR"] = str(_TMP / "uploads")
+os.environ["AES_TABLE_PATH"] = str(_TMP / "aes-tables.bin")
+os.environ["RATE_LIMIT_PER_MINUTE"] = "100000"
+os.environ["SMTP_USER"] = ""
+os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(_TMP / "metrics")
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from Backend import models  # noqa: E402
+from Backend.core.config import settings  # noqa: E402
+from Backend.database import SessionLocal  # noqa: E402
+from Backend.main import app  # noqa: E402
+from Backend.utils.resultcache import get_result_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_result_cache():
+    """Memoized GF results would otherwise leak between tests."""
+    get_result_cache().clear()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def upload_dir() -> Path:
+    return Path(settings.UPLOAD_DIR)
+
+
+@pytest.fixture
+def make_user(db):
+    def _make(role=models.UserRole.student) -> models.User:
+        user = models.User(
+            email=f"{uuid.uuid4().hex[:10]}@example.com",
+            password_hash="x",
+            role=role,
+            email_verified=True,
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+
+    return _make
+
+
+@pytest.fixture
+def login(db, client):
+    """Give `client` a fresh session cookie for `user` (skips password/MFA)."""
+
+    def _login(user: models.User) -> TestClient:
+        sid = str(uuid.uuid4())
+        now = datetime.utcnow()
+        db.add(
+            models.Session(
+                id=sid,
+                user_id=user.id,
+                created_at=now,
+                expires_at=now + timedelta(hours=1),
+            )
+        )
+        db.commit()
+        client.cookies.set(settings.SESSION_COOKIE_NAME, sid)
+        # double-submit CSRF pair so unsafe requests pass the middleware
+        client.cookies.set(settings.CSRF_COOKIE_NAME, "test-csrf")
+        client.headers["x-csrf-token"] = "test-csrf"
+        return client
+
+    return _login
+
+
+@pytest.fixture
+def classroom(db, make_user):
+    instructor = make_user(models.UserRole.instructor)
+    room = models.Classroom(
+        name="Crypto", code=uuid.uuid4().hex[:6].upper(), instructor_id=instructor.id
+    )
+    db.add(room)
+    db.commit()
+    db.refresh(room)
+    return room
@@ -0,0 +1,95 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+from Backend.gf import aes
+
+PLAINTEXT = bytes.fromhex("00112233445566778899aabbccddeeff")
+# FIPS-197 appendix C
+VECTORS = [
+    (bytes(range(16)), "69c4e0d86a7b0430d8cdb78070b4c55a"),
+    (bytes(range(24)), "dda97ca4864cdfe06eaf70a0ec0d7191"),
+    (bytes(range(32)), "8ea2b7ca516745bfeafc49904b496089"),
+]
+
+
+@pytest.fixture
+def tables(tmp_path):
+    return aes.get_aes_tables(str(tmp_path / "aes.bin"))
+
+
+def test_derived_tables(tables):
+    assert tables.sbox[0] == 0x63 and tables.sbox[0x53] == 0xED and tables.inv_sbox[0xED] == 0x53
+    assert sorted(tables.sbox.tolist()) == list(range(256))
+    assert aes.sbox_entry(0x53) == {"x": 0x53, "inverse": 0xCA, "sbox": 0xED}
+    assert [aes.rcon(i) for i in range(1, 11)] == [1, 2, 4, 8, 16, 32, 64, 128, 0x1B, 0x36]
+    assert tables.mul[0x57, 0x13] == 0xFE
+
+
+def test_table_file_is_shared_and_rebuilt(tmp_path):
+    path = tmp_path / "aes.bin"
+    first = aes.get_aes_tables(str(path))
+    assert not first.sbox.flags.owndata and not first.sbox.flags.writeable  # a read-only mapping
+    assert path.stat().st_size == len(aes.build_tables())
+    path.write_bytes(b"garbage")
+    aes.get_aes_tables.cache_clear()
+    assert aes.get_aes_tables(str(path)).sbox[1] == 0x7C
+
+
+def test_tampered_table_file_is_rebuilt(tmp_path):
+    assert hashlib.sha256(aes.build_tables()).hexdigest() == aes.TABLES_SHA256
+    path = tmp_path / "aes.bin"
+    poisoned = bytearray(aes.build_tables())
+    poisoned[-512] ^= 0xFF  # same size and magic, different S-box
+    path.write_bytes(bytes(poisoned))
+    assert aes.get_aes_tables(str(path)).sbox[0] == 0x63
+    assert path.read_bytes() == aes.build_tables()
+
+
+@pytest.mark.parametrize("key, expected", VECTORS)
+def test_fips_197_vectors(tables, key, expected):
+    round_keys = aes.expand_key(key, tables)
+    states = aes.as_states([list(PLAINTEXT)] * 3)
+    cipher = aes.encrypt(states, round_keys, tables)
+    assert {row.tobytes().hex() for row in cipher} == {expected}
+    assert (aes.decrypt(cipher, round_keys, tables) == states).all()
+    output, _round_keys, key_steps, steps = aes.encrypt_trace(PLAINTEXT, key, tables)
+    assert output.hex() == expected and steps[-1]["state"] == expected
+    assert len(key_steps) == 4 * len(round_keys) - len(key) // 4
+
+
+def test_round_functions(tables):
+    column = aes.as_states([[0xDB, 0x13, 0x53, 0x45] * 4])
+    assert aes.mix_columns(column, tables)[0, :4].tolist() == [0x8E, 0x4D, 0xA1, 0xBC]
+    states = aes.as_states(np.random.default_rng(1).integers(0, 256, (500, 16)))
+    assert (aes.inv_mix_columns(aes.mix_columns(states, tables), tables) == states).all()
+    assert (aes.inv_shift_rows(aes.shift_rows(states)) == states).all()
+    assert (aes.inv_sub_bytes(aes.sub_bytes(states, tables), tables) == states).all()
+    # the last expanded word for the FIPS-197 appendix A.1 key
+    round_keys = aes.expand_key(bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c"), tables)
+    assert round_keys[-1].tobytes().hex() == "d014f9a8c9ee2589e13f0cc8b6630ca6"
+
+
+def test_aes_endpoints(login, make_user):
+    client = login(make_user())
+    key = bytes(range(16)).hex()
+    resp = client.post("/api/gf/aes/batch", json={"op": "encrypt", "key": key, "states": [PLAINTEXT.hex()] * 2})
+    assert resp.json()["states"] == [VECTORS[0][1]] * 2
+    back = client.post("/api/gf/aes/batch", json={"op": "decrypt", "key": key, "states": resp.json()["states"]})
+    assert back.json()["states"] == [PLAINTEXT.hex()] * 2
+    mixed = client.post("/api/gf/aes/batch", json={"op": "mix_columns", "states": ["db135345" * 4]})
+    assert mixed.json()["states"] == ["8e4da1bc" * 4]
+
+    trace = client.post("/api/gf/aes/trace", json={"key": key, "block": PLAINTEXT.hex()}).json()
+    assert trace["output"] == VECTORS[0][1] and len(trace["round_keys"]) == 11
+    assert [s["kind"] for s in trace["steps"][:6]] == [
+        "input", "AddRoundKey", "SubBytes", "ShiftRows", "MixColumns", "AddRoundKey"
+    ]
+    entry = client.get("/api/gf/aes/sbox/entry", params={"x": "0x53", "trace": True}).json()
+    assert entry["sbox"] == 0xED and entry["steps"][-1]["kind"] == "mod"
+    assert client.get("/api/gf/aes/sbox").json()["inv_sbox"][0x63] == 0
+
+    assert client.post("/api/gf/aes/batch", json={"op": "encrypt", "states": ["00" * 16]}).status_code == 400
+    assert client.post("/api/gf/aes/batch", json={"op": "sub_bytes", "states": ["00" * 15]}).status_code == 400
+    assert client.post("/api/gf/aes/trace", json={"key": "00" * 20, "block": "00" * 16}).status_code == 400
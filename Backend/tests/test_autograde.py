@@ -0,0 +1,93 @@
+import pytest
+
+from Backend import models
+from Backend.utils.autograde import answer_key, parse_gf2_poly, score
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("x^4 + x + 1", 0x13),
+        ("x⁴ + x + 1", 0x13),
+        ("0x13", 0x13),
+        ("x^2+x^2+1", 1),
+        ("3x^2 + 2x + 1", 0x5),
+        ("x + y", None),
+        ("banana", None),
+    ],
+)
+def test_parse_gf2_poly(text, expected):
+    assert parse_gf2_poly(text) == expected
+
+
+def test_answer_keys_come_from_the_engine():
+    assert answer_key("gf-addition").polys == (0x1B, 0xE7)
+    assert answer_key("gf-multiplication").polys == (0x4,)
+    assert answer_key("gf-irreducible").irreducible is True
+    assert answer_key("gf-eval").value == 0
+
+
+def test_score_per_template():
+    assert score("gf-addition", "1) x⁴ + x³ + x + 1\n2) x^7 + x^6 + x^5 + x^2 + x + 1") == 100
+    assert score("gf-addition", "1) 0x1B\n2) x^7") == 50
+    assert score("gf-multiplication", "(x^2+1)(x+1) = x^3 + x^2 + x + 1\n= x^2 (mod x^3 + x + 1)") == 100
+    assert score("gf-multiplication", "x + 1") == 0
+    assert score("gf-irreducible", "It is irreducible: no roots and not divisible by x^2+x+1") == 100
+    assert score("gf-irreducible", "It is not irreducible") == 0
+    assert score("gf-eval", "7 = 2 mod 5\nf(2) = 45 = 0 (mod 5)") == 100
+    assert score("gf-eval", "File upload: answer.pdf") is None
+    assert score("gf-multiplication", "File upload: answer.pdf") is None
+
+
+def test_file_names_and_prose_are_not_graded_as_values():
+    assert score("gf-eval", "File upload: hw0.pdf") is None
+    assert score("gf-eval", "File upload: hw3.pdf") is None
+    assert score("gf-irreducible", "File upload: irreducible.pdf") is None
+    assert score("gf-eval", "see page 2") is None
+    assert score("gf-eval", "f(2) = 3") == 0
+
+
+def test_autograde_endpoint_and_background_hook(login, db, classroom, make_user):
+    instructor = db.get(models.User, classroom.instructor_id)
+    resp = login(instructor).post(
+        "/api/assignments/",
+        json={
+            "title": "Mult",
+            "classroom_id": classroom.id,
+            "template_id": "gf-multiplication",
+        },
+    )
+    assert resp.status_code == 200
+    assignment_id = resp.json()["id"]
+    assert resp.json()["template_id"] == "gf-multiplication"
+
+    students = [make_user() for _ in range(3)]
+    for student in students:
+        db.add(models.ClassroomMember(classroom_id=classroom.id, user_id=student.id))
+    db.commit()
+    # rows inserted behind the API's back are only picked up by the batch pass
+    for student, content in zip(students, ["x^2", "x + 1", "see attached"]):
+        db.add(models.Submission(user_id=student.id, assignment_id=assignment_id, content=content))
+    db.commit()
+
+    resp = login(instructor).post(f"/api/assignments/{assignment_id}/autograde")
+    assert resp.json() == {"graded": 2, "skipped": 1}
+    grades = {
+        s.content: s.grade
+        for s in db.query(models.Submission).filter_by(assignment_id=assignment_id)
+    }
+    assert grades == {"x^2": 100, "x + 1": 0, "see attached": None}
+
+    # new submissions are graded right away by the background hook
+    resp = login(students[0]).post(
+        "/api/submissions/", json={"assignment_id": assignment_id, "content": "0x4"}
+    )
+    assert resp.status_code == 200
+    db.expire_all()
+    assert db.get(models.Submission, resp.json()["id"]).grade == 100
+
+    assert login(students[0]).post(f"/api/assignments/{assignment_id}/autograde").status_code == 403
+    bad = login(instructor).post(
+        "/api/assignments/", json={"title": "x", "classroom_id": classroom.id, "template_id": "nope"}
+    )
+    assert bad.status_code == 400
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from Backend import models
+from Backend.core.config import settings
+from Backend.gf.irreducible import order_factors
+from Backend.utils import compute
+
+
+@pytest.fixture
+def tier(monkeypatch):
+    compute.shutdown()
+    monkeypatch.setattr(settings, "COMPUTE_WORKERS", 1)
+    monkeypatch.setattr(settings, "COMPUTE_QUEUE_SIZE", 0)
+    yield compute
+    compute.shutdown()
+
+
+def test_cpu_time_limit(tier, monkeypatch):
+    monkeypatch.setattr(settings, "COMPUTE_CPU_SECONDS", 1)
+    started = time.monotonic()
+    with pytest.raises(compute.ComputeTimeLimit):
+        # Pollard-Brent on 2^571 - 1 with an effectively unlimited budget
+        asyncio.run(compute.run_compute(order_factors, 571, 10**12))
+    assert time.monotonic() - started < 10
+    # the worker survives and takes the next job
+    assert asyncio.run(compute.run_compute(order_factors, 11)) == (23, 89)
+    assert tier.metrics()["timed_out"] == 1
+
+
+def test_workers_are_recycled(tier, monkeypatch):
+    monkeypatch.setattr(settings, "COMPUTE_MAX_TASKS_PER_WORKER", 2)
+    pids = [asyncio.run(compute.run_compute(os.getpid)) for _ in range(3)]
+    assert pids[0] == pids[1] != pids[2]
+
+
+def test_saturated_tier_rejects_math_but_not_other_requests(tier, client, login, make_user):
+    busy = compute.submit(time.sleep, 2)
+
+    resp = client.get("/api/gf/inv", params={"a": 3, "m": 163})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == str(settings.COMPUTE_RETRY_AFTER_SECONDS)
+    # reducing more than a product's worth of bits leaves the event loop even for m = 8
+    assert client.get("/api/gf/mod", params={"x": hex(1 << 4000), "m": 8}).status_code == 503
+    assert client.get("/api/gf/moduli/sample", params={"m": 163, "count": 3}).status_code == 503
+    assert client.get("/api/gf/moduli", params={"m": 233, "kind": "trinomial"}).status_code == 503
+
+    # small fields never leave the API process, other routes are unaffected
+    assert client.get("/api/gf/mul", params={"a": "0x57", "b": "0x13"}).json()["value"] == 0xFE
+    started = time.monotonic()
+    assert client.get("/health").status_code == 200
+    assert time.monotonic() - started < 0.5
+
+    admin = login(make_user(models.UserRole.admin))
+    metrics = admin.get("/api/admin/compute").json()
+    assert metrics["running"] == 1 and metrics["queue_depth"] == 0
+    assert metrics["rejected"] >= 1 and metrics["capacity"] == 1
+
+    busy.result(timeout=10)
+    assert client.get("/api/gf/inv", params={"a": 3, "m": 163}).status_code == 200
+    assert admin.get("/api/admin/compute").json()["exec_ms"]["max"] >= 2000
@@ -0,0 +1,116 @@
+import time
+
+import pytest
+
+from Backend import models
+from Backend.gf import GFConfig, as_poly_string, gf_mul
+from Backend.utils.autograde import parse_gf2_poly, score
+from Backend.utils.exercises import EXERCISE_TEMPLATES, AnswerKey, generate, publish, variant_seed
+
+
+@pytest.mark.parametrize("template_id", list(EXERCISE_TEMPLATES))
+def test_variants_are_deterministic_and_differ(template_id):
+    assert generate(template_id, variant_seed(1, 2)) == generate(template_id, variant_seed(1, 2))
+    texts = {generate(template_id, variant_seed(1, user_id))[0] for user_id in range(40)}
+    assert len(texts) > 20
+    text, key = generate(template_id, variant_seed(7, 7))
+    assert "{" not in text
+    assert AnswerKey.from_json(key.to_json()) == key
+
+
+def test_multiplication_key_matches_the_text():
+    text, key = generate("gf-multiplication-random", variant_seed(3, 4))
+    # "Compute (a) · (b) over GF(2), then reduce modulo the irreducible polynomial f."
+    a, b = (parse_gf2_poly(part.strip("() ")) for part in text.split("Compute ")[1].split(" over")[0].split("·"))
+    mod = parse_gf2_poly(text.rsplit("polynomial ", 1)[1])
+    assert key.polys == (gf_mul(a, b, GFConfig(mod.bit_length() - 1, mod)),)
+    assert score("gf-multiplication-random", as_poly_string(key.polys[0]), key) == 100
+
+
+def _answer(key: AnswerKey) -> str:
+    if key.irreducible is not None:
+        return "irreducible" if key.irreducible else "It is not irreducible"
+    if key.value is not None:
+        return f"f(x) = {key.value}"
+    return "\n".join(f"{i}) {as_poly_string(p)}" for i, p in enumerate(key.polys, 1))
+
+
+def test_parameterized_assignment_flow(login, db, classroom, make_user):
+    students = [make_user() for _ in range(3)]
+    for student in students:
+        db.add(models.ClassroomMember(classroom_id=classroom.id, user_id=student.id))
+    db.commit()
+    instructor = db.get(models.User, classroom.instructor_id)
+    templates = login(instructor).get("/api/assignments/templates").json()
+    assert any(t["parameterized"] and t["id"] == "gf-inverse-random" for t in templates)
+
+    resp = login(instructor).post(
+        "/api/assignments/",
+        json={"title": "Inverse", "classroom_id": classroom.id, "template_id": "gf-inverse-random"},
+    )
+    assignment_id = resp.json()["id"]
+    variants = login(instructor).get(f"/api/assignments/{assignment_id}/variants").json()
+    assert sorted(v["user_id"] for v in variants) == sorted(s.id for s in students)
+
+    exercise = login(students[0]).get(f"/api/assignments/{assignment_id}/exercise").json()
+    mine = next(v for v in variants if v["user_id"] == students[0].id)
+    assert exercise["description"] == mine["description"]
+
+    # a student who joins later gets a variant on first lookup
+    late = make_user()
+    db.add(models.ClassroomMember(classroom_id=classroom.id, user_id=late.id))
+    db.commit()
+    assert login(late).get(f"/api/assignments/{assignment_id}/exercise").status_code == 200
+
+    # each submission is graded against its author's own key
+    resp = login(students[0]).post(
+        "/api/submissions/", json={"assignment_id": assignment_id, "content": mine["answer"]}
+    )
+    other = next(v for v in variants if v["user_id"] == students[1].id)
+    db.add(models.Submission(user_id=students[1].id, assignment_id=assignment_id, content=mine["answer"]))
+    db.add(models.Submission(user_id=students[2].id, assignment_id=assignment_id, content="see attached"))
+    db.commit()
+    db.expire_all()
+    assert db.get(models.Submission, resp.json()["id"]).grade == 100
+    assert login(instructor).post(f"/api/assignments/{assignment_id}/autograde").json() == {
+        "graded": 1,
+        "skipped": 1,
+    }
+    graded = db.query(models.Submission).filter_by(assignment_id=assignment_id, user_id=students[1].id).one()
+    assert graded.grade == (100 if other["answer"] == mine["answer"] else 0)
+
+    outsider = make_user()
+    assert login(outsider).get(f"/api/assignments/{assignment_id}/exercise").status_code == 403
+    assert login(students[0]).get(f"/api/assignments/{assignment_id}/variants").status_code == 403
+
+
+def test_publishing_500_students_is_fast(db, classroom, make_user):
+    users = [models.User(email=f"bulk{i}-{classroom.id}@example.com", password_hash="x") for i in range(500)]
+    db.add_all(users)
+    db.flush()
+    db.add_all(models.ClassroomMember(classroom_id=classroom.id, user_id=u.id) for u in users)
+    assignment = models.Assignment(title="Eval", classroom_id=classroom.id, template_id="gf-eval-random")
+    db.add(assignment)
+    db.commit()
+
+    start = time.perf_counter()
+    assert publish(db, assignment) == 500
+    assert time.perf_counter() - start < 2.0
+    variant = db.query(models.ExerciseVariant).filter_by(assignment_id=assignment.id, user_id=users[9].id).one()
+    text, key = generate("gf-eval-random", variant_seed(assignment.id, users[9].id))
+    assert variant.description == text
+    assert score("gf-eval-random", _answer(key), AnswerKey.from_json(variant.answer)) == 100
+
+
+def test_clearing_the_template_drops_all_variants(db, classroom, make_user):
+    student = make_user()
+    db.add(models.ClassroomMember(classroom_id=classroom.id, user_id=student.id))
+    assignment = models.Assignment(title="Eval", classroom_id=classroom.id, template_id="gf-eval-random")
+    db.add(assignment)
+    db.commit()
+    assert publish(db, assignment) == 1
+
+    assignment.template_id = None
+    db.commit()
+    assert publish(db, assignment) == 0
+    assert db.query(models.ExerciseVariant).filter_by(assignment_id=assignment.id).count() == 0
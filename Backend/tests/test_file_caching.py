@@ -0,0 +1,69 @@
+import gzip
+
+from Backend import models
+
+
+def _upload_material(client, db, classroom, name: str, content: bytes) -> str:
+    material = models.Material(classroom_id=classroom.id, title="Notes")
+    db.add(material)
+    db.commit()
+    resp = client.post(
+        f"/api/materials/{material.id}/upload",
+        files={"file": (name, content, "application/octet-stream")},
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()["file_url"].split("://", 1)[1].split("/", 1)[1]
+
+
+def test_reupload_gets_new_immutable_url(login, db, classroom):
+    client = login(db.get(models.User, classroom.instructor_id))
+    first = _upload_material(client, db, classroom, "ch01.pdf", b"%PDF v1")
+    second = _upload_material(client, db, classroom, "ch01.pdf", b"%PDF v2")
+    assert first != second
+
+    resp = client.get(f"/{first}")
+    assert resp.status_code == 200
+    assert resp.content == b"%PDF v1"
+    assert "immutable" in resp.headers["cache-control"]
+    assert resp.headers["etag"] == f'"{first.split("/")[-2]}"'
+
+    again = client.get(f"/{first}", headers={"If-None-Match": resp.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+
+
+def test_byte_ranges(login, db, classroom):
+    client = login(db.get(models.User, classroom.instructor_id))
+    body = bytes(range(256)) * 8
+    path = "/" + _upload_material(client, db, classroom, "big.pdf", body)
+
+    part = client.get(path, headers={"Range": "bytes=10-19"})
+    assert part.status_code == 206
+    assert part.content == body[10:20]
+    assert part.headers["content-range"] == f"bytes 10-19/{len(body)}"
+
+    tail = client.get(path, headers={"Range": "bytes=-5"})
+    assert tail.content == body[-5:]
+
+    stale = client.get(path, headers={"Range": "bytes=0-3", "If-Range": '"other"'})
+    assert stale.status_code == 200 and stale.content == body
+
+    bad = client.get(path, headers={"Range": f"bytes={len(body)}-"})
+    assert bad.status_code == 416
+    assert bad.headers["content-range"] == f"bytes */{len(body)}"
+
+
+def test_precompressed_variant_for_text(login, db, classroom):
+    client = login(db.get(models.User, classroom.instructor_id))
+    text = b"x^4 + x + 1 is irreducible over GF(2)\n" * 100
+    path = "/" + _upload_material(client, db, classroom, "notes.txt", text)
+
+    resp = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert resp.content == text  # httpx decodes transparently
+    assert int(resp.headers["content-length"]) == len(gzip.compress(text, mtime=0))
+
+    plain = client.get(path, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] != resp.headers["etag"]
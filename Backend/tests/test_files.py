@@ -0,0 +1,76 @@
+from urllib.parse import urlparse
+
+from Backend import models
+from Backend.core.config import settings
+from Backend.utils.signing import sign_upload_uri, verify_upload_signature
+
+
+def _material_file(upload_dir, classroom_id: int, name="notes.pdf") -> str:
+    folder = upload_dir / "materials" / f"classroom_{classroom_id}"
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / name).write_bytes(b"%PDF-1.4 test")
+    return f"/uploads/materials/classroom_{classroom_id}/{name}"
+
+
+def test_signature_roundtrip_and_expiry():
+    signed, expires = sign_upload_uri("/uploads/proofs/a b.png", ttl_seconds=60)
+    query = dict(p.split("=", 1) for p in urlparse(signed).query.split("&"))
+    assert signed.startswith("/uploads/proofs/a%20b.png?")
+    assert verify_upload_signature("/uploads/proofs/a b.png", query["expires"], query["sig"])
+    assert not verify_upload_signature("/uploads/proofs/other.png", query["expires"], query["sig"])
+    assert not verify_upload_signature("/uploads/proofs/a b.png", str(expires + 1), query["sig"])
+
+    stale, _ = sign_upload_uri("/uploads/x", ttl_seconds=-1)
+    stale_q = dict(p.split("=", 1) for p in urlparse(stale).query.split("&"))
+    assert not verify_upload_signature("/uploads/x", stale_q["expires"], stale_q["sig"])
+
+
+def test_download_requires_membership(client, db, classroom, make_user, login, upload_dir):
+    uri = _material_file(upload_dir, classroom.id)
+    member = make_user()
+    outsider = make_user()
+    db.add(models.ClassroomMember(classroom_id=classroom.id, user_id=member.id))
+    db.commit()
+
+    assert client.get(uri).status_code == 401
+    assert login(outsider).get(uri).status_code == 403
+
+    resp = login(member).get(uri)
+    assert resp.status_code == 200
+    assert resp.content == b"%PDF-1.4 test"
+
+
+def test_signed_url_works_without_session(client, db, classroom, make_user, login, upload_dir):
+    uri = _material_file(upload_dir, classroom.id, "signed.pdf")
+    instructor = db.get(models.User, classroom.instructor_id)
+
+    resp = login(instructor).get(
+        "/api/files/signed-url",
+        params={"url": f"{settings.backend_base_public}{uri}"},
+    )
+    assert resp.status_code == 200
+    signed = urlparse(resp.json()["url"])
+
+    client.cookies.clear()
+    anon = client.get(f"{signed.path}?{signed.query}")
+    assert anon.status_code == 200
+    assert anon.content == b"%PDF-1.4 test"
+
+
+def test_path_traversal_is_rejected(make_user, login):
+    admin = make_user(models.UserRole.admin)
+    resp = login(admin).get("/uploads/..%2F..%2Fetc%2Fpasswd")
+    assert resp.status_code == 404
+
+
+def test_accel_redirect_hands_off_to_nginx(classroom, db, login, upload_dir, monkeypatch):
+    uri = _material_file(upload_dir, classroom.id, "big.pdf")
+    instructor = db.get(models.User, classroom.instructor_id)
+    monkeypatch.setattr(settings, "FILES_ACCEL_REDIRECT", True)
+
+    resp = login(instructor).get(uri)
+    assert resp.status_code == 200
+    assert resp.content == b""
+    assert resp.headers["x-accel-redirect"] == (
+        f"{settings.FILES_ACCEL_PREFIX}materials/classroom_{classroom.id}/big.pdf"
+    )
@@ -0,0 +1,103 @@
+"""Mirrors Frontend/src/lib/gf2m.test.ts against the Python engine."""
+
+import pytest
+
+from Backend.gf import IRRED_DEFAULTS, GFConfig, get_tables, gf_add, gf_inv, gf_mod, gf_mul, gf_pow
+
+
+def naive_reduce(p: int, mod_poly: int, m: int) -> int:
+    deg_mod = mod_poly.bit_length() - 1
+    while p.bit_length() - 1 >= deg_mod:
+        p ^= mod_poly << (p.bit_length() - 1 - deg_mod)
+    return p & ((1 << m) - 1)
+
+
+def naive_mul(a: int, b: int, mod_poly: int, m: int) -> int:
+    res = 0
+    while b:
+        if b & 1:
+            res ^= a
+        a <<= 1
+        b >>= 1
+    return naive_reduce(res, mod_poly, m)
+
+
+FIELDS = sorted(IRRED_DEFAULTS.items())
+
+
+def test_irred_defaults_match_frontend():
+    assert IRRED_DEFAULTS == {2: 0x7, 3: 0xB, 4: 0x13, 5: 0x25, 6: 0x43, 7: 0x89, 8: 0x11B}
+
+
+@pytest.mark.parametrize("m,mod_poly", FIELDS)
+def test_mul_inv_pow_match_naive(m, mod_poly):
+    cfg = GFConfig(m, mod_poly)
+    size = 1 << m
+    assert get_tables(m, mod_poly) is not None
+    for a in range(size):
+        for b in range(size):
+            assert gf_mul(a, b, cfg) == naive_mul(a, b, mod_poly, m)
+        if a:
+            inv = gf_inv(a, cfg)
+            assert naive_mul(a, inv, mod_poly, m) == 1
+            assert gf_inv(a, cfg, []) == inv  # traced EEA path agrees with the tables
+            assert gf_pow(a, size - 1, cfg) == 1
+        for n in (0, 1, 2, 3, 4, 5, 7, size - 1):
+            expected = 1
+            for _ in range(n):
+                expected = naive_mul(expected, a, mod_poly, m)
+            assert gf_pow(a, n, cfg) == expected
+            assert gf_pow(a, n, cfg, []) == expected
+
+
+@pytest.mark.parametrize("m,mod_poly", FIELDS)
+def test_mod_matches_naive(m, mod_poly):
+    cfg = GFConfig(m, mod_poly)
+    for x in range(1 << (2 * m)):
+        assert gf_mod(x, cfg) == naive_reduce(x, mod_poly, m)
+    for a in range(1 << m):
+        assert gf_mod(a, cfg) == a
+
+
+def test_aes_golden_vectors_and_traces():
+    cfg = GFConfig(8, 0x11B)
+    assert gf_add(0x57, 0x13) == 0x44
+    assert gf_mul(0x57, 0x13, cfg) == 0xFE
+    assert gf_pow(0x57, 2, cfg) == 0xA5
+    assert gf_mul(0x57, gf_inv(0x57, cfg), cfg) == 1
+
+    steps = []
+    assert gf_mul(0x57, 0x13, cfg, steps) == 0xFE
+    assert [s["kind"] for s in steps[:8]] == ["mul"] * 8
+    raw = steps[7]["pAfter"]
+    assert raw == naive_mul(0x57, 0x13, 1 << 20, 20)  # unreduced carry-less product
+    assert steps[-1] == {"kind": "mod", "before": raw, "after": 0xFE}
+    with pytest.raises(ValueError):
+        gf_inv(0, cfg)
+
+
+def test_large_and_reducible_fields_use_shift_and_add():
+    # x^8 + 1 is reducible: no tables, but multiplication is still defined
+    assert get_tables(8, 0x101) is None
+    cfg = GFConfig(8, 0x101)
+    assert gf_mul(0x57, 0x13, cfg) == naive_mul(0x57, 0x13, 0x101, 8)
+    big = GFConfig(163, (1 << 163) | (1 << 7) | (1 << 6) | (1 << 3) | 1)
+    a = (1 << 162) | 0x1234
+    assert get_tables(163, big.mod_poly) is None
+    assert gf_mul(a, gf_inv(a, big), big) == 1
+
+
+def test_gf_endpoints(client):
+    resp = client.get("/api/gf/mul", params={"a": "0x57", "b": "0x13", "m": 8})
+    assert resp.status_code == 200
+    assert resp.json()["value"] == 0xFE and resp.json()["hex"] == "0xFE"
+    assert resp.json()["steps"] is None
+
+    traced = client.get("/api/gf/pow", params={"a": "0x57", "n": 2, "trace": "true"}).json()
+    assert traced["value"] == 0xA5 and traced["steps"][-1]["kind"] == "exp"
+
+    assert client.get("/api/gf/add", params={"a": "0x57", "b": "0x13"}).json()["value"] == 0x44
+    assert client.get("/api/gf/inv", params={"a": 0, "m": 8}).status_code == 400
+    assert client.get("/api/gf/mul", params={"a": 1, "b": 1, "m": 12}).status_code == 400
+    assert client.get("/api/gf/mul", params={"a": 1, "b": 1, "m": 4, "mod_poly": "0x11B"}).status_code == 400
+    assert client.get("/api/gf/irreducibles").json()["8"]["hex"] == "0x11B"
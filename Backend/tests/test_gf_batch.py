@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from Backend.gf import IRRED_DEFAULTS, GFConfig, gf_inv, gf_mul, gf_pow
+from Backend.gf.batch import batch_add, batch_inv, batch_mul, batch_pow, table_bytes
+
+AES = (8, IRRED_DEFAULTS[8])
+
+
+@pytest.mark.parametrize("m,mod_poly", [AES, (4, 0x13), (16, 0x1100B)])
+def test_batch_ops_match_scalar(m, mod_poly):
+    cfg = GFConfig(m, mod_poly)
+    rng = np.random.default_rng(1)
+    a = rng.integers(0, 1 << m, 2000)
+    b = rng.integers(0, 1 << m, 2000)
+    n = rng.integers(0, 1 << 20, 2000)
+    assert batch_add(a, b, m).tolist() == (a ^ b).tolist()
+    assert batch_mul(a, b, m, mod_poly).tolist() == [gf_mul(int(x), int(y), cfg) for x, y in zip(a, b)]
+    assert batch_pow(a, n, m, mod_poly).tolist() == [gf_pow(int(x), int(k), cfg) for x, k in zip(a, n)]
+    nonzero = a[a != 0]
+    assert batch_inv(nonzero, m, mod_poly).tolist() == [gf_inv(int(x), cfg) for x in nonzero]
+    with pytest.raises(ValueError):
+        batch_inv([0], m, mod_poly)
+
+
+def test_full_tables_are_compact_and_correct():
+    data, shape, dtype = table_bytes("mul", *AES)
+    assert (shape, dtype, len(data)) == ((256, 256), "uint8", 65536)
+    table = np.frombuffer(data, dtype=np.uint8).reshape(shape)
+    assert table[0x57, 0x13] == 0xFE
+
+    data, shape, dtype = table_bytes("inv", 16, 0x1100B)
+    assert (shape, dtype) == ((65536,), "uint16")
+    inv = np.frombuffer(data, dtype="<u2")
+    assert inv[0] == 0 and gf_mul(1234, int(inv[1234]), GFConfig(16, 0x1100B)) == 1
+    with pytest.raises(ValueError):
+        table_bytes("mul", 16, 0x1100B)
+
+
+def test_batch_and_table_endpoints(login, make_user):
+    client = login(make_user())
+    resp = client.post("/api/gf/batch", json={"op": "mul", "m": 8, "a": [0x57, 0, 2], "b": [0x13]})
+    assert resp.json() == {"values": [0xFE, 0, gf_mul(2, 0x13, GFConfig(*AES))]}
+    resp = client.post("/api/gf/batch", json={"op": "pow", "m": 8, "a": [0x57], "n": 2})
+    assert resp.json() == {"values": [0xA5]}
+    assert client.post("/api/gf/batch", json={"op": "inv", "m": 8, "a": [0]}).status_code == 400
+    assert client.post("/api/gf/batch", json={"op": "mul", "m": 8, "a": [1, 2], "b": [1, 2, 3]}).status_code == 400
+    # operands and exponents must fit in int64 (they used to overflow into a 500)
+    assert client.post("/api/gf/batch", json={"op": "mul", "a": [2**70], "b": [3]}).status_code == 422
+    assert client.post("/api/gf/batch", json={"op": "pow", "a": [3], "n": 2**70}).status_code == 422
+    assert client.post("/api/gf/batch", json={"op": "pow", "a": [3], "n": [2**63]}).status_code == 422
+    assert client.post("/api/gf/batch", json={"op": "pow", "a": [3], "n": [1] * ((1 << 20) + 1)}).status_code == 422
+    assert client.post("/api/gf/batch", json={"op": "pow", "a": [3], "n": 2**63 - 1}).status_code == 200
+
+    resp = client.get("/api/gf/tables/inv", params={"m": 8})
+    assert resp.status_code == 200
+    assert "immutable" in resp.headers["cache-control"]
+    assert resp.headers["x-gf-dtype"] == "uint8" and len(resp.content) == 256
+    assert client.get("/api/gf/tables/mul", params={"m": 16, "mod_poly": "0x1100B"}).status_code == 400
+    assert client.get("/api/gf/tables/nope", params={"m": 8}).status_code == 404
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from Backend.gf import NIST_MODULI, GFConfig, clmul, clsquare, gf_inv, gf_mod, gf_mul, gf_pow, reducer
+from Backend.gf import bigfield
+from Backend.gf.bigfield import inv_eea, inv_itoh_tsujii
+
+FIELDS = sorted(NIST_MODULI.items())
+
+
+def naive_clmul(a: int, b: int) -> int:
+    res = 0
+    while b:
+        if b & 1:
+            res ^= a
+        a <<= 1
+        b >>= 1
+    return res
+
+
+def naive_reduce(p: int, mod_poly: int) -> int:
+    m = mod_poly.bit_length() - 1
+    while p.bit_length() > m:
+        p ^= mod_poly << (p.bit_length() - 1 - m)
+    return p
+
+
+def test_clmul_and_square_match_schoolbook(monkeypatch):
+    rng = random.Random(1)
+    for bits in (1, 7, 64, 163, 571, 1200):
+        a, b = rng.getrandbits(bits), rng.getrandbits(bits)
+        assert clmul(a, b) == naive_clmul(a, b)
+        assert clsquare(a) == naive_clmul(a, a)
+    assert clmul(0, 5) == 0 and clsquare(0) == 0
+
+    monkeypatch.setattr(bigfield, "KARATSUBA_THRESHOLD", 32)
+    a, b = rng.getrandbits(571), rng.getrandbits(560)
+    assert clmul(a, b) == naive_clmul(a, b)
+
+
+@pytest.mark.parametrize("m,mod_poly", FIELDS)
+def test_nist_fields_match_naive(m, mod_poly):
+    rng = random.Random(m)
+    cfg = GFConfig(m, mod_poly)
+    reduce = reducer(m, mod_poly)
+    for _ in range(20):
+        a, b = rng.getrandbits(m) | 1, rng.getrandbits(m)
+        product = naive_clmul(a, b)
+        assert reduce(product) == naive_reduce(product, mod_poly)
+        assert gf_mod(product, cfg) == naive_reduce(product, mod_poly)
+        assert gf_mul(a, b, cfg) == naive_reduce(product, mod_poly)
+
+        inv = gf_inv(a, cfg)
+        assert gf_mul(a, inv, cfg) == 1
+        assert inv_itoh_tsujii(a, m, mod_poly) == inv
+        assert gf_pow(a, (1 << m) - 2, cfg) == inv
+    assert gf_pow(0, 0, cfg) == 1 and gf_pow(3, 1, cfg) == 3
+
+
+def test_reducible_or_dense_moduli():
+    # dense modulus -> generic reducer; reducible modulus -> no inverse for a factor
+    dense = (1 << 200) | (1 << 150) | (1 << 100) | (1 << 50) | (1 << 20) | 0b111
+    p = clmul(1 << 199 | 12345, 1 << 190 | 999)
+    assert reducer(200, dense)(p) == naive_reduce(p, dense)
+    with pytest.raises(ValueError):
+        inv_eea(0b11, (1 << 200) | 1)  # x^200 + 1 = (x + 1)^8 (...)
+    with pytest.raises(ValueError):
+        gf_inv(0, GFConfig(163, NIST_MODULI[163]))
+
+
+def test_big_field_endpoints(client):
+    a = (1 << 162) | 0xABCDEF
+    resp = client.get("/api/gf/inv", params={"a": hex(a), "m": 163})
+    assert resp.status_code == 200
+    inv = resp.json()["value"]
+    product = client.get("/api/gf/mul", params={"a": hex(a), "b": hex(inv), "m": 163}).json()
+    assert product["value"] == 1 and product["hex"] == "0x" + "0" * 40 + "1"
+
+    assert client.get("/api/gf/mul", params={"a": 1, "b": 1, "m": 163, "trace": "true"}).status_code == 400
+    assert client.get("/api/gf/mul", params={"a": 1, "b": 1, "m": 572}).status_code == 422
+    assert client.get("/api/gf/irreducibles").json()["571"]["poly"] == "x^571 + x^10 + x^5 + x^2 + 1"
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from Backend.gf import IRRED_DEFAULTS, ec
+
+# y^2 + xy = x^3 + x^3 x^2 + (x^3 + 1) over GF(2^4): 22 points with infinity
+SMALL = ec.Curve(4, IRRED_DEFAULTS[4], 0b1000, 0b1001)
+SMALL_POINTS = [(x, y) for x in range(16) for y in range(16) if SMALL.contains((x, y))]
+
+
+@pytest.mark.parametrize("name", list(ec.NIST_CURVES))
+def test_nist_generators_have_order_n(name):
+    curve = ec.NIST_CURVES[name]
+    assert curve.contains(curve.generator)
+    assert ec.montgomery_ladder(curve, curve.n, curve.generator) is None
+    assert ec.montgomery_ladder(curve, curve.n - 1, curve.generator) == ec.negate(curve, curve.generator)
+
+
+def test_group_law_on_a_small_curve():
+    assert len(SMALL_POINTS) + 1 == 22
+    for p in SMALL_POINTS:
+        assert ec.add_affine(SMALL, p, ec.negate(SMALL, p)) is None
+        assert ec.from_ld(SMALL, ec.double_ld(SMALL, ec.to_ld(p))) == ec.double_affine(SMALL, p)
+        for q in SMALL_POINTS:
+            r = ec.add_affine(SMALL, p, q)
+            assert SMALL.contains(r) and r == ec.add_affine(SMALL, q, p)
+            assert ec.from_ld(SMALL, ec.add_mixed(SMALL, ec.to_ld(p), q)) == r
+        for k in range(-3, 45):
+            expected = ec.scalar_mul_affine(SMALL, k, p)
+            assert ec.montgomery_ladder(SMALL, k, p) == expected
+            assert ec.scalar_mul_ld(SMALL, k, p) == expected
+
+
+@pytest.mark.parametrize("name", ["K-163", "B-233"])
+def test_scalar_multiplication_methods_agree(name):
+    curve = ec.NIST_CURVES[name]
+    g = curve.generator
+    table = ec.generator_table(name)
+    rng = random.Random(name)
+    for k in [1, 2, 15, 16, curve.n - 1] + [rng.randrange(curve.n) for _ in range(4)]:
+        expected = ec.scalar_mul_affine(curve, k, g)
+        assert ec.scalar_mul_ld(curve, k, g) == expected
+        assert ec.montgomery_ladder(curve, k, g) == expected
+        assert table.multiply(k) == expected
+    a, b = rng.randrange(curve.n), rng.randrange(curve.n)
+    assert ec.add_affine(curve, table.multiply(a), table.multiply(b)) == table.multiply(a + b)
+
+
+def test_traces():
+    curve = ec.NIST_CURVES["K-163"]
+    steps = []
+    ec.scalar_mul_affine(curve, 0b1011, curve.generator, steps)
+    assert [step["kind"] for step in steps] == ["ecAdd", "ecDouble", "ecDouble", "ecAdd", "ecDouble", "ecAdd"]
+    assert all(step["lambda"].startswith("0x") for step in steps[1:])
+    steps = []
+    ec.montgomery_ladder(curve, 0b1011, curve.generator, steps)
+    assert [step["bit"] for step in steps[:-1]] == [0, 1, 1] and steps[-1]["kind"] == "ladderY"
+
+
+def test_ec_endpoints(login, make_user):
+    client = login(make_user())
+    curves = client.get("/api/gf/ec/curves").json()
+    assert [c["name"] for c in curves] == list(ec.NIST_CURVES)
+    b163 = ec.NIST_CURVES["B-163"]
+    expected = ec.scalar_mul_affine(b163, 12345, b163.generator)
+    for method in ("ladder", "projective", "affine", "fixed"):
+        res = client.post("/api/gf/ec", json={"op": "mul", "curve": "B-163", "k": "12345", "method": method})
+        assert res.status_code == 200, res.text
+        assert res.json()["point"] == [hex(expected[0]), hex(expected[1])]
+    res = client.post("/api/gf/ec", json={"op": "mul", "curve": "B-163", "k": hex(b163.n)}).json()
+    assert res["point"] is None
+
+    p, q = SMALL_POINTS[3], SMALL_POINTS[7]
+    custom = {"m": 4, "a": "0x8", "b": "0x9"}
+    res = client.post("/api/gf/ec", json={"op": "add", **custom, "p": list(map(hex, p)), "q": list(map(hex, q)), "trace": True})
+    assert res.json()["point"] == list(map(hex, ec.add_affine(SMALL, p, q)))
+    assert res.json()["steps"][0]["kind"] == "ecAdd"
+    traced = client.post("/api/gf/ec", json={"op": "mul", **custom, "p": list(map(hex, p)), "k": "7", "trace": True})
+    assert traced.json()["steps"][-1]["kind"] == "ladderY"
+
+    bad = [
+        {"op": "add", **custom, "p": ["0x0", "0x0"], "q": ["0x0", "0x0"]},  # not on the curve
+        {"op": "mul", "curve": "B-999", "k": "1"},
+        {"op": "mul", **custom, "k": "3"},  # no p on a custom curve
+        {"op": "mul", "curve": "K-163", "k": "1", "method": "fixed", "trace": True},
+        {"op": "mul", **custom, "p": list(map(hex, p)), "k": "3", "method": "fixed"},
+        {"op": "double", "m": 4, "a": "0x8", "b": "0x0", "p": ["0x0", "0x0"]},
+    ]
+    for body in bad:
+        assert client.post("/api/gf/ec", json=body).status_code == 400, body
@@ -0,0 +1,84 @@
+from math import gcd
+
+import pytest
+
+from Backend import models
+from Backend.core.config import settings
+from Backend.gf import NIST_MODULI, is_irreducible
+from Backend.gf import irreducible
+from Backend.gf.irreducible import is_irreducible_ben_or, is_primitive, order_factors, scan
+from Backend.utils import compute, moduli
+
+
+def test_ben_or_matches_rabin():
+    for m in range(1, 11):
+        for f in range(1 << m, 1 << (m + 1)):
+            assert is_irreducible_ben_or(f) == is_irreducible(f, m), hex(f)
+    assert all(is_irreducible_ben_or(f) for f in NIST_MODULI.values())
+
+
+def test_primitive_counts_and_known_values():
+    # there are phi(2^m - 1) / m primitive polynomials of degree m
+    for m in range(2, 9):
+        order = (1 << m) - 1
+        expected = sum(gcd(k, order) == 1 for k in range(1, order + 1)) // m
+        assert sum(bool(is_primitive(f)) for f in range(1 << m, 1 << (m + 1))) == expected
+    assert order_factors(11) == (23, 89)
+    assert is_primitive(0x11B) is False  # AES modulus: x has order 51
+    assert is_primitive(0x11D) is True
+    assert is_primitive(NIST_MODULI[163]) is True
+
+
+def test_search_is_persisted(client, db, monkeypatch):
+    resp = client.get("/api/gf/moduli", params={"m": 8, "limit": 100})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["exhausted"] and not body["partial"]
+    assert len(body["moduli"]) == 30
+    assert [int(row["hex"], 16) for row in body["moduli"]] == [f for f, _ in scan(8, "any", 0, 128)]
+    assert db.query(models.GFModulus).filter_by(m=8).count() == 30
+
+    # no irreducible trinomials of degree 8 (Swan's theorem)
+    assert client.get("/api/gf/moduli", params={"m": 8, "kind": "trinomial"}).json()["moduli"] == []
+
+    # later lookups are answered from the index
+    monkeypatch.setattr(moduli, "scan", pytest.fail)
+    primitive = client.get("/api/gf/moduli", params={"m": 8, "primitive": "true", "limit": 100}).json()
+    assert len(primitive["moduli"]) == 16 and all(row["primitive"] for row in primitive["moduli"])
+    check = client.get("/api/gf/moduli/check", params={"poly": "0x11B"}).json()
+    assert check["irreducible"] and check["primitive"] is False
+
+
+def test_search_resumes_within_budget(client, monkeypatch):
+    monkeypatch.setattr(settings, "GF_SEARCH_MAX_CANDIDATES", 8)
+    seen = []
+    for _ in range(20):
+        body = client.get("/api/gf/moduli", params={"m": 20, "kind": "pentanomial", "limit": 5}).json()
+        seen = [int(row["hex"], 16) for row in body["moduli"]]
+        if not body["partial"]:
+            break
+    expected = [f for f, _ in scan(20, "pentanomial", 3, 20)][:5]
+    assert seen == expected and len(expected) == 5
+
+
+def test_pool_search_and_sampling(client, monkeypatch):
+    monkeypatch.setattr(settings, "GF_SEARCH_POOL_MIN_M", 2)
+    submitted = compute.metrics()["submitted"]
+    body = client.get("/api/gf/moduli", params={"m": 10, "kind": "trinomial"}).json()
+    assert [row["poly"] for row in body["moduli"]] == ["x^10 + x^3 + 1", "x^10 + x^7 + 1"]
+    assert body["exhausted"]
+
+    sampled = client.get("/api/gf/moduli/sample", params={"m": 163, "count": 3, "seed": 1}).json()
+    assert len(sampled) == 3
+    assert all(irreducible.is_irreducible_ben_or(int(row["hex"], 16)) for row in sampled)
+    assert client.get("/api/gf/moduli/check", params={"poly": "0x11B"}).json()["irreducible"] is True
+    assert compute.metrics()["submitted"] > submitted  # no private pool: every test went through the tier
+
+
+def test_moduli_errors(client):
+    assert client.get("/api/gf/moduli/check", params={"poly": "0x11A"}).json()["irreducible"] is False
+    assert client.get("/api/gf/moduli/check", params={"poly": 1}).status_code == 400
+    assert client.get("/api/gf/moduli", params={"m": 8, "kind": "heptanomial"}).status_code == 422
+    # 2^571 - 1 doesn't factor within the budget
+    resp = client.get("/api/gf/moduli", params={"m": 571, "primitive": "true"})
+    assert resp.status_code == 400
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from Backend.gf import IRRED_DEFAULTS, GFConfig, gf_mul, gf_pow, matrix
+from Backend.gf.reedsolomon import DecodeFailure, ReedSolomon, get_code
+
+AES = GFConfig(8, IRRED_DEFAULTS[8])
+
+
+def test_matrix_inverse_rank_and_solve():
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, 256, (12, 12))
+    a[3] = a[1] ^ a[2]  # rows are dependent in characteristic 2
+    assert matrix.rank(a, AES) == 11
+    with pytest.raises(ValueError):
+        matrix.inverse(a, AES)
+
+    a = rng.integers(0, 256, (12, 12))
+    inv = matrix.inverse(a, AES)
+    assert (matrix.matmul(a, inv, AES) == np.eye(12, dtype=np.int64)).all()
+    # matmul agrees with the scalar field ops
+    assert matrix.matmul(a[:1], inv[:, :1], AES)[0, 0] == np.bitwise_xor.reduce(
+        [gf_mul(int(x), int(y), AES) for x, y in zip(a[0], inv[:, 0])]
+    )
+    b = rng.integers(0, 256, 12)
+    assert (matrix.matmul(a, matrix.solve(a, b, AES)[:, None], AES)[:, 0] == b).all()
+
+    reduced, pivots = matrix.rref([[2, 4, 6], [1, 2, 3]], AES)
+    assert pivots == [0] and reduced[1].tolist() == [0, 0, 0] and reduced[0, 0] == 1
+    with pytest.raises(ValueError):
+        matrix.solve([[1, 1], [1, 1]], [1, 2], AES)
+
+
+@pytest.mark.parametrize("m, n, k, fcr", [(4, 15, 9, 1), (8, 255, 223, 0), (8, 40, 20, 3)])
+def test_reed_solomon_corrects_up_to_t_errors(m, n, k, fcr):
+    cfg = GFConfig(m, IRRED_DEFAULTS[m])
+    code = ReedSolomon(n, k, cfg, fcr)
+    alpha = code._alpha(1)
+    for j in range(n - k):  # g(alpha^(fcr + j)) = 0
+        root = gf_pow(alpha, fcr + j, cfg)
+        value = 0
+        for coefficient in code.generator:
+            value = gf_mul(value, root, cfg) ^ coefficient
+        assert value == 0
+
+    rng = np.random.default_rng(m)
+    codewords = code.encode(rng.integers(0, 1 << m, (200, k)))
+    assert not code.syndromes(codewords).any()
+    received, counts = codewords.copy(), rng.integers(0, code.t + 1, 200)
+    for word, count in zip(received, counts):
+        word[rng.choice(n, count, replace=False)] ^= rng.integers(1, 1 << m, count)
+    corrected, errors = code.decode(received)
+    assert (corrected == codewords).all() and (errors == counts).all()
+
+    # beyond t: either flagged, or (rarely) decoded to another codeword within distance t
+    received = codewords.copy()
+    for word in received:
+        word[rng.choice(n, code.t + 1, replace=False)] ^= rng.integers(1, 1 << m, code.t + 1)
+    corrected, errors = code.decode(received)
+    failed = errors == -1
+    assert failed.sum() > 150 and (corrected[failed] == received[failed]).all()
+    assert not code.syndromes(corrected[~failed]).any()
+
+
+def test_decode_trace():
+    code = get_code(15, 9, 4, IRRED_DEFAULTS[4])
+    codeword = code.encode(list(range(1, 10)))
+    received = codeword.copy()
+    received[2] ^= 5
+    received[10] ^= 1
+    steps = []
+    corrected, positions = code.decode_word(received, steps)
+    assert corrected == codeword.tolist() and positions == [2, 10]
+    assert [s["kind"] for s in steps] == ["syndromes"] + ["bm"] * 6 + ["chien", "forney", "forney"]
+    assert steps[-2:] == [{"kind": "forney", "position": 2, "value": 5}, {"kind": "forney", "position": 10, "value": 1}]
+    received[:4] ^= 1
+    with pytest.raises(DecodeFailure):
+        code.decode_word(received)
+
+
+def test_matrix_and_rs_endpoints(login, make_user):
+    client = login(make_user())
+    inv = client.post("/api/gf/matrix", json={"op": "inverse", "m": 8, "a": [[1, 2], [3, 4]]})
+    assert inv.status_code == 200
+    product = client.post("/api/gf/matrix", json={"op": "mul", "m": 8, "a": [[1, 2], [3, 4]], "b": inv.json()["matrix"]})
+    assert product.json()["matrix"] == [[1, 0], [0, 1]]
+    assert client.post("/api/gf/matrix", json={"op": "rank", "a": [[1, 1], [1, 1]]}).json()["rank"] == 1
+    assert client.post("/api/gf/matrix", json={"op": "inverse", "a": [[1, 1], [1, 1]]}).status_code == 400
+    assert client.post("/api/gf/matrix", json={"op": "rank", "a": [[1, 1], [1]]}).status_code == 400
+
+    code = {"m": 4, "n": 15, "k": 9}
+    encoded = client.post("/api/gf/rs/encode", json={**code, "messages": [list(range(1, 10))]})
+    word = encoded.json()["codewords"][0]
+    damaged = list(word)
+    damaged[0] ^= 7
+    decoded = client.post("/api/gf/rs/decode", json={**code, "codewords": [damaged, word], "trace": False}).json()
+    assert decoded["codewords"] == [word, word] and decoded["errors"] == [1, 0]
+    assert decoded["messages"][0] == list(range(1, 10))
+    traced = client.post("/api/gf/rs/decode", json={**code, "codewords": [damaged], "trace": True}).json()
+    assert traced["steps"][-1] == {"kind": "forney", "position": 0, "value": 7}
+    assert client.post("/api/gf/rs/decode", json={**code, "n": 16, "codewords": [word]}).status_code == 400
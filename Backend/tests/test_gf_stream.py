@@ -0,0 +1,55 @@
+import json
+
+from Backend.core.config import settings
+from Backend.gf import GFConfig, gf_pow, iter_trace, summarize
+from Backend.gf.jobs import field_op
+
+CFG = GFConfig(32, 0x1000000AF)
+
+
+def test_generators_match_list_traces():
+    for op, x, y in [("mod", 0x1234567, None), ("mul", 0x57, 0x83), ("pow", 3, 1000), ("inv", 12345, None)]:
+        value, steps = field_op(op, x, y, CFG.m, CFG.mod_poly, True)
+        assert list(iter_trace(op, x, y, CFG)) == steps
+        assert list(summarize(iter_trace(op, x, y, CFG))) == list(enumerate(steps))
+
+
+def test_summary_modes():
+    _value, steps = field_op("pow", 3, 1000, CFG.m, CFG.mod_poly, True)
+    reduces = [(i, s) for i, s in enumerate(steps) if s["kind"] == "reduce"]
+    gen = summarize(iter_trace("pow", 3, 1000, CFG), every=5, kinds={"reduce"})
+    kept = []
+    while True:
+        try:
+            kept.append(next(gen))
+        except StopIteration as stop:
+            assert stop.value == (gf_pow(3, 1000, CFG), len(steps))
+            break
+    assert kept == reduces[::5]
+
+
+def test_ndjson_stream(client):
+    params = {"a": 3, "n": 1000, "m": 32, "mod_poly": CFG.mod_poly, "every": 10, "kinds": "exp,mod"}
+    with client.stream("GET", "/api/gf/pow/stream", params=params) as resp:
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in resp.iter_lines()]
+    *steps, result = lines
+    assert result["kind"] == "result" and result["value"] == gf_pow(3, 1000, CFG)
+    assert result["emitted"] == len(steps) and result["steps"] > 10 * len(steps)
+    assert {s["kind"] for s in steps} <= {"exp", "mod"}
+    assert [s["index"] for s in steps] == sorted(s["index"] for s in steps)
+
+
+def test_sse_stream_and_errors(client, monkeypatch):
+    resp = client.get("/api/gf/inv/stream", params={"a": "0x53", "format": "sse"})
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in resp.text.strip().split("\n\n")]
+    assert all(e[0] == "event: step" for e in events[:-1])
+    assert events[-1][0] == "event: result" and json.loads(events[-1][1][6:])["value"] == 0xCA
+
+    monkeypatch.setattr(settings, "GF_STREAM_MAX_STEPS", 100)
+    lines = client.get("/api/gf/pow/stream", params={"a": 3, "n": 1000, "m": 32, "mod_poly": CFG.mod_poly}).text.splitlines()
+    assert len(lines) == 101 and json.loads(lines[-1])["kind"] == "error"
+
+    assert client.get("/api/gf/inv/stream", params={"a": 0}).status_code == 400
+    assert client.get("/api/gf/mul/stream", params={"a": 1, "b": 1, "kinds": "bogus"}).status_code == 400
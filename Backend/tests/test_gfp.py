@@ -0,0 +1,82 @@
+import itertools
+import random
+
+import pytest
+
+from Backend.gf import gfp
+from Backend.utils.autograde import check_factorization, parse_factorization, parse_gfp_poly
+
+
+def brute_irreducible(f, p):
+    n = gfp.degree(f)
+    for d in range(1, n // 2 + 1):
+        for coeffs in itertools.product(range(p), repeat=d):
+            if not gfp.rem(f, coeffs + (1,), p):
+                return False
+    return n >= 1
+
+
+@pytest.mark.parametrize("p", [2, 3, 5, 7])
+def test_factor_matches_brute_force(p):
+    rng = random.Random(p)
+    for _ in range(150):
+        f = gfp.poly([rng.randrange(p) for _ in range(rng.randint(0, 8))] + [rng.randrange(1, p)], p)
+        if rng.random() < 0.5:  # repeated factors, including multiplicities divisible by p
+            f = gfp.mul(f, gfp.mul(f, (1, 1), p), p)
+        lead, factors = gfp.factor(f, p)
+        product = (lead,)
+        for g, k in factors:
+            assert g[-1] == 1
+            if gfp.degree(g) <= 5:
+                assert brute_irreducible(g, p)
+            for _ in range(k):
+                product = gfp.mul(product, g, p)
+        assert product == f
+
+
+def test_known_factorizations_and_evaluation():
+    f = gfp.poly([1, 2, 4, 3], 5)  # 3x^3 + 4x^2 + 2x + 1 (the gf-eval template)
+    assert gfp.factorization_string(*gfp.factor(f, 5)) == "3 (x + 1) (x + 3) (x + 4)"
+    assert gfp.evaluate(f, 7, 5) == 0
+    assert gfp.evaluate_many(f, [7, 0, 1, -1, 10**30], 5) == [gfp.evaluate(f, x % 5, 5) for x in (7, 0, 1, -1, 10**30)]
+    assert gfp.evaluate_many(f, [3], (1 << 61) - 1) == [gfp.evaluate(f, 3, (1 << 61) - 1)]
+    x_cubed_plus_one = gfp.poly([1, 0, 0, 1], 3)  # (x + 1)^3 in characteristic 3
+    assert gfp.factor(x_cubed_plus_one, 3) == (1, (((1, 1), 3),))
+    assert gfp.is_irreducible(gfp.poly([1, 1, 0, 0, 1], 2), 2)
+    assert gfp.factorization_string(*gfp.factor((1, 1, 0, 0, 1), 2)) == "x^4 + x + 1"
+
+
+def test_parse_answers():
+    assert parse_gfp_poly("3x³ - x + 1", 5) == (1, 4, 0, 3)
+    assert parse_gfp_poly("x + y", 5) is None
+    assert parse_factorization("2(x+1)^2 (x^2 + x + 2)", 5) == (2, [((1, 1), 2), ((2, 1, 1), 1)])
+    assert parse_factorization("x^2 (x + 4)", 5) == (1, [((0, 1), 2), ((4, 1), 1)])
+    assert parse_factorization("(x+1) banana", 5) is None
+
+    f = gfp.poly([4, 0, 0, 0, 1], 5)  # x^4 + 4 = (x+1)(x+2)(x+3)(x+4)
+    assert check_factorization("x^4 + 4 = (x+1)(x+2)(x+3)(x+4)", f, 5) is True
+    assert check_factorization("(x + 4)(x + 1)(x^2 + 1)", f, 5) is False  # x^2 + 1 splits mod 5
+    assert check_factorization("(x + 1)^4", f, 5) is False
+    assert check_factorization("I don't know", f, 5) is None
+
+
+def test_gfp_endpoints(login, make_user):
+    client = login(make_user())
+    resp = client.get("/api/gf/gfp/factor", params={"p": 5, "poly": "3x^3 + 4x^2 + 2x + 1"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["lead"] == 3 and not body["irreducible"]
+    assert [f["poly"] for f in body["factors"]] == ["x + 1", "x + 3", "x + 4"]
+
+    values = client.post("/api/gf/gfp/eval", json={"p": 5, "poly": "3x^3 + 4x^2 + 2x + 1", "xs": [7, 2]})
+    assert values.json()["values"] == [0, 0]
+
+    answers = ["(x+1)(x+2)(x+3)(x+4)", "(x^2+1)(x^2+4)", "no idea"] * 200
+    check = client.post("/api/gf/gfp/factor/check", json={"p": 5, "poly": "x^4 + 4", "answers": answers})
+    assert check.status_code == 200
+    assert check.json()["results"][:3] == [True, False, None]
+    assert check.json()["factorization"] == "(x + 1) (x + 2) (x + 3) (x + 4)"
+
+    assert client.get("/api/gf/gfp/factor", params={"p": 6, "poly": "x + 1"}).status_code == 400
+    assert client.get("/api/gf/gfp/factor", params={"p": 5, "poly": "0"}).status_code == 400
+    assert client.get("/api/gf/gfp/factor", params={"p": 5, "poly": "x^999999999"}).status_code == 400
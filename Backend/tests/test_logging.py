@@ -0,0 +1,82 @@
+import json
+import logging
+import time
+
+from Backend import models
+from Backend.core.config import settings
+from Backend.utils.slowqueries import slow_query_log
+
+
+def _wait_for(capsys, predicate, timeout: float = 2.0) -> list[dict]:
+    """JSON lines the background writer has printed, once one of them satisfies `predicate`."""
+    lines, deadline = [], time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        out = capsys.readouterr().out
+        lines += [json.loads(line) for line in out.splitlines() if line.startswith("{")]
+        if any(predicate(line) for line in lines):
+            return lines
+        time.sleep(0.01)
+    raise AssertionError(f"no matching log line in {lines}")
+
+
+def test_access_log_has_request_user_route_status_and_latency(client, login, make_user, capsys):
+    user = make_user()
+    login(user)
+    response = client.get("/api/assignments/987654")
+    rid = response.headers["x-request-id"]
+    lines = _wait_for(capsys, lambda line: line.get("request_id") == rid and line["logger"] == "polylab.access")
+    (access,) = [line for line in lines if line.get("request_id") == rid]
+    assert access["level"] == "INFO" and access["message"] == "GET /api/assignments/987654 404"
+    assert access["user_id"] == user.id and access["route"] == "/api/assignments/{assignment_id}"
+    assert access["status"] == 404 and access["method"] == "GET" and access["latency_ms"] > 0
+    assert access["ts"].endswith("+00:00")
+
+
+def test_request_ids_are_reused_when_sane(client):
+    assert client.get("/health", headers={"X-Request-ID": "edge-1234abcd"}).headers["x-request-id"] == "edge-1234abcd"
+    replaced = client.get("/health", headers={"X-Request-ID": "bad id\n"}).headers["x-request-id"]
+    assert replaced != "bad id\n" and len(replaced) == 32
+
+
+def test_successful_requests_are_sampled(client, capsys, monkeypatch):
+    monkeypatch.setattr(settings, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+    ok = client.get("/health").headers["x-request-id"]
+    missing = client.get("/no/such/page").headers["x-request-id"]
+    lines = _wait_for(capsys, lambda line: line.get("request_id") == missing)
+    assert not any(line.get("request_id") == ok for line in lines)
+    assert next(line for line in lines if line.get("request_id") == missing)["route"] == "<unmatched>"
+
+
+def test_logs_from_request_threads_carry_the_request_context(client, login, make_user, capsys, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    slow_query_log.clear()
+    admin = make_user(models.UserRole.admin)
+    login(admin)
+    rid = client.get("/api/admin/users").headers["x-request-id"]
+    lines = _wait_for(capsys, lambda line: line["logger"] == "Backend.utils.slowqueries" and line.get("request_id") == rid)
+    slow = next(line for line in lines if line["logger"] == "Backend.utils.slowqueries" and line.get("request_id") == rid)
+    assert slow["level"] == "WARNING" and slow["route"] == "/api/admin/users"
+    assert slow["duration_ms"] >= 0 and len(slow["fingerprint"]) == 16
+    slow_query_log.clear()
+
+
+def test_exceptions_get_their_own_field(capsys):
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("polylab.test").warning("failed %s", "here", exc_info=True)
+    lines = _wait_for(capsys, lambda line: line["logger"] == "polylab.test")
+    (line,) = [line for line in lines if line["logger"] == "polylab.test"]
+    assert line["message"] == "failed here" and "ValueError: boom" in line["exc"]
+    assert "request_id" not in line
+
+
+def test_dev_email_fallback_keeps_the_body_out_of_info(capsys):
+    from Backend.utils.email import _send_mail
+
+    _send_mail("someone@example.com", "Verify your PolyLab account", "https://x/verify?token=s3cret")
+    logging.getLogger("polylab.test").warning("marker")
+    lines = _wait_for(capsys, lambda line: line["message"] == "marker")
+    mail = [line for line in lines if line["logger"] == "Backend.utils.email"]
+    assert len(mail) == 1 and mail[0]["level"] == "INFO"
+    assert "someone@example.com" in mail[0]["message"] and "s3cret" not in json.dumps(lines)
@@ -0,0 +1,90 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from Backend.core import metrics, ratelimit
+from Backend.core.config import settings
+from Backend.core.security import hash_password, verify_password
+
+
+def _sample(text: str, name: str, **labels) -> float:
+    """Value of one sample in the exposition text (0 when absent)."""
+    wanted = {k: str(v) for k, v in labels.items()}
+    for line in text.splitlines():
+        match = re.fullmatch(r"(\w+)(?:\{(.*)\})? (\S+)", line)
+        if not match or match[1] != name:
+            continue
+        found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match[2] or ""))
+        if found == wanted:
+            return float(match[3])
+    return 0.0
+
+
+def test_requests_are_labelled_by_route_template(client, login, make_user):
+    login(make_user())
+    for assignment_id in (424242, 434343):
+        assert client.get(f"/api/assignments/{assignment_id}").status_code == 404
+    client.get("/no/such/path/123")
+    text = client.get("/metrics").text
+    route = "/api/assignments/{assignment_id}"
+    assert _sample(text, "polylab_http_requests_total", method="GET", route=route, status=404) >= 2
+    assert _sample(text, "polylab_http_request_duration_seconds_count", method="GET", route=route) >= 2
+    assert _sample(text, "polylab_http_requests_total", method="GET", route="<unmatched>", status=404) >= 1
+    assert "424242" not in text and "/no/such/path" not in text
+    # the scrape itself is in flight while it renders
+    assert _sample(text, "polylab_http_requests_in_flight") >= 1
+
+
+def test_database_argon2_and_rate_limit_metrics(client, monkeypatch):
+    hashed = hash_password("correct horse")
+    assert verify_password("correct horse", hashed)
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_MINUTE", 0)
+    ratelimit._buckets.clear()
+    assert client.get("/health").status_code == 429
+    monkeypatch.undo()
+    ratelimit._buckets.clear()
+
+    text = client.get("/metrics").text
+    assert _sample(text, "polylab_argon2_duration_seconds_count", op="hash") >= 1
+    assert _sample(text, "polylab_argon2_duration_seconds_count", op="verify") >= 1
+    assert _sample(text, "polylab_rate_limit_rejections_total") >= 1
+    assert _sample(text, "polylab_db_query_duration_seconds_count", statement="SELECT") > 0
+    assert _sample(text, "polylab_db_pool_checkouts_total") > 0
+    assert "polylab_db_pool_checked_out" in text and "polylab_db_pool_overflow" in text
+
+
+def test_upload_bytes_are_counted(client, login, make_user):
+    login(make_user())
+    before = _sample(client.get("/metrics").text, "polylab_upload_bytes_total", kind="instructor_request")
+    response = client.post(
+        "/api/roles/requests",
+        data={"note": "I teach the lab"},
+        files={"file": ("proof.pdf", b"%PDF-1.4" + bytes(1000), "application/pdf")},
+    )
+    assert response.status_code == 200, response.text
+    after = _sample(client.get("/metrics").text, "polylab_upload_bytes_total", kind="instructor_request")
+    assert after - before == 1008
+
+
+def test_samples_from_other_workers_are_merged(client):
+    """Another process writing to the same PROMETHEUS_MULTIPROC_DIR shows up in this one's scrape."""
+    assert metrics.MULTIPROC_DIR
+    metrics.record_upload("merge-test", 5)
+    subprocess.run(
+        [sys.executable, "-c", "from Backend.core.metrics import record_upload; record_upload('merge-test', 7)"],
+        check=True,
+        cwd=Path(__file__).resolve().parents[2],
+        env=os.environ,
+    )
+    assert _sample(client.get("/metrics").text, "polylab_upload_bytes_total", kind="merge-test") == 12
+
+
+def test_token_protects_the_endpoint(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer nope"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
@@ -0,0 +1,48 @@
+import pytest
+
+from Backend.benchmarks.perf.harness import Result, Stats, compare, load, measure, resolve_baseline, save
+
+
+def _result(name: str, median: float, low: float | None = None) -> Result:
+    low = median if low is None else low
+    return Result(name, "g", Stats(low, median * 2, median, median, 0.0, 5, 1))
+
+
+def test_measure_calibrates_and_counts_rounds():
+    calls = []
+    stats, value = measure(lambda: calls.append(1) or len(calls), min_round_time=0.001, max_time=0.01)
+    assert value == len(calls)
+    assert stats.rounds >= 5 and stats.iterations > 1
+    assert stats.min <= stats.median <= stats.max
+
+
+def test_measure_with_setup_runs_one_call_per_round():
+    fresh = []
+    stats, _ = measure(lambda: fresh.pop(), setup=lambda: fresh.append(0), min_rounds=3, max_rounds=3, max_time=0)
+    assert (stats.rounds, stats.iterations) == (3, 1) and not fresh
+
+
+def test_compare_flags_slowdowns_beyond_threshold():
+    baseline = {r.name: r for r in [_result("a", 1.0), _result("b", 1.0), _result("gone", 1.0)]}
+    current = [_result("a", 1.2), _result("b", 1.5), _result("new", 9.0)]
+    by_name = {c.name: c for c in compare(current, baseline, 0.25)}
+    assert set(by_name) == {"a", "b"}
+    assert not by_name["a"].regressed and by_name["b"].regressed
+    assert by_name["b"].change == pytest.approx(0.5)
+    # a noisy median with an unchanged best round isn't a regression by default
+    noisy = [_result("a", 3.0, low=1.0)]
+    assert not compare(noisy, baseline, 0.25)[0].regressed
+    assert compare(noisy, baseline, 0.25, "median")[0].regressed
+
+
+def test_baselines_round_trip(tmp_path):
+    save(tmp_path / "one.json", [_result("a", 1.0)])
+    save(tmp_path / "two.json", [_result("a", 2.0)])
+    assert load(tmp_path / "one.json")["a"].stats == _result("a", 1.0).stats
+    assert resolve_baseline(tmp_path, "one") == tmp_path / "one.json"
+    assert resolve_baseline(tmp_path, "latest") == tmp_path / "two.json"
+    with pytest.raises(FileNotFoundError):
+        resolve_baseline(tmp_path, "three")
+    (tmp_path / "bad.json").write_text('{"format": 99}')
+    with pytest.raises(ValueError):
+        load(tmp_path / "bad.json")
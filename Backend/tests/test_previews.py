@@ -0,0 +1,120 @@
+import io
+import time
+from urllib.parse import urlparse
+
+import pytest
+
+from Backend import models
+from Backend.storage import get_storage
+from Backend.storage.resumable import partial_path
+from Backend.utils import previews
+from Backend.utils.previews import preview_key, preview_url_for, render_preview
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _jpeg(size=(1600, 1200)) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(out, "JPEG")
+    return out.getvalue()
+
+
+def test_preview_url_mapping():
+    assert (
+        preview_url_for("http://h/uploads/proofs/a.jpeg")
+        == "http://h/uploads/previews/proofs/a.jpeg.webp"
+    )
+    assert preview_url_for("/uploads/proofs/a.jpeg") == "/uploads/previews/proofs/a.jpeg.webp"
+    assert preview_url_for("/uploads/notes.txt") is None
+    assert preview_url_for(None) is None
+
+
+def test_render_image_thumbnail():
+    webp = render_preview(_jpeg(), "scan.jpg", 480)
+    thumb = Image.open(io.BytesIO(webp))
+    assert thumb.format == "WEBP"
+    assert max(thumb.size) == 480
+
+
+def test_render_from_a_path(tmp_path):
+    path = tmp_path / "scan.jpg"
+    path.write_bytes(_jpeg())
+    assert Image.open(io.BytesIO(render_preview(str(path), "scan.jpg", 200))).size == (200, 150)
+
+
+def test_render_pdf_first_page(tmp_path):
+    pymupdf = pytest.importorskip("pymupdf")
+    doc = pymupdf.open()
+    doc.new_page(width=595, height=842).insert_text((72, 72), "GF(2^8)")
+    webp = render_preview(doc.tobytes(), "hw.pdf", 300)
+    assert Image.open(io.BytesIO(webp)).size[1] == 300
+    partial = tmp_path / "no-suffix"
+    partial.write_bytes(doc.tobytes())
+    assert Image.open(io.BytesIO(render_preview(str(partial), "hw.pdf", 300))).size[1] == 300
+
+
+def test_submission_exposes_preview_and_serves_it(login, db, classroom, make_user):
+    student = make_user()
+    db.add(models.ClassroomMember(classroom_id=classroom.id, user_id=student.id))
+    assignment = models.Assignment(title="HW", classroom_id=classroom.id)
+    db.add(assignment)
+    db.commit()
+    client = login(student)
+
+    resp = client.post(
+        f"/api/submissions/{assignment.id}/upload",
+        files={"file": ("photo.jpg", _jpeg(), "image/jpeg")},
+    )
+    assert resp.status_code == 200, resp.text
+    preview = urlparse(resp.json()["preview_url"]).path
+    assert preview.startswith("/uploads/previews/submissions/")
+    assert preview.endswith(".jpg.webp")
+
+    # rendered in the background or on demand, whichever comes first
+    got = client.get(preview)
+    assert got.status_code == 200
+    assert got.headers["content-type"] == "image/webp"
+
+    outsider = make_user()
+    assert login(outsider).get(preview).status_code == 403
+
+
+def test_resumable_upload_preview_reads_the_partial_file(login, db, classroom, make_user):
+    student = make_user()
+    db.add(models.ClassroomMember(classroom_id=classroom.id, user_id=student.id))
+    assignment = models.Assignment(title="HW", classroom_id=classroom.id)
+    db.add(assignment)
+    db.commit()
+    client = login(student)
+    body = _jpeg()
+    url = client.post(
+        f"/api/submissions/{assignment.id}/resumable", json={"filename": "scan.jpg", "length": len(body)}
+    ).json()["url"]
+    upload_id = url.rsplit("/", 1)[-1]
+    headers = {"Content-Type": "application/offset+octet-stream", "Upload-Offset": "0"}
+    assert client.patch(url, content=body, headers=headers).status_code == 204
+    key = client.post(
+        f"/api/submissions/{assignment.id}/resumable/{upload_id}/finalize", json={}
+    ).json()["file_url"].split("/uploads/", 1)[1]
+
+    # the worker renders from the partial file, which is removed once it is done
+    deadline = time.monotonic() + 30
+    while partial_path(upload_id).exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not partial_path(upload_id).exists()
+    assert get_storage().exists(preview_key(key))
+
+
+def test_pool_uses_forkserver_and_shuts_down():
+    pool = previews._get_pool()
+    assert pool._mp_context.get_start_method() == "forkserver"
+    previews.shutdown()
+    assert previews._get_pool() is not pool
+    previews.shutdown()
+
+
+def test_missing_pdf_renderer_is_reported(monkeypatch, caplog):
+    monkeypatch.setattr(previews, "pymupdf", None)
+    assert not previews.can_preview("hw.pdf") and previews.can_preview("scan.jpg")
+    previews.check_dependencies()
+    assert "pymupdf is not installed" in caplog.text
@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from Backend import models
+from Backend.core.config import settings
+from Backend.utils import profiling
+
+
+@pytest.fixture(autouse=True)
+def _profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path / "profiles"))
+
+
+def _busy_listing():
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+    return []
+
+
+def test_tokens_are_signed_and_expire():
+    token, expires = profiling.make_token(7)
+    assert profiling.verify_token(token) == 7 and expires > time.time()
+    admin_id, exp, signature = token.split(".")
+    assert profiling.verify_token(f"8.{exp}.{signature}") is None
+    assert profiling.verify_token(f"{admin_id}.{int(exp) + 1}.{signature}") is None
+    assert profiling.verify_token(profiling.make_token(7, ttl_seconds=-1)[0]) is None
+    assert profiling.verify_token("garbage") is None
+
+
+def test_token_profiles_the_request_in_the_threadpool(client, login, make_user, monkeypatch):
+    login(make_user(models.UserRole.admin))
+    assert client.get("/api/admin/profiles").json() == []
+    token = client.post("/api/admin/profiles/token").json()["token"]
+
+    # a sync endpoint: its work happens in a threadpool thread, not the event loop's
+    with monkeypatch.context() as patch:
+        patch.setattr(profiling, "list_reports", _busy_listing)
+        response = client.get("/api/admin/profiles", headers={"X-Profile-Token": token})
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+
+    report = client.get(f"/api/admin/profiles/{profile_id}").json()
+    assert report["route"] == "/api/admin/profiles" and report["trigger"] == "token"
+    assert report["status"] == 200 and report["samples"] > 10
+    assert any(f["function"].startswith("_busy_listing") and f["total"] > 10 for f in report["functions"])
+    folded = client.get(f"/api/admin/profiles/{profile_id}/folded").text
+    assert any(line.startswith("worker thread;") and "_busy_listing" in line for line in folded.splitlines())
+
+    (summary,) = client.get("/api/admin/profiles").json()
+    assert summary["id"] == profile_id and "folded" not in summary
+    assert client.get("/api/admin/profiles/" + "0" * 32).status_code == 404
+    assert client.get("/api/admin/profiles/..%2F..%2Fetc").status_code == 404
+    assert client.delete("/api/admin/profiles").json() == {"ok": True}
+    assert client.get("/api/admin/profiles").json() == []
+
+
+def test_query_flag_and_bad_tokens(client):
+    token, _ = profiling.make_token(1)
+    assert "x-profile-id" in client.get(f"/health?_profile={token}").headers
+    assert "x-profile-id" not in client.get("/health", headers={"X-Profile-Token": token + "x"}).headers
+    assert "x-profile-id" not in client.get("/health").headers
+
+
+def test_sample_rate_profiles_random_requests(client, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 1.0)
+    profile_id = client.get("/health").headers["x-profile-id"]
+    assert profiling.load_report(profile_id)["trigger"] == "sampled"
+
+
+def test_only_admins_see_profiles(client, login, make_user):
+    login(make_user())
+    assert client.get("/api/admin/profiles").status_code == 403
+    assert client.post("/api/admin/profiles/token").status_code == 403
+
+
+def test_oldest_reports_are_pruned(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_MAX_REPORTS", 2)
+    ids = []
+    for _ in range(3):
+        profile = profiling.RequestProfile({"method": "GET", "path": "/"}, 0, "sampled")
+        profiling.save_report(profile.report(200, "/"))
+        ids.append(profile.id)
+        time.sleep(0.01)
+    assert [r["id"] for r in profiling.list_reports()] == ids[:0:-1]
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import sqlite3
+import time
+
+from Backend import models
+from Backend.gf.jobs import field_op
+from Backend.utils.resultcache import ResultCache, decode_result, encode_result, field_key, get_result_cache
+
+
+def test_encoding_round_trips_traces():
+    for args in [("inv", 0x53, None, 8, 0x11B), ("pow", 3, 1000, 32, 0x1000000AF)]:
+        value, steps = field_op(*args, True)
+        assert decode_result(encode_result(value, steps)) == (value, steps)
+    assert len(encode_result(value, steps)) * 10 < len(json.dumps(steps))
+    assert decode_result(encode_result(7, None)) == (7, None)
+
+
+def test_canonical_keys():
+    assert field_key("mul", 8, 0x11B, 0x13, 0x57, False) == field_key("mul", 8, 0x11B, 0x157, 0x13, False)
+    assert field_key("mul", 8, 0x11B, 0x13, 0x57, True) != field_key("mul", 8, 0x11B, 0x57, 0x13, True)
+    assert field_key("mod", 8, 0x11B, 0x157, None, False) != field_key("mod", 8, 0x11B, 0x57, None, False)
+
+
+def test_eviction_is_by_bytes():
+    cache = ResultCache(max_bytes=8 * 1000)
+    for i in range(20):
+        cache.put(f"k{i}", bytes(800))
+    metrics = cache.metrics()
+    assert metrics["bytes"] <= 8000 and metrics["evictions"] > 0
+    assert cache.get("k0") is None and cache.get("k19") is not None
+    cache.put("huge", bytes(2000))  # larger than 1/8 of the budget
+    assert cache.get("huge") is None
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "results.db")
+    ResultCache(1 << 20, path).put("a", b"value")
+    fresh = ResultCache(1 << 20, path)
+    assert fresh.get("a") == b"value"
+    assert fresh.get("a") == b"value"
+    assert fresh.metrics()["disk_hits"] == 1 and fresh.metrics()["hits"] == 2
+
+
+def test_locked_sqlite_file_is_a_miss_not_an_error(tmp_path):
+    path = str(tmp_path / "results.db")
+    ResultCache(1 << 20, path).put("a", b"value")
+    other_worker = sqlite3.connect(path, isolation_level=None)
+    other_worker.execute("BEGIN EXCLUSIVE")
+    try:
+        cache = ResultCache(1 << 20, path)
+        started = time.monotonic()
+        assert asyncio.run(cache.aget("a")) == b"value"  # reads still work under WAL; the recency update is skipped
+        asyncio.run(cache.aput("b", b"other"))  # the write is skipped, the entry stays in memory
+        assert cache.get("b") == b"other"
+        assert time.monotonic() - started < 2
+    finally:
+        other_worker.execute("ROLLBACK")
+        other_worker.close()
+    assert ResultCache(1 << 20, path).get("b") is None
+
+
+def test_endpoints_are_memoized(client, login, make_user):
+    before = get_result_cache().metrics()
+    params = {"a": 3, "m": 163, "trace": False}
+    first = client.get("/api/gf/inv", params=params).json()
+    assert client.get("/api/gf/inv", params=params).json() == first
+    traced = {"a": "0x53", "m": 8, "trace": True}
+    assert client.get("/api/gf/inv", params=traced).json() == client.get("/api/gf/inv", params=traced).json()
+    factor = {"p": 5, "poly": "x^4 + 4"}
+    assert client.get("/api/gf/gfp/factor", params=factor).json() == client.get("/api/gf/gfp/factor", params=factor).json()
+
+    metrics = login(make_user(models.UserRole.admin)).get("/api/admin/compute").json()["result_cache"]
+    assert metrics["hits"] - before["hits"] == 3 and metrics["misses"] - before["misses"] == 3
+    assert metrics["entries"] == 3
@@ -0,0 +1,113 @@
+import os
+from datetime import datetime, timedelta
+
+from Backend import models
+from Backend.core.config import settings
+from Backend.database import SessionLocal
+from Backend.storage.resumable import partial_path, purge_expired_uploads
+
+CHUNK = {"Content-Type": "application/offset+octet-stream"}
+
+
+def _assignment_with_student(db, classroom, make_user):
+    assignment = models.Assignment(title="HW", classroom_id=classroom.id)
+    db.add(assignment)
+    db.commit()
+    student = make_user()
+    db.add(models.ClassroomMember(classroom_id=classroom.id, user_id=student.id))
+    db.commit()
+    return assignment, student
+
+
+def _patch(client, url, offset, body):
+    return client.patch(url, content=body, headers={**CHUNK, "Upload-Offset": str(offset)})
+
+
+def test_resume_and_finalize_submission(login, db, classroom, make_user, upload_dir):
+    assignment, student = _assignment_with_student(db, classroom, make_user)
+    client = login(student)
+    body = os.urandom(300_000)
+
+    resp = client.post(
+        f"/api/submissions/{assignment.id}/resumable",
+        json={"filename": "big report.pdf", "length": len(body)},
+    )
+    assert resp.status_code == 201
+    url = resp.json()["url"]
+    assert resp.headers["Location"] == url
+    assert resp.headers["Upload-Offset"] == "0"
+
+    assert _patch(client, url, 0, body[:100_000]).headers["Upload-Offset"] == "100000"
+    # a retried chunk with a stale offset is rejected, the client asks where to resume
+    assert _patch(client, url, 0, body[:100_000]).status_code == 409
+    assert client.head(url).headers["Upload-Offset"] == "100000"
+
+    finalize = f"/api/submissions/{assignment.id}/resumable/{url.rsplit('/', 1)[-1]}/finalize"
+    assert client.post(finalize, json={}).status_code == 409  # incomplete
+
+    assert _patch(client, url, 100_000, body[100_000:]).status_code == 204
+    resp = client.post(finalize, json={"content": "final"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["content"] == "final"
+    key = data["file_url"].split("/uploads/", 1)[1]
+    assert (upload_dir / key).read_bytes() == body
+    assert key.endswith("_big_report.pdf")
+
+    # consumed: a second finalize does not create another row
+    assert client.post(finalize, json={}).status_code == 404
+    assert db.query(models.Submission).filter_by(user_id=student.id).count() == 1
+
+
+def test_chunk_rules_and_ownership(login, db, classroom, make_user):
+    assignment, student = _assignment_with_student(db, classroom, make_user)
+    client = login(student)
+    url = client.post(
+        f"/api/submissions/{assignment.id}/resumable",
+        json={"filename": "a.bin", "length": 10},
+    ).json()["url"]
+
+    assert client.patch(url, content=b"x", headers={"Upload-Offset": "0"}).status_code == 415
+    assert _patch(client, url, 0, b"x" * 11).status_code == 413
+
+    other = login(make_user())
+    assert other.head(url).status_code == 404
+    assert other.patch(url, content=b"x", headers={**CHUNK, "Upload-Offset": "0"}).status_code == 404
+
+
+def test_material_finalize_uses_digest_folder(login, db, classroom):
+    material = models.Material(classroom_id=classroom.id, title="Slides")
+    db.add(material)
+    db.commit()
+    client = login(db.get(models.User, classroom.instructor_id))
+    body = b"%PDF-1.4 slides"
+    url = client.post(
+        f"/api/materials/{material.id}/resumable",
+        json={"filename": "slides.pdf", "length": len(body)},
+    ).json()["url"]
+    _patch(client, url, 0, body)
+    resp = client.post(f"/api/materials/{material.id}/resumable/{url.rsplit('/', 1)[-1]}/finalize")
+    assert resp.status_code == 200
+    assert resp.json()["file_url"].endswith("/slides.pdf")
+    assert "/uploads/materials/" in resp.json()["file_url"]
+
+
+def test_purge_expired_uploads(login, db, classroom, make_user):
+    assignment, student = _assignment_with_student(db, classroom, make_user)
+    upload_id = login(student).post(
+        f"/api/submissions/{assignment.id}/resumable",
+        json={"filename": "a.bin", "length": 10},
+    ).json()["id"]
+    assert partial_path(upload_id).is_file()
+    db.query(models.ResumableUpload).filter_by(id=upload_id).update(
+        {"expires_at": datetime.utcnow() - timedelta(minutes=1)}
+    )
+    db.commit()
+
+    session = SessionLocal()
+    try:
+        assert purge_expired_uploads(session) >= 1
+    finally:
+        session.close()
+    assert not partial_path(upload_id).exists()
+    assert settings.resumable_upload_dir.is_dir()
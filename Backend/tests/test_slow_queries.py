@@ -0,0 +1,70 @@
+from sqlalchemy import text
+
+from Backend import models
+from Backend.core.config import settings
+from Backend.utils.slowqueries import SlowQueryLog, explain, fingerprint, normalize, redact, slow_query_log
+
+
+def test_fingerprints_ignore_literals_and_list_lengths():
+    a = "SELECT * FROM users WHERE id = 5 AND email = 'a@b.c' AND role IN (?, ?)"
+    b = "select *  FROM users\n WHERE id = 712 AND email = 'x''y@z' AND role IN (?, ?, ?, ?)"
+    assert normalize(a) == "SELECT * FROM users WHERE id = ? AND email = ? AND role IN (...)"
+    assert fingerprint(a) != fingerprint("SELECT * FROM users WHERE id = 5")
+    assert fingerprint(a) == fingerprint(a.replace("5", "6")) == fingerprint(b.replace("select", "SELECT"))
+    assert normalize("SELECT t1.x FROM t1 WHERE y = :y_1 AND z = %(z)s") == "SELECT t1.x FROM t1 WHERE y = ? AND z = ?"
+
+
+def test_parameters_are_redacted():
+    assert redact(("secret@example.com", 3, None, b"\x00" * 4)) == ["<str:18>", 3, None, "<bytes:4>"]
+    assert redact({"token": "abc", "n": 1.5}) == {"token": "<str:3>", "n": 1.5}
+    assert redact([("a", 1), ("bb", 2)], executemany=True) == ["<str:1>", 1]
+
+
+def test_buffer_is_bounded_and_deduplicated():
+    log = SlowQueryLog(max_entries=2)
+    assert log.record("SELECT 1 FROM a WHERE id = 1", (), False, 300, "/x")
+    assert not log.record("SELECT 1 FROM a WHERE id = 2", (), False, 500, "/y")
+    log.record("SELECT 1 FROM b", (), False, 250, None)
+    log.record("SELECT 1 FROM a WHERE id = 3", (), False, 200, "/x")  # `a` is newer than `b` now
+    log.record("SELECT 1 FROM c", (), False, 900, None)
+    entries = log.entries()
+    assert [e["statement"] for e in entries] == ["SELECT ? FROM a WHERE id = ?", "SELECT ? FROM c"]
+    a = entries[0]
+    assert (a["count"], a["total_ms"], a["max_ms"], a["last_ms"]) == (3, 1000, 500, 200)
+    assert a["routes"] == {"/x": 2, "/y": 1}
+
+
+def test_sqlite_plans(db):
+    conn = db.connection().connection.dbapi_connection
+    plan = explain(conn, "sqlite", "SELECT * FROM users WHERE email = ?", ("a@b.c",), False)
+    assert plan and "USING INDEX" in plan[0]
+    assert explain(conn, "sqlite", "PRAGMA table_info(users)", (), False) is None
+    assert explain(conn, "sqlite", "SELECT * FROM nope", (), False)[0].startswith("EXPLAIN failed")
+
+
+def test_slow_queries_are_logged_with_route_plan_and_redacted_params(client, login, make_user, db, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    slow_query_log.clear()
+    admin = make_user(models.UserRole.admin)
+    login(admin)
+    assert client.get("/api/classrooms").status_code == 200
+    db.execute(text("SELECT count(*) FROM users"))  # outside any request
+
+    entries = client.get("/api/admin/slow-queries").json()
+    by_route = {}
+    for entry in entries:
+        for route in entry["routes"]:
+            by_route.setdefault(route, []).append(entry)
+    session_lookup = next(e for e in by_route["/api/classrooms"] if "FROM sessions" in e["statement"])
+    assert session_lookup["plan"] and "sessions" in " ".join(session_lookup["plan"])
+    assert all(not isinstance(p, str) or p.startswith("<") for p in session_lookup["parameters"])
+    assert any("count(*)" in e["statement"] for e in by_route["<no request>"])
+
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", None)
+    assert client.delete("/api/admin/slow-queries").json() == {"ok": True}
+    assert client.get("/api/admin/slow-queries").json() == []
+
+
+def test_only_admins_see_slow_queries(client, login, make_user):
+    login(make_user(models.UserRole.instructor))
+    assert client.get("/api/admin/slow-queries").status_code == 403
@@ -0,0 +1,100 @@
+from urllib.parse import urlparse
+
+import pytest
+
+from Backend import models
+from Backend.core.config import settings
+from Backend.storage import InvalidKey, LocalStorage, Storage, get_storage, normalize_key
+
+
+def test_normalize_key_rejects_traversal():
+    assert normalize_key("/materials//classroom_1/a.pdf") == "materials/classroom_1/a.pdf"
+    for bad in ("", "../etc/passwd", "proofs/../../x"):
+        with pytest.raises(InvalidKey):
+            normalize_key(bad)
+
+
+def test_incomplete_backend_cannot_be_instantiated():
+    class ReadOnly(Storage):
+        def read(self, key):
+            return b""
+
+    with pytest.raises(TypeError, match="save"):
+        ReadOnly()
+
+
+def test_local_storage_roundtrip(tmp_path):
+    storage = LocalStorage(tmp_path)
+    storage.save("proofs/a.txt", b"hello")
+    assert storage.exists("proofs/a.txt")
+    assert storage.read("proofs/a.txt") == b"hello"
+    assert list(storage.iter_keys()) == [("proofs/a.txt", 5)]
+    storage.delete("proofs/a.txt")
+    assert not storage.exists("proofs/a.txt")
+
+
+def test_direct_upload_rejected_on_local_storage(login, db, classroom):
+    client = login(db.get(models.User, classroom.instructor_id))
+    material = models.Material(classroom_id=classroom.id, title="Slides")
+    db.add(material)
+    db.commit()
+    resp = client.post(f"/api/materials/{material.id}/upload-url", json={"filename": "a.pdf"})
+    assert resp.status_code == 400
+
+
+@pytest.fixture
+def s3_storage(monkeypatch):
+    boto3 = pytest.importorskip("boto3")
+    moto = pytest.importorskip("moto")
+    with moto.mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="polylab-test")
+        monkeypatch.setattr(settings, "STORAGE_BACKEND", "s3")
+        monkeypatch.setattr(settings, "S3_BUCKET", "polylab-test")
+        monkeypatch.setattr(settings, "S3_REGION", "us-east-1")
+        get_storage.cache_clear()
+        yield get_storage()
+    get_storage.cache_clear()
+
+
+def test_direct_submission_upload_via_s3(s3_storage, login, db, classroom, make_user, monkeypatch):
+    from Backend.routers import submission
+
+    recorded, scheduled = [], []
+    monkeypatch.setattr(submission, "record_upload", lambda kind, size: recorded.append((kind, size)))
+    monkeypatch.setattr(submission, "schedule_preview", scheduled.append)
+    student = make_user()
+    db.add(models.ClassroomMember(classroom_id=classroom.id, user_id=student.id))
+    assignment = models.Assignment(title="HW1", classroom_id=classroom.id)
+    db.add(assignment)
+    db.commit()
+    client = login(student)
+
+    grant = client.post(
+        f"/api/submissions/{assignment.id}/upload-url",
+        json={"filename": "hw 1.pdf", "content_type": "application/pdf"},
+    )
+    assert grant.status_code == 200, grant.text
+    body = grant.json()
+    assert body["method"] == "PUT"
+    assert body["key"].startswith(f"submissions/assignment_{assignment.id}/user{student.id}_")
+    assert "Signature" in body["url"]
+
+    # The browser would PUT to body["url"]; moto only intercepts boto calls
+    s3_storage.client.put_object(Bucket="polylab-test", Key=body["key"], Body=b"%PDF")
+
+    other = client.post(
+        f"/api/submissions/{assignment.id}/upload-complete",
+        json={"key": f"submissions/assignment_{assignment.id}/user999_1_x.pdf"},
+    )
+    assert other.status_code == 403
+
+    done = client.post(
+        f"/api/submissions/{assignment.id}/upload-complete", json={"key": body["key"]}
+    )
+    assert done.status_code == 200, done.text
+    assert done.json()["content"] == "File upload: hw_1.pdf"
+    assert recorded == [("submission", 4)] and scheduled == [body["key"]]
+
+    download = client.get(urlparse(done.json()["file_url"]).path, follow_redirects=False)
+    assert download.status_code == 307
+    assert "polylab-test" in download.headers["location"]
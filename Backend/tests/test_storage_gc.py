@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from Backend import models
+from Backend.storage import get_storage, public_url
+from Backend.storage.gc import QUARANTINE_PREFIX, collect_garbage
+
+
+def _age_orphans(db, **delta):
+    for row in db.query(models.StorageOrphan):
+        row.first_seen_at -= timedelta(**delta)
+        if row.quarantined_at:
+            row.quarantined_at -= timedelta(**delta)
+    db.commit()
+
+
+def test_gc_quarantines_then_deletes_orphans(db, classroom):
+    storage = get_storage()
+    live = "materials/classroom_1/aaaaaaaaaaaaaaaa/live.pdf"
+    orphan = "assignments/assignment_999/old.pdf"
+    legacy = "submissions/assignment_998/user1_1_legacy.pdf"
+    for key in (live, orphan, legacy, f"previews/{live}.webp", f"previews/{orphan}.webp"):
+        storage.save(key, b"12345")
+    material = models.Material(classroom_id=classroom.id, title="m", file_url=public_url(live))
+    assignment = models.Assignment(title="legacy", classroom_id=classroom.id)
+    db.add_all([material, assignment])
+    db.commit()
+    db.add(
+        models.Submission(
+            user_id=classroom.instructor_id,
+            assignment_id=assignment.id,
+            content=f"/app/uploads/{legacy}",
+            submitted_at=datetime.utcnow(),
+        )
+    )
+    db.commit()
+
+    first = collect_garbage(db)
+    assert first.orphans >= 2 and first.quarantined == 0
+    assert storage.exists(orphan)
+
+    _age_orphans(db, hours=2)
+    second = collect_garbage(db)
+    assert second.quarantined >= 2
+    assert not storage.exists(orphan)
+    assert storage.exists(f"{QUARANTINE_PREFIX}{orphan}")
+    for key in (live, legacy, f"previews/{live}.webp"):
+        assert storage.exists(key)
+
+    _age_orphans(db, days=8)
+    report = collect_garbage(db, dry_run=True)
+    assert report.deleted >= 2 and storage.exists(f"{QUARANTINE_PREFIX}{orphan}")
+    report = collect_garbage(db)
+    assert report.reclaimed_bytes >= 10
+    assert not storage.exists(f"{QUARANTINE_PREFIX}{orphan}")
+    assert not storage.exists(f"{QUARANTINE_PREFIX}previews/{orphan}.webp")
+
+
+def test_gc_restores_file_referenced_again(db, classroom):
+    storage = get_storage()
+    key = "assignments/assignment_997/back.pdf"
+    storage.save(key, b"x")
+    collect_garbage(db)
+    _age_orphans(db, hours=2)
+    collect_garbage(db)
+    assert not storage.exists(key)
+
+    db.add(models.Assignment(title="a", classroom_id=classroom.id, attachment_url=public_url(key)))
+    db.commit()
+    assert collect_garbage(db).restored >= 1
+    assert storage.read(key) == b"x"
+    assert db.get(models.StorageOrphan, key) is None
+
+
+def test_gc_endpoint_is_admin_only(login, make_user):
+    assert login(make_user()).post("/api/admin/storage/gc").status_code == 403
+    resp = login(make_user(models.UserRole.admin)).post("/api/admin/storage/gc")
+    assert resp.status_code == 200
+    assert resp.json()["dry_run"] is True
@@ -0,0 +1,56 @@
+import io
+import zipfile
+from datetime import datetime, timedelta
+
+from Backend import models
+from Backend.utils.zipstream import ZipEntry, stream_zip
+
+
+def test_stream_zip_is_valid_and_stores_pdfs():
+    payload = b"%PDF" + b"\0" * 5000
+    chunks = list(
+        stream_zip(
+            [
+                ZipEntry("a.pdf", lambda: io.BytesIO(payload), len(payload)),
+                ZipEntry("b.txt", lambda: io.BytesIO(b"x" * 5000)),
+            ]
+        )
+    )
+    assert len(chunks) > 1
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.testzip() is None
+    assert archive.getinfo("a.pdf").compress_type == zipfile.ZIP_STORED
+    assert archive.getinfo("b.txt").compress_type == zipfile.ZIP_DEFLATED
+    assert archive.read("a.pdf") == payload
+
+
+def test_assignment_zip_has_latest_file_per_student(login, db, classroom, make_user):
+    instructor = db.get(models.User, classroom.instructor_id)
+    assignment = models.Assignment(title="HW", classroom_id=classroom.id)
+    db.add(assignment)
+    db.commit()
+    alice, bob = make_user(), make_user()
+    for student in (alice, bob):
+        db.add(models.ClassroomMember(classroom_id=classroom.id, user_id=student.id))
+    db.commit()
+
+    for student, body in ((alice, b"old"), (alice, b"new"), (bob, b"bob")):
+        resp = login(student).post(
+            f"/api/submissions/{assignment.id}/upload",
+            files={"file": ("work.pdf", body, "application/pdf")},
+        )
+        assert resp.status_code == 200
+    # make ordering independent of upload timestamps within the same second
+    latest = db.query(models.Submission).filter_by(user_id=alice.id).order_by(models.Submission.id).all()
+    latest[0].submitted_at = datetime.utcnow() - timedelta(hours=1)
+    db.commit()
+
+    resp = login(instructor).get(f"/api/assignments/{assignment.id}/submissions.zip")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(resp.content))
+    assert archive.read(f"{alice.email}.pdf") == b"new"
+    assert archive.read(f"{bob.email}.pdf") == b"bob"
+    assert archive.read("manifest.csv").decode().count("\n") == 3
+
+    assert login(alice).get(f"/api/assignments/{assignment.id}/submissions.zip").status_code == 403
@@ -0,0 +1,285 @@
+"""
+Auto-grading for assignments created from POLY_TEMPLATES, including the
+parameterized ones whose per-student answer keys live in exercise_variants
+(utils/exercises.py).
+
+Answers are read from `Submission.content`, one per line (a leading "1)",
+"a." or "Answer:" and anything before the last "=" are ignored). Polynomials
+over GF(2) may be written as `x^4 + x + 1`, `x⁴ + x + 1` or `0x13`;
+factorizations over GF(p) as `2 (x + 1)^2 (x^2 + x + 2)`.
+Answer keys are computed with Backend.gf once per template, and a whole
+assignment is graded with a single UPDATE. Submissions whose content can't be
+parsed (e.g. file-only uploads) stay ungraded for the instructor.
+"""
+
+import logging
+import re
+from functools import cache
+
+from sqlalchemy import case, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import SessionLocal
+from ..gf import GFConfig, gf_add, gf_mul, gfp, is_irreducible
+from .exercises import AnswerKey, ensure_variants, is_parameterized
+
+logger = logging.getLogger(__name__)
+
+FULL_MARKS = 100.0
+# Content stored for submissions that are only a file (routers/submission.py)
+FILE_UPLOAD_PREFIX = "File upload: "
+# Stay well below SQLite's bound-parameter limit per statement
+_UPDATE_BATCH = 500
+
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹", "0123456789")
+_SUPERSCRIPT_RUN = re.compile(r"[⁰¹²³⁴⁵⁶⁷⁸⁹]+")
+_TERM = re.compile(r"^(\d*)(?:(x)(?:\^(\d+))?)?$")
+_ENUMERATION = re.compile(r"^\s*(?:\(?[0-9a-z]\)|[0-9a-z][.:]|answer\s*:)\s*", re.IGNORECASE)
+_MOD_SUFFIX = re.compile(r"\(?\s*(?:mod|modulo)\b.*$", re.IGNORECASE)
+_INTEGER = re.compile(r"-?\d+")
+_FACTOR = re.compile(r"\(([^()]+)\)(?:\^(\d+))?|(\d+)|x(?:\^(\d+))?")
+# Highest power accepted in a GF(p) polynomial answer
+_MAX_POWER = 4096
+_SIGNED_TERMS = re.compile(r"[+-]?[^+-]+(?:[+-][^+-]+)*")
+
+
+def _clean(text: str) -> str:
+    text = _SUPERSCRIPT_RUN.sub(lambda m: "^" + m.group(0).translate(_SUPERSCRIPTS), text)
+    return re.sub(r"[\s·*]", "", text).rstrip(".;,").lower()
+
+
+def parse_gf2_poly(text: str) -> int | None:
+    """`x^4 + x + 1`, `x⁴+x+1`, `0x13` or `0b10011` -> 0x13; None if it isn't a polynomial."""
+    text = _clean(text)
+    if not text:
+        return None
+    if re.fullmatch(r"0x[0-9a-f]+|0b[01]+", text):
+        return int(text, 0)
+    value = 0
+    # Over GF(2) subtraction is addition
+    for term in re.split(r"[+-]", text):
+        match = _TERM.match(term)
+        if not term or not match or not (match.group(1) or match.group(2)):
+            return None
+        coeff = int(match.group(1)) if match.group(1) else 1
+        power = 0 if not match.group(2) else int(match.group(3) or 1)
+        if coeff % 2:
+            value ^= 1 << power
+    return value
+
+
+def parse_gfp_poly(text: str, p: int) -> gfp.Poly | None:
+    """`3x^3 - x + 1` over GF(p) -> coefficient tuple (see gf/gfp.py); None if it isn't a polynomial."""
+    text = _clean(text)
+    if not _SIGNED_TERMS.fullmatch(text):
+        return None
+    coeffs: dict[int, int] = {}
+    for term in re.findall(r"[+-]?[^+-]+", text):
+        sign, term = (-1, term[1:]) if term[0] == "-" else (1, term.lstrip("+"))
+        match = _TERM.match(term)
+        if not match or not (match.group(1) or match.group(2)):
+            return None
+        coeff = int(match.group(1)) if match.group(1) else 1
+        power = 0 if not match.group(2) else int(match.group(3) or 1)
+        if power > _MAX_POWER:
+            return None
+        coeffs[power] = coeffs.get(power, 0) + sign * coeff
+    return gfp.poly([coeffs.get(i, 0) for i in range(max(coeffs) + 1)], p)
+
+
+def parse_factorization(text: str, p: int) -> tuple[int, list[tuple[gfp.Poly, int]]] | None:
+    """`2(x+1)^2(x^2+x+2)` or `x^2 (x + 4)` -> (constant, [(factor, exponent), ...])."""
+    text = _clean(text)
+    lead, factors, pos = 1, [], 0
+    for match in _FACTOR.finditer(text):
+        if match.start() != pos:
+            return None
+        pos = match.end()
+        inner, exponent, constant, x_power = match.groups()
+        if constant:
+            lead *= int(constant)
+        elif inner is not None:
+            factor = parse_gfp_poly(inner, p)
+            if factor is None:
+                return None
+            factors.append((factor, int(exponent or 1)))
+        else:
+            factors.append((gfp.X, int(x_power or 1)))
+    if not text or pos != len(text):
+        return None
+    return lead % p, factors
+
+
+def check_factorization(answer: str, f: gfp.Poly, p: int) -> bool | None:
+    """
+    True if the last line of `answer` that reads as a factorization multiplies
+    out to f with every non-constant factor irreducible; None if none parses.
+    """
+    parsed = None
+    for line in reversed(_answer_lines(answer)):
+        parsed = parse_factorization(line, p)
+        if parsed is not None:
+            break
+    if parsed is None:
+        return None
+    lead, factors = parsed
+    if sum(gfp.degree(g) * k for g, k in factors if g) != gfp.degree(f):
+        return False
+    product = gfp.poly([lead], p)
+    for g, k in factors:
+        if gfp.degree(g) < 1:  # a constant (or zero) written in parentheses
+            product = gfp.scale(product, pow(g[0], k, p) if g else 0, p)
+            continue
+        if not gfp.is_irreducible(gfp.monic(g, p), p):
+            return False
+        for _ in range(k):
+            product = gfp.mul(product, g, p)
+    return product == f
+
+
+def check_factorizations(answers: list[str], f: gfp.Poly, p: int) -> tuple[str, list[bool | None]]:
+    """(expected factorization, verdict per answer) — one compute-tier job per class."""
+    return gfp.factorization_string(*gfp.factor(f, p)), [check_factorization(a, f, p) for a in answers]
+
+
+def _answer_lines(content: str) -> list[str]:
+    lines = []
+    for raw in re.split(r"[\n;]", content or ""):
+        line = _ENUMERATION.sub("", raw).strip()
+        line = line.rsplit("=", 1)[-1].rsplit("≡", 1)[-1]
+        line = _MOD_SUFFIX.sub("", line).strip()
+        if line:
+            lines.append(line)
+    return lines
+
+
+def parse_poly_answers(content: str) -> list[int]:
+    return [p for p in map(parse_gf2_poly, _answer_lines(content)) if p is not None]
+
+
+# ---------------------------------------------------------------------------
+# Answer keys (same problems as POLY_TEMPLATES in routers/assignment.py)
+# ---------------------------------------------------------------------------
+def _poly(text: str) -> int:
+    value = parse_gf2_poly(text)
+    assert value is not None, text
+    return value
+
+
+@cache
+def answer_key(template_id: str) -> AnswerKey | None:
+    if template_id == "gf-addition":
+        return AnswerKey(
+            polys=(
+                gf_add(_poly("x^4 + x^2 + 1"), _poly("x^3 + x^2 + x")),
+                gf_add(_poly("x^7 + x + 1"), _poly("x^6 + x^5 + x^2")),
+            )
+        )
+    if template_id == "gf-multiplication":
+        field = GFConfig(3, _poly("x^3 + x + 1"))
+        return AnswerKey(polys=(gf_mul(_poly("x^2 + 1"), _poly("x + 1"), field),))
+    if template_id == "gf-irreducible":
+        return AnswerKey(irreducible=is_irreducible(_poly("x^4 + x + 1"), 4))
+    if template_id == "gf-eval":
+        return AnswerKey(value=gfp.evaluate(gfp.poly([1, 2, 4, 3], 5), 7, 5))
+    return None
+
+
+def score(template_id: str, content: str, key: AnswerKey | None = None) -> float | None:
+    """
+    Grade out of FULL_MARKS, or None when the answer needs a human. `key`
+    is the student's own key for parameterized templates.
+    """
+    key = key or answer_key(template_id)
+    if key is None or (content or "").startswith(FILE_UPLOAD_PREFIX):
+        return None
+
+    if key.irreducible is not None:
+        text = (content or "").lower()
+        says_reducible = bool(
+            re.search(r"\bnot\s+irreducible\b", text) or re.search(r"\breducible\b", text)
+        )
+        says_irreducible = bool(re.search(r"\birreducible\b", re.sub(r"\bnot\s+irreducible\b", "", text)))
+        if says_reducible == says_irreducible:  # neither or both: ambiguous
+            return None
+        return FULL_MARKS if says_irreducible == key.irreducible else 0.0
+
+    if key.value is not None:
+        lines = _answer_lines(content)
+        if not lines or not _INTEGER.fullmatch(lines[-1]):  # digits inside prose aren't an answer
+            return None
+        return FULL_MARKS if int(lines[-1]) == key.value else 0.0
+
+    answers = parse_poly_answers(content)
+    if not answers:
+        return None
+    if len(key.polys) == 1:
+        # intermediate results may come first; the last line is the final answer
+        return FULL_MARKS if answers[-1] == key.polys[0] else 0.0
+    found = set(answers)
+    return round(FULL_MARKS * sum(p in found for p in key.polys) / len(key.polys), 2)
+
+
+# ---------------------------------------------------------------------------
+# Batch + incremental grading
+# ---------------------------------------------------------------------------
+def grade_pending(db: Session, assignment: models.Assignment) -> tuple[int, int]:
+    """
+    Grade every ungraded submission of `assignment`.
+    Returns (graded, left for manual grading).
+    """
+    template_id = assignment.template_id
+    parameterized = is_parameterized(template_id)
+    if not template_id or (answer_key(template_id) is None and not parameterized):
+        return 0, 0
+    rows = db.query(
+        models.Submission.id, models.Submission.user_id, models.Submission.content
+    ).filter(
+        models.Submission.assignment_id == assignment.id,
+        models.Submission.grade.is_(None),
+    ).all()
+    keys = ensure_variants(db, assignment, {row.user_id for row in rows}) if parameterized else {}
+    grades: dict[int, float] = {}
+    skipped = 0
+    for submission_id, user_id, content in rows:
+        result = score(template_id, content, keys.get(user_id))
+        if result is None:
+            skipped += 1
+        else:
+            grades[submission_id] = result
+
+    ids = list(grades)
+    for start in range(0, len(ids), _UPDATE_BATCH):
+        chunk = {i: grades[i] for i in ids[start : start + _UPDATE_BATCH]}
+        db.execute(
+            update(models.Submission)
+            .where(models.Submission.id.in_(chunk), models.Submission.grade.is_(None))
+            .values(grade=case(chunk, value=models.Submission.id))
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    return len(grades), skipped
+
+
+def grade_submission_in_background(submission_id: int) -> None:
+    """BackgroundTasks hook: grade one new submission if its assignment is auto-gradable."""
+    db = SessionLocal()
+    try:
+        submission = db.get(models.Submission, submission_id)
+        if submission is None or submission.grade is not None:
+            return
+        assignment = submission.assignment
+        if not assignment.template_id:
+            return
+        key = None
+        if is_parameterized(assignment.template_id):
+            key = ensure_variants(db, assignment, [submission.user_id])[submission.user_id]
+        result = score(assignment.template_id, submission.content, key)
+        if result is not None:
+            submission.grade = result
+            db.commit()
+    except Exception as exc:  # grading is best-effort; the submission is already stored
+        logger.warning("Auto-grading submission %s failed: %r", submission_id, exc, exc_info=True)
+    finally:
+        db.close()
@@ -0,0 +1,220 @@
+"""
+Compute tier for CPU-heavy math endpoints (big-field GF ops, traces, batches,
+GF(p)[x] factorization).
+
+Jobs run in a dedicated ProcessPoolExecutor, so they never hold the GIL or a
+request thread of the API process; endpoints `await run_compute(...)` on the
+event loop. Sync code that already runs in the threadpool between database
+calls (the modulus search) submits its jobs the same way and blocks on them
+with `wait`/`call`. Admission is bounded: at most COMPUTE_WORKERS running plus
+COMPUTE_QUEUE_SIZE waiting, everything beyond that is rejected right away
+(ComputeSaturated -> 503 with Retry-After) instead of queueing behind minutes
+of work. Inside a worker each job gets COMPUTE_CPU_SECONDS of CPU time
+(RLIMIT_CPU + SIGXCPU, POSIX only); the API additionally stops waiting after
+COMPUTE_WALL_SECONDS. Workers are replaced after COMPUTE_MAX_TASKS_PER_WORKER
+jobs so caches and fragmentation can't grow without bound.
+"""
+
+import asyncio
+import multiprocessing
+import signal
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+try:  # POSIX only; without it jobs are limited by COMPUTE_WALL_SECONDS alone
+    import resource
+except ImportError:  # pragma: no cover - Windows dev machines
+    resource = None
+
+from ..core.config import settings
+
+# Execution times kept for the percentiles in metrics()
+_TIMING_WINDOW = 1024
+
+
+class ComputeSaturated(Exception):
+    """Every worker is busy and the queue is full."""
+
+
+class ComputeTimeLimit(Exception):
+    """The job used up its CPU (or wall-clock) time."""
+
+
+@dataclass
+class _Stats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    exec_seconds: deque = field(default_factory=lambda: deque(maxlen=_TIMING_WINDOW))
+    wait_seconds: deque = field(default_factory=lambda: deque(maxlen=_TIMING_WINDOW))
+
+
+_pool: ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+_pending = 0
+_stats = _Stats()
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+def _raise_time_limit(_signum, _frame):
+    raise ComputeTimeLimit("Computation exceeded its CPU time limit")
+
+
+def _run_limited(fn: Callable, args: tuple, cpu_seconds: int, queued_at: float) -> tuple[Any, float, float]:
+    """Run fn(*args) with a CPU budget; returns (result, seconds waited in the queue, seconds run)."""
+    started = time.time()
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _raise_time_limit)
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = usage.ru_utime + usage.ru_stime
+        _soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        resource.setrlimit(resource.RLIMIT_CPU, (int(used) + 1 + cpu_seconds, hard))
+    try:
+        return fn(*args), started - queued_at, time.time() - started
+    finally:
+        if resource is not None:
+            resource.setrlimit(resource.RLIMIT_CPU, (resource.RLIM_INFINITY, hard))
+
+
+# ---------------------------------------------------------------------------
+# API side
+# ---------------------------------------------------------------------------
+def _capacity() -> int:
+    return settings.COMPUTE_WORKERS + settings.COMPUTE_QUEUE_SIZE
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # forkserver/spawn: max_tasks_per_child can't be combined with fork, and
+        # workers shouldn't inherit the API process's sockets and threads
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.COMPUTE_WORKERS,
+            mp_context=context,
+            max_tasks_per_child=settings.COMPUTE_MAX_TASKS_PER_WORKER,
+        )
+    return _pool
+
+
+def _finished(future: Future) -> None:
+    global _pending
+    with _lock:
+        _pending = max(0, _pending - 1)  # futures cancelled by shutdown() were already dropped
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is None:
+            _result, waited, ran = future.result()
+            _stats.completed += 1
+            _stats.wait_seconds.append(waited)
+            _stats.exec_seconds.append(ran)
+        elif isinstance(exc, ComputeTimeLimit):
+            _stats.timed_out += 1
+        else:
+            _stats.failed += 1
+
+
+def submit(fn: Callable, *args) -> Future:
+    """Queue fn(*args) (both picklable) or raise ComputeSaturated."""
+    global _pending
+    with _lock:
+        if _pending >= _capacity():
+            _stats.rejected += 1
+            raise ComputeSaturated()
+        future = _get_pool().submit(_run_limited, fn, args, settings.COMPUTE_CPU_SECONDS, time.time())
+        _pending += 1
+        _stats.submitted += 1
+    future.add_done_callback(_finished)
+    return future
+
+
+async def run_compute(fn: Callable, *args) -> Any:
+    """Run fn(*args) in the compute tier without blocking the event loop."""
+    future = submit(fn, *args)
+    try:
+        result, _waited, _ran = await asyncio.wait_for(
+            asyncio.wrap_future(future), timeout=settings.COMPUTE_WALL_SECONDS
+        )
+    except asyncio.TimeoutError:
+        # the worker stops on its own once the CPU limit hits (counted in _finished)
+        raise ComputeTimeLimit(f"Computation took longer than {settings.COMPUTE_WALL_SECONDS} s")
+    except BrokenProcessPool:
+        shutdown()  # a worker died (e.g. OOM-killed); start a fresh pool next time
+        raise
+    return result
+
+
+def wait(future: Future) -> Any:
+    """Block until a job from `submit` is done; the threadpool counterpart of run_compute."""
+    try:
+        result, _waited, _ran = future.result(timeout=settings.COMPUTE_WALL_SECONDS)
+    except FutureTimeout:
+        raise ComputeTimeLimit(f"Computation took longer than {settings.COMPUTE_WALL_SECONDS} s")
+    except BrokenProcessPool:
+        shutdown()
+        raise
+    return result
+
+
+def call(fn: Callable, *args) -> Any:
+    """Run fn(*args) in the compute tier from sync code, blocking the calling thread."""
+    return wait(submit(fn, *args))
+
+
+def _percentile(values: list[float], q: int) -> float | None:
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def metrics() -> dict:
+    with _lock:
+        pending = _pending
+        stats = {key: getattr(_stats, key) for key in ("submitted", "completed", "failed", "rejected", "timed_out")}
+        exec_seconds = list(_stats.exec_seconds)
+        wait_seconds = list(_stats.wait_seconds)
+    workers = settings.COMPUTE_WORKERS
+    return {
+        "workers": workers,
+        "capacity": _capacity(),
+        "running": min(pending, workers),
+        "queue_depth": max(0, pending - workers),
+        **stats,
+        "exec_ms": {
+            "p50": _ms(_percentile(exec_seconds, 50)),
+            "p95": _ms(_percentile(exec_seconds, 95)),
+            "max": _ms(max(exec_seconds, default=None)),
+        },
+        "queue_wait_ms": {
+            "p50": _ms(_percentile(wait_seconds, 50)),
+            "p95": _ms(_percentile(wait_seconds, 95)),
+        },
+    }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def shutdown() -> None:
+    global _pool, _pending
+    with _lock:
+        pool, _pool = _pool, None
+        _pending = 0
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
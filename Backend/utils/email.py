@@ -1,3 +1,5 @@
+import logging
+
 from sqlalchemy.orm import Session
 import requests
 
@@ -5,21 +7,24 @@ from ..core.config import settings
 from ..models import User
 from .tokens import make_token
 
+logger = logging.getLogger(__name__)
+
 MAILJET_URL = "https://api.mailjet.com/v3.1/send"
 
 
 def _send_mail(to: str, subject: str, body: str) -> None:
     """
     Send an email using Mailjet's HTTP API.
-    Falls back to printing in dev if mail settings are not configured.
+    Falls back to logging the message in dev if mail settings are not configured.
     """
     if not (
         settings.SMTP_USER
         and settings.SMTP_PASSWORD
         and settings.MAIL_FROM
     ):
-        # Dev fallback: just print the email content
-        print(f"[DEV] Would send email to {to}: {subject}\n{body}\n")
+        # Dev fallback: log the email instead; the body holds a verify/reset link, a credential
+        logger.info("Would send email to %s: %s (no mail settings; LOG_LEVEL=DEBUG shows the body)", to, subject)
+        logger.debug("Email body for %s:\n%s", to, body)
         return
 
     payload = {
@@ -44,14 +49,13 @@ def _send_mail(to: str, subject: str, body: str) -> None:
             timeout=10,
         )
         if resp.status_code >= 400:
-            print(
-                f"[ERROR] Mailjet API send failed: "
-                f"status={resp.status_code}, body={resp.text}"
+            logger.error(
+                "Mailjet API send failed: status=%s, body=%s", resp.status_code, resp.text
             )
         else:
-            print(f"[MAIL] Sent email to {to}: {subject}")
+            logger.info("Sent email to %s: %s", to, subject)
     except Exception as exc:  # best-effort, don't break signup/reset
-        print(f"[ERROR] Mailjet API send failed: {repr(exc)}")
+        logger.error("Mailjet API send failed: %r", exc)
 
 
 def send_verification_email(db: Session, user: User) -> str:
@@ -65,7 +69,7 @@ def send_verification_email(db: Session, user: User) -> str:
         "If you did not create this account, you can ignore this email."
     )
     _send_mail(user.email, "Verify your PolyLab account", body)
-    print(f"[DEV] Verify link for {user.email}: {link}")
+    logger.debug("Verify link for %s: %s", user.email, link)  # a credential: debug level only
     return token
 
 
@@ -80,7 +84,7 @@ def send_reset_email(db: Session, user: User) -> str:
         "If you did not request a reset, you can ignore this email."
     )
     _send_mail(user.email, "Reset your PolyLab password", body)
-    print(f"[DEV] Reset link for {user.email}: {link}")
+    logger.debug("Reset link for %s: %s", user.email, link)
     return token
 
 
@@ -0,0 +1,252 @@
+"""
+Parameterized exercises: one variant of a template per (assignment, student).
+
+A parameterized template is text with slots (`{a}`, `{mod}`, ...) plus a
+generator that draws the slot values and computes the answer key with
+Backend.gf. The generator's RNG is seeded from an HMAC of (assignment id,
+student id) under SECRET_KEY, so a variant can always be regenerated but
+can't be predicted from the ids alone.
+
+Variants are generated in bulk when the assignment is published (created from
+a parameterized template) for every member of the classroom, and stored in
+`exercise_variants` with a unique (assignment_id, user_id) index. Showing a
+student their exercise and grading their submission are lookups. Students
+who join later get their variant on first lookup.
+"""
+
+import hashlib
+import hmac
+import json
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import cache
+from typing import Callable
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core.config import settings
+from ..gf import GFConfig, as_poly_string, gf_add, gf_inv, gf_mul, gfp, is_irreducible
+
+_SUPERSCRIPTS = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    polys: tuple[int, ...] = ()
+    irreducible: bool | None = None
+    value: int | None = None
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> "AnswerKey":
+        data = json.loads(text)
+        return cls(tuple(data["polys"]), data["irreducible"], data["value"])
+
+
+@dataclass(frozen=True)
+class ExerciseTemplate:
+    id: str
+    title: str
+    text: str  # str.format slots filled by `generate`
+    generate: Callable[[random.Random], tuple[dict[str, str | int], AnswerKey]]
+
+
+def pretty(poly: int) -> str:
+    """0x13 -> "x⁴ + x + 1", the way the fixed templates are written."""
+    return " + ".join(
+        term.split("^")[0] + term.split("^")[1].translate(_SUPERSCRIPTS) if "^" in term else term
+        for term in as_poly_string(poly).split(" + ")
+    )
+
+
+@cache
+def irreducibles(m: int) -> tuple[int, ...]:
+    return tuple(f for f in range(1 << m, 1 << (m + 1)) if is_irreducible(f, m))
+
+
+def _poly_of_degree(rng: random.Random, degree: int) -> int:
+    return (1 << degree) | rng.getrandbits(degree)
+
+
+def _element(rng: random.Random, m: int) -> int:
+    """A field element that isn't 0 or 1."""
+    return rng.randrange(2, 1 << m)
+
+
+# ---------- Generators ----------
+def _addition(rng: random.Random):
+    params, polys = {}, []
+    for i in (1, 2):
+        p = _poly_of_degree(rng, rng.randint(4, 7))
+        q = _poly_of_degree(rng, rng.randint(3, 7))
+        while q == p:
+            q = _poly_of_degree(rng, rng.randint(3, 7))
+        params[f"p{i}"], params[f"q{i}"] = pretty(p), pretty(q)
+        polys.append(gf_add(p, q))
+    return params, AnswerKey(polys=tuple(polys))
+
+
+def _multiplication(rng: random.Random):
+    m = rng.randint(3, 5)
+    mod = rng.choice(irreducibles(m))
+    a, b = _element(rng, m), _element(rng, m)
+    product = gf_mul(a, b, GFConfig(m, mod))
+    return {"a": pretty(a), "b": pretty(b), "mod": pretty(mod)}, AnswerKey(polys=(product,))
+
+
+def _inverse(rng: random.Random):
+    m = rng.randint(4, 6)
+    mod = rng.choice(irreducibles(m))
+    a = _element(rng, m)
+    return {"a": pretty(a), "m": m, "mod": pretty(mod)}, AnswerKey(polys=(gf_inv(a, GFConfig(m, mod)),))
+
+
+def _irreducible(rng: random.Random):
+    m = rng.randint(4, 6)
+    if rng.random() < 0.5:
+        f = rng.choice(irreducibles(m))
+    else:
+        f = _poly_of_degree(rng, m) | 1  # no root at 0, so x doesn't give it away
+    return {"f": pretty(f)}, AnswerKey(irreducible=is_irreducible(f, m))
+
+
+def _evaluation(rng: random.Random):
+    p = rng.choice((5, 7, 11, 13))
+    coeffs = [rng.randrange(p) for _ in range(3)] + [rng.randrange(1, p)]
+    f = gfp.poly(coeffs, p)
+    x = rng.randrange(p + 2, 4 * p)  # above p, so reducing x first is part of the work
+    return {"f": gfp.as_string(f), "x": x, "p": p}, AnswerKey(value=gfp.evaluate(f, x, p))
+
+
+EXERCISE_TEMPLATES: dict[str, ExerciseTemplate] = {
+    template.id: template
+    for template in (
+        ExerciseTemplate(
+            "gf-addition-random",
+            "Polynomial Addition in GF(2) (individual)",
+            "Add the following polynomials over GF(2):\n1) {p1}  +  {q1}\n2) {p2}  +  {q2}",
+            _addition,
+        ),
+        ExerciseTemplate(
+            "gf-multiplication-random",
+            "Polynomial Multiplication mod an Irreducible (individual)",
+            "Compute ({a}) · ({b}) over GF(2), then reduce modulo the irreducible polynomial {mod}.",
+            _multiplication,
+        ),
+        ExerciseTemplate(
+            "gf-inverse-random",
+            "Multiplicative Inverse in GF(2^m) (individual)",
+            "Find the inverse of {a} in GF(2^{m}) = GF(2)[x] / ({mod}) with the extended Euclidean algorithm.",
+            _inverse,
+        ),
+        ExerciseTemplate(
+            "gf-irreducible-random",
+            "Check Irreducibility (individual)",
+            "Show whether {f} is irreducible over GF(2). If reducible, factor it; if irreducible, justify briefly.",
+            _irreducible,
+        ),
+        ExerciseTemplate(
+            "gf-eval-random",
+            "Evaluate a Polynomial in GF(p) (individual)",
+            "Evaluate f(x) = {f} at x = {x} (mod {p}). Show intermediate steps.",
+            _evaluation,
+        ),
+    )
+}
+
+
+def is_parameterized(template_id: str | None) -> bool:
+    return template_id in EXERCISE_TEMPLATES
+
+
+def variant_seed(assignment_id: int, user_id: int) -> int:
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(), f"exercise:{assignment_id}:{user_id}".encode(), hashlib.sha256
+    ).digest()
+    return int.from_bytes(digest[:8], "big") >> 1  # fits a signed 64-bit column
+
+
+def generate(template_id: str, seed: int) -> tuple[str, AnswerKey]:
+    """(exercise text, answer key) of one variant; the same seed always gives the same variant."""
+    template = EXERCISE_TEMPLATES[template_id]
+    params, key = template.generate(random.Random(seed))
+    return template.text.format(**params), key
+
+
+# ---------- Storage ----------
+def ensure_variants(db: Session, assignment: models.Assignment, user_ids) -> dict[int, AnswerKey]:
+    """
+    Answer keys of `user_ids` for a parameterized assignment; missing variants
+    are generated and inserted with one statement. Commits.
+    """
+    wanted = set(user_ids)
+    # one indexed range scan over the assignment's variants (a class's worth of rows)
+    keys = {
+        user_id: AnswerKey.from_json(answer)
+        for user_id, answer in db.execute(
+            select(models.ExerciseVariant.user_id, models.ExerciseVariant.answer).where(
+                models.ExerciseVariant.assignment_id == assignment.id
+            )
+        )
+        if user_id in wanted
+    }
+    rows = []
+    now = datetime.utcnow()
+    for user_id in sorted(wanted - keys.keys()):
+        seed = variant_seed(assignment.id, user_id)
+        text, key = generate(assignment.template_id, seed)
+        keys[user_id] = key
+        rows.append(
+            {
+                "assignment_id": assignment.id,
+                "user_id": user_id,
+                "template_id": assignment.template_id,
+                "seed": seed,
+                "description": text,
+                "answer": key.to_json(),
+                "created_at": now,
+            }
+        )
+    if rows:
+        # a concurrent lookup may have inserted the same (deterministic) row
+        db.execute(insert(models.ExerciseVariant).prefix_with("OR IGNORE"), rows)
+        db.commit()
+    return keys
+
+
+def publish(db: Session, assignment: models.Assignment) -> int:
+    """
+    Generate every classroom member's variant (dropping variants of a previous
+    template); returns how many members have one.
+    """
+    db.execute(
+        delete(models.ExerciseVariant).where(
+            models.ExerciseVariant.assignment_id == assignment.id,
+            # IS DISTINCT FROM: a cleared template (NULL) drops them all
+            models.ExerciseVariant.template_id.is_distinct_from(assignment.template_id),
+        )
+    )
+    db.commit()
+    if not is_parameterized(assignment.template_id):
+        return 0
+    members = db.scalars(
+        select(models.ClassroomMember.user_id).where(
+            models.ClassroomMember.classroom_id == assignment.classroom_id
+        )
+    ).all()
+    return len(ensure_variants(db, assignment, members))
+
+
+def get_variant(db: Session, assignment: models.Assignment, user_id: int) -> models.ExerciseVariant:
+    ensure_variants(db, assignment, [user_id])
+    return db.scalars(
+        select(models.ExerciseVariant).where(
+            models.ExerciseVariant.assignment_id == assignment.id,
+            models.ExerciseVariant.user_id == user_id,
+        )
+    ).one()
@@ -0,0 +1,216 @@
+import hashlib
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import quote
+
+import anyio
+from fastapi import Request
+from fastapi.responses import Response
+
+from .uploads import is_text_like, is_versioned
+
+CHUNK_SIZE = 64 * 1024
+IMMUTABLE_CACHE = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE = "private, no-cache"
+# Preferred first; each entry is (Accept-Encoding token, file suffix)
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+@lru_cache(maxsize=4096)
+def _hash_file(path: str, mtime_ns: int, size: int) -> str:
+    # mtime/size are part of the cache key so a rewritten file gets a new hash
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def file_etag(path: Path, rel_path: str) -> str:
+    """Strong ETag: the digest folder for versioned uploads, else a content hash."""
+    if is_versioned(rel_path):
+        return f'"{rel_path.split("/")[-2]}"'
+    st = path.stat()
+    return f'"{_hash_file(str(path), st.st_mtime_ns, st.st_size)}"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def _parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Return (start, end) inclusive for a single `bytes=` range, None to send the
+    whole file, or raise ValueError when the range cannot be satisfied.
+    Multi-range requests are answered with the full body, which RFC 9110 allows.
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:  # suffix range: last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+def _pick_variant(request: Request, path: Path) -> tuple[Path, str | None]:
+    if not is_text_like(path.name):
+        return path, None
+    accepted = {
+        token.split(";")[0].strip()
+        for token in request.headers.get("accept-encoding", "").split(",")
+    }
+    for encoding, suffix in PRECOMPRESSED:
+        variant = path.with_name(path.name + suffix)
+        if encoding in accepted and variant.is_file():
+            return variant, encoding
+    return path, None
+
+
+class FileSliceResponse(Response):
+    """
+    Send `length` bytes of a file starting at `offset`.
+
+    Uses the ASGI `http.response.zerocopysend` extension (sendfile) when the
+    server offers it, otherwise streams fixed-size chunks from a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        offset: int,
+        length: int,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        super().__init__(status_code=status_code, headers=headers)
+        self.path = path
+        self.offset = offset
+        self.length = length
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if scope["method"] == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as fh:
+                await send(
+                    {
+                        "type": "http.response.zerocopysend",
+                        "file": fh,
+                        "offset": self.offset,
+                        "count": self.length,
+                        "more_body": False,
+                    }
+                )
+            return
+
+        remaining = self.length
+        async with await anyio.open_file(self.path, "rb") as fh:
+            await fh.seek(self.offset)
+            while remaining > 0:
+                chunk = await fh.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": remaining > 0,
+                    }
+                )
+        if remaining > 0:  # file shrank underneath us; close the body cleanly
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def cache_headers(path: Path, rel_path: str) -> dict[str, str]:
+    """Caching headers shared by the direct and X-Accel responses."""
+    return {
+        "Cache-Control": IMMUTABLE_CACHE if is_versioned(rel_path) else REVALIDATE_CACHE,
+        "Content-Disposition": f"inline; filename*=UTF-8''{quote(path.name)}",
+    }
+
+
+def serve_file(request: Request, path: Path, rel_path: str) -> Response:
+    """
+    Conditional + range-aware file response.
+    Handles If-None-Match (304), If-Range, single byte ranges (206/416) and
+    precompressed `.br`/`.gz` siblings for text-like files.
+    """
+    source, encoding = _pick_variant(request, path)
+    etag = file_etag(path, rel_path)
+    if encoding:
+        # Each representation needs its own strong validator
+        etag = f'{etag[:-1]}-{encoding}"'
+    headers = {**cache_headers(path, rel_path), "ETag": etag}
+    if is_text_like(path.name):
+        headers["Vary"] = "Accept-Encoding"
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Type"] = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    st = os.stat(source)
+    headers["Last-Modified"] = formatdate(st.st_mtime, usegmt=True)
+
+    if encoding:
+        # Byte ranges would refer to the encoded body; keep it simple and send it whole
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(st.st_size)
+        return FileSliceResponse(source, 0, st.st_size, headers=headers)
+
+    size = st.st_size
+    headers["Accept-Ranges"] = "bytes"
+    if_range = request.headers.get("if-range")
+    range_header = request.headers.get("range")
+    if if_range and if_range.strip() != etag:
+        range_header = None
+
+    try:
+        byte_range = _parse_range(range_header, size)
+    except ValueError:
+        return Response(
+            status_code=416,
+            headers={**headers, "Content-Range": f"bytes */{size}"},
+        )
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return FileSliceResponse(path, 0, size, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return FileSliceResponse(path, start, end - start + 1, status_code=206, headers=headers)
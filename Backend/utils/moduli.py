@@ -0,0 +1,195 @@
+"""
+Persistent index of irreducible / primitive moduli (tables gf_moduli, gf_modulus_scans).
+
+Every irreducible polynomial the server finds is stored once with its degree,
+weight and primitivity, so a repeated check or search is one indexed query.
+Searches walk the candidate order of gf/irreducible.py and remember how far
+they got per (m, kind): stored rows below that point are known to be complete,
+later requests only test what hasn't been tested yet. A request tests at most
+GF_SEARCH_MAX_CANDIDATES polynomials. For fields with m >= GF_SEARCH_POOL_MIN_M
+the tests run in the compute tier (utils/compute.py), one slice or sample batch
+per job and COMPUTE_WORKERS jobs at a time, so they share its admission bound
+and CPU limit: a search that can't get a single job in raises ComputeSaturated,
+one that gets some but not all stops early and reports `partial`.
+"""
+
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core.config import settings
+from ..gf.irreducible import (
+    candidate_count,
+    lower_bound,
+    order_factors,
+    outer_range,
+    sample,
+    scan,
+)
+from ..gf.jobs import classify_modulus
+from . import compute
+
+# Candidates per slice handed to one job (or tested inline)
+_SLICE_CANDIDATES = 256
+# Irreducible polynomials one sampling job looks for; keeps m = 571 well within COMPUTE_CPU_SECONDS
+_SAMPLE_BATCH = 4
+_WEIGHTS = {"trinomial": 3, "pentanomial": 5}
+
+_locks_lock = threading.Lock()
+_scan_locks: dict[tuple[int, str], threading.Lock] = {}
+
+
+@dataclass
+class SearchResult:
+    moduli: list[models.GFModulus]
+    exhausted: bool  # every candidate of this kind has been tested
+    partial: bool  # fewer than `limit` found within this request's budget; ask again
+
+
+def poly_hex(f: int, m: int) -> str:
+    return format(f, f"0{m // 4 + 1}x")
+
+
+def _in_compute_tier(m: int) -> bool:
+    return m >= settings.GF_SEARCH_POOL_MIN_M
+
+
+def _scan_lock(m: int, kind: str) -> threading.Lock:
+    with _locks_lock:
+        return _scan_locks.setdefault((m, kind), threading.Lock())
+
+
+def _store(db: Session, m: int, found: list[tuple[int, bool | None]]) -> None:
+    rows = {poly_hex(f, m): (f, primitive) for f, primitive in found}
+    if not rows:
+        return
+    existing = {
+        poly
+        for (poly,) in db.query(models.GFModulus.poly).filter(
+            models.GFModulus.m == m, models.GFModulus.poly.in_(list(rows))
+        )
+    }
+    for poly, (f, primitive) in rows.items():
+        if poly not in existing:
+            db.add(models.GFModulus(m=m, poly=poly, weight=f.bit_count(), primitive=primitive))
+
+
+def _commit(db: Session) -> None:
+    try:
+        db.commit()
+    except IntegrityError:  # another process stored the same rows first; theirs are as good
+        db.rollback()
+
+
+def check_polynomial(db: Session, f: int) -> tuple[bool, bool | None]:
+    """(irreducible, primitive) for f; irreducible ones are remembered."""
+    m = f.bit_length() - 1
+    row = db.query(models.GFModulus).filter_by(m=m, poly=poly_hex(f, m)).one_or_none()
+    if row is not None:
+        return True, row.primitive
+    irreducible, primitive = compute.call(classify_modulus, f) if _in_compute_tier(m) else classify_modulus(f)
+    if not irreducible:
+        return False, False
+    _store(db, m, [(f, primitive)])
+    _commit(db)
+    return True, primitive
+
+
+def _get_scan(db: Session, m: int, kind: str) -> models.GFModulusScan:
+    progress = db.get(models.GFModulusScan, (m, kind))
+    if progress is None:
+        progress = models.GFModulusScan(m=m, kind=kind, next_index=str(outer_range(m, kind).start))
+        db.add(progress)
+    return progress
+
+
+def _stored(
+    db: Session, m: int, kind: str, progress: models.GFModulusScan, primitive_only: bool, limit: int
+) -> list[models.GFModulus]:
+    query = db.query(models.GFModulus).filter(models.GFModulus.m == m)
+    if kind in _WEIGHTS:
+        query = query.filter(models.GFModulus.weight == _WEIGHTS[kind])
+    if primitive_only:
+        query = query.filter(models.GFModulus.primitive.is_(True))
+    if not progress.exhausted:
+        # only the part of the order that has been searched is complete
+        bound = lower_bound(m, kind, int(progress.next_index))
+        query = query.filter(models.GFModulus.poly < poly_hex(bound, m))
+    return query.order_by(models.GFModulus.poly).limit(limit).all()
+
+
+def find_moduli(db: Session, m: int, kind: str, limit: int, primitive_only: bool = False) -> SearchResult:
+    """The first `limit` irreducible (or primitive) polynomials of degree m and `kind`."""
+    outer = outer_range(m, kind)  # validates kind
+    if primitive_only and order_factors(m) is None:
+        raise ValueError(f"Primitivity is unknown for m={m}: 2^{m} - 1 could not be factored")
+    use_pool = _in_compute_tier(m)
+    slices_per_wave = settings.COMPUTE_WORKERS if use_pool else 1
+    budget = settings.GF_SEARCH_MAX_CANDIDATES
+
+    with _scan_lock(m, kind):
+        progress = _get_scan(db, m, kind)
+        while True:
+            rows = _stored(db, m, kind, progress, primitive_only, limit)
+            if len(rows) >= limit or progress.exhausted or budget <= 0:
+                return SearchResult(rows, progress.exhausted, len(rows) < limit and not progress.exhausted)
+
+            index = int(progress.next_index)
+            parts: list[list] = []
+            jobs = []
+            while len(parts) + len(jobs) < slices_per_wave and index < outer.stop and budget > 0:
+                start, count = index, 0
+                while index < outer.stop and count < min(_SLICE_CANDIDATES, budget):
+                    count += candidate_count(m, kind, index)
+                    index += 1
+                if not use_pool:
+                    parts.append(scan(m, kind, start, index))
+                else:
+                    try:
+                        jobs.append(compute.submit(scan, m, kind, start, index))
+                    except compute.ComputeSaturated:
+                        if not jobs:
+                            raise
+                        index = start  # this slice is left for the next request
+                        budget = 0
+                        break
+                budget -= count
+            parts += [compute.wait(job) for job in jobs]
+            _store(db, m, [item for part in parts for item in part])
+            progress.next_index = str(index)
+            progress.exhausted = index >= outer.stop
+            _commit(db)
+            progress = _get_scan(db, m, kind)
+
+
+def sample_moduli(db: Session, m: int, count: int, seed: int | None = None) -> list[models.GFModulus]:
+    """`count` random irreducible polynomials of degree m (fewer if the budget runs out)."""
+    tries = settings.GF_SEARCH_MAX_CANDIDATES
+    if _in_compute_tier(m):
+        batches = -(-count // _SAMPLE_BATCH)
+        seeds = [None if seed is None else seed * batches + i for i in range(batches)]
+        found: dict[int, bool | None] = {}
+        while seeds and len(found) < count:
+            jobs = []
+            for batch_seed in seeds[: settings.COMPUTE_WORKERS]:
+                try:
+                    jobs.append(compute.submit(sample, m, _SAMPLE_BATCH, batch_seed, tries // batches))
+                except compute.ComputeSaturated:
+                    if not jobs and not found:
+                        raise
+                    seeds = []  # return what we have
+                    break
+            seeds = seeds[len(jobs):]
+            for job in jobs:
+                found.update(compute.wait(job))
+    else:
+        found = dict(sample(m, count, seed, tries))
+    polys = [poly_hex(f, m) for f in list(found)[:count]]
+    _store(db, m, [(f, found[f]) for f in list(found)[:count]])
+    _commit(db)
+    rows = db.query(models.GFModulus).filter(models.GFModulus.m == m, models.GFModulus.poly.in_(polys))
+    by_poly = {row.poly: row for row in rows}
+    return [by_poly[poly] for poly in polys if poly in by_poly]
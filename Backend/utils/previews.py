@@ -0,0 +1,199 @@
+"""
+Downscaled WebP previews for uploaded images and PDFs.
+
+Previews live next to the originals under `previews/<original key>.webp` and are
+rendered in a small process pool right after upload, so instructors and admins
+don't have to download full-size scans and PDFs just to glance at them. A
+preview that is requested before the pool got to it is rendered on demand.
+Workers get a file path when the upload is on this machine and the bytes
+otherwise. Like the compute tier they are started by a forkserver, so they
+don't inherit the API process's threads (log writer, profiler, threadpool).
+"""
+
+import io
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
+from urllib.parse import urlsplit, urlunsplit
+
+from ..core.config import settings
+from ..storage import get_storage
+
+try:  # optional: image thumbnails
+    from PIL import Image
+except ImportError:  # pragma: no cover - depends on environment
+    Image = None
+
+try:  # optional: first-page PDF previews
+    import pymupdf
+except ImportError:  # pragma: no cover - depends on environment
+    try:
+        import fitz as pymupdf
+    except ImportError:
+        pymupdf = None
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_PREFIX = "previews/"
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"}
+PDF_SUFFIXES = {".pdf"}
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _supported_suffixes() -> set[str]:
+    suffixes: set[str] = set()
+    if Image is not None:
+        suffixes |= IMAGE_SUFFIXES
+        if pymupdf is not None:
+            suffixes |= PDF_SUFFIXES
+    return suffixes
+
+
+def check_dependencies() -> None:
+    """Log a warning at startup for each missing renderer; those uploads get no preview."""
+    if not settings.PREVIEWS_ENABLED:
+        return
+    if Image is None:
+        logger.warning("Pillow is not installed: uploads get no previews")
+    elif pymupdf is None:
+        logger.warning("pymupdf is not installed: PDF uploads get no previews")
+
+
+def can_preview(name: str) -> bool:
+    return settings.PREVIEWS_ENABLED and PurePosixPath(name).suffix.lower() in _supported_suffixes()
+
+
+def preview_key(key: str) -> str:
+    return f"{PREVIEW_PREFIX}{key}.webp"
+
+
+def source_key(preview: str) -> str | None:
+    """Inverse of preview_key(); None if `preview` is not a preview key."""
+    if not preview.startswith(PREVIEW_PREFIX) or not preview.endswith(".webp"):
+        return None
+    return preview[len(PREVIEW_PREFIX) : -len(".webp")] or None
+
+
+def preview_url_for(file_url: str | None) -> str | None:
+    """
+    `/uploads/<key>` (absolute or relative) -> `/uploads/previews/<key>.webp`,
+    or None when the file type has no preview.
+    """
+    if not file_url:
+        return None
+    parts = urlsplit(file_url)
+    if not parts.path.startswith("/uploads/") or not can_preview(parts.path):
+        return None
+    key = parts.path[len("/uploads/") :]
+    if key.startswith(PREVIEW_PREFIX):
+        return None
+    return urlunsplit(parts._replace(path=f"/uploads/{preview_key(key)}", query=""))
+
+
+# ---------------------------------------------------------------------------
+# Rendering (runs inside the worker processes)
+# ---------------------------------------------------------------------------
+def render_preview(source: bytes | str, name: str, max_px: int) -> bytes | None:
+    """WebP preview of `source`, the file's bytes or its path."""
+    suffix = PurePosixPath(name).suffix.lower()
+    from_path = isinstance(source, str)
+    if suffix in PDF_SUFFIXES:
+        if pymupdf is None:
+            return None
+        if from_path:  # a partial resumable upload's path has no suffix
+            opened = pymupdf.open(source, filetype="pdf")
+        else:
+            opened = pymupdf.open(stream=source, filetype="pdf")
+        with opened as doc:
+            if doc.page_count == 0:
+                return None
+            page = doc[0]
+            zoom = max_px / max(page.rect.width, page.rect.height)
+            pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+            image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+    else:
+        image = Image.open(source if from_path else io.BytesIO(source))
+        image.draft("RGB", (max_px, max_px))  # cheap JPEG downscale while decoding
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+    image.thumbnail((max_px, max_px))
+    out = io.BytesIO()
+    image.save(out, "WEBP", quality=80, method=4)
+    return out.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# Scheduling (API process)
+# ---------------------------------------------------------------------------
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _pool = ProcessPoolExecutor(max_workers=settings.PREVIEW_WORKERS, mp_context=context)
+        return _pool
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _stored_source(key: str) -> bytes | str:
+    path = get_storage().local_path(key)
+    return str(path) if path is not None else get_storage().read(key)
+
+
+def _store_result(key: str, future: Future) -> None:
+    if future.cancelled():  # shut down before it ran; rendered on demand later
+        return
+    try:
+        data = future.result()
+    except Exception as exc:  # corrupt upload, decoder error, ... best-effort only
+        logger.warning("Preview for %s failed: %r", key, exc)
+        return
+    if data:
+        get_storage().save(preview_key(key), data, "image/webp")
+
+
+def schedule_preview(key: str, source: bytes | Path | None = None) -> Future | None:
+    """
+    Render the preview for a freshly stored upload in the background. `source`
+    is its content or a local copy (which must outlive the job); by default the
+    stored object itself.
+    """
+    if not can_preview(key):
+        return None
+    if source is None:
+        source = _stored_source(key)
+    elif isinstance(source, Path):
+        source = str(source)
+    future = _get_pool().submit(render_preview, source, key, settings.PREVIEW_MAX_PX)
+    future.add_done_callback(lambda f: _store_result(key, f))
+    return future
+
+
+def ensure_preview(key: str, timeout: float = 20.0) -> bool:
+    """Render a missing preview synchronously (legacy uploads, direct uploads, races)."""
+    storage = get_storage()
+    if storage.exists(preview_key(key)):
+        return True
+    if not can_preview(key) or not storage.exists(key):
+        return False
+    future = _get_pool().submit(render_preview, _stored_source(key), key, settings.PREVIEW_MAX_PX)
+    try:
+        data = future.result(timeout=timeout)
+    except Exception as exc:
+        logger.warning("Preview for %s failed: %r", key, exc)
+        return False
+    if not data:
+        return False
+    storage.save(preview_key(key), data, "image/webp")
+    return True
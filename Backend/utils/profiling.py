@@ -0,0 +1,257 @@
+"""
+Per-request profiler for admins (middleware/profiling.py does the wiring).
+
+A request is profiled when it carries a profiling token — minted by an admin
+at POST /api/admin/profiles/token and sent as the `X-Profile-Token` header or
+the `_profile` query parameter — or when it falls into the PROFILE_SAMPLE_RATE
+fraction picked at random. Everything else pays for one header scan.
+
+cProfile and pyinstrument both hook the thread that starts them, but sync
+endpoints (most of this API) run in the threadpool while the event loop thread
+waits. So the profiler here samples instead: a daemon thread reads
+`sys._current_frames()` every PROFILE_INTERVAL_MS and, for each profiled
+request, keeps the stacks of the event loop thread (unless it's idle in the
+selector) and of any thread that is inside the request's endpoint function.
+Other requests on the same loop can show up in the loop thread's samples,
+and work sent to the compute tier's processes doesn't appear at all.
+
+Reports are JSON files in PROFILE_DIR (shared by all workers on a host): the
+request, the hottest functions by self and total samples, and the stacks in
+folded form (`frame;frame;frame count`), which speedscope, flamegraph.pl and
+inferno turn into a flame graph. The newest PROFILE_MAX_REPORTS are kept.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ..core.config import settings
+
+TOKEN_HEADER = "x-profile-token"
+TOKEN_QUERY_PARAM = "_profile"
+DEFAULT_PROFILE_DIR = Path(tempfile.gettempdir()) / "polylab-profiles"
+_MAX_DEPTH = 128
+_TOP_FUNCTIONS = 40
+# innermost Python frame of an idle event loop thread: asyncio's loop waits in the
+# selector, uvloop's in C code under asyncio.run
+_IDLE_FRAMES = {("selectors.py", "select"), ("runners.py", "run")}
+
+
+# ---------------------------------------------------------------------------
+# Tokens
+# ---------------------------------------------------------------------------
+def _token_signature(admin_id: int, expires: int) -> str:
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(), f"profile:{admin_id}:{expires}".encode(), hashlib.sha256
+    ).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def make_token(admin_id: int, ttl_seconds: int | None = None) -> tuple[str, int]:
+    """A signed `admin_id.expires.signature` token and its expiry (unix time)."""
+    ttl = settings.PROFILE_TOKEN_TTL_MINUTES * 60 if ttl_seconds is None else ttl_seconds
+    expires = int(time.time()) + ttl
+    return f"{admin_id}.{expires}.{_token_signature(admin_id, expires)}", expires
+
+
+def verify_token(token: str) -> int | None:
+    """The admin id a valid, unexpired token was minted for; None otherwise."""
+    admin_id, _, rest = token.partition(".")
+    expires, _, signature = rest.partition(".")
+    if not admin_id.isdigit() or not expires.isdigit() or int(expires) < time.time():
+        return None
+    if not hmac.compare_digest(_token_signature(int(admin_id), int(expires)), signature):
+        return None
+    return int(admin_id)
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def _is_idle(code) -> bool:
+    return (Path(code.co_filename).name, code.co_name) in _IDLE_FRAMES
+
+
+def _stack(frame) -> tuple[list, set]:
+    """Root-first code objects of `frame`'s stack (at most _MAX_DEPTH deep), and the set of them."""
+    codes = []
+    while frame is not None and len(codes) < _MAX_DEPTH:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    codes.reverse()
+    return codes, set(codes)
+
+
+class RequestProfile:
+    """Samples collected for one request; `scope` is its ASGI scope (the router adds "endpoint")."""
+
+    def __init__(self, scope: dict, loop_thread: int, trigger: str, admin_id: int | None = None):
+        self.id = uuid.uuid4().hex
+        self.scope = scope
+        self.loop_thread = loop_thread
+        self.trigger = trigger
+        self.admin_id = admin_id
+        self.stacks: Counter[tuple] = Counter()
+        self.samples = 0
+        self.started = time.perf_counter()
+        self.created_at = datetime.now(timezone.utc)
+
+    def sample(self, frames: dict) -> None:
+        self.samples += 1
+        loop_frame = frames.get(self.loop_thread)
+        if loop_frame is not None and not _is_idle(loop_frame.f_code):
+            self.stacks[("event loop", *_stack(loop_frame)[0])] += 1
+        endpoint = getattr(self.scope.get("endpoint"), "__code__", None)
+        if endpoint is None:
+            return
+        for ident, frame in frames.items():
+            if ident == self.loop_thread:
+                continue
+            codes, seen = _stack(frame)
+            if endpoint in seen:
+                self.stacks[("worker thread", *codes)] += 1
+
+    def report(self, status: int, route: str | None) -> dict:
+        duration = time.perf_counter() - self.started
+        folded = Counter()
+        self_samples, total_samples = Counter(), Counter()
+        for (root, *codes), count in self.stacks.items():
+            labels = [_frame_label(code) for code in codes]
+            folded[";".join([root, *labels])] += count
+            if labels:
+                self_samples[labels[-1]] += count
+            for label in set(labels):
+                total_samples[label] += count
+        top = sorted(total_samples, key=lambda label: (-self_samples[label], -total_samples[label]))
+        return {
+            "id": self.id,
+            "created_at": self.created_at.isoformat(),
+            "method": self.scope["method"],
+            "path": self.scope["path"],
+            "route": route,
+            "status": status,
+            "duration_ms": round(duration * 1000, 3),
+            "trigger": self.trigger,
+            "admin_id": self.admin_id,
+            "interval_ms": settings.PROFILE_INTERVAL_MS,
+            "samples": self.samples,
+            "functions": [
+                {"function": label, "self": self_samples[label], "total": total_samples[label]}
+                for label in top[:_TOP_FUNCTIONS]
+            ],
+            "folded": "\n".join(f"{stack} {count}" for stack, count in folded.most_common()),
+        }
+
+
+class _Sampler:
+    """One daemon thread sampling every active profile; it sleeps while there are none."""
+
+    def __init__(self):
+        self._active: set[RequestProfile] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active.add(profile)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def stop(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active.discard(profile)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                profiles = list(self._active)
+                if not profiles:
+                    self._wakeup.clear()
+            if not profiles:
+                self._wakeup.wait()
+                continue
+            frames = sys._current_frames()
+            for profile in profiles:
+                profile.sample(frames)
+            del frames
+            time.sleep(settings.PROFILE_INTERVAL_MS / 1000)
+
+
+sampler = _Sampler()
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+def profile_dir() -> Path:
+    return Path(settings.PROFILE_DIR) if settings.PROFILE_DIR else DEFAULT_PROFILE_DIR
+
+
+def _report_path(profile_id: str) -> Path | None:
+    try:
+        uuid.UUID(hex=profile_id)
+    except ValueError:
+        return None
+    return profile_dir() / f"{profile_id}.json"
+
+
+def save_report(report: dict) -> None:
+    """Write the report (atomically) and drop the oldest beyond PROFILE_MAX_REPORTS."""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / f"{report['id']}.json"
+    tmp = target.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(report))
+    tmp.replace(target)
+    reports = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    for old in reports[: max(0, len(reports) - settings.PROFILE_MAX_REPORTS)]:
+        old.unlink(missing_ok=True)
+
+
+def load_report(profile_id: str) -> dict | None:
+    path = _report_path(profile_id)
+    if path is None or not path.is_file():
+        return None
+    return json.loads(path.read_text())
+
+
+def list_reports() -> list[dict]:
+    """Newest first, without the stacks."""
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    out = []
+    for path in sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True):
+        try:
+            report = json.loads(path.read_text())
+        except (OSError, ValueError):  # pruned or half-written by another worker
+            continue
+        report.pop("folded", None)
+        report.pop("functions", None)
+        out.append(report)
+    return out
+
+
+def delete_reports() -> int:
+    removed = 0
+    for path in profile_dir().glob("*.json"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
@@ -0,0 +1,238 @@
+"""
+Result cache for the GF endpoints.
+
+A class working through the same exercise asks for the same `(op, m, modPoly,
+a, b)` over and over; the answer (and its step trace) is computed once and
+served from here afterwards, before anything is sent to the compute tier.
+
+- keys are canonical: operands masked to the field, untraced products sorted
+- values are compact: the step dicts become positional rows (`[kind, v1, v2, ...]`
+  with one key list per kind) and the JSON is zlib-compressed, 3-5x smaller
+  than the steps' JSON for short traces and 15x+ for long ones
+- memory is bounded by bytes, not entries (GF_CACHE_MAX_BYTES), least recently
+  used first; a single entry may use at most 1/8 of it
+- with GF_CACHE_SQLITE_PATH set, entries are written through to a SQLite file
+  that is shared by all workers and survives restarts; a memory miss looks
+  there before recomputing. The async routes use `aget`/`aput`, which do the
+  SQLite part in a worker thread, and a file that is locked (or otherwise
+  failing) counts as a miss or a skipped write: the cache is never the reason
+  a request fails
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+import anyio
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough per-entry bookkeeping cost (OrderedDict node, key object, bytes header)
+_ENTRY_OVERHEAD = 120
+# Trim the SQLite file back to GF_CACHE_SQLITE_MAX_ROWS every this many writes
+_PRUNE_EVERY = 1000
+# Seconds to wait for another worker's write lock before giving up on the SQLite tier
+_BUSY_TIMEOUT = 0.2
+
+
+class ResultCache:
+    def __init__(self, max_bytes: int, sqlite_path: str | None = None, max_rows: int = 0):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 8
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.disk_hits = self.evictions = 0
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()  # one statement at a time on the shared connection
+        self._max_rows = max_rows
+        self._writes = 0
+        if sqlite_path:
+            Path(sqlite_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                sqlite_path, timeout=_BUSY_TIMEOUT, check_same_thread=False, isolation_level=None
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, used_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS ix_results_used_at ON results (used_at)")
+
+    @staticmethod
+    def _size(key: str, value: bytes) -> int:
+        return len(key) + len(value) + _ENTRY_OVERHEAD
+
+    def _remember(self, key: str, value: bytes) -> None:
+        """Insert into the in-memory LRU (caller holds the lock)."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= self._size(key, old)
+        self._entries[key] = value
+        self._bytes += self._size(key, value)
+        while self._bytes > self.max_bytes:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._bytes -= self._size(evicted_key, evicted)
+            self.evictions += 1
+
+    def _memory_get(self, key: str) -> bytes | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            elif self._db is None:
+                self.misses += 1
+            return value
+
+    def _disk_get(self, key: str) -> bytes | None:
+        row = None
+        try:
+            with self._db_lock:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:  # recency for pruning; losing one update is harmless
+                    self._db.execute("UPDATE results SET used_at = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as exc:  # locked by another worker, corrupt file, ...: a miss
+            logger.warning("Result cache read failed: %s", exc)
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self._remember(key, row[0])
+            self.hits += 1
+            self.disk_hits += 1
+            return row[0]
+
+    def _disk_put(self, key: str, value: bytes) -> None:
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, used_at) VALUES (?, ?, ?)",
+                    (key, value, time.time()),
+                )
+                self._writes += 1
+                if self._max_rows and self._writes % _PRUNE_EVERY == 0:
+                    self._db.execute(
+                        "DELETE FROM results WHERE key IN "
+                        "(SELECT key FROM results ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                        (self._max_rows,),
+                    )
+        except sqlite3.Error as exc:  # the entry stays in memory; the file is only a second tier
+            logger.warning("Result cache write failed: %s", exc)
+
+    def _memory_put(self, key: str, value: bytes) -> bool:
+        """False when the entry is too big to cache at all."""
+        if self._size(key, value) > self.max_entry_bytes:
+            return False
+        with self._lock:
+            self._remember(key, value)
+        return True
+
+    def get(self, key: str) -> bytes | None:
+        value = self._memory_get(key)
+        if value is None and self._db is not None:
+            value = self._disk_get(key)
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        if self._memory_put(key, value) and self._db is not None:
+            self._disk_put(key, value)
+
+    async def aget(self, key: str) -> bytes | None:
+        """`get` for the event loop: the SQLite lookup runs in a worker thread."""
+        value = self._memory_get(key)
+        if value is None and self._db is not None:
+            value = await anyio.to_thread.run_sync(self._disk_get, key)
+        return value
+
+    async def aput(self, key: str, value: bytes) -> None:
+        """`put` for the event loop: the SQLite write runs in a worker thread."""
+        if self._memory_put(key, value) and self._db is not None:
+            await anyio.to_thread.run_sync(self._disk_put, key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM results")
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "persistent": self._db is not None,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_result_cache() -> ResultCache:
+    return ResultCache(
+        settings.GF_CACHE_MAX_BYTES,
+        settings.GF_CACHE_SQLITE_PATH,
+        settings.GF_CACHE_SQLITE_MAX_ROWS,
+    )
+
+
+# ---------------------------------------------------------------------------
+# GF results: canonical keys + compact step encoding
+# ---------------------------------------------------------------------------
+def field_key(op: str, m: int, mod_poly: int, x: int, y: int | None, trace: bool) -> str:
+    mask = (1 << m) - 1
+    if op in ("mul", "pow", "inv"):
+        x &= mask  # the engine masks operands before computing (and tracing)
+    if op == "mul":
+        y &= mask
+        if not trace:  # a*b == b*a, but the traces differ
+            x, y = min(x, y), max(x, y)
+    operands = f"{x:x}" if y is None else f"{x:x}:{y:x}"
+    return f"gf:{op}:{m}:{mod_poly:x}:{operands}:{int(trace)}"
+
+
+def encode_result(value: int, steps: list[dict] | None) -> bytes:
+    kinds: dict[str, list[str]] = {}
+    rows = None
+    if steps is not None:
+        rows = []
+        for step in steps:
+            keys = kinds.setdefault(step["kind"], [k for k in step if k != "kind"])
+            rows.append([list(kinds).index(step["kind"]), *(step[k] for k in keys)])
+    return encode_json({"v": value, "k": kinds, "s": rows})
+
+
+def decode_result(blob: bytes) -> tuple[int, list[dict] | None]:
+    payload = decode_json(blob)
+    if payload["s"] is None:
+        return payload["v"], None
+    kinds = list(payload["k"].items())
+    steps = []
+    for kind_index, *values in payload["s"]:
+        kind, keys = kinds[kind_index]
+        steps.append({"kind": kind, **dict(zip(keys, values))})
+    return payload["v"], steps
+
+
+def encode_json(payload) -> bytes:
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode(), 6)
+
+
+def decode_json(blob: bytes):
+    return json.loads(zlib.decompress(blob))
@@ -0,0 +1,36 @@
+import base64
+import hashlib
+import hmac
+import time
+from urllib.parse import quote, urlencode
+
+from ..core.config import settings
+
+
+def _secret() -> bytes:
+    return (settings.FILE_URL_SECRET or settings.SECRET_KEY).encode()
+
+
+def _signature(uri: str, expires: int) -> str:
+    # Must stay byte-for-byte identical to nginx/signed_url.js
+    digest = hmac.new(_secret(), f"{expires}:{uri}".encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def sign_upload_uri(uri: str, ttl_seconds: int | None = None) -> tuple[str, int]:
+    """
+    Return `uri?expires=...&sig=...` for an `/uploads/...` path plus its expiry.
+    The signature covers the decoded path, which is what nginx sees in `$uri`.
+    """
+    ttl = settings.SIGNED_URL_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    expires = int(time.time()) + ttl
+    query = urlencode({"expires": expires, "sig": _signature(uri, expires)})
+    return f"{quote(uri)}?{query}", expires
+
+
+def verify_upload_signature(uri: str, expires: str | None, sig: str | None) -> bool:
+    if not expires or not sig or not expires.isdigit():
+        return False
+    if int(expires) < time.time():
+        return False
+    return hmac.compare_digest(_signature(uri, int(expires)), sig)
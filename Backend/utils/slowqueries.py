@@ -0,0 +1,226 @@
+"""
+Slow query log: statements slower than SLOW_QUERY_MS, for admins at
+GET /api/admin/slow-queries.
+
+`instrument_engine` times every cursor execution. A slow one is
+fingerprinted: literals become `?`, IN lists collapse to `IN (...)` and
+whitespace is normalized, so the same query with other ids is one entry.
+Each entry counts occurrences and total/max time, and keeps the routes that
+ran it (core/context.py), the bound parameters of the latest occurrence with
+strings and bytes redacted to their length, and a query plan. The plan comes
+from `EXPLAIN QUERY PLAN` (SQLite) or `EXPLAIN` (PostgreSQL) on a separate
+cursor of the same connection, and it's captured the first time a fingerprint
+is seen, so a hot slow query pays for it once; that first sighting is also
+logged as a warning.
+
+Entries live in a bounded, per-process buffer (SLOW_QUERY_LOG_SIZE): a
+recurring fingerprint moves to the end, and the one not seen for longest
+falls out. With several workers, each one keeps its own.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..core.config import settings
+from ..core.context import current_route
+
+logger = logging.getLogger(__name__)
+
+_EXPLAINABLE = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+_MAX_ROUTES = 10
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    """The statement with literals and placeholders as `?` and IN lists as `IN (...)`."""
+    text = _STRING_LITERAL.sub("?", statement)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _IN_LIST.sub("IN (...)", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize(statement).encode()).hexdigest()[:16]
+
+
+def _redact_value(value):
+    if value is None or isinstance(value, (bool, int, float, Decimal)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str):
+        return f"<str:{len(value)}>"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<bytes:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact(parameters, executemany: bool = False):
+    """Bound parameters with strings/bytes replaced by their length (first row of an executemany)."""
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    return [_redact_value(value) for value in parameters or ()]
+
+
+@dataclass
+class SlowQuery:
+    fingerprint: str
+    statement: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+    first_seen: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    last_seen: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    routes: Counter = field(default_factory=Counter)
+    parameters: list | dict = field(default_factory=list)
+    plan: list[str] | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "fingerprint": self.fingerprint,
+            "statement": self.statement,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "last_ms": round(self.last_ms, 3),
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "routes": dict(self.routes.most_common()),
+            "parameters": self.parameters,
+            "plan": self.plan,
+        }
+
+
+class SlowQueryLog:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, SlowQuery] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, parameters, executemany: bool, ms: float, route: str | None) -> bool:
+        """Add one occurrence; True when the fingerprint is new (so it still needs a plan)."""
+        key = fingerprint(statement)
+        with self._lock:
+            entry = self._entries.get(key)
+            new = entry is None
+            if new:
+                entry = self._entries[key] = SlowQuery(key, normalize(statement))
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            entry.count += 1
+            entry.total_ms += ms
+            entry.max_ms = max(entry.max_ms, ms)
+            entry.last_ms = ms
+            entry.last_seen = datetime.now(timezone.utc)
+            route = route or "<no request>"
+            if route in entry.routes or len(entry.routes) < _MAX_ROUTES:
+                entry.routes[route] += 1
+            entry.parameters = redact(parameters, executemany)
+        return new
+
+    def set_plan(self, statement: str, plan: list[str]) -> None:
+        with self._lock:
+            entry = self._entries.get(fingerprint(statement))
+            if entry is not None:
+                entry.plan = plan
+
+    def entries(self) -> list[dict]:
+        """Slowest in total first."""
+        with self._lock:
+            rows = [entry.to_dict() for entry in self._entries.values()]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_LOG_SIZE)
+
+
+# ---------------------------------------------------------------------------
+# EXPLAIN
+# ---------------------------------------------------------------------------
+def _format_sqlite_plan(rows) -> list[str]:
+    """EXPLAIN QUERY PLAN rows (id, parent, notused, detail) as an indented tree."""
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _unused, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def explain(dbapi_connection, dialect: str, statement: str, parameters, executemany: bool) -> list[str] | None:
+    """The plan of `statement`, or None for dialects/statements we don't explain."""
+    words = statement.split(None, 1)
+    if not words or words[0].upper() not in _EXPLAINABLE:
+        return None
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    if dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    elif dialect == "postgresql":
+        prefix = "EXPLAIN "
+    else:
+        return None
+    cursor = dbapi_connection.cursor()  # the statement's own cursor may still hold rows
+    try:
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+    except Exception as exc:  # a plan is a nice-to-have; never fail the query over it
+        return [f"EXPLAIN failed: {exc}"]
+    finally:
+        cursor.close()
+    if dialect == "sqlite":
+        return _format_sqlite_plan(rows)
+    return [row[0] for row in rows]
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Log statements on `engine` slower than SLOW_QUERY_MS; call once per engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, _cursor, _statement, _parameters, _context, _executemany):
+        conn.info["slow_query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, _cursor, statement, parameters, _context, executemany):
+        ms = (time.perf_counter() - conn.info.pop("slow_query_started")) * 1000
+        threshold = settings.SLOW_QUERY_MS
+        if threshold is None or ms < threshold:
+            return
+        route = current_route()
+        if slow_query_log.record(statement, parameters, executemany, ms, route):
+            logger.warning(
+                "Slow query (%.1f ms): %s",
+                ms,
+                normalize(statement)[:200],
+                extra={"duration_ms": round(ms, 3), "fingerprint": fingerprint(statement)},
+            )
+            if settings.SLOW_QUERY_EXPLAIN:
+                plan = explain(conn.connection.dbapi_connection, conn.dialect.name, statement, parameters, executemany)
+                if plan is not None:
+                    slow_query_log.set_plan(statement, plan)
@@ -0,0 +1,58 @@
+import gzip
+import hashlib
+import mimetypes
+import re
+from pathlib import Path
+
+try:  # optional: only used to write .br siblings when installed
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+# Versioned uploads live in a folder named after the first 16 hex chars of the
+# content's SHA-256, e.g. materials/classroom_3/1f0c2a9be4d17c55/ch01.pdf.
+DIGEST_LEN = 16
+_DIGEST_DIR = re.compile(rf"^[0-9a-f]{{{DIGEST_LEN}}}$")
+
+TEXT_LIKE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+# Precompressing tiny files costs more than it saves
+MIN_PRECOMPRESS_BYTES = 1024
+
+
+def content_digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()[:DIGEST_LEN]
+
+
+def is_versioned(rel_path: str) -> bool:
+    """True when the parent folder of an upload is a content digest."""
+    parts = rel_path.split("/")
+    return len(parts) >= 2 and bool(_DIGEST_DIR.match(parts[-2]))
+
+
+def is_text_like(name: str) -> bool:
+    media_type, _ = mimetypes.guess_type(name)
+    return bool(media_type) and (
+        media_type.startswith("text/") or media_type in TEXT_LIKE_TYPES
+    )
+
+
+def write_precompressed(dest: Path, content: bytes) -> None:
+    """Write `.gz` (and `.br` when brotli is available) next to text-like uploads."""
+    if not is_text_like(dest.name) or len(content) < MIN_PRECOMPRESS_BYTES:
+        return
+    dest.with_name(dest.name + ".gz").write_bytes(gzip.compress(content, mtime=0))
+    if brotli is not None:
+        dest.with_name(dest.name + ".br").write_bytes(brotli.compress(content))
+
+
+def versioned_key(prefix: str, filename: str, content: bytes) -> str:
+    """
+    Storage key `<prefix>/<digest>/<filename>`. A new upload never overwrites
+    an older URL, so those URLs can be cached forever.
+    """
+    return f"{prefix.rstrip('/')}/{content_digest(content)}/{filename}"
@@ -0,0 +1,75 @@
+"""
+Build ZIP archives on the fly without a temp file or an in-memory archive.
+
+`zipfile` writes through a sink that only buffers the bytes produced since
+the last yield, so memory use is bounded by one read chunk plus headers.
+Entries are written with data descriptors because the output isn't seekable.
+"""
+
+import zipfile
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime
+from pathlib import PurePosixPath
+from typing import BinaryIO, NamedTuple
+
+CHUNK_SIZE = 256 * 1024
+# Already-compressed formats: deflating them again only burns CPU
+STORED_SUFFIXES = {
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".webp",
+    ".zip", ".gz", ".7z", ".rar", ".docx", ".xlsx", ".pptx", ".mp4",
+}
+
+
+class ZipEntry(NamedTuple):
+    name: str
+    open: Callable[[], BinaryIO]
+    size: int | None = None
+    modified: datetime | None = None
+
+
+class _Sink:
+    """Write-only, unseekable file object that hands its bytes to the generator."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def compress_type_for(name: str) -> int:
+    if PurePosixPath(name).suffix.lower() in STORED_SUFFIXES:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def stream_zip(entries: Iterable[ZipEntry]) -> Iterator[bytes]:
+    sink = _Sink()
+    with zipfile.ZipFile(sink, mode="w") as archive:
+        for entry in entries:
+            info = zipfile.ZipInfo(
+                entry.name,
+                date_time=(entry.modified or datetime.now()).timetuple()[:6],
+            )
+            info.compress_type = compress_type_for(entry.name)
+            if entry.size is not None:
+                info.file_size = entry.size  # lets zipfile decide on zip64 up front
+            with entry.open() as src, archive.open(info, mode="w") as dest:
+                while chunk := src.read(CHUNK_SIZE):
+                    dest.write(chunk)
+                    if data := sink.drain():
+                        yield data
+            if data := sink.drain():
+                yield data
+    # central directory
+    if data := sink.drain():
+        yield data
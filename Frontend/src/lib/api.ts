@@ -278,6 +278,7 @@ export type Assignment = {
   classroom_id: number;
   due_date?: string | null;
   attachment_url?: string | null;
+  template_id?: string | null;
   created_at: string;
 };
 
@@ -287,6 +288,7 @@ export type Material = {
   title: string;
   description?: string | null;
   file_url?: string | null;
+  preview_url?: string | null;
   created_at: string;
 };
 
@@ -305,6 +307,7 @@ export type Submission = {
   grade?: number | null;
   submitted_at: string;
   file_url?: string | null;
+  preview_url?: string | null;
 };
 
 export type InstructorRequest = {
@@ -313,6 +316,7 @@ export type InstructorRequest = {
   status: "pending" | "approved" | "rejected";
   note: string | null;
   file_path: string;
+  preview_url?: string | null;
   created_at?: string;
   decision_by?: number | null;
   decided_at?: string | null;
@@ -402,6 +406,7 @@ type AssignmentCreatePayload = {
   description?: string | null;
   classroom_id: number;
   due_date?: string | null;
+  template_id?: string | null;
 };
 
 export async function listAssignments(
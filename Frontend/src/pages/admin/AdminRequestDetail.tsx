@@ -78,6 +78,7 @@ export default function AdminRequestDetail() {
   }
 
   const proofHref = req ? buildFileUrl(req.file_path) : null;
+  const proofPreview = req ? buildFileUrl(req.preview_url) : null;
 
   return (
     <div className="relative min-h-screen text-slate-100">
@@ -139,6 +140,17 @@ export default function AdminRequestDetail() {
                 </div>
               )}
 
+              {proofHref && proofPreview && (
+                <a href={proofHref} target="_blank" rel="noreferrer">
+                  <img
+                    src={proofPreview}
+                    alt="Proof preview"
+                    loading="lazy"
+                    className="max-h-80 rounded-lg border border-slate-700"
+                  />
+                </a>
+              )}
+
               <div className="flex gap-2 pt-2">
                 <Button
                   onClick={() => act("approve")}
@@ -369,6 +369,7 @@ function AssignmentsPanel({
         title: title.trim(),
         description: desc.trim() ? desc.trim() : null,
         due_date: due ? new Date(due).toISOString() : null,
+        template_id: templateId || null,
       };
       const created = await createAssignment(payload);
       if (file) {
@@ -80,6 +80,7 @@ export default function InstructorSubmissionPage() {
   ).toLocaleString("en-LB", { timeZone: "Asia/Beirut" });
 
   const fileHref = buildFileUrl(submission.file_url);
+  const previewSrc = buildFileUrl(submission.preview_url);
 
   return (
     <div className="min-h-screen bg-slate-950 text-slate-100 p-6">
@@ -118,7 +119,17 @@ export default function InstructorSubmissionPage() {
         )}
 
         {fileHref && (
-          <section>
+          <section className="space-y-2">
+            {previewSrc && (
+              <a href={fileHref} target="_blank" rel="noopener noreferrer">
+                <img
+                  src={previewSrc}
+                  alt="Submission preview"
+                  loading="lazy"
+                  className="max-h-96 rounded-md border border-slate-700"
+                />
+              </a>
+            )}
             <a
               href={fileHref}
               target="_blank"
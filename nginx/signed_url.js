@@ -0,0 +1,35 @@
+// nginx/signed_url.js
+// Validates expiring /uploads/... links minted by Backend/utils/signing.py so
+// nginx can serve them straight from disk without asking the API.
+// Signature: base64url(HMAC-SHA256(FILE_URL_SECRET or SECRET_KEY, "<expires>:<decoded uri>"))
+
+const crypto = require("crypto");
+
+// Constant-time string comparison: always walks every character so the
+// response time doesn't reveal how much of a forged signature matched.
+function safeEqual(a, b) {
+  if (a.length !== b.length) return false;
+  let diff = 0;
+  for (let i = 0; i < a.length; i++) {
+    diff |= a.charCodeAt(i) ^ b.charCodeAt(i);
+  }
+  return diff === 0;
+}
+
+function verify(r) {
+  const secret = process.env.FILE_URL_SECRET || process.env.SECRET_KEY;
+  const expires = r.args.expires;
+  const sig = r.args.sig;
+
+  if (!secret || !expires || !sig || !/^\d+$/.test(expires)) return "0";
+  if (Number(expires) < Math.floor(Date.now() / 1000)) return "0";
+
+  const expected = crypto
+    .createHmac("sha256", secret)
+    .update(`${expires}:${r.uri}`)
+    .digest("base64url");
+
+  return safeEqual(expected, sig) ? "1" : "0";
+}
+
+export default { verify };
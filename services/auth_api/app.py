@@ -16,6 +16,12 @@ ROOT = Path(__file__).resolve().parent
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
+from Backend.core.logs import configure_logging  # noqa: E402
+
+# Before anything logs: without a handler, utils/email.py's dev-mode messages
+# (INFO/DEBUG) would be dropped at Python's default WARNING level
+configure_logging()
+
 from Backend.main import app  # noqa: E402  (import after sys.path tweak)
 
 __all__ = ["app"]
@@ -1,5 +1,6 @@
 # services/auth_api/utils/email.py
 
+import logging
 import smtplib
 from email.message import EmailMessage
 from sqlalchemy.orm import Session
@@ -8,6 +9,8 @@ from .tokens import make_token
 from ..models.user import User
 from ..core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 def _send_mail(to: str, subject: str, body: str) -> None:
     """
@@ -16,8 +19,9 @@ def _send_mail(to: str, subject: str, body: str) -> None:
     the API doesn't crash.
     """
     if not (settings.SMTP_HOST and settings.SMTP_USER and settings.SMTP_PASSWORD and settings.MAIL_FROM):
-        # Dev mode: no SMTP configured, just print the message so nothing crashes
-        print(f"[DEV] Would send email to {to}: {subject}\n{body}\n")
+        # Dev fallback: log the email instead; the body holds a verify/reset link, a credential
+        logger.info("Would send email to %s: %s (no mail settings; LOG_LEVEL=DEBUG shows the body)", to, subject)
+        logger.debug("Email body for %s:\n%s", to, body)
         return
 
     msg = EmailMessage()
@@ -32,11 +36,10 @@ def _send_mail(to: str, subject: str, body: str) -> None:
             smtp.starttls()
             smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
             smtp.send_message(msg)
-        print(f"[MAIL] Sent email to {to}: {subject}")
+        logger.info("Sent email to %s: %s", to, subject)
     except Exception as exc:
         # Don't crash signup/reset flows if email fails
-        print(f"[ERROR] SMTP send failed: {exc}")
-        # You could log this somewhere later
+        logger.error("SMTP send failed: %s", exc)
 
 
 def send_verification_email(db: Session, user: User) -> str:
@@ -51,7 +54,7 @@ def send_verification_email(db: Session, user: User) -> str:
     )
 
     _send_mail(user.email, "Verify your PolyLab account", body)
-    print(f"[DEV] Verify link for {user.email}: {link}")
+    logger.debug("Verify link for %s: %s", user.email, link)
     return token
 
 
@@ -67,5 +70,5 @@ def send_reset_email(db: Session, user: User) -> str:
     )
 
     _send_mail(user.email, "Reset your PolyLab password", body)
-    print(f"[DEV] Reset link for {user.email}: {link}")
+    logger.debug("Reset link for %s: %s", user.email, link)
     return token